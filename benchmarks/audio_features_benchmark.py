@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк обработки аудио в AudioHelper.
+
+Сравнивает прежние реализации на циклах Python с векторизованными:
+обрезку тишины (поиск границ по отсчетам против RMS фреймов через
+stride tricks) и выбор основной частоты по кадрам piptrack (цикл по
+кадрам против argmax по оси). Также сравнивает последовательное
+извлечение характеристик из набора WAV файлов с extract_features_many.
+
+Запуск:
+    python benchmarks/audio_features_benchmark.py [--seconds N] [--files N]
+"""
+
+import sys
+import os
+import time
+import wave
+import argparse
+import tempfile
+
+import numpy as np
+
+# Добавляем путь к модулям проекта
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice_control.utils.audio_helper import AudioHelper
+
+
+def legacy_trim_silence(audio_data: np.ndarray, threshold: float) -> np.ndarray:
+    """Прежняя обрезка тишины: два цикла по отсчетам."""
+    start_idx = 0
+    end_idx = len(audio_data)
+    for i in range(len(audio_data)):
+        if abs(audio_data[i]) > threshold:
+            start_idx = i
+            break
+    for i in range(len(audio_data) - 1, -1, -1):
+        if abs(audio_data[i]) > threshold:
+            end_idx = i + 1
+            break
+    return audio_data[start_idx:end_idx]
+
+
+def legacy_median_pitch(pitches: np.ndarray, magnitudes: np.ndarray):
+    """Прежний выбор основной частоты: цикл по кадрам."""
+    pitch_values = []
+    for t in range(pitches.shape[1]):
+        index = magnitudes[:, t].argmax()
+        pitch = pitches[index, t]
+        if pitch > 0:
+            pitch_values.append(pitch)
+    return float(np.median(pitch_values)) if pitch_values else None
+
+
+def timed(func, *args, repeat: int = 3) -> float:
+    """Минимальное время выполнения в миллисекундах."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def make_speech_like(seconds: float, sample_rate: int, seed: int = 0) -> np.ndarray:
+    """Сигнал с тишиной по краям и тоном с шумом в середине."""
+    rng = np.random.default_rng(seed)
+    samples = int(seconds * sample_rate)
+    audio = rng.normal(0, 0.001, samples).astype(np.float32)
+    voiced = slice(samples // 4, samples * 3 // 4)
+    t = np.arange(voiced.stop - voiced.start) / sample_rate
+    audio[voiced] += (0.3 * np.sin(2 * np.pi * 180 * t)).astype(np.float32)
+    return audio
+
+
+def write_wav(path: str, audio: np.ndarray, sample_rate: int) -> None:
+    with wave.open(path, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes((np.clip(audio, -1, 1) * 32767).astype(np.int16).tobytes())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк обработки аудио в AudioHelper")
+    parser.add_argument("--seconds", type=float, default=30.0,
+                        help="Длительность тестового сигнала, секунды")
+    parser.add_argument("--files", type=int, default=8,
+                        help="Количество файлов для extract_features_many")
+    args = parser.parse_args()
+
+    sample_rate = 16000
+    helper = AudioHelper()
+    audio = make_speech_like(args.seconds, sample_rate)
+
+    print(f"trim_silence, {args.seconds:.0f} с сигнала")
+    legacy_ms = timed(legacy_trim_silence, audio, 0.01)
+    framed_ms = timed(helper._frame_rms, audio, 2048, 512)
+    print(f"  циклы по отсчетам     {legacy_ms:10.2f} мс")
+    print(f"  RMS фреймов           {framed_ms:10.2f} мс  (x{legacy_ms / framed_ms:.1f})")
+
+    frames = int(args.seconds * sample_rate / 512)
+    rng = np.random.default_rng(1)
+    pitches = rng.uniform(0, 400, (1025, frames)).astype(np.float32)
+    magnitudes = rng.random((1025, frames)).astype(np.float32)
+    print(f"\nВыбор основной частоты, {frames} кадров piptrack")
+    legacy_ms = timed(legacy_median_pitch, pitches, magnitudes)
+    vector_ms = timed(helper._median_pitch, pitches, magnitudes)
+    print(f"  цикл по кадрам        {legacy_ms:10.2f} мс")
+    print(f"  argmax по оси         {vector_ms:10.2f} мс  (x{legacy_ms / vector_ms:.1f})")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(work_dir, f"sample_{i}.wav")
+            write_wav(path, make_speech_like(args.seconds, sample_rate, seed=i), sample_rate)
+            paths.append(path)
+
+        print(f"\nИзвлечение характеристик, {args.files} файлов по {args.seconds:.0f} с")
+        serial_ms = timed(helper.extract_features_many, paths, None, 1, repeat=1)
+        pool_ms = timed(helper.extract_features_many, paths, repeat=1)
+        print(f"  последовательно       {serial_ms:10.2f} мс")
+        print(f"  пул процессов         {pool_ms:10.2f} мс  (x{serial_ms / pool_ms:.1f})")
+
+
+if __name__ == "__main__":
+    main()
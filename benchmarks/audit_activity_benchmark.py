@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк обнаружения подозрительной активности в AuditLogger.
+
+Измеряет стоимость учета события в скользящих окнах (SlidingWindowCounter)
+при всплесках разной интенсивности, а также полную стоимость
+AuditLogger.log_security_event при росте числа событий в окне. Время на
+событие не должно зависеть от интенсивности всплеска и размера кэша.
+
+Запуск:
+    python benchmarks/audit_activity_benchmark.py [--events N]
+"""
+
+import sys
+import os
+import time
+import argparse
+import tempfile
+
+# Добавляем путь к модулям проекта
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice_control.security.activity_counters import SlidingWindowCounter
+from voice_control.security.audit_logger import AuditLogger, SecurityEventType, SecurityLevel
+
+
+def measure_counters(events: int, rate: float) -> float:
+    """Среднее время учета события в микросекундах.
+
+    Args:
+        events: Количество событий
+        rate: Интенсивность всплеска, событий в секунду (по времени событий)
+
+    Returns:
+        Время на событие в микросекундах
+    """
+    counter = SlidingWindowCounter(window=300.0, resolution=5.0)
+    start_timestamp = time.time()
+    step = 1.0 / rate
+
+    start = time.perf_counter()
+    for i in range(events):
+        timestamp = start_timestamp + i * step
+        counter.add(("event_type", "access_denied"), timestamp=timestamp)
+        counter.add(("user_id", f"user{i % 50}"), timestamp=timestamp)
+        counter.add(("source_ip", f"10.0.0.{i % 200}"), timestamp=timestamp)
+    return (time.perf_counter() - start) / events * 1e6
+
+
+def measure_audit_logger(events: int, chunk: int) -> list:
+    """Время log_security_event по мере заполнения окна.
+
+    Args:
+        events: Количество событий
+        chunk: Размер порции, для которой выводится среднее время
+
+    Returns:
+        Список (событий в окне, мкс на событие)
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as log_dir:
+        audit_logger = AuditLogger("benchmark", log_dir=log_dir)
+        for offset in range(0, events, chunk):
+            start = time.perf_counter()
+            for i in range(offset, offset + chunk):
+                audit_logger.log_security_event(
+                    SecurityEventType.ACCESS_DENIED,
+                    "benchmark event",
+                    {"index": i},
+                    SecurityLevel.LOW,
+                    user_id=f"user{i % 50}",
+                    source_ip=f"10.0.0.{i % 200}"
+                )
+            results.append((offset + chunk, (time.perf_counter() - start) / chunk * 1e6))
+        audit_logger.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк счетчиков подозрительной активности")
+    parser.add_argument("--events", type=int, default=20000,
+                        help="Количество событий в каждом сценарии")
+    args = parser.parse_args()
+
+    print(f"SlidingWindowCounter: 3 ключа на событие, {args.events} событий")
+    for rate in (10, 1000, 10000, 100000):
+        micros = measure_counters(args.events, rate)
+        print(f"  всплеск {rate:>7} событий/с  {micros:10.3f} мкс/событие")
+
+    print(f"\nAuditLogger.log_security_event, {args.events} событий")
+    for in_window, micros in measure_audit_logger(args.events, max(1, args.events // 5)):
+        print(f"  событий в окне {in_window:>7}  {micros:10.3f} мкс/событие")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Микро-бенчмарк DIContainer.resolve.
+
+Измеряет стоимость разрешения зависимостей для singleton, transient и
+scoped регистраций (граф из трех уровней), а также стоимость первого
+разрешения, включающего компиляцию плана.
+
+Запуск:
+    python benchmarks/di_container_benchmark.py [--iterations N]
+"""
+
+import sys
+import os
+import time
+import argparse
+
+# Добавляем путь к модулям проекта
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice_control.core.di_container import DIContainer
+
+
+class Repository:
+    """Зависимость нижнего уровня."""
+
+    def __init__(self):
+        self.items = []
+
+
+class Service:
+    """Зависимость среднего уровня."""
+
+    def __init__(self, repository: Repository):
+        self.repository = repository
+
+
+class Controller:
+    """Зависимость верхнего уровня."""
+
+    def __init__(self, service: Service, repository: Repository):
+        self.service = service
+        self.repository = repository
+
+
+def _measure(func, iterations: int) -> float:
+    """Среднее время вызова в микросекундах."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def _build_container(register) -> DIContainer:
+    """Создание контейнера с одинаковой областью жизни для всего графа."""
+    container = DIContainer("benchmark")
+    register(container, Repository)
+    register(container, Service)
+    register(container, Controller)
+    return container
+
+
+def run_benchmark(iterations: int) -> dict:
+    """Запуск всех сценариев бенчмарка.
+
+    Args:
+        iterations: Количество вызовов resolve в каждом сценарии
+
+    Returns:
+        Словарь сценарий -> среднее время resolve в микросекундах
+    """
+    results = {}
+
+    # Первое разрешение: проверка графа и компиляция плана
+    start = time.perf_counter()
+    container = _build_container(DIContainer.register_transient)
+    container.resolve(Controller)
+    results["first_resolve_with_compile"] = (time.perf_counter() - start) * 1e6
+
+    container = _build_container(DIContainer.register_singleton)
+    container.freeze()
+    container.resolve(Controller)
+    results["singleton"] = _measure(lambda: container.resolve(Controller), iterations)
+
+    container = _build_container(DIContainer.register_transient)
+    container.freeze()
+    results["transient"] = _measure(lambda: container.resolve(Controller), iterations)
+
+    container = _build_container(DIContainer.register_scoped)
+    container.freeze()
+    with container.create_scope("request"):
+        container.resolve(Controller)
+        results["scoped"] = _measure(lambda: container.resolve(Controller), iterations)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк DIContainer.resolve")
+    parser.add_argument("--iterations", type=int, default=100000,
+                        help="Количество вызовов resolve в каждом сценарии")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.iterations)
+
+    print(f"DIContainer.resolve ({args.iterations} итераций)")
+    for scenario, micros in results.items():
+        print(f"  {scenario:<28} {micros:10.3f} мкс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк запуска приложения в трее.
+
+Запускает TrayApplication в отдельном процессе с Qt платформой offscreen
+(без дисплея) и интерпретатором в режиме -X importtime. Измеряет время
+до сигнала TrayApplication.ready, время импорта tray_app и создания
+приложения, стоимость импорта по модулям, резидентную память после
+запуска и число созданных потоков. Результаты (медиана по запускам)
+сохраняются в JSON и сравниваются с базовой линией: при превышении
+допуска скрипт завершается с кодом 1.
+
+Дочерний процесс изолирован от рабочей копии и домашней директории:
+он запускается во временной рабочей директории (с ссылкой на assets)
+с временными HOME и файлом настроек, в котором точка метрик отключена.
+Привязки окон и их горячие клавиши читаются из пустой директории settings/,
+поэтому глобальные горячие клавиши не регистрируются.
+
+Запуск:
+    python benchmarks/startup_benchmark.py [--runs N] [--output FILE]
+        [--baseline FILE] [--update-baseline] [--tolerance 0.2]
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import statistics
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Добавляем путь к модулям проекта
+sys.path.insert(0, PROJECT_ROOT)
+
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, "benchmarks", "startup_baseline.json")
+
+# Метрики, сравниваемые с базовой линией: имя -> вид допуска
+COMPARED_METRICS = {
+    "ready_ms": "time",
+    "import_ms": "time",
+    "construct_ms": "time",
+    "process_wall_ms": "time",
+    "rss_mb": "memory",
+    "threads_created": "threads",
+}
+
+
+def count_threads() -> int:
+    """Число потоков процесса, включая созданные Qt и библиотеками."""
+    try:
+        import psutil
+        return psutil.Process().num_threads()
+    except ImportError:
+        pass
+    try:
+        return len(os.listdir(f"/proc/{os.getpid()}/task"))
+    except OSError:
+        return threading.active_count()
+
+
+def resident_memory_mb() -> float:
+    """Резидентная память процесса в мегабайтах."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        import resource
+        # ru_maxrss - пик, в килобайтах на Linux и в байтах на macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_child(output_path: str, timeout: float) -> int:
+    """Запуск приложения в текущем процессе и запись метрик.
+
+    Args:
+        output_path: Файл для результатов
+        timeout: Максимальное время ожидания готовности (сек)
+
+    Returns:
+        Код завершения
+    """
+    start = time.perf_counter()
+    threads_before = count_threads()
+
+    from utils.startup import get_startup_timeline
+    timeline = get_startup_timeline()
+
+    import_start = time.perf_counter()
+    from tray_app import TrayApplication
+    import_ms = (time.perf_counter() - import_start) * 1000
+
+    from PySide6.QtCore import QTimer
+
+    construct_start = time.perf_counter()
+    app = TrayApplication(sys.argv[:1])
+    construct_ms = (time.perf_counter() - construct_start) * 1000
+
+    result: Dict[str, Any] = {"import_ms": import_ms, "construct_ms": construct_ms}
+
+    def on_ready():
+        result["ready_ms"] = (time.perf_counter() - start) * 1000
+        result["rss_mb"] = resident_memory_mb()
+        result["threads"] = count_threads()
+        result["threads_created"] = result["threads"] - threads_before
+        result["timeline"] = timeline.to_dict()["marks"]
+        QTimer.singleShot(0, app.quit)
+
+    if app.is_ready:
+        on_ready()
+    else:
+        app.ready.connect(on_ready)
+        QTimer.singleShot(int(timeout * 1000), app.quit)
+        app.exec()
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+    return 0 if "ready_ms" in result else 2
+
+
+def parse_importtime(stderr: str) -> Dict[str, Dict[str, float]]:
+    """Разбор вывода python -X importtime.
+
+    Args:
+        stderr: Поток ошибок дочернего процесса
+
+    Returns:
+        Словарь модуль -> {"self_ms", "cumulative_ms"}
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            modules[name.strip()] = {
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            }
+        except ValueError:
+            continue
+    return modules
+
+
+def prepare_sandbox(root: str) -> Dict[str, str]:
+    """Подготовка изолированного окружения дочернего процесса.
+
+    Args:
+        root: Временная директория
+
+    Returns:
+        Переменные окружения для дочернего процесса (HOME, путь к настройкам)
+        и рабочая директория под ключом "cwd"
+    """
+    from settings_modules.settings_manager import SETTINGS_PATH_ENV_VAR
+
+    home_dir = os.path.join(root, "home")
+    work_dir = os.path.join(root, "cwd")
+    os.makedirs(home_dir)
+    os.makedirs(work_dir)
+
+    # Иконки загружаются по относительному пути, как при обычном запуске
+    assets = os.path.join(PROJECT_ROOT, "assets")
+    if os.path.isdir(assets):
+        try:
+            os.symlink(assets, os.path.join(work_dir, "assets"), target_is_directory=True)
+        except OSError:
+            shutil.copytree(assets, os.path.join(work_dir, "assets"))
+
+    settings_path = os.path.join(root, "settings.json")
+    with open(settings_path, "w", encoding="utf-8") as f:
+        json.dump({"diagnostics": {"metrics_endpoint_enabled": False}}, f)
+
+    return {
+        "cwd": work_dir,
+        "HOME": home_dir,
+        "USERPROFILE": home_dir,
+        SETTINGS_PATH_ENV_VAR: settings_path,
+    }
+
+
+def run_once(timeout: float) -> Dict[str, Any]:
+    """Один запуск приложения в дочернем процессе.
+
+    Args:
+        timeout: Максимальное время ожидания готовности (сек)
+
+    Returns:
+        Метрики запуска
+    """
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        sandbox = prepare_sandbox(temp_dir)
+        cwd = sandbox.pop("cwd")
+        env.update(sandbox)
+
+        output_path = os.path.join(temp_dir, "result.json")
+        command = [sys.executable, "-X", "importtime", os.path.abspath(__file__),
+                   "--child", output_path, "--timeout", str(timeout)]
+
+        start = time.perf_counter()
+        process = subprocess.run(command, cwd=cwd, env=env, capture_output=True,
+                                 text=True, timeout=timeout + 30)
+        process_wall_ms = (time.perf_counter() - start) * 1000
+
+        if process.returncode != 0 or not os.path.exists(output_path):
+            tail = "\n".join(process.stderr.splitlines()[-20:])
+            raise RuntimeError(f"Запуск приложения завершился с кодом {process.returncode}:\n{tail}")
+
+        with open(output_path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+
+    result["process_wall_ms"] = process_wall_ms
+    result["imports"] = parse_importtime(process.stderr)
+    return result
+
+
+def aggregate(runs: List[Dict[str, Any]], top: int) -> Dict[str, Any]:
+    """Медианы метрик по запускам и самые дорогие импорты.
+
+    Args:
+        runs: Результаты отдельных запусков
+        top: Количество модулей в списке самых дорогих импортов
+
+    Returns:
+        Сводные результаты
+    """
+    metrics = {name: statistics.median(run[name] for run in runs)
+               for name in COMPARED_METRICS}
+    metrics["threads"] = statistics.median(run["threads"] for run in runs)
+
+    marks = {}
+    for name in runs[0].get("timeline", {}):
+        values = [run["timeline"][name] for run in runs if name in run.get("timeline", {})]
+        marks[name] = statistics.median(values)
+
+    modules: Dict[str, List[Dict[str, float]]] = {}
+    for run in runs:
+        for name, cost in run["imports"].items():
+            modules.setdefault(name, []).append(cost)
+    imports = {
+        name: {
+            "self_ms": statistics.median(cost["self_ms"] for cost in costs),
+            "cumulative_ms": statistics.median(cost["cumulative_ms"] for cost in costs),
+        }
+        for name, costs in modules.items()
+    }
+
+    packages: Dict[str, float] = {}
+    for name, cost in imports.items():
+        package = name.split(".", 1)[0]
+        packages[package] = packages.get(package, 0.0) + cost["self_ms"]
+
+    slowest = sorted(imports.items(), key=lambda item: item[1]["self_ms"], reverse=True)[:top]
+    return {
+        "runs": len(runs),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "metrics": metrics,
+        "timeline": marks,
+        "modules_imported": len(imports),
+        "import_self_ms_total": sum(cost["self_ms"] for cost in imports.values()),
+        "slowest_imports": dict(slowest),
+        "packages": dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]),
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            tolerances: Dict[str, float], thread_slack: int) -> List[str]:
+    """Сравнение с базовой линией.
+
+    Args:
+        current: Текущие результаты
+        baseline: Базовая линия
+        tolerances: Относительный допуск по виду метрики ("time", "memory")
+        thread_slack: Допустимое число дополнительных потоков
+
+    Returns:
+        Список описаний регрессий (пустой, если их нет)
+    """
+    regressions = []
+    for name, kind in COMPARED_METRICS.items():
+        old = baseline.get("metrics", {}).get(name)
+        new = current["metrics"].get(name)
+        if old is None or new is None:
+            continue
+        if kind == "threads":
+            limit = old + thread_slack
+        else:
+            limit = old * (1 + tolerances[kind])
+        if new > limit:
+            regressions.append(f"{name}: {new:.1f} > {limit:.1f} (база {old:.1f})")
+    return regressions
+
+
+def print_report(result: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    """Вывод результатов и изменений относительно базовой линии."""
+    metrics = result["metrics"]
+    base_metrics = (baseline or {}).get("metrics", {})
+
+    print(f"Запуск TrayApplication, медиана по {result['runs']} запускам:")
+    for name in list(COMPARED_METRICS) + ["threads"]:
+        line = f"  {name:18} {metrics[name]:10.1f}"
+        if name in base_metrics and base_metrics[name]:
+            change = (metrics[name] - base_metrics[name]) / base_metrics[name] * 100
+            line += f"  (база {base_metrics[name]:.1f}, {change:+.1f}%)"
+        print(line)
+
+    if result["timeline"]:
+        print("\nЭтапы запуска, мс от начала отсчета:")
+        for name, elapsed in sorted(result["timeline"].items(), key=lambda item: item[1]):
+            print(f"  {name:18} {elapsed:10.1f}")
+
+    print(f"\nИмпортировано модулей: {result['modules_imported']}, "
+          f"собственное время импорта: {result['import_self_ms_total']:.1f} мс")
+    print("Самые дорогие импорты (self / cumulative, мс):")
+    for name, cost in result["slowest_imports"].items():
+        print(f"  {cost['self_ms']:8.1f} {cost['cumulative_ms']:10.1f}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк запуска приложения в трее")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Количество запусков (берется медиана)")
+    parser.add_argument("--output", default=None,
+                        help="Файл для результатов в JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Файл базовой линии")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Сохранить результаты как новую базовую линию")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Допустимый относительный рост времени запуска")
+    parser.add_argument("--memory-tolerance", type=float, default=0.1,
+                        help="Допустимый относительный рост резидентной памяти")
+    parser.add_argument("--thread-slack", type=int, default=0,
+                        help="Допустимое число дополнительных потоков")
+    parser.add_argument("--top", type=int, default=15,
+                        help="Количество модулей в списке самых дорогих импортов")
+    parser.add_argument("--timeout", type=float, default=60.0,
+                        help="Максимальное время ожидания готовности, секунды")
+    parser.add_argument("--child", metavar="RESULT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.exit(run_child(args.child, args.timeout))
+
+    runs = []
+    for index in range(args.runs):
+        run = run_once(args.timeout)
+        print(f"Запуск {index + 1}/{args.runs}: готовность через {run['ready_ms']:.0f} мс")
+        runs.append(run)
+    result = aggregate(runs, args.top)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print()
+    print_report(result, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"\nБазовая линия сохранена в {args.baseline}")
+        return
+
+    if baseline is None:
+        print(f"\nБазовая линия {args.baseline} не найдена, сравнение пропущено")
+        return
+
+    tolerances = {"time": args.tolerance, "memory": args.memory_tolerance}
+    regressions = compare(result, baseline, tolerances, args.thread_slack)
+    if regressions:
+        print("\nРегрессии относительно базовой линии:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("\nРегрессий относительно базовой линии нет")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк валидации по схеме в InputValidator.
+
+Сравнивает прежний интерпретируемый обход схемы (на каждый вызов - разбор
+конфигурации полей; реализация перенесена сюда из InputValidator) со
+скомпилированным валидатором compile_schema и с одноразовыми схемами,
+создаваемыми на каждый вызов validate_data. Схемы повторяют проверки
+ConfigManager.validate_config для секций audio/recognition/tts/performance
+и словарь пользовательских настроек.
+
+Запуск:
+    python benchmarks/validator_benchmark.py [--iterations N]
+"""
+
+import sys
+import os
+import re
+import time
+import argparse
+
+# Добавляем путь к модулям проекта
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice_control.utils.validator import InputValidator, ValidationRule, ValidationResult, _TYPE_MAPPING
+
+
+CONFIG_SCHEMA = {
+    "sample_rate": {"type": "int", "required": True, "min_value": 1, "max_value": 192000},
+    "channels": {"type": "int", "required": True, "allowed_values": [1, 2]},
+    "chunk_size": {"type": "int", "min_value": 64, "max_value": 65536},
+    "volume_threshold": {"type": "number", "min_value": 0, "max_value": 1},
+    "engine": {"type": "str", "required": True,
+               "allowed_values": ["google", "whisper", "azure", "yandex", "vosk"]},
+    "language": {"type": "str", "pattern": r"^[a-z]{2}(-[A-Z]{2})?$"},
+    "confidence_threshold": {"type": "number", "min_value": 0, "max_value": 1},
+    "speed": {"type": "number", "min_value": 0.1, "max_value": 10},
+    "volume": {"type": "number", "min_value": 0, "max_value": 1},
+    "max_worker_threads": {"type": "int", "required": True, "min_value": 1, "max_value": 64},
+}
+
+SETTINGS_SCHEMA = {
+    "theme": {"type": "str", "allowed_values": ["light", "dark", "system"]},
+    "hotkey": {"type": "str", "min_length": 1, "max_length": 32},
+    "model_path": {"type": "str", "max_length": 1024},
+    "api_key": {"type": "str", "pattern": "api_key"},
+    "app_version": {"type": "str", "pattern": "version"},
+    "autostart": {"type": "bool"},
+    "history_size": {"type": "int", "min_value": 0, "max_value": 10000},
+}
+
+CONFIG_DATA = {
+    "sample_rate": 16000, "channels": 1, "chunk_size": 1024, "volume_threshold": 0.01,
+    "engine": "vosk", "language": "ru-RU", "confidence_threshold": 0.7,
+    "speed": 1.0, "volume": 0.8, "max_worker_threads": 4,
+}
+
+SETTINGS_DATA = {
+    "theme": "dark", "hotkey": "ctrl+shift+space", "model_path": "models/vosk/vosk-model-small-ru-0.22",
+    "api_key": "AbCdEfGhIjKlMnOpQrSt", "app_version": "1.2.3", "autostart": True, "history_size": 500,
+}
+
+
+def legacy_validate_type(value, expected_type: str) -> bool:
+    """Прежняя проверка типа значения."""
+    expected_python_type = _TYPE_MAPPING.get(expected_type.lower())
+    if expected_python_type:
+        return isinstance(value, expected_python_type)
+    return True
+
+
+def legacy_validate_field_value(validator: InputValidator, field_name: str, value, config: dict):
+    """Прежняя проверка значения поля: (валидно, список ошибок)."""
+    errors = []
+
+    if isinstance(value, str):
+        min_length = config.get('min_length')
+        max_length = config.get('max_length', validator._default_settings['max_string_length'])
+        if min_length and len(value) < min_length:
+            errors.append(f"Field '{field_name}' must be at least {min_length} characters long")
+        if max_length and len(value) > max_length:
+            errors.append(f"Field '{field_name}' must be no more than {max_length} characters long")
+
+    if isinstance(value, (int, float)):
+        min_value = config.get('min_value')
+        max_value = config.get('max_value')
+        if min_value is not None and value < min_value:
+            errors.append(f"Field '{field_name}' must be at least {min_value}")
+        if max_value is not None and value > max_value:
+            errors.append(f"Field '{field_name}' must be no more than {max_value}")
+
+    pattern = config.get('pattern')
+    if pattern and isinstance(value, str) and isinstance(pattern, str):
+        if pattern in validator._patterns:
+            if not validator._patterns[pattern].match(value):
+                errors.append(f"Field '{field_name}' does not match required pattern")
+        else:
+            try:
+                if not re.match(pattern, value):
+                    errors.append(f"Field '{field_name}' does not match required pattern")
+            except re.error:
+                errors.append(f"Invalid pattern for field '{field_name}'")
+
+    allowed_values = config.get('allowed_values')
+    if allowed_values and value not in allowed_values:
+        errors.append(f"Field '{field_name}' must be one of: {', '.join(map(str, allowed_values))}")
+
+    forbidden_values = config.get('forbidden_values')
+    if forbidden_values and value in forbidden_values:
+        errors.append(f"Field '{field_name}' cannot be one of: {', '.join(map(str, forbidden_values))}")
+
+    return len(errors) == 0, errors
+
+
+def legacy_validate(validator: InputValidator, data: dict, schema: dict) -> ValidationResult:
+    """Прежний validate_data: интерпретируемый обход схемы на каждый вызов."""
+    errors = []
+    field_errors = {}
+    validated_data = {}
+    for field_name, field_config in schema.items():
+        field_errors[field_name] = []
+        if field_config.get('required', False) and field_name not in data:
+            field_errors[field_name].append(f"Field '{field_name}' is required")
+            continue
+        if field_name in data:
+            field_value = data[field_name]
+            expected_type = field_config.get('type')
+            if expected_type and not legacy_validate_type(field_value, expected_type):
+                field_errors[field_name].append(f"Field '{field_name}' must be of type {expected_type}")
+                continue
+            valid, value_errors = legacy_validate_field_value(validator, field_name, field_value, field_config)
+            if not valid:
+                field_errors[field_name].extend(value_errors)
+            else:
+                validated_data[field_name] = field_value
+    for field_name, value in data.items():
+        for rule in validator._custom_rules.get(field_name, []):
+            if rule.level.value <= validator._validation_level.value and not rule.validator(value):
+                field_errors.setdefault(field_name, []).append(rule.error_message)
+    for rule in validator._global_rules:
+        if rule.level.value <= validator._validation_level.value and not rule.validator(data):
+            errors.append(rule.error_message)
+    for field_error_list in field_errors.values():
+        errors.extend(field_error_list)
+    field_errors = {k: v for k, v in field_errors.items() if v}
+    return ValidationResult(not errors, errors, [], field_errors, validated_data if not errors else None)
+
+
+def measure(func, iterations: int) -> float:
+    """Количество вызовов в секунду."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк валидации по схеме")
+    parser.add_argument("--iterations", type=int, default=20000,
+                        help="Количество проверок в каждом сценарии")
+    args = parser.parse_args()
+
+    validator = InputValidator()
+    validator.add_global_rule(ValidationRule("size", lambda data: len(data) < 100, "Too many fields"))
+
+    for name, schema, data in (("config", CONFIG_SCHEMA, CONFIG_DATA),
+                               ("settings", SETTINGS_SCHEMA, SETTINGS_DATA)):
+        assert validator.validate_data(data, schema).is_valid
+
+        legacy = measure(lambda: legacy_validate(validator, data, schema), args.iterations)
+
+        def uncached():
+            validator.clear_schema_cache()
+            validator.validate_data(data, schema)
+
+        recompiled = measure(uncached, args.iterations)
+        one_shot = measure(lambda: validator.validate_data(data, dict(schema)), args.iterations)
+        cached = measure(lambda: validator.validate_data(data, schema), args.iterations)
+        compiled = validator.compile_schema(schema)
+        direct = measure(lambda: compiled(data), args.iterations)
+
+        print(f"Схема {name} ({len(schema)} полей), проверок в секунду:")
+        print(f"  интерпретация схемы      {legacy:12.0f}")
+        print(f"  компиляция на каждый вызов {recompiled:10.0f}")
+        print(f"  новая схема на каждый вызов {one_shot:9.0f}")
+        print(f"  validate_data (кэш)      {cached:12.0f}  (x{cached / legacy:.1f})")
+        print(f"  скомпилированный валидатор {direct:10.0f}  (x{direct / legacy:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,276 @@
 """
 Упрощенная конфигурация логирования для проекта BotEye.
 Настраивает базовое логирование для всех модулей проекта.
+
+Все обработчики (консоль, файлы) работают в одном фоновом потоке
+QueueListener: логгеры получают только QueueHandler, который кладет запись
+в очередь без ожидания ввода-вывода. Поэтому запись на диск или в консоль
+не блокирует аудио-коллбэки и потоки распознавания. Частые отладочные
+сообщения ограничиваются по частоте для каждого логгера отдельно.
 """
 
+import atexit
 import logging
+import queue
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple, Union
+
+# Максимальный размер очереди записей; при переполнении записи отбрасываются
+LOG_QUEUE_SIZE = 50000
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Ограничение частоты сообщений для каждого логгера (token bucket).
+
+    Ограничиваются только сообщения уровня max_level и ниже (по умолчанию
+    DEBUG), предупреждения и ошибки проходят всегда. Количество подавленных
+    сообщений добавляется к следующему пропущенному сообщению логгера.
+    """
+
+    def __init__(self, rate: float = 20.0, burst: int = 50, max_level: int = logging.DEBUG):
+        """
+        Args:
+            rate: Допустимое среднее количество сообщений в секунду на логгер
+            burst: Допустимый всплеск сообщений
+            max_level: Максимальный уровень ограничиваемых сообщений
+        """
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.max_level = max_level
+        self._buckets: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        self.suppressed_total = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+
+        # Запись проходит через несколько QueueHandler при распространении
+        # по иерархии логгеров - решение принимается один раз
+        decision = getattr(record, "_rate_limit_passed", None)
+        if decision is not None:
+            return decision
+
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(record.name)
+            if bucket is None:
+                # [токены, время последнего пополнения, подавлено сообщений]
+                bucket = self._buckets[record.name] = [float(self.burst), now, 0]
+
+            bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                suppressed, bucket[2] = bucket[2], 0
+                passed = True
+            else:
+                bucket[2] += 1
+                self.suppressed_total += 1
+                suppressed = 0
+                passed = False
+
+        if suppressed:
+            record.msg = f"{record.getMessage()} [подавлено похожих сообщений: {suppressed}]"
+            record.args = None
+        record._rate_limit_passed = passed
+        return passed
+
+
+class _RoutedQueueHandler(QueueHandler):
+    """QueueHandler, помечающий записи маршрутом (логгером, к которому он подключен)."""
+
+    def __init__(self, log_queue: queue.Queue, route: str):
+        super().__init__(log_queue)
+        self.route = route
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = super().prepare(record)
+        record.log_route = self.route
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Не блокируем вызывающий поток: лучше потерять запись лога
+            self.dropped += 1
+
+
+class _RoutingQueueListener(QueueListener):
+    """QueueListener, передающий запись только обработчикам ее маршрута."""
+
+    def __init__(self, log_queue: queue.Queue, routes: Dict[str, Tuple[logging.Handler, ...]]):
+        super().__init__(log_queue, respect_handler_level=True)
+        self.routes = routes
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def handle(self, record: logging.LogRecord) -> None:
+        for handler in self.routes.get(getattr(record, "log_route", ""), ()):
+            if record.levelno >= handler.level:
+                try:
+                    handler.handle(record)
+                except Exception:
+                    handler.handleError(record)
+
+
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+_listener: Optional[_RoutingQueueListener] = None
+# Маршрут (имя логгера) -> обработчики, вызываемые в фоновом потоке
+_routes: Dict[str, Tuple[logging.Handler, ...]] = {}
+_queue_handlers: Dict[str, _RoutedQueueHandler] = {}
+_rate_limit_filter = RateLimitFilter()
+_pipeline_lock = threading.RLock()
+
+
+def _ensure_listener() -> _RoutingQueueListener:
+    """Ленивый запуск общего потока обработки логов."""
+    global _listener
+    with _pipeline_lock:
+        if _listener is None:
+            _listener = _RoutingQueueListener(_log_queue, _routes)
+            _listener.start()
+        return _listener
+
+
+def route_handler(logger: Union[str, logging.Logger], handler: logging.Handler) -> logging.Handler:
+    """
+    Подключает обработчик к логгеру через общую очередь.
+
+    Логгер получает (однократно) QueueHandler, а сам обработчик вызывается
+    в фоновом потоке для записей, прошедших через этот логгер, - так же,
+    как если бы он был добавлен через logger.addHandler().
+
+    Args:
+        logger: Логгер или его имя ("" - корневой логгер)
+        handler: Обработчик (StreamHandler, FileHandler и т.д.)
+
+    Returns:
+        logging.Handler: Переданный обработчик
+    """
+    if isinstance(logger, str):
+        logger = logging.getLogger(logger) if logger else logging.getLogger()
+    route = logger.name
+
+    with _pipeline_lock:
+        _ensure_listener()
+        _routes[route] = _routes.get(route, ()) + (handler,)
 
-def configure_logging():
+        queue_handler = _queue_handlers.get(route)
+        if queue_handler is None or queue_handler not in logger.handlers:
+            queue_handler = _RoutedQueueHandler(_log_queue, route)
+            queue_handler.addFilter(_rate_limit_filter)
+            _queue_handlers[route] = queue_handler
+            logger.addHandler(queue_handler)
+
+    return handler
+
+
+def clear_routed_handlers(logger: Union[str, logging.Logger]) -> None:
+    """
+    Отключает от логгера все обработчики, подключенные через route_handler().
+
+    Args:
+        logger: Логгер или его имя
+    """
+    if isinstance(logger, str):
+        logger = logging.getLogger(logger) if logger else logging.getLogger()
+
+    with _pipeline_lock:
+        queue_handler = _queue_handlers.pop(logger.name, None)
+        if queue_handler is not None:
+            logger.removeHandler(queue_handler)
+        handlers = _routes.pop(logger.name, ())
+
+    for handler in handlers:
+        handler.close()
+
+
+def set_rate_limit(rate: float, burst: int, max_level: int = logging.DEBUG) -> None:
+    """
+    Настройка ограничения частоты сообщений.
+
+    Args:
+        rate: Сообщений в секунду на логгер
+        burst: Допустимый всплеск
+        max_level: Максимальный уровень ограничиваемых сообщений
+    """
+    _rate_limit_filter.rate = rate
+    _rate_limit_filter.burst = burst
+    _rate_limit_filter.max_level = max_level
+
+
+def get_logging_statistics() -> Dict[str, int]:
+    """
+    Статистика конвейера логирования.
+
+    Returns:
+        dict: Размер очереди, отброшенные при переполнении и подавленные записи
+    """
+    with _pipeline_lock:
+        dropped = sum(handler.dropped for handler in _queue_handlers.values())
+        routes = len(_routes)
+    return {
+        "queue_size": _log_queue.qsize(),
+        "dropped": dropped,
+        "rate_limited": _rate_limit_filter.suppressed_total,
+        "routes": routes
+    }
+
+
+def stop_logging() -> None:
+    """
+    Останавливает фоновый поток, предварительно обработав все записи из очереди.
+
+    Вызывается автоматически при завершении процесса. Следующий вызов
+    route_handler() снова запустит поток.
+    """
+    global _listener
+    with _pipeline_lock:
+        listener, _listener = _listener, None
+    if listener is None:
+        return
+    listener.stop()
+    for handlers in list(_routes.values()):
+        for handler in handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+
+
+atexit.register(stop_logging)
+
+
+def configure_logging(log_file: Optional[str] = None):
     """
     Простая настройка логирования для всего приложения.
-    Устанавливает уровень DEBUG для всех модулей и настраивает вывод в консоль.
-    
+    Устанавливает уровень DEBUG для всех модулей и настраивает вывод в консоль
+    (и в файл, если указан) через общую очередь логирования.
+
+    Args:
+        log_file: Путь к файлу лога (необязательно)
+
     Returns:
         logging.Logger: Корневой логгер
     """
     # Сброс всех предыдущих настроек логирования
+    clear_routed_handlers(logging.getLogger())
     logging.root.handlers = []
-    
+
     # Настраиваем корневой логгер
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)
-    
+
     # Настраиваем кодировку консоли для Windows
     if sys.platform == 'win32':
         import codecs
@@ -35,18 +285,25 @@ def configure_logging():
             if sys.stderr:
                 sys.stderr = codecs.getwriter('utf-8')(sys.stderr.detach())
 
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
     # Создаем обработчик для вывода в консоль, если она доступна
     if sys.stdout:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.DEBUG)
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
         console_handler.setFormatter(formatter)
-        root_logger.addHandler(console_handler)
-    
+        route_handler(root_logger, console_handler)
+
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(formatter)
+        route_handler(root_logger, file_handler)
+
     # Отключаем логи от внешних библиотек
     for lib in ['PIL', 'matplotlib', 'PySide6']:
         logging.getLogger(lib).setLevel(logging.WARNING)
-    
+
     # Особый акцент на модули селектора элементов
     modules_to_monitor = [
         # Основной модуль управления элементами
@@ -56,13 +313,13 @@ def configure_logging():
         'screen_selector.selector_modules.selection.selection_state',
         'screen_selector.selector_modules.selection.hierarchy_integration',
     ]
-    
+
     for module in modules_to_monitor:
         module_logger = logging.getLogger(module)
         module_logger.setLevel(logging.DEBUG)
         # Гарантируем, что сообщения от этих модулей будут отображаться
         module_logger.propagate = True
-    
+
     return root_logger
 
 if __name__ == "__main__":
@@ -8,6 +8,11 @@ with open('startup_test.log', 'w') as f:
 
 import logging
 import sys
+from utils.startup import get_startup_timeline
+
+# Отсчет шкалы времени запуска начинается до импорта Qt и модулей приложения
+startup_timeline = get_startup_timeline()
+
 from PySide6.QtWidgets import QApplication
 from logging_config import configure_logging
 
@@ -20,7 +25,8 @@ logger.debug("main.py: Script started")
 
 logger.debug("main.py: Attempting to import TrayApplication")
 try:
-    from tray_app import TrayApplication
+    with startup_timeline.measure("tray_app", "import"):
+        from tray_app import TrayApplication
     logger.debug("main.py: TrayApplication imported successfully")
 except ImportError as e:
     logger.error(f"main.py: Failed to import TrayApplication: {e}", exc_info=True)
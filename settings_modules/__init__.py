@@ -2,13 +2,33 @@
 Пакет для работы с настройками приложения.
 """
 
-from .settings_manager import SettingsManager
-from .settings_applicator import SettingsApplicator
-from .hotkey_widget import HotkeyEditor
-from .tabs.base_settings_tab import BaseSettingsTab
-from .tabs.voice_settings_tab import VoiceSettingsTab
-from .tabs.notification_settings_tab import NotificationSettingsTab
-from .tabs.file_settings_tab import FileSettingsTab
+import importlib
+
+# Имя -> подмодуль. Вкладки настроек (виджеты Qt и их зависимости)
+# импортируются при первом обращении, а не при импорте SettingsManager.
+_EXPORTS = {
+    'SettingsManager': 'settings_manager',
+    'SettingsApplicator': 'settings_applicator',
+    'HotkeyEditor': 'hotkey_widget',
+    'BaseSettingsTab': 'tabs.base_settings_tab',
+    'VoiceSettingsTab': 'tabs.voice_settings_tab',
+    'NotificationSettingsTab': 'tabs.notification_settings_tab',
+    'FileSettingsTab': 'tabs.file_settings_tab',
+}
+
+
+def __getattr__(name):
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
 
 __all__ = [
     'SettingsManager', 
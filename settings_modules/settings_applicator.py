@@ -31,6 +31,7 @@ class SettingsApplicator(QObject):
         """
         super().__init__()
         self.settings_manager = settings_manager
+        self._unsubscribers = []
     
     def apply_all_settings(self, tray_app=None, element_selector=None, voice_widget=None, magnifier_widget=None):
         """
@@ -55,6 +56,67 @@ class SettingsApplicator(QObject):
         if magnifier_widget:
             self.apply_magnifier_settings(magnifier_widget)
     
+    def bind_components(self, tray_app=None, element_selector=None, voice_widget=None, magnifier_widget=None):
+        """
+        Подписывает компоненты на изменения только своих секций настроек.
+        
+        В отличие от apply_all_settings, после изменения настроек
+        переприменяется лишь затронутая часть: горячие клавиши, распознаватель,
+        лупа и т.д. Повторный вызов заменяет предыдущие подписки.
+        
+        Args:
+            tray_app: Экземпляр приложения в трее
+            element_selector: Экземпляр селектора элементов
+            voice_widget: Экземпляр виджета голосовой аннотации
+            magnifier_widget: Экземпляр виджета лупы
+        """
+        self.unbind_components()
+        
+        subscriptions = []
+        if tray_app:
+            subscriptions.append(("hotkeys", lambda *_: self.apply_hotkey_settings(tray_app)))
+            subscriptions.append(("notifications", lambda *_: self.apply_notification_settings(tray_app)))
+        
+        if element_selector:
+            # Селектор зависит от нескольких секций - одна подписка на все настройки с фильтром,
+            # чтобы одновременное изменение секций применялось один раз
+            selector_sections = {"selection", "magnifier", "ui"}
+            
+            def on_selector_settings_changed(snapshot, changes):
+                if any(change.keys and change.keys[0] in selector_sections for change in changes):
+                    self.apply_element_selector_settings(element_selector)
+            
+            subscriptions.append(("", on_selector_settings_changed))
+        
+        if voice_widget:
+            subscriptions.append(("voice_annotation", lambda *_: self.apply_voice_annotation_settings(voice_widget)))
+            subscriptions.append(("voice_recognition", lambda *_: self.apply_recognizer_settings(voice_widget)))
+        
+        if magnifier_widget:
+            subscriptions.append(("magnifier", lambda *_: self.apply_magnifier_settings(magnifier_widget)))
+        
+        for key, callback in subscriptions:
+            self._unsubscribers.append(self.settings_manager.subscribe(key, callback))
+        
+        logger.debug(f"Компоненты подписаны на изменения настроек: {len(subscriptions)} подписок")
+    
+    def unbind_components(self):
+        """Отменяет подписки компонентов, созданные bind_components."""
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers = []
+    
+    def apply_recognizer_settings(self, voice_widget):
+        """
+        Перезагружает распознаватель после изменения настроек распознавания
+        
+        Args:
+            voice_widget: Экземпляр виджета голосовой аннотации
+        """
+        if hasattr(voice_widget, 'reload_recognizer'):
+            voice_widget.reload_recognizer()
+            logger.debug("Распознаватель перезагружен после изменения настроек")
+    
     def apply_hotkey_settings(self, tray_app):
         """
         Применяет настройки горячих клавиш
@@ -63,9 +125,9 @@ class SettingsApplicator(QObject):
             tray_app: Экземпляр приложения в трее
         """
         hotkeys = {
-            "start_selection": self.settings_manager.get_setting("hotkeys", "start_selection"),
-            "minimize_dialog": self.settings_manager.get_setting("hotkeys", "minimize_dialog"),
-            "voice_annotation": self.settings_manager.get_setting("hotkeys", "voice_annotation")
+            "start_selection": self.settings_manager.get_setting("hotkeys/start_selection"),
+            "minimize_dialog": self.settings_manager.get_setting("hotkeys/minimize_dialog"),
+            "voice_annotation": self.settings_manager.get_setting("hotkeys/voice_annotation")
         }
         
         self.hotkeys_changed.emit(hotkeys)
@@ -87,23 +149,23 @@ class SettingsApplicator(QObject):
         
         # Настройки выделения
         selection_settings = {
-            "min_width": self.settings_manager.get_setting("selection", "min_width"),
-            "min_height": self.settings_manager.get_setting("selection", "min_height"),
-            "darkening_factor": self.settings_manager.get_setting("selection", "darkening_factor")
+            "min_width": self.settings_manager.get_setting("selection/min_width"),
+            "min_height": self.settings_manager.get_setting("selection/min_height"),
+            "darkening_factor": self.settings_manager.get_setting("selection/darkening_factor")
         }
         
         # Настройки лупы
         magnifier_settings = {
-            "enabled": self.settings_manager.get_setting("magnifier", "enabled"),
-            "zoom_factor": self.settings_manager.get_setting("magnifier", "zoom_factor"),
-            "size": self.settings_manager.get_setting("magnifier", "size"),
-            "grid_enabled": self.settings_manager.get_setting("magnifier", "grid_enabled")
+            "enabled": self.settings_manager.get_setting("magnifier/enabled"),
+            "zoom_factor": self.settings_manager.get_setting("magnifier/zoom_factor"),
+            "size": self.settings_manager.get_setting("magnifier/size"),
+            "grid_enabled": self.settings_manager.get_setting("magnifier/grid_enabled")
         }
         
         # Настройки UI
         ui_settings = {
-            "highlight_color": self.settings_manager.get_setting("ui", "highlight_color"),
-            "selection_border_width": self.settings_manager.get_setting("ui", "selection_border_width")
+            "highlight_color": self.settings_manager.get_setting("ui/highlight_color"),
+            "selection_border_width": self.settings_manager.get_setting("ui/selection_border_width")
         }
         
         # Отправляем сигналы с настройками
@@ -123,9 +185,9 @@ class SettingsApplicator(QObject):
             voice_widget: Экземпляр виджета голосовой аннотации
         """
         voice_settings = {
-            "max_duration": self.settings_manager.get_setting("voice_annotation", "max_duration"),
-            "auto_recognition": self.settings_manager.get_setting("voice_annotation", "auto_recognition"),
-            "audio_quality": self.settings_manager.get_setting("voice_annotation", "audio_quality")
+            "max_duration": self.settings_manager.get_setting("voice_annotation/max_duration"),
+            "auto_recognition": self.settings_manager.get_setting("voice_annotation/auto_recognition"),
+            "audio_quality": self.settings_manager.get_setting("voice_annotation/audio_quality")
         }
         
         self.voice_settings_changed.emit(voice_settings)
@@ -172,10 +234,10 @@ class SettingsApplicator(QObject):
             tray_app: Экземпляр приложения в трее
         """
         notification_settings = {
-            "show_on_startup": self.settings_manager.get_setting("notifications", "show_on_startup"),
-            "show_on_capture": self.settings_manager.get_setting("notifications", "show_on_capture"),
-            "show_on_save": self.settings_manager.get_setting("notifications", "show_on_save"),
-            "sound_enabled": self.settings_manager.get_setting("notifications", "sound_enabled")
+            "show_on_startup": self.settings_manager.get_setting("notifications/show_on_startup"),
+            "show_on_capture": self.settings_manager.get_setting("notifications/show_on_capture"),
+            "show_on_save": self.settings_manager.get_setting("notifications/show_on_save"),
+            "sound_enabled": self.settings_manager.get_setting("notifications/sound_enabled")
         }
         
         self.notification_settings_changed.emit(notification_settings)
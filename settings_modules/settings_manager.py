@@ -6,13 +6,25 @@
 import os
 import json
 import logging
-from typing import Dict, Any, Optional, Type
+from typing import Dict, Any, Optional, Type, Callable, List
+
+from voice_control.utils.config_store import ConfigStore, ConfigSnapshot, ConfigChange, freeze
+from utils.write_behind import get_write_behind_writer
 
 # Настройка логгера
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+# Переменная окружения с путем к другому файлу настроек (например, для бенчмарков)
+SETTINGS_PATH_ENV_VAR = "VOICE2TEXT_SETTINGS_PATH"
+
 # Путь к файлу настроек
-DEFAULT_SETTINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "settings.json")
+DEFAULT_SETTINGS_PATH = (os.environ.get(SETTINGS_PATH_ENV_VAR)
+                         or os.path.join(os.path.dirname(os.path.abspath(__file__)), "settings.json"))
+
+# Бюджет холодного старта до готовности приложения (мс)
+DEFAULT_STARTUP_BUDGET_MS = 1500
 
 # Настройки по умолчанию
 DEFAULT_SETTINGS = {
@@ -55,6 +67,14 @@ DEFAULT_SETTINGS = {
         "selection_border_width": 2,
         "auto_save_path": "",
         "remember_last_save_location": True
+    },
+    "diagnostics": {
+        "metrics_endpoint_enabled": False,  # Локальная точка метрик OpenMetrics (только 127.0.0.1)
+        "metrics_endpoint_port": 9464
+    },
+    "startup": {
+        "lazy_widget": True,  # Создавать виджет аннотаций после показа иконки трея
+        "budget_ms": DEFAULT_STARTUP_BUDGET_MS  # Бюджет холодного старта (мс)
     }
 }
 
@@ -70,7 +90,9 @@ class SettingsManager:
             settings_path: Путь к файлу настроек
         """
         self.settings_path = settings_path
+        self._store = ConfigStore()
         self.settings = self.load_settings()
+        self._store.replace(self.settings)
     
     def load_settings(self) -> Dict[str, Any]:
         """
@@ -80,6 +102,9 @@ class SettingsManager:
             Dict[str, Any]: Словарь с настройками
         """
         try:
+            # Незаписанные изменения должны попасть на диск до чтения
+            get_write_behind_writer().flush(self.settings_path)
+            
             if os.path.exists(self.settings_path):
                 with open(self.settings_path, 'r', encoding='utf-8') as f:
                     settings = json.load(f)
@@ -155,7 +180,9 @@ class SettingsManager:
     
     def save_settings(self, settings: Dict[str, Any]) -> bool:
         """
-        Сохраняет настройки в файл
+        Сохраняет настройки в файл.
+        Запись отложенная: частые изменения объединяются, файл атомарно
+        перезаписывается после паузы в изменениях или при завершении работы.
         
         Args:
             settings: Словарь с настройками
@@ -164,11 +191,13 @@ class SettingsManager:
             bool: True если сохранение прошло успешно, иначе False
         """
         try:
-            with open(self.settings_path, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, indent=4, ensure_ascii=False)
+            get_write_behind_writer().write_json(self.settings_path, settings, indent=4)
             
             self.settings = settings
-            logger.info(f"Настройки успешно сохранены в {self.settings_path}")
+            logger.debug(f"Настройки запланированы к сохранению в {self.settings_path}")
+            
+            # Публикация нового снимка и уведомление подписчиков изменённых путей
+            self._store.replace(settings)
             return True
         except Exception as e:
             logger.error(f"Ошибка при сохранении настроек: {e}")
@@ -232,6 +261,12 @@ class SettingsManager:
             bool: True, если настройка успешно установлена и сохранена, иначе False.
         """
         try:
+            # Значение не изменилось - файл не перезаписываем. Хранилище
+            # отдает замороженные значения (кортежи, mappingproxy), поэтому
+            # сравнивается замороженная форма нового значения
+            if self._store.get(key, _MISSING) == freeze(value):
+                return True
+            
             keys = key.split('/')
             current_level = self.settings
             for i, k_part in enumerate(keys[:-1]):
@@ -254,3 +289,31 @@ class SettingsManager:
             bool: True если сброс прошел успешно, иначе False
         """
         return self.save_settings(DEFAULT_SETTINGS.copy())
+    
+    def get_snapshot(self) -> ConfigSnapshot:
+        """
+        Возвращает неизменяемый снимок текущих настроек.
+        Чтение не требует блокировок и безопасно из любого потока.
+        
+        Returns:
+            ConfigSnapshot: Снимок настроек с номером версии
+        """
+        return self._store.snapshot
+    
+    def subscribe(self, key: str, callback: Callable[[ConfigSnapshot, List[ConfigChange]], None]) -> Callable[[], None]:
+        """
+        Подписывает на изменения настроек внутри ключа.
+        Ключ может быть вложенным, разделенным '/'; пустой ключ - все настройки.
+        
+        Args:
+            key: Ключ настройки (например, "magnifier" или "hotkeys/voice_annotation").
+            callback: Функция callback(snapshot, changes), вызываемая только при изменении значений по ключу.
+        
+        Returns:
+            Callable[[], None]: Функция отмены подписки
+        """
+        return self._store.subscribe(key, callback)
+    
+    def flush(self) -> None:
+        """Немедленно записывает на диск отложенные изменения настроек."""
+        get_write_behind_writer().flush(self.settings_path)
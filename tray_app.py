@@ -2,41 +2,132 @@ import sys
 import os
 from PySide6.QtWidgets import QApplication, QSystemTrayIcon, QMenu
 from PySide6.QtGui import QIcon, QAction
-from PySide6.QtCore import Signal, Slot
+from PySide6.QtCore import Signal, Slot, QTimer
 import logging
-from voice_control.voice_annotation_widget import VoiceAnnotationWidget
-from settings_modules.hotkey_manager import HotkeyManager
-from settings_modules.hotkey_settings_dialog import HotkeySettingsDialog
-from settings_modules.settings_manager import SettingsManager
-from window_binder.binder_manager import BinderManager
+from settings_modules.settings_manager import SettingsManager, DEFAULT_STARTUP_BUDGET_MS
+from settings_modules.settings_applicator import SettingsApplicator
+from voice_control.utils.profiler import get_profiler
+from voice_control.utils.tracing import get_tracer
+from utils.startup import get_startup_timeline, lazy_import, TIMELINE_ENV_VAR
+
+# Тяжелые модули (распознаватели, аудио, привязки окон) импортируются
+# при первом использовании, после того как иконка трея уже показана
+voice_annotation_widget = lazy_import("voice_control.voice_annotation_widget")
+binder_manager_module = lazy_import("window_binder.binder_manager")
+hotkey_manager_module = lazy_import("settings_modules.hotkey_manager")
+hotkey_settings_dialog = lazy_import("settings_modules.hotkey_settings_dialog")
 
 logger = logging.getLogger(__name__)
 
 class TrayApplication(QApplication):
     # Сигнал для потокобезопасного вызова виджета
     hotkey_pressed = Signal(bool)
+    # Запуск завершен: иконка показана, привязки восстановлены
+    ready = Signal()
 
     def __init__(self, argv):
         super().__init__(argv)
+        self.timeline = get_startup_timeline()
+        self.timeline.mark("qapplication")
+        self._startup_profile = get_profiler().start("startup")
         logger.info("========================================")
         logger.info("      TrayApplication Initializing      ")
         logger.info("========================================")
         self.setQuitOnLastWindowClosed(False)
+        self._hotkey_span = None
+        self.is_ready = False
+        self.widget = None
+        self.binder_manager = None
 
         logger.info("TrayApplication.__init__: Initializing SettingsManager")
-        self.settings_manager = SettingsManager()
+        with self.timeline.measure("SettingsManager"):
+            self.settings_manager = SettingsManager()
         logger.info("TrayApplication.__init__: SettingsManager initialized")
 
-        logger.info("TrayApplication.__init__: Initializing BinderManager")
-        self.binder_manager = BinderManager(self)
-        logger.info("TrayApplication.__init__: BinderManager initialized")
+        # Изменения настроек переприменяются только к затронутым компонентам
+        self.settings_applicator = SettingsApplicator(self.settings_manager)
+        self.settings_applicator.bind_components(tray_app=self)
+        self.aboutToQuit.connect(self.settings_applicator.unbind_components)
+
+        # Иконка трея показывается до импорта и создания тяжелых компонентов
+        with self.timeline.measure("tray_icon"):
+            self.create_tray_icon()
+        self.timeline.mark("tray_icon_shown")
+        self.start_metrics_endpoint()
+
+        if self.settings_manager.get_setting("startup/lazy_widget", True, bool):
+            # Привязки окон восстанавливаются сразу после запуска цикла событий,
+            # виджет аннотации создается при первом использовании
+            QTimer.singleShot(0, self._finish_startup)
+        else:
+            self._ensure_widget()
+            self._finish_startup()
+
+    def _finish_startup(self):
+        """Завершает запуск: создает BinderManager и фиксирует шкалу времени."""
+        self._ensure_binder_manager()
+        get_profiler().stop(self._startup_profile)
+        self._startup_profile = None
+
+        elapsed = self.timeline.mark("ready")
+        self.is_ready = True
+        budget = self.settings_manager.get_setting("startup/budget_ms", DEFAULT_STARTUP_BUDGET_MS, int)
+        logger.info(f"TrayApplication ready in {elapsed:.0f} ms\n{self.timeline.format_report()}")
+        if not self.timeline.check_budget(budget):
+            logger.warning(f"Startup took {elapsed:.0f} ms, budget is {budget} ms")
+
+        timeline_path = os.environ.get(TIMELINE_ENV_VAR)
+        if timeline_path:
+            try:
+                self.timeline.export_json(timeline_path)
+            except OSError as e:
+                logger.error(f"Failed to write startup timeline to {timeline_path}: {e}")
+
+        self.ready.emit()
+
+    def _ensure_binder_manager(self):
+        """Создает BinderManager при первом обращении."""
+        if self.binder_manager is None:
+            logger.info("TrayApplication: Initializing BinderManager")
+            with self.timeline.measure("BinderManager"):
+                self.binder_manager = binder_manager_module.BinderManager(self)
+            logger.info("TrayApplication: BinderManager initialized")
+            self._connect_widget_to_binder()
+        return self.binder_manager
+
+    def _ensure_widget(self):
+        """Создает VoiceAnnotationWidget при первом обращении."""
+        if self.widget is None:
+            with self.timeline.measure("VoiceAnnotationWidget"):
+                self.widget = voice_annotation_widget.VoiceAnnotationWidget(settings_manager=self.settings_manager)
+            self.settings_applicator.bind_components(tray_app=self, voice_widget=self.widget)
+            self._connect_widget_to_binder()
+        return self.widget
 
-        self.widget = VoiceAnnotationWidget(settings_manager=self.settings_manager)
+    def _connect_widget_to_binder(self):
+        """Связывает виджет и BinderManager, когда созданы оба."""
+        if self.widget is None or self.binder_manager is None:
+            return
         self.widget.view.text_changed_signal.connect(self.binder_manager.on_recognition_finished)
         self.binder_manager.widget_manager.stop_recognition_signal.connect(self.widget._finalize_annotation)
-        logger.info("TrayApplication.__init__: Connected recognition_finished to binder_manager")
+        logger.info("TrayApplication: Connected recognition_finished to binder_manager")
 
-        self.create_tray_icon()
+    def start_metrics_endpoint(self):
+        """Запускает локальную точку метрик OpenMetrics, если она включена в настройках."""
+        self.metrics_exporter = None
+        if not self.settings_manager.get_setting("diagnostics/metrics_endpoint_enabled", False, bool):
+            return
+
+        from voice_control.utils.metrics_exporter import get_metrics_exporter
+
+        port = self.settings_manager.get_setting("diagnostics/metrics_endpoint_port", 9464, int)
+        try:
+            self.metrics_exporter = get_metrics_exporter(port)
+            self.metrics_exporter.start()
+            self.aboutToQuit.connect(self.metrics_exporter.stop)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to start metrics endpoint on port {port}: {e}")
+            self.metrics_exporter = None
 
     def create_tray_icon(self):
         logger.info("Creating tray icon")
@@ -75,6 +166,16 @@ class TrayApplication(QApplication):
         manage_bindings_action.triggered.connect(self.open_binding_management)
         menu.addAction(manage_bindings_action)
 
+        export_trace_action = QAction("Экспорт трассировки задержек", self)
+        export_trace_action.triggered.connect(self.export_latency_trace)
+        menu.addAction(export_trace_action)
+
+        self.profiling_action = QAction("Профилирование", self)
+        self.profiling_action.setCheckable(True)
+        self.profiling_action.setChecked(get_profiler().enabled)
+        self.profiling_action.toggled.connect(self.toggle_profiling)
+        menu.addAction(self.profiling_action)
+
         menu.addSeparator()
 
         exit_action = QAction("Выход", self)
@@ -83,7 +184,7 @@ class TrayApplication(QApplication):
         return menu
 
         # Подключаем сигнал к слоту
-        self.hotkey_manager = HotkeyManager()
+        self.hotkey_manager = hotkey_manager_module.HotkeyManager()
         self.hotkey_manager.register_hotkey('launch_widget', 'ctrl+shift+space', self.on_hotkey_pressed)
 
         self.hotkey_pressed.connect(self.launch_widget)
@@ -91,28 +192,52 @@ class TrayApplication(QApplication):
 
 
 
+    def export_latency_trace(self):
+        """Сохраняет трассировку задержек фраз в формате Chrome Trace и JSONL."""
+        from datetime import datetime
+        from pathlib import Path
+
+        trace_dir = Path.home() / ".voice_control" / "traces"
+        trace_dir.mkdir(parents=True, exist_ok=True)
+        stem = trace_dir / f"latency_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        tracer = get_tracer()
+        count = tracer.export_chrome_trace(f"{stem}.json")
+        tracer.export_jsonl(f"{stem}.jsonl")
+        logger.info(f"Exported {count} trace spans to {stem}.json")
+        self.tray_icon.showMessage("Трассировка задержек", f"Сохранено интервалов: {count}\n{stem}.json")
+
+    def toggle_profiling(self, enabled):
+        """Включает или выключает профилирование операций без перезапуска."""
+        profiler = get_profiler()
+        profiler.set_enabled(enabled)
+        if enabled:
+            self.tray_icon.showMessage("Профилирование", f"Профили сохраняются в {profiler.output_dir.resolve()}")
+
     def open_binder_settings(self):
-        self.binder_manager.show_settings()
+        self._ensure_binder_manager().show_settings()
     
     def open_binding_management(self):
         """Открыть диалог управления привязками"""
-        self.binder_manager.show_management_dialog()
+        self._ensure_binder_manager().show_management_dialog()
 
     def on_hotkey_pressed(self):
         """Обработчик нажатия горячей клавиши."""
         logger.info("Горячая клавиша нажата!")
+        # Новая фраза: трасса от нажатия клавиши до вставки текста
+        tracer = get_tracer()
+        tracer.start_trace("utterance", trigger="hotkey")
+        self._hotkey_span = tracer.start_span("hotkey_dispatch")
         self.hotkey_pressed.emit(True)
 
     def open_hotkey_settings(self):
-        dialog = HotkeySettingsDialog(self.hotkey_manager)
+        dialog = hotkey_settings_dialog.HotkeySettingsDialog(self.hotkey_manager)
         dialog.exec()
 
     def open_recognition_settings(self):
         """Открывает окно настроек распознавания речи."""
-        if self.widget is None:
-            # Если виджет еще не создан, создаем его для доступа к настройкам
-            self.widget = VoiceAnnotationWidget(settings_manager=self.settings_manager)
-            # Мы не будем показывать основной виджет, только диалог настроек
+        # Если виджет еще не создан, создаем его для доступа к настройкам
+        # (показывается только диалог настроек, а не основной виджет)
+        self._ensure_widget()
 
         # Получаем диалог настроек из виджета
         settings_dialog = self.widget.open_settings_dialog()
@@ -131,10 +256,9 @@ class TrayApplication(QApplication):
     def launch_widget(self, start_recording=False):
         logger.info(f"launch_widget called with start_recording={start_recording}")
         """Запускает и отображает VoiceAnnotationWidget (вызывается в основном потоке)."""
-        if self.widget is None:
-            self.widget = VoiceAnnotationWidget(settings_manager=self.settings_manager)
-            
-
+        get_tracer().end_span(self._hotkey_span)
+        self._hotkey_span = None
+        self._ensure_widget()
         
         if not self.widget.isVisible():
             if start_recording:
@@ -1,11 +1,13 @@
 import logging
 
+from logging_config import route_handler
+
 def get_logger(name):
     logger = logging.getLogger(name)
     if not logger.hasHandlers():
         handler = logging.StreamHandler()
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        route_handler(logger, handler)
         logger.setLevel(logging.INFO) # Или другой уровень по умолчанию
     return logger
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""
+Шкала времени запуска приложения и ленивый импорт модулей.
+
+Запуск трея записывается как последовательность событий: импорты
+(с числом подтянутых модулей, как в -X importtime), создание объектов
+и отметки этапов. Тяжелые модули (виджет аннотации, распознаватели,
+привязки окон) подключаются через LazyModule и импортируются только
+при первом обращении к атрибуту, поэтому иконка трея появляется до них.
+"""
+
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Путь, по которому сохраняется шкала времени после запуска (если задан)
+TIMELINE_ENV_VAR = "VOICE2TEXT_STARTUP_TIMELINE"
+
+
+@dataclass
+class TimelineEvent:
+    """Событие шкалы времени запуска."""
+    name: str
+    kind: str
+    start_ms: float
+    duration_ms: float = 0.0
+    self_ms: float = 0.0
+    modules: int = 0
+    depth: int = 0
+
+
+class StartupTimeline:
+    """Шкала времени запуска: импорты, создание объектов и этапы.
+
+    Вложенные измерения учитываются отдельно: self_ms - время без
+    вложенных событий, duration_ms - полное время (как self/cumulative
+    в выводе python -X importtime).
+    """
+
+    def __init__(self):
+        """Инициализация шкалы; отсчет ведется от момента создания."""
+        self._origin = time.perf_counter()
+        self._events: List[TimelineEvent] = []
+        self._marks: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def elapsed_ms(self) -> float:
+        """Время от начала отсчета в миллисекундах."""
+        return (time.perf_counter() - self._origin) * 1000
+
+    def mark(self, name: str) -> float:
+        """Отметка этапа запуска.
+
+        Args:
+            name: Название этапа
+
+        Returns:
+            Время от начала отсчета в миллисекундах
+        """
+        elapsed = self.elapsed_ms()
+        with self._lock:
+            self._marks[name] = elapsed
+            self._events.append(TimelineEvent(name, "mark", elapsed))
+        return elapsed
+
+    def get_mark(self, name: str) -> Optional[float]:
+        """Время отметки этапа или None, если этап не пройден."""
+        with self._lock:
+            return self._marks.get(name)
+
+    @contextmanager
+    def measure(self, name: str, kind: str = "construct") -> Iterator[TimelineEvent]:
+        """Измерение импорта или создания объекта.
+
+        Args:
+            name: Имя модуля или объекта
+            kind: Тип события ("import" или "construct")
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        event = TimelineEvent(name, kind, self.elapsed_ms(), depth=len(stack))
+        children = [0.0]
+        stack.append(children)
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield event
+        finally:
+            event.duration_ms = (time.perf_counter() - start) * 1000
+            event.self_ms = max(event.duration_ms - children[0], 0.0)
+            event.modules = len(sys.modules) - modules_before
+            stack.pop()
+            if stack:
+                stack[-1][0] += event.duration_ms
+            with self._lock:
+                self._events.append(event)
+
+    def events(self) -> List[TimelineEvent]:
+        """События в порядке начала."""
+        with self._lock:
+            return sorted(self._events, key=lambda event: event.start_ms)
+
+    def check_budget(self, budget_ms: float, mark: str = "ready") -> bool:
+        """Проверка, уложился ли этап в бюджет времени запуска.
+
+        Args:
+            budget_ms: Бюджет в миллисекундах
+            mark: Этап, время которого проверяется
+
+        Returns:
+            True, если этап пройден не позже бюджета
+        """
+        elapsed = self.get_mark(mark)
+        return elapsed is not None and elapsed <= budget_ms
+
+    def format_report(self) -> str:
+        """Текстовый отчет в стиле python -X importtime."""
+        lines = ["startup: self [ms] | cumulative [ms] | modules | event"]
+        for event in self.events():
+            if event.kind == "mark":
+                lines.append(f"startup: {'':>9} | {event.start_ms:16.1f} | {'':>7} | -- {event.name}")
+            else:
+                indent = "  " * event.depth
+                lines.append(f"startup: {event.self_ms:9.1f} | {event.duration_ms:16.1f} | "
+                             f"{event.modules:7d} | {indent}{event.kind} {event.name}")
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Шкала времени в виде словаря для JSON."""
+        with self._lock:
+            marks = dict(self._marks)
+        return {
+            "pid": os.getpid(),
+            "marks": marks,
+            "events": [asdict(event) for event in self.events()],
+        }
+
+    def export_json(self, path: Union[str, Path]) -> None:
+        """Сохранение шкалы времени в JSON файл.
+
+        Args:
+            path: Путь к файлу
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+
+class LazyModule(ModuleType):
+    """Модуль, импортируемый при первом обращении к атрибуту.
+
+    Время импорта записывается в шкалу запуска.
+    """
+
+    def __init__(self, name: str, timeline: Optional["StartupTimeline"] = None):
+        """
+        Инициализация прокси
+
+        Args:
+            name: Полное имя модуля
+            timeline: Шкала времени (по умолчанию - общая шкала запуска)
+        """
+        super().__init__(name)
+        object.__setattr__(self, "_lazy_timeline", timeline)
+        object.__setattr__(self, "_lazy_module", None)
+        object.__setattr__(self, "_lazy_lock", threading.Lock())
+
+    @property
+    def is_loaded(self) -> bool:
+        """Модуль уже импортирован."""
+        return object.__getattribute__(self, "_lazy_module") is not None
+
+    def _load(self) -> ModuleType:
+        """Импорт модуля (однократно)."""
+        module = object.__getattribute__(self, "_lazy_module")
+        if module is not None:
+            return module
+
+        with object.__getattribute__(self, "_lazy_lock"):
+            module = object.__getattribute__(self, "_lazy_module")
+            if module is None:
+                name = self.__name__
+                timeline = object.__getattribute__(self, "_lazy_timeline") or get_startup_timeline()
+                with timeline.measure(name, "import"):
+                    module = importlib.import_module(name)
+                object.__setattr__(self, "_lazy_module", module)
+        return module
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._load(), attribute)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str, timeline: Optional[StartupTimeline] = None) -> ModuleType:
+    """Ленивый импорт модуля.
+
+    Args:
+        name: Полное имя модуля
+        timeline: Шкала времени для записи импорта
+
+    Returns:
+        Уже импортированный модуль или LazyModule
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name, timeline)
+
+
+_global_timeline: Optional[StartupTimeline] = None
+_global_timeline_lock = threading.Lock()
+
+
+def get_startup_timeline() -> StartupTimeline:
+    """Получение общей шкалы времени запуска."""
+    global _global_timeline
+    with _global_timeline_lock:
+        if _global_timeline is None:
+            _global_timeline = StartupTimeline()
+        return _global_timeline
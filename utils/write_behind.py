@@ -0,0 +1,566 @@
+"""
+Отложенная (write-behind) атомарная запись файлов настроек и привязок.
+
+Изменения накапливаются в памяти: для каждого файла хранится только
+последнее содержимое. Фоновый поток записывает их после паузы в изменениях
+(debounce) или при завершении работы - через временный файл и os.replace,
+поэтому файл на диске всегда целый. До записи каждое изменение попадает
+в небольшой журнал (write-ahead journal), который воспроизводится при
+следующем запуске, если процесс аварийно завершился до сброса.
+
+У каждого писателя свой журнал рядом с journal_path; пока писатель жив,
+он держит блокировку файла <журнал>.lock. Восстанавливаются только
+журналы, блокировку которых удалось захватить, то есть журналы
+завершившихся процессов.
+"""
+
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOURNAL_PATH = Path.home() / ".voice_control" / "write_behind.journal"
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def _lock_file(f, blocking: bool) -> bool:
+    """Захват исключительной блокировки открытого файла.
+
+    Args:
+        f: Открытый файл
+        blocking: Ждать освобождения блокировки
+
+    Returns:
+        True, если блокировка захвачена
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock_file(f) -> None:
+    """Освобождение блокировки, захваченной _lock_file."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+
+
+class WriteBehindWriter:
+    """Общий слой отложенной атомарной записи файлов."""
+
+    def __init__(self,
+                 journal_path: Optional[Union[str, Path]] = DEFAULT_JOURNAL_PATH,
+                 debounce_interval: float = 0.5,
+                 max_delay: float = 3.0,
+                 max_journal_size: int = 1024 * 1024,
+                 max_retries: int = 5,
+                 retry_backoff: float = 1.0,
+                 max_retry_delay: float = 60.0):
+        """
+        Инициализация писателя
+
+        Args:
+            journal_path: Базовый путь журналов; журнал писателя получает
+                суффикс с pid процесса (None - без журнала)
+            debounce_interval: Пауза в изменениях, после которой выполняется запись (сек)
+            max_delay: Максимальная задержка записи при непрерывных изменениях (сек)
+            max_journal_size: Размер журнала, при превышении которого запись выполняется сразу
+            max_retries: Количество повторных попыток записи файла после ошибки
+            retry_backoff: Задержка перед первой повторной попыткой (сек), далее удваивается
+            max_retry_delay: Максимальная задержка между повторными попытками (сек)
+        """
+        self._journal_base = Path(journal_path) if journal_path else None
+        self._journal_path = None
+        if self._journal_base is not None:
+            self._journal_path = self._journal_base.with_name(
+                f"{self._journal_base.stem}.{os.getpid()}-{uuid.uuid4().hex[:8]}{self._journal_base.suffix}"
+            )
+        self._journal_lock = None
+        self._debounce_interval = debounce_interval
+        self._max_delay = max_delay
+        self._max_journal_size = max_journal_size
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._max_retry_delay = max_retry_delay
+
+        self._pending: Dict[str, str] = {}
+        self._first_pending_at: Optional[float] = None
+        self._last_submit_at = 0.0
+        self._force_flush = False
+        self._closed = False
+        # Файлы, запись которых завершилась ошибкой: число неудачных попыток
+        # и время следующей попытки (по time.monotonic)
+        self._retry_counts: Dict[str, int] = {}
+        self._retry_at: Dict[str, float] = {}
+
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._journal = None
+        self._journal_size = 0
+
+        self._metrics = {
+            "submitted": 0,
+            "coalesced": 0,
+            "files_written": 0,
+            "flushes": 0,
+            "write_errors": 0,
+            "dropped": 0,
+            "total_flush_latency": 0.0,
+            "last_flush_latency": 0.0,
+            "max_flush_latency": 0.0
+        }
+
+        if self._journal_path:
+            self._acquire_journal_lock()
+            self._recover_journals()
+
+    def write_text(self, path: Union[str, Path], content: str) -> None:
+        """
+        Запланировать запись текста в файл
+
+        Args:
+            path: Путь к файлу
+            content: Полное новое содержимое файла
+        """
+        key = os.path.abspath(path)
+
+        with self._cond:
+            if self._closed:
+                # После закрытия пишем синхронно, чтобы не потерять данные
+                self._write_atomic(key, content)
+                return
+
+            self._append_journal(key, content)
+
+            if key in self._pending:
+                self._metrics["coalesced"] += 1
+            if self._first_pending_at is None:
+                self._first_pending_at = time.monotonic()
+
+            self._pending[key] = content
+            # Новое содержимое записывается в обычном порядке, без ожидания повтора
+            self._retry_counts.pop(key, None)
+            self._retry_at.pop(key, None)
+            self._metrics["submitted"] += 1
+            self._last_submit_at = time.monotonic()
+
+            if self._journal_size >= self._max_journal_size:
+                self._force_flush = True
+
+            self._ensure_thread()
+            self._cond.notify()
+
+    def write_json(self, path: Union[str, Path], data: Any, indent: int = 4) -> None:
+        """
+        Запланировать запись JSON в файл. Данные сериализуются сразу,
+        поэтому вызывающий код может продолжать изменять объект.
+
+        Args:
+            path: Путь к файлу
+            data: Сериализуемые данные
+            indent: Отступ JSON
+        """
+        self.write_text(path, json.dumps(data, indent=indent, ensure_ascii=False))
+
+    def has_pending(self, path: Union[str, Path]) -> bool:
+        """Есть ли незаписанные изменения для файла."""
+        with self._cond:
+            return os.path.abspath(path) in self._pending
+
+    def flush(self, path: Optional[Union[str, Path]] = None) -> int:
+        """
+        Немедленно записать накопленные изменения
+
+        Args:
+            path: Записать только этот файл (None - все файлы)
+
+        Returns:
+            Количество записанных файлов
+        """
+        return self._flush(path)
+
+    def _flush(self, path: Optional[Union[str, Path]] = None, due_only: bool = False) -> int:
+        """
+        Запись накопленных изменений
+
+        Args:
+            path: Записать только этот файл (None - все файлы)
+            due_only: Пропустить файлы, время повторной попытки которых не наступило
+
+        Returns:
+            Количество записанных файлов
+        """
+        with self._flush_lock:
+            with self._cond:
+                if path is None and due_only and self._retry_at:
+                    now = time.monotonic()
+                    batch = {key: content for key, content in self._pending.items()
+                             if self._retry_at.get(key, now) <= now}
+                    for key in batch:
+                        del self._pending[key]
+                elif path is None:
+                    batch = self._pending
+                    self._pending = {}
+                else:
+                    key = os.path.abspath(path)
+                    batch = {key: self._pending.pop(key)} if key in self._pending else {}
+                self._force_flush = False
+                if all(key in self._retry_at for key in self._pending):
+                    self._first_pending_at = None
+
+            if not batch:
+                return 0
+
+            start = time.perf_counter()
+            written = 0
+            for key, content in batch.items():
+                try:
+                    self._write_atomic(key, content)
+                    written += 1
+                    with self._cond:
+                        if key not in self._pending:
+                            self._retry_counts.pop(key, None)
+                            self._retry_at.pop(key, None)
+                except Exception as e:
+                    with self._cond:
+                        self._metrics["write_errors"] += 1
+                        self._schedule_retry(key, content, e)
+            latency = time.perf_counter() - start
+
+            with self._cond:
+                self._metrics["files_written"] += written
+                self._metrics["flushes"] += 1
+                self._metrics["total_flush_latency"] += latency
+                self._metrics["last_flush_latency"] = latency
+                self._metrics["max_flush_latency"] = max(self._metrics["max_flush_latency"], latency)
+
+                # В журнале остаются только еще не записанные изменения
+                self._rewrite_journal()
+
+            logger.debug(f"WriteBehindWriter: записано файлов: {written} за {latency * 1000:.1f} мс")
+            return written
+
+    def _schedule_retry(self, key: str, content: str, error: Exception) -> None:
+        """Повторная попытка записи с экспоненциальной задержкой (вызывается под self._cond).
+
+        После max_retries неудачных попыток изменение отбрасывается.
+        """
+        if key in self._pending:
+            # Уже есть более новое содержимое - оно будет записано в обычном порядке
+            return
+
+        attempts = self._retry_counts.get(key, 0) + 1
+        if attempts > self._max_retries:
+            self._retry_counts.pop(key, None)
+            self._retry_at.pop(key, None)
+            self._metrics["dropped"] += 1
+            logger.error(f"WriteBehindWriter: изменение {key} отброшено после "
+                         f"{attempts} неудачных попыток записи: {error}")
+            return
+
+        delay = min(self._retry_backoff * 2 ** (attempts - 1), self._max_retry_delay)
+        self._retry_counts[key] = attempts
+        self._retry_at[key] = time.monotonic() + delay
+        self._pending[key] = content
+        if attempts == 1:
+            logger.error(f"WriteBehindWriter: ошибка записи {key}: {error}; "
+                         f"повтор через {delay:.1f} с")
+        else:
+            logger.debug(f"WriteBehindWriter: повторная ошибка записи {key} "
+                         f"(попытка {attempts}): {error}; повтор через {delay:.1f} с")
+
+    def close(self) -> None:
+        """Записать все изменения и остановить фоновый поток."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+
+        self.flush()
+
+        with self._cond:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+                if not self._pending:
+                    try:
+                        self._journal_path.unlink()
+                    except OSError:
+                        pass
+            # Незаписанные изменения остаются в журнале и будут воспроизведены
+            # при следующем запуске, так как блокировка освобождается
+            self._release_journal_lock(remove=not self._pending)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Метрики отложенной записи
+
+        Returns:
+            Словарь с количеством запросов и записей, коэффициентом
+            объединения и задержками сброса в миллисекундах
+        """
+        with self._cond:
+            metrics = self._metrics.copy()
+            pending = len(self._pending)
+            journal_size = self._journal_size
+
+        flushes = metrics["flushes"]
+        return {
+            "submitted": metrics["submitted"],
+            "coalesced": metrics["coalesced"],
+            "files_written": metrics["files_written"],
+            "flushes": flushes,
+            "write_errors": metrics["write_errors"],
+            "dropped": metrics["dropped"],
+            "pending_files": pending,
+            "journal_bytes": journal_size,
+            "coalesce_ratio": (
+                metrics["submitted"] / metrics["files_written"] if metrics["files_written"] else 0.0
+            ),
+            "last_flush_latency_ms": metrics["last_flush_latency"] * 1000,
+            "avg_flush_latency_ms": (
+                metrics["total_flush_latency"] / flushes * 1000 if flushes else 0.0
+            ),
+            "max_flush_latency_ms": metrics["max_flush_latency"] * 1000
+        }
+
+    def _ensure_thread(self) -> None:
+        """Ленивый запуск фонового потока записи (вызывается под self._cond)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="WriteBehindWriter", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Цикл фонового потока: ожидание паузы в изменениях и сброс."""
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+
+                if self._closed:
+                    return
+
+                while not self._closed and not self._force_flush and self._pending:
+                    now = time.monotonic()
+                    deadline = self._next_deadline(now)
+                    if now >= deadline:
+                        break
+                    self._cond.wait(deadline - now)
+
+                if self._closed:
+                    return
+
+            self._flush(due_only=True)
+
+    def _next_deadline(self, now: float) -> float:
+        """Время следующего сброса (вызывается под self._cond)."""
+        deadlines = []
+        if any(key not in self._retry_at for key in self._pending):
+            deadlines.append(min(self._last_submit_at + self._debounce_interval,
+                                 (self._first_pending_at or now) + self._max_delay))
+        if self._retry_at:
+            deadlines.append(min(self._retry_at.values()))
+        return min(deadlines) if deadlines else now
+
+    def _write_atomic(self, path: str, content: str) -> None:
+        """Атомарная запись: временный файл в той же директории и os.replace."""
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=os.path.basename(path), dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _append_journal(self, path: str, content: str) -> None:
+        """Добавление изменения в журнал (вызывается под self._cond)."""
+        if self._journal_path is None:
+            return
+
+        try:
+            if self._journal is None:
+                self._journal_path.parent.mkdir(parents=True, exist_ok=True)
+                self._journal = open(self._journal_path, "a", encoding="utf-8")
+                self._journal_size = self._journal.tell()
+
+            line = json.dumps({"path": path, "content": content, "timestamp": time.time()},
+                              ensure_ascii=False) + "\n"
+            self._journal.write(line)
+            self._journal.flush()
+            self._journal_size += len(line)
+        except Exception as e:
+            logger.warning(f"WriteBehindWriter: не удалось записать журнал: {e}")
+
+    def _rewrite_journal(self) -> None:
+        """Перезапись журнала оставшимися изменениями (вызывается под self._cond)."""
+        if self._journal is None:
+            return
+
+        try:
+            self._journal.seek(0)
+            self._journal.truncate()
+            self._journal_size = 0
+            for path, content in self._pending.items():
+                line = json.dumps({"path": path, "content": content, "timestamp": time.time()},
+                                  ensure_ascii=False) + "\n"
+                self._journal.write(line)
+                self._journal_size += len(line)
+            self._journal.flush()
+        except Exception as e:
+            logger.warning(f"WriteBehindWriter: не удалось обновить журнал: {e}")
+
+    def _acquire_journal_lock(self) -> None:
+        """Блокировка собственного журнала на время жизни писателя."""
+        lock_path = f"{self._journal_path}.lock"
+        try:
+            self._journal_path.parent.mkdir(parents=True, exist_ok=True)
+            lock = open(lock_path, "a+")
+        except OSError as e:
+            logger.warning(f"WriteBehindWriter: не удалось создать блокировку журнала: {e}")
+            return
+        if _lock_file(lock, blocking=True):
+            self._journal_lock = lock
+        else:
+            lock.close()
+            logger.warning(f"WriteBehindWriter: не удалось заблокировать {lock_path}")
+
+    def _release_journal_lock(self, remove: bool) -> None:
+        """Освобождение блокировки журнала (вызывается при закрытии)."""
+        if self._journal_lock is None:
+            return
+        lock_path = self._journal_lock.name
+        _unlock_file(self._journal_lock)
+        self._journal_lock.close()
+        self._journal_lock = None
+        if remove:
+            try:
+                os.remove(lock_path)
+            except OSError:
+                pass
+
+    def _recover_journals(self) -> None:
+        """Воспроизведение журналов процессов, завершившихся до сброса."""
+        base = self._journal_base
+        if not base.parent.exists():
+            return
+
+        # Журнал прежнего формата (общий для всех процессов, без блокировки)
+        if base.exists():
+            self._replay_journal(base)
+
+        for journal in sorted(base.parent.glob(f"{base.stem}.*{base.suffix}")):
+            if journal == self._journal_path:
+                continue
+
+            lock_path = f"{journal}.lock"
+            try:
+                lock = open(lock_path, "a+")
+            except OSError as e:
+                logger.warning(f"WriteBehindWriter: не удалось открыть {lock_path}: {e}")
+                continue
+
+            replayed = False
+            try:
+                # Блокировку держит живой писатель - его журнал не трогаем
+                if not _lock_file(lock, blocking=False):
+                    continue
+                if journal.exists():
+                    replayed = self._replay_journal(journal)
+                _unlock_file(lock)
+            finally:
+                lock.close()
+
+            if replayed:
+                try:
+                    os.remove(lock_path)
+                except OSError:
+                    pass
+
+    def _replay_journal(self, journal: Path) -> bool:
+        """Запись изменений из журнала и его удаление.
+
+        Args:
+            journal: Путь к журналу
+
+        Returns:
+            True, если журнал прочитан и удален
+        """
+        recovered: Dict[str, str] = {}
+        try:
+            with open(journal, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Последняя строка могла быть записана не полностью
+                        continue
+                    recovered[entry["path"]] = entry["content"]
+        except Exception as e:
+            logger.error(f"WriteBehindWriter: не удалось прочитать журнал {journal}: {e}")
+            return False
+
+        for path, content in recovered.items():
+            try:
+                self._write_atomic(path, content)
+                logger.info(f"WriteBehindWriter: восстановлен файл из журнала: {path}")
+            except Exception as e:
+                logger.error(f"WriteBehindWriter: не удалось восстановить {path}: {e}")
+
+        try:
+            journal.unlink()
+        except OSError as e:
+            logger.warning(f"WriteBehindWriter: не удалось удалить журнал: {e}")
+            return False
+        return True
+
+
+# Глобальный писатель
+_global_writer: Optional[WriteBehindWriter] = None
+_global_writer_lock = threading.Lock()
+
+
+def get_write_behind_writer() -> WriteBehindWriter:
+    """Получение общего для процесса писателя (создается при первом обращении)."""
+    global _global_writer
+    with _global_writer_lock:
+        if _global_writer is None:
+            _global_writer = WriteBehindWriter()
+            atexit.register(_global_writer.close)
+        return _global_writer
@@ -12,7 +12,15 @@ project_root = os.path.dirname(current_dir)
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from .core.voice_controller import VoiceController
+
+def __getattr__(name):
+    # VoiceController тянет распознаватели и аудио стек, поэтому импортируется
+    # при первом обращении, а не при импорте любого подмодуля пакета
+    if name == 'VoiceController':
+        from .core.voice_controller import VoiceController
+        return VoiceController
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __version__ = '1.0.0'
 __author__ = 'Screph Team'
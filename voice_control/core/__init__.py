@@ -10,79 +10,116 @@
 - ConfigManager - менеджер конфигурации
 """
 
-from voice_control.core.audio_manager import AudioManager
-from voice_control.core.recognition_factory import RecognitionFactory
-from voice_control.core.audio_capture_pool import AudioCapturePool
-from voice_control.core.progress_manager import ProgressManager
-from voice_control.core.voice_recognizer import VoiceRecognizer
-from voice_control.core.command_processor import CommandProcessor
-from voice_control.core.response_generator import ResponseGenerator
-
-# Новые модули
-from voice_control.core.voice_controller import (
-    VoiceController,
-    VoiceControllerState,
-    VoiceControllerMode,
-    VoiceControllerConfig,
-    VoiceSession,
-    VoiceControllerEventType,
-    VoiceControllerEvent,
-    create_voice_controller
-)
-
-from voice_control.core.di_container import (
-    DIContainer,
-    DIScope,
-    ScopeContext,
-    LifetimeScope,
-    DependencyInfo,
-    DIException,
-    CircularDependencyException,
-    DependencyNotRegisteredException,
-    get_container,
-    register_singleton,
-    register_transient,
-    register_scoped,
-    register_instance,
-    resolve
-)
-
-from voice_control.core.error_handler import (
-    ErrorHandler,
-    BaseErrorHandler,
-    LoggingErrorHandler,
-    RetryErrorHandler,
-    FallbackErrorHandler,
-    NotificationErrorHandler,
-    ErrorSeverity,
-    ErrorCategory,
-    ErrorAction,
-    ErrorContext,
-    ErrorInfo,
-    handle_errors,
-    get_error_handler
-)
-
-from voice_control.core.config import (
-    VoiceControlConfig,
-    AudioConfig,
-    RecognitionConfig,
-    TTSConfig,
-    CommandConfig,
-    SecurityConfig,
-    PerformanceConfig,
-    UIConfig,
-    LoggingConfig,
-    ConfigManager,
-    AudioFormat,
-    RecognitionEngine,
-    TTSEngine,
-    LogLevel,
-    get_config_manager,
-    get_config,
-    save_config,
-    update_config
-)
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .voice_controller import VoiceController
+
+# Подмодуль -> экспортируемые имена. Подмодули импортируются при первом
+# обращении к имени, поэтому импорт voice_control.core.config не тянет
+# контроллер, распознаватели и аудио стек.
+_EXPORTS_BY_MODULE = {
+    'audio_manager': (
+        'AudioManager',
+    ),
+    'recognition_factory': (
+        'RecognitionFactory',
+    ),
+    'audio_capture_pool': (
+        'AudioCapturePool',
+    ),
+    'progress_manager': (
+        'ProgressManager',
+    ),
+    'voice_recognizer': (
+        'VoiceRecognizer',
+    ),
+    'command_processor': (
+        'CommandProcessor',
+    ),
+    'response_generator': (
+        'ResponseGenerator',
+    ),
+    'voice_controller': (
+        'VoiceController',
+        'VoiceControllerState',
+        'VoiceControllerMode',
+        'VoiceControllerConfig',
+        'VoiceSession',
+        'VoiceControllerEventType',
+        'VoiceControllerEvent',
+        'create_voice_controller',
+    ),
+    'di_container': (
+        'DIContainer',
+        'DIScope',
+        'ScopeContext',
+        'LifetimeScope',
+        'DependencyInfo',
+        'ResolutionPlan',
+        'DIException',
+        'CircularDependencyException',
+        'DependencyNotRegisteredException',
+        'get_container',
+        'register_singleton',
+        'register_transient',
+        'register_scoped',
+        'register_instance',
+        'resolve',
+    ),
+    'error_handler': (
+        'ErrorHandler',
+        'BaseErrorHandler',
+        'LoggingErrorHandler',
+        'RetryErrorHandler',
+        'FallbackErrorHandler',
+        'NotificationErrorHandler',
+        'ErrorSeverity',
+        'ErrorCategory',
+        'ErrorAction',
+        'ErrorContext',
+        'ErrorInfo',
+        'handle_errors',
+        'get_error_handler',
+    ),
+    'config': (
+        'VoiceControlConfig',
+        'AudioConfig',
+        'RecognitionConfig',
+        'TTSConfig',
+        'CommandConfig',
+        'SecurityConfig',
+        'PerformanceConfig',
+        'UIConfig',
+        'LoggingConfig',
+        'ConfigManager',
+        'AudioFormat',
+        'RecognitionEngine',
+        'TTSEngine',
+        'LogLevel',
+        'get_config_manager',
+        'get_config',
+        'save_config',
+        'update_config',
+    ),
+}
+
+_EXPORTS = {name: module for module, names in _EXPORTS_BY_MODULE.items() for name in names}
+
+
+def __getattr__(name):
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
 
 __version__ = "1.0.0"
 __author__ = "Voice Control Team"
@@ -110,6 +147,7 @@ __all__ = [
     "ScopeContext",
     "LifetimeScope",
     "DependencyInfo",
+    "ResolutionPlan",
     "DIException",
     "CircularDependencyException",
     "DependencyNotRegisteredException",
@@ -160,7 +198,7 @@ __all__ = [
 ]
 
 
-def initialize_core(config_file: str = None) -> VoiceController:
+def initialize_core(config_file: str = None) -> 'VoiceController':
     """Инициализация ядра голосового управления.
     
     Args:
@@ -169,6 +207,9 @@ def initialize_core(config_file: str = None) -> VoiceController:
     Returns:
         Инициализированный контроллер голосового управления
     """
+    from voice_control.core.config import get_config_manager
+    from voice_control.core.voice_controller import create_voice_controller
+    
     # Загрузка конфигурации
     config_manager = get_config_manager(config_file)
     config = config_manager.get_config()
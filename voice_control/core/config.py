@@ -3,11 +3,13 @@
 import os
 import json
 import logging
-from typing import Dict, Any, Optional, Union, List
-from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, Optional, Union, List, Callable
+from dataclasses import dataclass, field, fields, asdict
 from enum import Enum
 from pathlib import Path
 
+from ..utils.config_store import ConfigStore, ConfigSnapshot, ConfigChange
+
 
 class AudioFormat(Enum):
     """Форматы аудио."""
@@ -224,14 +226,24 @@ class VoiceControlConfig:
     custom_settings: Dict[str, Any] = field(default_factory=dict)
 
 
+# Файл конфигурации по умолчанию (относительно рабочей директории)
+DEFAULT_CONFIG_FILE = Path("config/voice_control.json")
+
+
 class ConfigManager:
-    """Менеджер конфигурации."""
+    """Менеджер конфигурации.
+    
+    Помимо изменяемого VoiceControlConfig публикует неизменяемые
+    версионированные снимки (get_snapshot) и уведомляет подписчиков
+    только об изменениях по их путям (subscribe("recognition.engine", ...)).
+    """
     
     def __init__(self, config_file: Optional[Union[str, Path]] = None):
-        self.config_file = Path(config_file) if config_file else Path("config/voice_control.json")
+        self.config_file = Path(config_file) if config_file else DEFAULT_CONFIG_FILE
         self.logger = logging.getLogger(self.__class__.__name__)
         self._config: Optional[VoiceControlConfig] = None
         self._watchers: List[callable] = []
+        self._store = ConfigStore(separator=".")
         
         # Создание директории конфигурации
         self.config_file.parent.mkdir(parents=True, exist_ok=True)
@@ -255,6 +267,8 @@ class ConfigManager:
             # Применение переменных окружения
             self._apply_environment_variables()
             
+            self._store.replace(self._config_to_dict(self._config))
+            
             return self._config
             
         except Exception as e:
@@ -284,6 +298,10 @@ class ConfigManager:
             
             self.logger.info(f"Конфигурация сохранена в {self.config_file}")
             
+            # Публикация снимка (уведомляет подписчиков изменённых путей)
+            if config_to_save is self._config:
+                self._store.replace(data)
+            
             # Уведомление наблюдателей
             self._notify_watchers()
             
@@ -308,6 +326,11 @@ class ConfigManager:
             # Применение обновлений
             self._apply_updates(self._config, updates)
             
+            # Без фактических изменений файл не перезаписывается
+            if not self._store.diff(self._config_to_dict(self._config)):
+                self.logger.debug("Обновление конфигурации не содержит изменений")
+                return True
+            
             # Сохранение обновленной конфигурации
             return self.save_config()
             
@@ -356,6 +379,21 @@ class ConfigManager:
         
         return errors
     
+    def get_snapshot(self) -> ConfigSnapshot:
+        """Получение неизменяемого снимка конфигурации (без блокировок)."""
+        if self._config is None:
+            self.load_config()
+        return self._store.snapshot
+    
+    def subscribe(self, path: str,
+                  callback: Callable[[ConfigSnapshot, List[ConfigChange]], None]) -> Callable[[], None]:
+        """Подписка на изменения конфигурации по пути (например, "audio" или "recognition.engine").
+        
+        Returns:
+            Функция отмены подписки
+        """
+        return self._store.subscribe(path, callback)
+    
     def add_watcher(self, callback: callable):
         """Добавление наблюдателя за изменениями конфигурации."""
         self._watchers.append(callback)
@@ -384,8 +422,14 @@ class ConfigManager:
         return config
     
     def _config_to_dict(self, config: VoiceControlConfig) -> Dict[str, Any]:
-        """Преобразование конфигурации в словарь."""
-        return asdict(config)
+        """Преобразование конфигурации в словарь (перечисления - в их значения)."""
+        return asdict(
+            config,
+            dict_factory=lambda items: {
+                key: value.value if isinstance(value, Enum) else value
+                for key, value in items
+            }
+        )
     
     def _apply_updates(self, config: VoiceControlConfig, updates: Dict[str, Any]):
         """Применение обновлений к конфигурации."""
@@ -454,6 +498,31 @@ class ConfigManager:
 _global_config_manager: Optional[ConfigManager] = None
 
 
+def read_performance_config() -> PerformanceConfig:
+    """Чтение настроек производительности без побочных эффектов.
+    
+    В отличие от get_config() не создает менеджер конфигурации и не
+    записывает файл конфигурации по умолчанию: берутся настройки уже
+    загруженного менеджера, иначе секция performance существующего
+    файла, иначе значения по умолчанию.
+    
+    Returns:
+        Настройки производительности
+    """
+    manager = _global_config_manager
+    if manager is not None and manager._config is not None:
+        return manager._config.performance
+    
+    performance = PerformanceConfig()
+    if DEFAULT_CONFIG_FILE.exists():
+        with open(DEFAULT_CONFIG_FILE, 'r', encoding='utf-8') as f:
+            section = json.load(f).get("performance", {})
+        for config_field in fields(PerformanceConfig):
+            if config_field.name in section:
+                setattr(performance, config_field.name, section[config_field.name])
+    return performance
+
+
 def get_config_manager(config_file: Optional[Union[str, Path]] = None) -> ConfigManager:
     """Получение глобального менеджера конфигурации."""
     global _global_config_manager
@@ -3,7 +3,7 @@
 import logging
 import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Type, TypeVar, Optional, Callable, List, Union
+from typing import Dict, Any, Type, TypeVar, Optional, Callable, List, Union, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import inspect
@@ -87,8 +87,31 @@ class DIScope:
             self._instances.clear()
 
 
+# Кэш разобранных сигнатур конструкторов: реализация -> типы параметров
+_signature_cache: Dict[Type, List[Type]] = {}
+_signature_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ResolutionPlan:
+    """Скомпилированный план разрешения зависимости.
+    
+    Строится один раз после проверки графа зависимостей (отсутствие
+    циклов и незарегистрированных типов) и используется при каждом resolve.
+    """
+    interface: Type
+    dependency_info: DependencyInfo
+    dependencies: Tuple[Type, ...]
+
+
 class DIContainer:
-    """Контейнер зависимостей."""
+    """Контейнер зависимостей.
+    
+    Граф зависимостей проверяется заранее: циклы обнаруживаются при
+    регистрации, а для каждого типа при первом разрешении (или при вызове
+    freeze) компилируется план разрешения. Уже созданные singleton'ы
+    возвращаются чтением словаря без захвата блокировки.
+    """
     
     def __init__(self, name: str = "default"):
         self.name = name
@@ -97,7 +120,9 @@ class DIContainer:
         self._singletons: Dict[Type, Any] = {}
         self._scopes: Dict[str, DIScope] = {}
         self._current_scope: Optional[str] = None
-        self._resolution_stack: List[Type] = []
+        self._plans: Dict[Type, ResolutionPlan] = {}
+        self._building: Set[Type] = set()
+        self._frozen = False
         self._lock = threading.RLock()
         
         # Регистрация самого контейнера
@@ -124,7 +149,7 @@ class DIContainer:
                 lifetime=lifetime,
                 factory=factory
             )
-            self._dependencies[interface] = dependency_info
+            self._add_dependency(dependency_info)
             self.logger.debug(f"Зарегистрирована фабрика для {interface.__name__} с областью {lifetime.value}")
         return self
     
@@ -137,7 +162,7 @@ class DIContainer:
                 lifetime=LifetimeScope.SINGLETON,
                 instance=instance
             )
-            self._dependencies[interface] = dependency_info
+            self._add_dependency(dependency_info)
             self._singletons[interface] = instance
             self.logger.debug(f"Зарегистрирован экземпляр для {interface.__name__}")
         return self
@@ -158,13 +183,84 @@ class DIContainer:
                 dependencies=dependencies
             )
             
-            self._dependencies[interface] = dependency_info
+            self._add_dependency(dependency_info)
             self.logger.debug(f"Зарегистрирована зависимость {interface.__name__} -> {implementation.__name__} с областью {lifetime.value}")
         
         return self
     
+    def _add_dependency(self, dependency_info: DependencyInfo):
+        """Добавление зависимости с проверкой графа и сбросом планов.
+        
+        Raises:
+            DIException: Если контейнер заморожен
+            CircularDependencyException: Если регистрация замыкает цикл
+        """
+        if self._frozen:
+            raise DIException(
+                f"Контейнер {self.name} заморожен, регистрация {dependency_info.interface.__name__} невозможна"
+            )
+        
+        interface = dependency_info.interface
+        previous = self._dependencies.get(interface)
+        self._dependencies[interface] = dependency_info
+        
+        cycle = self._find_cycle(interface)
+        if cycle:
+            # Откат регистрации, замыкающей цикл
+            if previous is None:
+                del self._dependencies[interface]
+            else:
+                self._dependencies[interface] = previous
+            raise CircularDependencyException(
+                f"Обнаружена циклическая зависимость: {' -> '.join(t.__name__ for t in cycle)}"
+            )
+        
+        # Новая регистрация может изменить планы зависимых типов
+        self._plans.clear()
+        self._singletons.pop(interface, None)
+    
+    def _find_cycle(self, start: Type) -> Optional[List[Type]]:
+        """Поиск цикла в графе зависимостей, достижимого из типа.
+        
+        Незарегистрированные зависимости пропускаются: они будут
+        проверены при компиляции плана.
+        
+        Returns:
+            Путь цикла или None
+        """
+        path: List[Type] = []
+        on_path: Set[Type] = set()
+        visited: Set[Type] = set()
+        
+        def visit(interface: Type) -> Optional[List[Type]]:
+            if interface in on_path:
+                return path[path.index(interface):] + [interface]
+            if interface in visited:
+                return None
+            
+            dependency_info = self._dependencies.get(interface)
+            if dependency_info is None:
+                return None
+            
+            path.append(interface)
+            on_path.add(interface)
+            for dep_type in dependency_info.dependencies:
+                cycle = visit(dep_type)
+                if cycle:
+                    return cycle
+            path.pop()
+            on_path.discard(interface)
+            visited.add(interface)
+            return None
+        
+        return visit(start)
+    
     def _analyze_dependencies(self, implementation: Type) -> List[Type]:
-        """Анализ зависимостей конструктора."""
+        """Анализ зависимостей конструктора (с кэшированием по реализации)."""
+        cached = _signature_cache.get(implementation)
+        if cached is not None:
+            return list(cached)
+        
         try:
             signature = inspect.signature(implementation.__init__)
             dependencies = []
@@ -178,32 +274,100 @@ class DIContainer:
                 else:
                     self.logger.warning(f"Параметр {param_name} в {implementation.__name__} не имеет аннотации типа")
             
-            return dependencies
+            with _signature_cache_lock:
+                _signature_cache[implementation] = dependencies
+            return list(dependencies)
         except Exception as e:
             self.logger.error(f"Ошибка анализа зависимостей для {implementation.__name__}: {e}")
             return []
     
+    def _compile_plan(self, interface: Type) -> ResolutionPlan:
+        """Компиляция плана разрешения для типа и всех его зависимостей.
+        
+        Raises:
+            DependencyNotRegisteredException: Если зависимость не зарегистрирована
+            CircularDependencyException: Если обнаружен цикл
+        """
+        plan = self._plans.get(interface)
+        if plan is not None:
+            return plan
+        
+        dependency_info = self._dependencies.get(interface)
+        if not dependency_info:
+            raise DependencyNotRegisteredException(f"Зависимость {interface.__name__} не зарегистрирована")
+        
+        cycle = self._find_cycle(interface)
+        if cycle:
+            raise CircularDependencyException(
+                f"Обнаружена циклическая зависимость: {' -> '.join(t.__name__ for t in cycle)}"
+            )
+        
+        dependencies: Tuple[Type, ...] = ()
+        if dependency_info.instance is None and dependency_info.factory is None:
+            for dep_type in dependency_info.dependencies:
+                if dep_type not in self._dependencies:
+                    raise DependencyNotRegisteredException(
+                        f"Зависимость {dep_type.__name__} для {interface.__name__} не зарегистрирована"
+                    )
+                self._compile_plan(dep_type)
+            dependencies = tuple(dependency_info.dependencies)
+        
+        plan = ResolutionPlan(
+            interface=interface,
+            dependency_info=dependency_info,
+            dependencies=dependencies
+        )
+        self._plans[interface] = plan
+        return plan
+    
+    def freeze(self) -> 'DIContainer':
+        """Проверка всего графа и компиляция планов для всех типов.
+        
+        После заморозки новые регистрации запрещены.
+        
+        Raises:
+            DIException: Если граф зависимостей некорректен
+        """
+        with self._lock:
+            for interface in list(self._dependencies.keys()):
+                self._compile_plan(interface)
+            self._frozen = True
+            self.logger.debug(f"Контейнер {self.name} заморожен, планов: {len(self._plans)}")
+        return self
+    
+    @property
+    def is_frozen(self) -> bool:
+        """Заморожен ли контейнер."""
+        return self._frozen
+    
     def resolve(self, interface: Type[T]) -> T:
         """Разрешение зависимости."""
+        # Быстрый путь: готовый singleton читается без блокировки
+        instance = self._singletons.get(interface)
+        if instance is not None:
+            return instance
+        
         with self._lock:
-            try:
-                self._resolution_stack.append(interface)
-                return self._resolve_internal(interface)
-            finally:
-                if interface in self._resolution_stack:
-                    self._resolution_stack.remove(interface)
+            plan = self._plans.get(interface)
+            if plan is None:
+                plan = self._compile_plan(interface)
+            return self._resolve_plan(plan)
     
     def _resolve_internal(self, interface: Type[T]) -> T:
-        """Внутреннее разрешение зависимости."""
-        # Проверка циклических зависимостей
-        if self._resolution_stack.count(interface) > 1:
-            cycle = " -> ".join([t.__name__ for t in self._resolution_stack])
-            raise CircularDependencyException(f"Обнаружена циклическая зависимость: {cycle}")
+        """Внутреннее разрешение зависимости (вызывается под блокировкой)."""
+        instance = self._singletons.get(interface)
+        if instance is not None:
+            return instance
         
-        # Поиск зарегистрированной зависимости
-        dependency_info = self._dependencies.get(interface)
-        if not dependency_info:
-            raise DependencyNotRegisteredException(f"Зависимость {interface.__name__} не зарегистрирована")
+        plan = self._plans.get(interface)
+        if plan is None:
+            plan = self._compile_plan(interface)
+        return self._resolve_plan(plan)
+    
+    def _resolve_plan(self, plan: ResolutionPlan) -> Any:
+        """Разрешение зависимости по скомпилированному плану."""
+        interface = plan.interface
+        dependency_info = plan.dependency_info
         
         # Возврат готового экземпляра
         if dependency_info.instance is not None:
@@ -211,10 +375,11 @@ class DIContainer:
         
         # Singleton
         if dependency_info.lifetime == LifetimeScope.SINGLETON:
-            if interface in self._singletons:
-                return self._singletons[interface]
+            instance = self._singletons.get(interface)
+            if instance is not None:
+                return instance
             
-            instance = self._create_instance(dependency_info)
+            instance = self._create_instance(plan)
             self._singletons[interface] = instance
             return instance
         
@@ -227,29 +392,37 @@ class DIContainer:
                     if instance is not None:
                         return instance
                     
-                    instance = self._create_instance(dependency_info)
+                    instance = self._create_instance(plan)
                     scope.set_instance(interface, instance)
                     return instance
             
             # Если нет активной области, создаем как transient
-            return self._create_instance(dependency_info)
+            return self._create_instance(plan)
         
         # Transient
         else:
-            return self._create_instance(dependency_info)
+            return self._create_instance(plan)
     
-    def _create_instance(self, dependency_info: DependencyInfo) -> Any:
+    def _create_instance(self, plan: ResolutionPlan) -> Any:
         """Создание экземпляра зависимости."""
+        dependency_info = plan.dependency_info
+        interface = plan.interface
+        
+        # Защита от циклов, которые нельзя обнаружить заранее
+        # (например, фабрика, разрешающая собственный тип)
+        if interface in self._building:
+            raise CircularDependencyException(
+                f"Обнаружена циклическая зависимость при создании {interface.__name__}"
+            )
+        
+        self._building.add(interface)
         try:
             # Использование фабрики
             if dependency_info.factory:
                 return dependency_info.factory()
             
             # Разрешение зависимостей конструктора
-            constructor_args = []
-            for dep_type in dependency_info.dependencies:
-                arg = self._resolve_internal(dep_type)
-                constructor_args.append(arg)
+            constructor_args = [self._resolve_internal(dep_type) for dep_type in plan.dependencies]
             
             # Создание экземпляра
             instance = dependency_info.implementation(*constructor_args)
@@ -260,10 +433,14 @@ class DIContainer:
             
             self.logger.debug(f"Создан экземпляр {dependency_info.implementation.__name__}")
             return instance
-            
+        
+        except DIException:
+            raise
         except Exception as e:
             self.logger.error(f"Ошибка создания экземпляра {dependency_info.implementation.__name__}: {e}")
             raise DIException(f"Не удалось создать экземпляр {dependency_info.implementation.__name__}: {e}")
+        finally:
+            self._building.discard(interface)
     
     def try_resolve(self, interface: Type[T]) -> Optional[T]:
         """Попытка разрешения зависимости без исключений."""
@@ -328,8 +505,10 @@ class DIContainer:
             self._dependencies.clear()
             self._singletons.clear()
             self._scopes.clear()
+            self._plans.clear()
+            self._building.clear()
             self._current_scope = None
-            self._resolution_stack.clear()
+            self._frozen = False
             
             # Повторная регистрация самого контейнера
             self.register_instance(DIContainer, self)
@@ -340,9 +519,10 @@ class DIContainer:
             return {
                 "registered_dependencies": len(self._dependencies),
                 "singleton_instances": len(self._singletons),
+                "compiled_plans": len(self._plans),
+                "frozen": self._frozen,
                 "active_scopes": len(self._scopes),
-                "current_scope": self._current_scope,
-                "resolution_stack_depth": len(self._resolution_stack)
+                "current_scope": self._current_scope
             }
 
 
@@ -12,6 +12,15 @@ import json
 import sys
 from pathlib import Path
 
+try:
+    from logging_config import route_handler
+except ImportError:
+    # Пакет установлен без модуля logging_config приложения:
+    # обработчики подключаются к логгеру напрямую
+    def route_handler(logger: logging.Logger, handler: logging.Handler) -> logging.Handler:
+        logger.addHandler(handler)
+        return handler
+
 
 class ErrorSeverity(Enum):
     """Уровни серьезности ошибок."""
@@ -111,7 +120,7 @@ class LoggingErrorHandler(BaseErrorHandler):
                 '%(asctime)s - %(levelname)s - %(message)s'
             )
             handler.setFormatter(formatter)
-            self.error_logger.addHandler(handler)
+            route_handler(self.error_logger, handler)
             self.error_logger.setLevel(logging.ERROR)
         else:
             self.error_logger = self.logger
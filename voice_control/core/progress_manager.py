@@ -6,7 +6,7 @@
 
 import time
 import threading
-from typing import Dict, Any, Optional, Callable, List
+from typing import Dict, Any, Optional, Callable, List, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -36,6 +36,7 @@ class ProgressInfo:
     updated_at: float = field(default_factory=time.time)
     completed_at: Optional[float] = None
     error_message: Optional[str] = None
+    eta_seconds: Optional[float] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
@@ -44,6 +45,10 @@ class ProgressManager:
     
     Обеспечивает централизованное отслеживание прогресса различных операций
     с поддержкой уведомлений и метрик производительности.
+    
+    В режиме троттлинга (см. enable_throttling) обновления прогресса не
+    применяются сразу, а накапливаются по сессиям: хранится только последнее
+    значение, а фоновый поток доставляет их пакетом не чаще заданной частоты.
     """
     
     def __init__(self):
@@ -55,7 +60,8 @@ class ProgressManager:
             "progress_updated": [],
             "operation_completed": [],
             "operation_failed": [],
-            "operation_cancelled": []
+            "operation_cancelled": [],
+            "progress_batch": []
         }
         
         # Метрики производительности
@@ -64,9 +70,28 @@ class ProgressManager:
             "completed_operations": 0,
             "failed_operations": 0,
             "cancelled_operations": 0,
-            "average_duration": 0.0
+            "average_duration": 0.0,
+            "delivered_batches": 0
+        }
+        
+        # Счетчики входящих обновлений; изменяются только под _pending_lock,
+        # чтобы троттлинг не брал основную блокировку
+        self._update_counters = {
+            "received_updates": 0,
+            "coalesced_updates": 0
         }
         
+        # Оценка ETA: session_id -> (время, процент, сглаженная скорость %/с)
+        self._rate_estimates: Dict[str, Tuple[float, float, Optional[float]]] = {}
+        self._eta_smoothing = 0.3
+        
+        # Троттлинг обновлений прогресса
+        self._max_update_rate: Optional[float] = None
+        self._pending_updates: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_stop = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+        
         self._logger.info("ProgressManager initialized")
     
     def register_callback(self, event: str, callback: Callable) -> None:
@@ -93,16 +118,16 @@ class ProgressManager:
             self._callbacks[event].remove(callback)
             self._logger.debug(f"Callback unregistered for event: {event}")
     
-    def _emit_event(self, event: str, progress_info: ProgressInfo) -> None:
+    def _emit_event(self, event: str, payload: Any) -> None:
         """Вызов всех callback функций для события.
         
         Args:
             event: Тип события
-            progress_info: Информация о прогрессе
+            payload: Информация о прогрессе (для progress_batch - список)
         """
         for callback in self._callbacks.get(event, []):
             try:
-                callback(progress_info)
+                callback(payload)
             except Exception as e:
                 self._logger.error(f"Error in callback for {event}: {e}")
     
@@ -128,11 +153,63 @@ class ProgressManager:
             )
             
             self._operations[session_id] = progress_info
+            self._rate_estimates[session_id] = (progress_info.started_at, 0.0, None)
             self._metrics["total_operations"] += 1
             
             self._logger.info(f"Session started: {session_id} ({operation_type})")
             self._emit_event("progress_updated", progress_info)
     
+    def enable_throttling(self, max_updates_per_second: float = 10.0,
+                          eta_smoothing: float = 0.3) -> None:
+        """Включение режима троттлинга обновлений прогресса.
+        
+        Обновления объединяются по сессиям и доставляются не чаще
+        max_updates_per_second раз в секунду, независимо от частоты вызовов
+        update_progress.
+        
+        Args:
+            max_updates_per_second: Максимальная частота доставки обновлений
+            eta_smoothing: Коэффициент экспоненциального сглаживания скорости (0-1]
+        """
+        if max_updates_per_second <= 0:
+            raise ValueError("max_updates_per_second must be positive")
+        if not 0.0 < eta_smoothing <= 1.0:
+            raise ValueError("eta_smoothing must be in range (0, 1]")
+        
+        with self._lock:
+            self._max_update_rate = max_updates_per_second
+            self._eta_smoothing = eta_smoothing
+            
+            if self._flush_thread is None or not self._flush_thread.is_alive():
+                self._flush_stop.clear()
+                self._flush_thread = threading.Thread(
+                    target=self._flush_loop,
+                    name="ProgressManagerFlush",
+                    daemon=True
+                )
+                self._flush_thread.start()
+        
+        self._logger.info(f"Progress throttling enabled: {max_updates_per_second} updates/s")
+    
+    def disable_throttling(self) -> None:
+        """Отключение троттлинга с доставкой всех накопленных обновлений."""
+        with self._lock:
+            self._max_update_rate = None
+            flush_thread = self._flush_thread
+            self._flush_thread = None
+        
+        self._flush_stop.set()
+        if flush_thread is not None and flush_thread is not threading.current_thread():
+            flush_thread.join(timeout=1.0)
+        
+        self.flush_pending_updates()
+        self._logger.info("Progress throttling disabled")
+    
+    @property
+    def is_throttled(self) -> bool:
+        """Включен ли режим троттлинга."""
+        return self._max_update_rate is not None
+    
     def update_progress(self, session_id: str,
                        progress_percent: Optional[float] = None,
                        current_step: Optional[str] = None,
@@ -140,6 +217,9 @@ class ProgressManager:
                        metadata_update: Optional[Dict[str, Any]] = None) -> None:
         """Обновление прогресса операции.
         
+        В режиме троттлинга обновление только запоминается и будет
+        доставлено при следующем сбросе (см. flush_pending_updates).
+        
         Args:
             session_id: ID сессии
             progress_percent: Процент выполнения (0-100)
@@ -147,39 +227,189 @@ class ProgressManager:
             completed_steps: Количество завершенных шагов
             metadata_update: Обновления метаданных
         """
+        if self._max_update_rate is not None:
+            self._queue_update(session_id, progress_percent, current_step,
+                               completed_steps, metadata_update)
+            return
+        
+        with self._pending_lock:
+            self._update_counters["received_updates"] += 1
+        
         with self._lock:
             if session_id not in self._operations:
                 self._logger.warning(f"Attempt to update non-existent session: {session_id}")
                 return
             
             progress_info = self._operations[session_id]
+            self._apply_update(progress_info, {
+                "progress_percent": progress_percent,
+                "current_step": current_step,
+                "completed_steps": completed_steps,
+                "metadata_update": metadata_update,
+                "timestamp": time.time()
+            })
             
-            # Обновление полей
-            if progress_percent is not None:
-                progress_info.progress_percent = max(0.0, min(100.0, progress_percent))
+            self._logger.debug(f"Progress updated for {session_id}: {progress_info.progress_percent:.1f}%")
+            self._emit_event("progress_updated", progress_info)
+    
+    def _queue_update(self, session_id: str,
+                      progress_percent: Optional[float],
+                      current_step: Optional[str],
+                      completed_steps: Optional[int],
+                      metadata_update: Optional[Dict[str, Any]]) -> None:
+        """Объединение обновления с ожидающим обновлением сессии.
+        
+        Берется только короткая блокировка очереди; основная блокировка
+        менеджера и callback функции задействуются лишь при сбросе.
+        """
+        with self._pending_lock:
+            pending = self._pending_updates.get(session_id)
+            if pending is None:
+                pending = {
+                    "progress_percent": None,
+                    "current_step": None,
+                    "completed_steps": None,
+                    "metadata_update": None
+                }
+                self._pending_updates[session_id] = pending
+            else:
+                self._update_counters["coalesced_updates"] += 1
+            
+            self._update_counters["received_updates"] += 1
             
+            if progress_percent is not None:
+                pending["progress_percent"] = progress_percent
             if current_step is not None:
-                progress_info.current_step = current_step
-            
+                pending["current_step"] = current_step
             if completed_steps is not None:
-                progress_info.completed_steps = completed_steps
-                # Автоматический расчет процента если не указан
-                if progress_percent is None and progress_info.total_steps > 0:
-                    progress_info.progress_percent = (
-                        completed_steps / progress_info.total_steps * 100.0
-                    )
-            
+                pending["completed_steps"] = completed_steps
             if metadata_update:
-                progress_info.metadata.update(metadata_update)
-            
-            progress_info.updated_at = time.time()
+                if pending["metadata_update"] is None:
+                    pending["metadata_update"] = {}
+                pending["metadata_update"].update(metadata_update)
+            pending["timestamp"] = time.time()
+    
+    def _take_pending(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Извлечение ожидающего обновления сессии из очереди."""
+        with self._pending_lock:
+            return self._pending_updates.pop(session_id, None)
+    
+    def _apply_update(self, progress_info: ProgressInfo, update: Dict[str, Any]) -> None:
+        """Применение обновления к информации о прогрессе.
+        
+        Args:
+            progress_info: Информация о прогрессе
+            update: Поля обновления (значения None не применяются)
+        """
+        progress_percent = update.get("progress_percent")
+        current_step = update.get("current_step")
+        completed_steps = update.get("completed_steps")
+        metadata_update = update.get("metadata_update")
+        
+        # Обновление полей
+        if progress_percent is not None:
+            progress_info.progress_percent = max(0.0, min(100.0, progress_percent))
+        
+        if current_step is not None:
+            progress_info.current_step = current_step
+        
+        if completed_steps is not None:
+            progress_info.completed_steps = completed_steps
+            # Автоматический расчет процента если не указан
+            if progress_percent is None and progress_info.total_steps > 0:
+                progress_info.progress_percent = (
+                    completed_steps / progress_info.total_steps * 100.0
+                )
+        
+        if metadata_update:
+            progress_info.metadata.update(metadata_update)
+        
+        progress_info.updated_at = update.get("timestamp") or time.time()
+        
+        # Обновление статуса
+        if progress_info.status == OperationStatus.PENDING:
+            progress_info.status = OperationStatus.IN_PROGRESS
+        
+        self._update_eta(progress_info)
+    
+    def _update_eta(self, progress_info: ProgressInfo) -> None:
+        """Пересчет ETA по экспоненциально сглаженной скорости выполнения.
+        
+        Args:
+            progress_info: Информация о прогрессе
+        """
+        session_id = progress_info.operation_id
+        now = progress_info.updated_at
+        percent = progress_info.progress_percent
+        
+        last_time, last_percent, rate = self._rate_estimates.get(
+            session_id, (progress_info.started_at, 0.0, None)
+        )
+        
+        elapsed = now - last_time
+        if elapsed > 0 and percent >= last_percent:
+            instant_rate = (percent - last_percent) / elapsed
+            if rate is None:
+                rate = instant_rate
+            else:
+                rate = self._eta_smoothing * instant_rate + (1.0 - self._eta_smoothing) * rate
+            self._rate_estimates[session_id] = (now, percent, rate)
+        
+        if rate and rate > 0:
+            progress_info.eta_seconds = (100.0 - percent) / rate
+        else:
+            progress_info.eta_seconds = None
+    
+    def flush_pending_updates(self) -> int:
+        """Доставка накопленных обновлений прогресса одним пакетом.
+        
+        Returns:
+            Количество сессий, получивших обновление
+        """
+        with self._pending_lock:
+            if not self._pending_updates:
+                return 0
+            pending = self._pending_updates
+            self._pending_updates = {}
+        
+        updated: List[ProgressInfo] = []
+        with self._lock:
+            for session_id, update in pending.items():
+                progress_info = self._operations.get(session_id)
+                if progress_info is None:
+                    self._logger.warning(f"Attempt to update non-existent session: {session_id}")
+                    continue
+                if progress_info.status not in (OperationStatus.PENDING, OperationStatus.IN_PROGRESS):
+                    continue
+                
+                self._apply_update(progress_info, update)
+                updated.append(progress_info)
+            
+            if updated:
+                self._metrics["delivered_batches"] += 1
+        
+        # Callback функции вызываются вне основной блокировки
+        for progress_info in updated:
+            self._emit_event("progress_updated", progress_info)
+        if updated:
+            self._emit_event("progress_batch", updated)
+        
+        return len(updated)
+    
+    def _flush_loop(self) -> None:
+        """Фоновый цикл доставки обновлений с ограничением частоты."""
+        while True:
+            rate = self._max_update_rate
+            if rate is None:
+                break
             
-            # Обновление статуса
-            if progress_info.status == OperationStatus.PENDING:
-                progress_info.status = OperationStatus.IN_PROGRESS
+            if self._flush_stop.wait(1.0 / rate):
+                break
             
-            self._logger.debug(f"Progress updated for {session_id}: {progress_info.progress_percent:.1f}%")
-            self._emit_event("progress_updated", progress_info)
+            try:
+                self.flush_pending_updates()
+            except Exception as e:
+                self._logger.error(f"Error flushing progress updates: {e}")
     
     def complete_session(self, session_id: str, result: Optional[Dict[str, Any]] = None) -> None:
         """Завершение сессии с успехом.
@@ -194,9 +424,16 @@ class ProgressManager:
                 return
             
             progress_info = self._operations[session_id]
+            
+            # Последнее ожидающее обновление применяется без уведомления
+            pending = self._take_pending(session_id)
+            if pending:
+                self._apply_update(progress_info, pending)
+            
             progress_info.status = OperationStatus.COMPLETED
             progress_info.progress_percent = 100.0
             progress_info.completed_steps = progress_info.total_steps
+            progress_info.eta_seconds = 0.0
             progress_info.completed_at = time.time()
             progress_info.updated_at = progress_info.completed_at
             
@@ -223,6 +460,12 @@ class ProgressManager:
                 return
             
             progress_info = self._operations[session_id]
+            
+            # Последнее ожидающее обновление применяется без уведомления
+            pending = self._take_pending(session_id)
+            if pending:
+                self._apply_update(progress_info, pending)
+            
             progress_info.status = OperationStatus.FAILED
             progress_info.error_message = error_message
             progress_info.completed_at = time.time()
@@ -247,6 +490,12 @@ class ProgressManager:
                 return
             
             progress_info = self._operations[session_id]
+            
+            # Последнее ожидающее обновление применяется без уведомления
+            pending = self._take_pending(session_id)
+            if pending:
+                self._apply_update(progress_info, pending)
+            
             progress_info.status = OperationStatus.CANCELLED
             progress_info.completed_at = time.time()
             progress_info.updated_at = progress_info.completed_at
@@ -288,6 +537,7 @@ class ProgressManager:
                     (progress_info.completed_at or time.time()) - progress_info.started_at
                 ),
                 "error_message": progress_info.error_message,
+                "eta_seconds": progress_info.eta_seconds,
                 "metadata": progress_info.metadata.copy()
             }
     
@@ -319,7 +569,10 @@ class ProgressManager:
             Словарь с метриками
         """
         with self._lock:
-            return self._metrics.copy()
+            metrics = self._metrics.copy()
+        with self._pending_lock:
+            metrics.update(self._update_counters)
+        return metrics
     
     def _update_average_duration(self, progress_info: ProgressInfo) -> None:
         """Обновление средней продолжительности операций.
@@ -367,6 +620,7 @@ class ProgressManager:
             
             for session_id in sessions_to_remove:
                 del self._operations[session_id]
+                self._rate_estimates.pop(session_id, None)
             
             if sessions_to_remove:
                 self._logger.info(f"Cleaned up {len(sessions_to_remove)} old sessions")
@@ -375,6 +629,9 @@ class ProgressManager:
     
     def cleanup(self) -> None:
         """Полная очистка менеджера прогресса."""
+        if self.is_throttled:
+            self.disable_throttling()
+        
         with self._lock:
             # Отмена всех активных сессий
             active_sessions = self.get_active_sessions()
@@ -383,6 +640,13 @@ class ProgressManager:
             
             # Очистка всех данных
             self._operations.clear()
+            self._rate_estimates.clear()
+            with self._pending_lock:
+                self._pending_updates.clear()
+                self._update_counters = {
+                    "received_updates": 0,
+                    "coalesced_updates": 0
+                }
             
             # Сброс метрик
             self._metrics = {
@@ -390,7 +654,8 @@ class ProgressManager:
                 "completed_operations": 0,
                 "failed_operations": 0,
                 "cancelled_operations": 0,
-                "average_duration": 0.0
+                "average_duration": 0.0,
+                "delivered_batches": 0
             }
             
             self._logger.info("ProgressManager cleanup completed")
\ No newline at end of file
@@ -5,6 +5,8 @@
 """
 
 import asyncio
+import functools
+import os
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, Type, List
 from enum import Enum
@@ -86,9 +88,10 @@ class WhisperRecognizer(BaseRecognizer):
             except ImportError:
                 self._device = "cpu"
             
-            # Загрузка модели
+            # Загрузка модели в пуле потоков, чтобы не блокировать цикл событий
             model_name = "base"  # Можно сделать конфигурируемым
-            self._model = whisper.load_model(model_name, device=self._device)
+            self._model = await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(whisper.load_model, model_name, device=self._device))
             
             self._logger.info(f"Whisper model '{model_name}' loaded on {self._device}")
             
@@ -277,7 +280,7 @@ class VoskRecognizer(BaseRecognizer):
             if not os.path.exists(model_path):
                 raise FileNotFoundError(f"Vosk model not found at: {model_path}")
             
-            self._model = vosk.Model(model_path)
+            self._model = await asyncio.get_running_loop().run_in_executor(None, vosk.Model, model_path)
             self._recognizer = vosk.KaldiRecognizer(self._model, 16000)
             
             self._logger.info(f"Vosk model loaded from {model_path}")
@@ -388,7 +391,44 @@ class RecognitionFactory:
             Список названий доступных сервисов
         """
         return list(self._recognizer_classes.keys())
-    
+
+    async def initialize_services(self, services: Optional[List[str]] = None) -> Dict[str, Optional[Exception]]:
+        """Параллельная инициализация нескольких распознавателей.
+
+        Учетные данные читаются и расшифровываются, а модели Whisper и Vosk
+        загружаются вне цикла событий, поэтому сервисы инициализируются
+        одновременно.
+
+        Args:
+            services: Названия сервисов (по умолчанию - все доступные)
+
+        Returns:
+            Словарь service -> исключение или None при успехе
+        """
+        services = services or self.get_available_services()
+
+        status: Dict[str, Optional[Exception]] = {}
+        recognizers = {}
+        for service in services:
+            try:
+                recognizers[service] = self.get_recognizer(service)
+            except Exception as e:
+                self._logger.error(f"Failed to create {service} recognizer: {e}")
+                status[service] = e
+
+        results = await asyncio.gather(
+            *(recognizer.ensure_initialized() for recognizer in recognizers.values()),
+            return_exceptions=True
+        )
+
+        for service, result in zip(recognizers, results):
+            if isinstance(result, Exception):
+                self._logger.error(f"Failed to initialize {service} recognizer: {result}")
+                status[service] = result
+            else:
+                status[service] = None
+        return status
+
     async def cleanup(self) -> None:
         """Очистка всех созданных распознавателей."""
         for service, recognizer in self._recognizers.items():
@@ -7,13 +7,37 @@
 """
 
 import logging
+import threading
 from collections import deque
 import numpy as np
-from typing import Optional, Union, Deque
+from typing import Dict, Optional, Union, Deque
 
 # Настройка логгера
 logger = logging.getLogger(__name__)
 
+# Общие счетчики вытесненных (потерянных) аудиоданных по всем буферам процесса
+_drop_statistics: Dict[str, int] = {"dropped_blocks": 0, "dropped_bytes": 0}
+_drop_statistics_lock = threading.Lock()
+
+
+def get_drop_statistics() -> Dict[str, int]:
+    """
+    Возвращает суммарные счетчики аудиоданных, вытесненных из буферов
+    из-за переполнения.
+    
+    Returns:
+        Dict[str, int]: Количество вытесненных блоков и байтов.
+    """
+    with _drop_statistics_lock:
+        return dict(_drop_statistics)
+
+
+def _record_drop(blocks: int, size: int) -> None:
+    """Учитывает вытесненные данные в общих счетчиках."""
+    with _drop_statistics_lock:
+        _drop_statistics["dropped_blocks"] += blocks
+        _drop_statistics["dropped_bytes"] += size
+
 class CircularAudioBuffer:
     """
     Кольцевой буфер для эффективного хранения и обработки аудиоданных.
@@ -48,6 +72,10 @@ class CircularAudioBuffer:
         # Общее количество добавленных байтов (для отслеживания позиции)
         self.total_bytes_added = 0
         
+        # Счетчики вытесненных при переполнении данных
+        self.dropped_blocks = 0
+        self.dropped_bytes = 0
+        
         logger.debug(f"Создан кольцевой аудиобуфер размером {max_size} байт "
                     f"({max_seconds:.1f} сек, {sample_rate} Гц, {channels} канал(ов), "
                     f"{sample_width} байт/сэмпл)")
@@ -81,6 +109,12 @@ class CircularAudioBuffer:
         if not audio_data:
             return 0
         
+        # deque с maxlen молча вытеснил бы старейший блок - вытесняем его явно
+        if len(self.buffer) == self.buffer.maxlen:
+            removed = self.buffer.popleft()
+            self.total_bytes_added -= len(removed)
+            self._count_dropped(removed)
+        
         # Добавляем данные как единый блок байтов
         if isinstance(audio_data, (bytes, bytearray)):
             # Добавляем целый блок байтов (для предотвращения преобразования в int)
@@ -105,6 +139,7 @@ class CircularAudioBuffer:
             # Удаляем старые блоки данных
             removed = self.buffer.popleft()
             self.total_bytes_added -= len(removed)
+            self._count_dropped(removed)
         
         # Логируем состояние буфера только каждые 50 вызовов
         if self._add_bytes_call_count % 50 == 0:
@@ -112,6 +147,13 @@ class CircularAudioBuffer:
         
         return data_len
     
+    def _count_dropped(self, block: Union[bytes, bytearray]) -> None:
+        """Учитывает вытесненный из буфера блок."""
+        size = len(block)
+        self.dropped_blocks += 1
+        self.dropped_bytes += size
+        _record_drop(1, size)
+    
     def add_numpy_array(self, audio_array: np.ndarray) -> int:
         """
         Добавляет аудиоданные из numpy массива в буфер.
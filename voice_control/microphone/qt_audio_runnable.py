@@ -15,6 +15,7 @@ import threading
 from PySide6.QtCore import QRunnable, QObject, Signal, QThread
 
 from voice_control.microphone.audio_buffer import CircularAudioBuffer
+from voice_control.utils.tracing import get_tracer
 import pyaudio
 
 # Настройка логгера
@@ -105,6 +106,10 @@ class AudioCaptureRunnable(QRunnable):
         # Счетчики для оптимизации логирования
         self._audio_data_call_count = 0
         self._total_data_received = 0
+        
+        # Трасса фразы, к которой относится запись (открытие потока, первый сэмпл)
+        self._trace_id = get_tracer().current_trace_id()
+        self._stream_started_ns = None
     
     def _on_audio_data(self, in_data, frame_count, time_info, status):
         """
@@ -130,6 +135,9 @@ class AudioCaptureRunnable(QRunnable):
             self._audio_data_call_count += 1
             self._total_data_received += data_size
             
+            if self._audio_data_call_count == 1 and self._stream_started_ns is not None:
+                get_tracer().record_span("first_sample", self._stream_started_ns, trace_id=self._trace_id)
+            
             # Логируем каждые 50 вызовов или при пустых данных
             if self._audio_data_call_count % 50 == 0 or data_size == 0:
                 logger.debug(f"_on_audio_data: Вызов #{self._audio_data_call_count}, данные {data_size} байт, общий объем {self._total_data_received} байт, frame_count={frame_count}")
@@ -227,10 +235,13 @@ class AudioCaptureRunnable(QRunnable):
             self._stop_requested = False # Сбрасываем флаг запроса на остановку
             
             # Инициализация PyAudio
+            open_started_ns = time.perf_counter_ns()
             self._initialize_audio()
             
             # Запуск потока аудио через callback
             self._start_audio_stream_with_callback()
+            get_tracer().record_span("stream_open", open_started_ns, self._stream_started_ns,
+                                     trace_id=self._trace_id)
             
             if self.signals: # Проверяем перед emit
                 self.signals.started.emit()
@@ -340,6 +351,7 @@ class AudioCaptureRunnable(QRunnable):
             )
             logger.info(f"Запущен поток аудио с параметрами: {self.rate} Гц, {self.channels} канал(ов), формат {self.format}")
             # Запускаем поток
+            self._stream_started_ns = time.perf_counter_ns()
             self._stream.start_stream()
         except Exception as e:
             logger.error(f"Не удалось открыть аудиопоток с callback: {e}")
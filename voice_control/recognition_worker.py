@@ -2,20 +2,30 @@ import os
 import logging
 from PySide6.QtCore import QObject, Signal, Slot
 
+from voice_control.utils.profiler import get_profiler
+from voice_control.utils.tracing import get_tracer
+
 logger = logging.getLogger(__name__)
 
 class RecognitionWorker(QObject):
     recognition_finished = Signal(dict)  # Сигнал с результатом распознавания (словарь от SpeechRecognizer)
     recognition_error = Signal(str)    # Сигнал об ошибке
 
-    def __init__(self, recognizer, audio_file_path=None, audio_data_tuple=None):
+    def __init__(self, recognizer, audio_file_path=None, audio_data_tuple=None, trace_id=None):
         super().__init__()
         self.recognizer = recognizer
         self.audio_file_path = audio_file_path
         self.audio_data_tuple = audio_data_tuple # Кортеж (raw_data, sample_rate, channels, sample_width)
+        self.trace_id = trace_id # Идентификатор трассы фразы
 
     @Slot()
     def run(self):
+        recognizer_name = type(self.recognizer).__name__ if self.recognizer else None
+        with get_tracer().span("recognize", self.trace_id, recognizer=recognizer_name), \
+                get_profiler().profile(f"recognition_{recognizer_name}"):
+            self._run()
+
+    def _run(self):
         try:
             logger.debug(f"RecognitionWorker.run: Начало работы, recognizer={type(self.recognizer).__name__ if self.recognizer else None}")
             
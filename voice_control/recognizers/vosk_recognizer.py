@@ -1,10 +1,12 @@
 from .base_recognizer import BaseRecognizer
 import json
+import logging
 import os
 import wave
 from typing import List, Dict, Union
 from .base_recognizer import BaseRecognizer
 from voice_control.utils.vosk_model_loader import VoskModelManager
+from voice_control.utils.tracing import get_tracer
 
 # Попытка импортировать vosk, если не установлен, будет ошибка при создании экземпляра
 try:
@@ -13,6 +15,8 @@ try:
 except ImportError:
     VOSK_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
 class VoskSpeechRecognizer(BaseRecognizer):
     """
     Реализация распознавателя речи с использованием Vosk API для локального распознавания.
@@ -85,23 +89,10 @@ class VoskSpeechRecognizer(BaseRecognizer):
             dict: Словарь с результатами распознавания в формате:
                   {"success": True/False, "text": "распознанный текст", "results": [...]}
         """
-        import logging
-        logger = logging.getLogger(__name__)
-        
-        # Принудительно устанавливаем уровень логирования для диагностики
-        logger.setLevel(logging.INFO)
-        if not logger.handlers:
-            handler = logging.StreamHandler()
-            handler.setLevel(logging.INFO)
-            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
-        
         try:
-            # Диагностическое логирование входных данных
-            logger.info(f"VoskSpeechRecognizer: Получены аудиоданные размером {len(audio_data)} байт")
-            logger.info(f"VoskSpeechRecognizer: Sample rate модели: {self.sample_rate}")
-            print(f"[DEBUG] VoskSpeechRecognizer: Получены аудиоданные размером {len(audio_data)} байт")  # Дублируем в print для гарантии
+            # Диагностика входных данных (только на уровне DEBUG: вызывается на каждую фразу)
+            logger.debug(f"VoskSpeechRecognizer: Получены аудиоданные размером {len(audio_data)} байт, "
+                         f"sample rate модели: {self.sample_rate}")
             
             # Проверяем, что данные не пустые
             if not audio_data:
@@ -114,29 +105,27 @@ class VoskSpeechRecognizer(BaseRecognizer):
             # Логируем первые несколько байт для диагностики формата
             if len(audio_data) >= 44:  # Минимальный размер WAV заголовка
                 header_info = audio_data[:44]
-                logger.info(f"VoskSpeechRecognizer: Первые 12 байт аудиоданных: {header_info[:12]}")
+                logger.debug(f"VoskSpeechRecognizer: Первые 12 байт аудиоданных: {header_info[:12]}")
                 # Проверяем WAV заголовок
                 if header_info[:4] == b'RIFF' and header_info[8:12] == b'WAVE':
-                    logger.info("VoskSpeechRecognizer: Обнаружен корректный WAV заголовок")
+                    logger.debug("VoskSpeechRecognizer: Обнаружен корректный WAV заголовок")
                 else:
                     logger.warning("VoskSpeechRecognizer: WAV заголовок не обнаружен или некорректен")
             else:
                 logger.warning(f"VoskSpeechRecognizer: Размер данных ({len(audio_data)} байт) меньше минимального WAV заголовка (44 байта)")
             
             # Попытка распознавания: передаем все аудиоданные и получаем финальный результат
-            logger.info("VoskSpeechRecognizer: Передаем все аудиоданные в распознаватель с AcceptWaveform")
-            self.recognizer.AcceptWaveform(audio_data)
-            
-            result_json = self.recognizer.FinalResult()
-            result_data = json.loads(result_json)
-            logger.info(f"VoskSpeechRecognizer: Распознан текст: {result_data.get('text')}")
+            logger.debug("VoskSpeechRecognizer: Передаем все аудиоданные в распознаватель с AcceptWaveform")
+            with get_tracer().span("decode", bytes=len(audio_data)):
+                self.recognizer.AcceptWaveform(audio_data)
+                result_json = self.recognizer.FinalResult()
             
             result = json.loads(result_json)
-            logger.info(f"VoskSpeechRecognizer: Распарсенный результат: {result}")
+            logger.debug(f"VoskSpeechRecognizer: Распарсенный результат: {result}")
 
             # В финальном результате текст находится в ключе 'text'
             text = result.get("text", "").strip()
-            logger.info(f"VoskSpeechRecognizer: Извлеченный текст: '{text}'")
+            logger.debug(f"VoskSpeechRecognizer: Извлеченный текст: '{text}'")
 
             if not text:
                 logger.warning(f"VoskSpeechRecognizer: Текст не распознан. Полный результат: {result}")
@@ -173,8 +162,7 @@ class VoskSpeechRecognizer(BaseRecognizer):
                 "results": [result_item]
             }
         except Exception as e:
-            # Логирование ошибки
-            print(f"Ошибка во время распознавания аудиоданных Vosk: {e}")
+            logger.error(f"Ошибка во время распознавания аудиоданных Vosk: {e}")
             return {
                 "success": False,
                 "error": f"Ошибка распознавания: {e}"
@@ -288,8 +276,7 @@ class VoskSpeechRecognizer(BaseRecognizer):
         except wave.Error as e:
             raise ValueError(f"Ошибка чтения WAV файла {file_path}: {e}")
         except Exception as e:
-            # Логирование ошибки
-            print(f"Ошибка во время распознавания файла Vosk ({file_path}): {e}")
+            logger.error(f"Ошибка во время распознавания файла Vosk ({file_path}): {e}")
             return {
                 "success": False,
                 "error": f"Ошибка распознавания файла: {e}"
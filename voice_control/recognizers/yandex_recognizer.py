@@ -14,6 +14,7 @@ from speechkit import model_repository, configure_credentials, creds
 from speechkit.stt import AudioProcessingType
 
 from .base_recognizer import BaseRecognizer # Added import for BaseRecognizer
+from voice_control.utils.tracing import get_tracer
 
 # Настройка логирования
 logger = logging.getLogger(__name__)
@@ -198,7 +199,9 @@ class YandexSpeechRecognizer(BaseRecognizer):
 
         temp_wav_file = None
         converted_file = None
+        tracer = get_tracer()
         try:
+            encode_span = tracer.start_span("encode", bytes=len(audio_data))
             fd, temp_wav_file = tempfile.mkstemp(suffix=".wav")
             os.close(fd)
 
@@ -211,6 +214,7 @@ class YandexSpeechRecognizer(BaseRecognizer):
             self.logger.info(f"Создан временный WAV файл: {temp_wav_file}, размер: {os.path.getsize(temp_wav_file)} байт")
 
             converted_file = self._convert_audio_if_needed(temp_wav_file, target_sample_rate=self.sample_rate_hertz)
+            tracer.end_span(encode_span)
             if converted_file != temp_wav_file:
                  self.logger.info(f"Аудио было конвертировано в: {converted_file}, размер: {os.path.getsize(converted_file)} байт")
             else:
@@ -222,9 +226,11 @@ class YandexSpeechRecognizer(BaseRecognizer):
             
             self.logger.info(f"Запуск распознавания файла: {converted_file} с моделью {self.model_name}, язык {self.language}")
             
-            raw_transcriptions: List[Any] = self.recognizer_model.transcribe_file(
-                audio_path=converted_file,
-            )
+            # Запрос к SpeechKit: отправка аудио и ожидание распознавания на сервере
+            with tracer.span("upload", remote_decode=True):
+                raw_transcriptions: List[Any] = self.recognizer_model.transcribe_file(
+                    audio_path=converted_file,
+                )
             
             self.logger.info(f"Распознавание успешно, получено {len(raw_transcriptions) if raw_transcriptions else 0} объектов транскрипции.")
             processed_results = self._process_transcriptions_base(raw_transcriptions)
@@ -7,6 +7,7 @@
 from .credentials_manager import SecureCredentialsManager, CredentialInfo
 from .encryption import EncryptionManager
 from .audit_logger import AuditLogger, SecurityEvent, SecurityEventType, SecurityLevel
+from .audit_store import AuditStore
 
 __all__ = [
     # Credentials Management
@@ -20,7 +21,8 @@ __all__ = [
     'AuditLogger',
     'SecurityEvent',
     'SecurityEventType',
-    'SecurityLevel'
+    'SecurityLevel',
+    'AuditStore'
 ]
 
 __version__ = '1.0.0'
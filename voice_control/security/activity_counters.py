@@ -0,0 +1,144 @@
+"""Sliding-window activity counters.
+
+Счетчики событий в скользящем окне на основе колеса времени (time wheel):
+окно делится на корзины фиксированной ширины, для каждого ключа хранится
+кольцо корзин и текущая сумма. Добавление и чтение выполняются за O(1)
+(амортизированно), независимо от количества событий в окне.
+"""
+
+import threading
+import time
+from typing import Dict, Hashable, List, Optional
+
+
+class _Wheel:
+    """Кольцо корзин одного ключа."""
+
+    __slots__ = ("buckets", "total", "tick")
+
+    def __init__(self, size: int, tick: int):
+        self.buckets: List[int] = [0] * size
+        self.total = 0
+        self.tick = tick
+
+
+class SlidingWindowCounter:
+    """Счетчики событий по ключам в скользящем окне.
+
+    Точность ограничена шириной корзины: события старше window, но попавшие
+    в еще не вытесненную корзину, учитываются до ее вытеснения.
+    """
+
+    def __init__(self, window: float = 300.0, resolution: float = 5.0):
+        """Инициализация счетчиков.
+
+        Args:
+            window: Ширина окна, секунды
+            resolution: Ширина корзины, секунды
+        """
+        if window <= 0 or resolution <= 0:
+            raise ValueError("window and resolution must be positive")
+
+        self._window = window
+        self._resolution = resolution
+        self._size = max(1, int(round(window / resolution)))
+        self._wheels: Dict[Hashable, _Wheel] = {}
+        self._lock = threading.Lock()
+        self._last_sweep_tick = 0
+
+    @property
+    def window(self) -> float:
+        """Ширина окна, секунды."""
+        return self._window
+
+    def add(self, key: Hashable, amount: int = 1, timestamp: Optional[float] = None) -> int:
+        """Учет события и получение количества событий ключа в окне.
+
+        Args:
+            key: Ключ (например, ("event_type", "access_denied"))
+            amount: Количество событий
+            timestamp: Время события (по умолчанию - текущее)
+
+        Returns:
+            Количество событий ключа в окне с учетом добавленного
+        """
+        tick = self._tick(timestamp)
+        with self._lock:
+            wheel = self._wheels.get(key)
+            if wheel is None:
+                wheel = self._wheels[key] = _Wheel(self._size, tick)
+            else:
+                self._advance(wheel, tick)
+            wheel.buckets[tick % self._size] += amount
+            wheel.total += amount
+
+            # Периодическое удаление ключей без событий в окне
+            if tick - self._last_sweep_tick >= self._size:
+                self._sweep(tick)
+            return wheel.total
+
+    def count(self, key: Hashable, timestamp: Optional[float] = None) -> int:
+        """Количество событий ключа в окне.
+
+        Args:
+            key: Ключ
+            timestamp: Момент оценки (по умолчанию - текущий)
+
+        Returns:
+            Количество событий
+        """
+        tick = self._tick(timestamp)
+        with self._lock:
+            wheel = self._wheels.get(key)
+            if wheel is None:
+                return 0
+            self._advance(wheel, tick)
+            return wheel.total
+
+    def rate(self, key: Hashable, timestamp: Optional[float] = None) -> float:
+        """Средняя частота событий ключа в окне, событий в секунду."""
+        return self.count(key, timestamp) / self._window
+
+    def snapshot(self, timestamp: Optional[float] = None) -> Dict[Hashable, int]:
+        """Количество событий в окне по всем ключам."""
+        tick = self._tick(timestamp)
+        with self._lock:
+            result = {}
+            for key, wheel in self._wheels.items():
+                self._advance(wheel, tick)
+                if wheel.total:
+                    result[key] = wheel.total
+            return result
+
+    def clear(self) -> None:
+        """Сброс всех счетчиков."""
+        with self._lock:
+            self._wheels.clear()
+
+    def __len__(self) -> int:
+        return len(self._wheels)
+
+    def _tick(self, timestamp: Optional[float]) -> int:
+        return int((timestamp if timestamp is not None else time.time()) // self._resolution)
+
+    def _advance(self, wheel: _Wheel, tick: int) -> None:
+        """Вытеснение корзин, вышедших за окно (не более размера кольца)."""
+        elapsed = tick - wheel.tick
+        if elapsed <= 0:
+            return
+        if elapsed >= self._size:
+            wheel.buckets = [0] * self._size
+            wheel.total = 0
+        else:
+            buckets = wheel.buckets
+            for step in range(wheel.tick + 1, tick + 1):
+                index = step % self._size
+                wheel.total -= buckets[index]
+                buckets[index] = 0
+        wheel.tick = tick
+
+    def _sweep(self, tick: int) -> None:
+        self._last_sweep_tick = tick
+        stale = [key for key, wheel in self._wheels.items() if tick - wheel.tick >= self._size]
+        for key in stale:
+            del self._wheels[key]
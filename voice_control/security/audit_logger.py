@@ -4,19 +4,23 @@
 с поддержкой различных уровней логирования и форматов.
 """
 
-import os
 import json
 import time
 import threading
-from typing import Dict, Any, List, Optional, Union
+from collections import deque
+from typing import Dict, Any, Deque, List, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from datetime import datetime, timezone
 from enum import Enum
 import hashlib
 import uuid
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 
 from ..utils.logger import PerformanceLogger
+from .activity_counters import SlidingWindowCounter
+from .audit_store import AuditStore
+from .audit_writer import AuditLogWriter
 
 
 class SecurityEventType(Enum):
@@ -79,7 +83,11 @@ class AuditLogger:
                  log_dir: Optional[str] = None,
                  max_log_size: int = 10 * 1024 * 1024,  # 10MB
                  max_log_files: int = 5,
-                 enable_console_output: bool = False):
+                 enable_console_output: bool = False,
+                 flush_interval: float = 0.5,
+                 enable_store: bool = False,
+                 store_path: Optional[str] = None,
+                 retention_days: Optional[float] = None):
         """Инициализация логгера аудита.
         
         Args:
@@ -88,6 +96,10 @@ class AuditLogger:
             max_log_size: Максимальный размер лог-файла
             max_log_files: Максимальное количество лог-файлов
             enable_console_output: Включить вывод в консоль
+            flush_interval: Максимальная задержка записи событий LOW/MEDIUM, секунды
+            enable_store: Сохранять события в индексированное хранилище SQLite
+            store_path: Путь к базе данных (по умолчанию - в директории логов)
+            retention_days: Срок хранения событий в базе данных
         """
         self._component_name = component_name
         self._logger = PerformanceLogger(f"AuditLogger-{component_name}")
@@ -105,15 +117,43 @@ class AuditLogger:
         self._max_log_files = max_log_files
         self._enable_console_output = enable_console_output
         
-        # Текущий лог-файл
-        self._current_log_file = self._get_current_log_file()
+        # Фоновая запись с групповой фиксацией; HIGH/CRITICAL подтверждаются после fsync
+        self._writer = AuditLogWriter(
+            self._log_dir,
+            component_name,
+            max_log_size=max_log_size,
+            max_log_files=max_log_files,
+            flush_interval=flush_interval
+        )
         
         # Блокировка для потокобезопасности
         self._lock = threading.RLock()
         
+        # Индексированное хранилище для выборок за длительные периоды
+        self._store: Optional[AuditStore] = None
+        if enable_store or store_path:
+            self._store = AuditStore(
+                store_path or self._log_dir / f"audit_{component_name}.db",
+                retention_days=retention_days
+            )
+        
+        # Максимальное ожидание fsync для событий HIGH/CRITICAL
+        self._durable_write_timeout = 5.0
+        
         # Кэш событий для анализа
-        self._events_cache: List[SecurityEvent] = []
         self._max_cache_size = 1000
+        self._events_cache: Deque[SecurityEvent] = deque(maxlen=self._max_cache_size)
+        
+        # Счетчики в скользящем окне по типу события, пользователю и источнику
+        # для обнаружения подозрительной активности (O(1) на событие)
+        self._suspicious_window = 300  # секунды
+        self._activity_counters = SlidingWindowCounter(window=self._suspicious_window, resolution=5.0)
+        self._suspicious_thresholds = {
+            "event_type": 10,
+            "user_id": 50,
+            "source_ip": 50
+        }
+        self._last_alerts: Dict[Tuple[str, Any], float] = {}
         
         # Счетчики событий
         self._event_counters: Dict[str, int] = {}
@@ -125,65 +165,21 @@ class AuditLogger:
         self._logger.info(f"AuditLogger initialized for component: {component_name}")
         self._log_system_event("audit_logger_initialized", "Audit logger started", {})
     
-    def _get_current_log_file(self) -> Path:
-        """Получение пути к текущему лог-файлу.
-        
-        Returns:
-            Путь к лог-файлу
-        """
-        timestamp = datetime.now().strftime("%Y%m%d")
-        return self._log_dir / f"audit_{self._component_name}_{timestamp}.log"
-    
-    def _should_rotate_log(self) -> bool:
-        """Проверка необходимости ротации лога.
-        
-        Returns:
-            True если нужна ротация
-        """
-        if not self._current_log_file.exists():
-            return False
-        
-        return self._current_log_file.stat().st_size >= self._max_log_size
-    
-    def _rotate_log(self) -> None:
-        """Ротация лог-файлов."""
-        try:
-            # Получение списка существующих лог-файлов
-            log_pattern = f"audit_{self._component_name}_*.log"
-            existing_logs = sorted(
-                self._log_dir.glob(log_pattern),
-                key=lambda x: x.stat().st_mtime,
-                reverse=True
-            )
-            
-            # Удаление старых логов
-            if len(existing_logs) >= self._max_log_files:
-                for old_log in existing_logs[self._max_log_files-1:]:
-                    try:
-                        old_log.unlink()
-                        self._logger.info(f"Deleted old audit log: {old_log}")
-                    except Exception as e:
-                        self._logger.error(f"Failed to delete old log {old_log}: {e}")
-            
-            # Создание нового лог-файла
-            self._current_log_file = self._get_current_log_file()
-            
-            self._logger.info(f"Log rotated to: {self._current_log_file}")
-            
-        except Exception as e:
-            self._logger.error(f"Log rotation failed: {e}")
+    @property
+    def _current_log_file(self) -> Optional[Path]:
+        """Текущий лог-файл."""
+        return self._writer.current_log_file
     
-    def _write_to_log(self, event: SecurityEvent) -> None:
-        """Запись события в лог-файл.
+    def _write_to_log(self, event: SecurityEvent) -> Optional[Future]:
+        """Постановка события в очередь записи лог-файла.
         
         Args:
             event: Событие для записи
+            
+        Returns:
+            Future подтверждения fsync для HIGH/CRITICAL, иначе None
         """
         try:
-            # Проверка ротации
-            if self._should_rotate_log():
-                self._rotate_log()
-            
             # Формирование записи
             log_entry = {
                 "timestamp": datetime.fromtimestamp(event.timestamp, tz=timezone.utc).isoformat(),
@@ -204,19 +200,18 @@ class AuditLogger:
                 "tags": event.tags or []
             }
             
-            # Запись в файл
-            with open(self._current_log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
-            
-            # Установка безопасных прав доступа
-            os.chmod(self._current_log_file, 0o600)
+            durable = event.security_level in (SecurityLevel.HIGH.value, SecurityLevel.CRITICAL.value)
+            committed = self._writer.write(json.dumps(log_entry, ensure_ascii=False), durable)
             
             # Вывод в консоль если включен
             if self._enable_console_output:
                 print(f"[AUDIT] {event.security_level.upper()}: {event.message}")
             
+            return committed
+            
         except Exception as e:
             self._logger.error(f"Failed to write audit log: {e}")
+            return None
     
     def _generate_event_id(self) -> str:
         """Генерация уникального ID события.
@@ -226,13 +221,18 @@ class AuditLogger:
         """
         return str(uuid.uuid4())
     
-    def _calculate_risk_score(self, event_type: str, security_level: str, details: Dict[str, Any]) -> int:
+    def _calculate_risk_score(self,
+                              event_type: str,
+                              security_level: str,
+                              details: Dict[str, Any],
+                              window_counts: Optional[Dict[str, int]] = None) -> int:
         """Расчет оценки риска события.
         
         Args:
             event_type: Тип события
             security_level: Уровень безопасности
             details: Детали события
+            window_counts: Количество событий в скользящем окне по измерениям
             
         Returns:
             Оценка риска (0-100)
@@ -258,8 +258,36 @@ class AuditLogger:
         if "privilege_escalation" in details:
             risk_score += 25
         
+        # Повышенная частота событий того же типа, пользователя или источника
+        for dimension, count in (window_counts or {}).items():
+            if count > self._suspicious_thresholds.get(dimension, count):
+                risk_score += 15
+        
         return min(risk_score, 100)
     
+    def _count_activity(self,
+                        event_type: str,
+                        user_id: Optional[str],
+                        source_ip: Optional[str],
+                        timestamp: float) -> Dict[str, int]:
+        """Учет события в скользящих окнах.
+        
+        Args:
+            event_type: Тип события
+            user_id: ID пользователя
+            source_ip: IP-адрес источника
+            timestamp: Время события
+            
+        Returns:
+            Количество событий в окне по измерениям (включая текущее)
+        """
+        counts = {"event_type": self._activity_counters.add(("event_type", event_type), timestamp=timestamp)}
+        if user_id is not None:
+            counts["user_id"] = self._activity_counters.add(("user_id", user_id), timestamp=timestamp)
+        if source_ip is not None:
+            counts["source_ip"] = self._activity_counters.add(("source_ip", source_ip), timestamp=timestamp)
+        return counts
+    
     def log_security_event(self, 
                           event_type: Union[str, SecurityEventType],
                           message: str,
@@ -292,6 +320,8 @@ class AuditLogger:
         Returns:
             ID созданного события
         """
+        committed = None
+        alerts: List[Tuple[str, Dict[str, Any]]] = []
         with self._lock:
             # Преобразование enum в строку
             if isinstance(event_type, SecurityEventType):
@@ -307,8 +337,9 @@ class AuditLogger:
             event_id = self._generate_event_id()
             current_time = time.time()
             
-            # Расчет оценки риска
-            risk_score = self._calculate_risk_score(event_type, security_level, details)
+            # Учет в скользящих окнах и расчет оценки риска
+            window_counts = self._count_activity(event_type, user_id, source_ip, current_time)
+            risk_score = self._calculate_risk_score(event_type, security_level, details, window_counts)
             
             event = SecurityEvent(
                 event_id=event_id,
@@ -330,7 +361,14 @@ class AuditLogger:
             )
             
             # Запись в лог
-            self._write_to_log(event)
+            committed = self._write_to_log(event)
+            if self._store is not None:
+                # Ошибка индекса (например, после close()) не должна
+                # прерывать логирование: событие уже поставлено в журнал
+                try:
+                    self._store.add(event)
+                except Exception as e:
+                    self._logger.error(f"Failed to add audit event to store: {e}")
             
             # Добавление в кэш
             self._add_to_cache(event)
@@ -339,9 +377,41 @@ class AuditLogger:
             self._update_counters(event_type, security_level)
             
             # Проверка на подозрительную активность
-            self._check_suspicious_activity(event)
-            
-            return event_id
+            alerts = self._check_suspicious_activity(event, window_counts)
+        
+        # Ожидание fsync вне блокировки, чтобы не задерживать другие потоки
+        if committed is not None:
+            self._wait_committed(event_id, committed)
+        
+        # Сигналы записываются после освобождения блокировки: это HIGH события,
+        # и ожидание их fsync не должно задерживать другие потоки
+        for alert_message, alert_details in alerts:
+            self.log_security_event(
+                SecurityEventType.SUSPICIOUS_ACTIVITY,
+                alert_message,
+                alert_details,
+                SecurityLevel.HIGH
+            )
+        
+        return event_id
+    
+    def _wait_committed(self, event_id: str, committed: Future) -> None:
+        """Ожидание надежной записи события в журнал.
+        
+        Args:
+            event_id: ID события
+            committed: Future подтверждения от писателя журнала
+        """
+        try:
+            committed.result(self._durable_write_timeout)
+        except FutureTimeoutError:
+            self._logger.warning(f"Audit event {event_id} was not committed within "
+                                 f"{self._durable_write_timeout} s")
+        except Exception as e:
+            with self._lock:
+                self._event_counters["durable_write_failures"] = \
+                    self._event_counters.get("durable_write_failures", 0) + 1
+            self._logger.critical(f"Audit event {event_id} was NOT written to the audit log: {e}")
     
     def _should_log_event(self, event_type: str, security_level: str) -> bool:
         """Проверка необходимости логирования события.
@@ -381,11 +451,8 @@ class AuditLogger:
         Args:
             event: Событие для добавления
         """
+        # Размер кэша ограничен maxlen
         self._events_cache.append(event)
-        
-        # Ограничение размера кэша
-        if len(self._events_cache) > self._max_cache_size:
-            self._events_cache = self._events_cache[-self._max_cache_size:]
     
     def _update_counters(self, event_type: str, security_level: str) -> None:
         """Обновление счетчиков событий.
@@ -398,30 +465,65 @@ class AuditLogger:
         self._event_counters[f"level_{security_level}"] = self._event_counters.get(f"level_{security_level}", 0) + 1
         self._event_counters["total"] = self._event_counters.get("total", 0) + 1
     
-    def _check_suspicious_activity(self, event: SecurityEvent) -> None:
+    def _check_suspicious_activity(self,
+                                   event: SecurityEvent,
+                                   window_counts: Optional[Dict[str, int]] = None
+                                   ) -> List[Tuple[str, Dict[str, Any]]]:
         """Проверка на подозрительную активность.
         
+        Сигнал формируется при превышении порога частоты по типу события,
+        пользователю или источнику не чаще одного раза за окно для каждого
+        значения, чтобы всплеск событий не порождал поток предупреждений.
+        
         Args:
             event: Событие для анализа
+            window_counts: Количество событий в окне по измерениям
+            
+        Returns:
+            Сигналы (сообщение, детали) для записи после освобождения блокировки
         """
-        # Анализ частоты событий
-        recent_events = [
-            e for e in self._events_cache
-            if (event.timestamp - e.timestamp) < 300  # Последние 5 минут
-            and e.event_type == event.event_type
-        ]
-        
-        if len(recent_events) > 10:  # Более 10 событий за 5 минут
-            self.log_security_event(
-                SecurityEventType.SUSPICIOUS_ACTIVITY,
-                f"High frequency of {event.event_type} events detected",
-                {
-                    "event_count": len(recent_events),
-                    "time_window": 300,
-                    "original_event_id": event.event_id
-                },
-                SecurityLevel.HIGH
-            )
+        alerts: List[Tuple[str, Dict[str, Any]]] = []
+        
+        # Сигналы о подозрительной активности сами не анализируются
+        if event.event_type == SecurityEventType.SUSPICIOUS_ACTIVITY.value:
+            return alerts
+        
+        if window_counts is None:
+            window_counts = {
+                dimension: self._activity_counters.count((dimension, getattr(event, dimension)), event.timestamp)
+                for dimension in self._suspicious_thresholds
+                if getattr(event, dimension) is not None
+            }
+        
+        for dimension, count in window_counts.items():
+            if count <= self._suspicious_thresholds.get(dimension, count):
+                continue
+            
+            value = getattr(event, dimension)
+            alert_key = (dimension, value)
+            if event.timestamp - self._last_alerts.get(alert_key, float("-inf")) < self._suspicious_window:
+                continue
+            self._last_alerts[alert_key] = event.timestamp
+            if len(self._last_alerts) > 4096:
+                self._last_alerts = {
+                    key: alerted_at for key, alerted_at in self._last_alerts.items()
+                    if event.timestamp - alerted_at < self._suspicious_window
+                }
+            
+            if dimension == "event_type":
+                message = f"High frequency of {event.event_type} events detected"
+            else:
+                message = f"High frequency of events from {dimension} {value} detected"
+            
+            alerts.append((message, {
+                "event_count": count,
+                "time_window": self._suspicious_window,
+                "dimension": dimension,
+                "value": value,
+                "original_event_id": event.event_id
+            }))
+        
+        return alerts
     
     def _log_system_event(self, event_type: str, message: str, details: Dict[str, Any]) -> None:
         """Логирование системного события.
@@ -473,8 +575,17 @@ class AuditLogger:
         Returns:
             Список событий
         """
+        if self._store is not None:
+            self._store.flush()
+            return self._store.query(
+                start_time=time.time() - time_range if time_range else None,
+                event_types=[event_type] if event_type else None,
+                security_levels=[security_level] if security_level else None,
+                limit=count
+            )
+        
         with self._lock:
-            events = self._events_cache.copy()
+            events = list(self._events_cache)
             
             # Применение фильтров
             if time_range:
@@ -530,7 +641,8 @@ class AuditLogger:
                 "top_event_types": dict(top_events),
                 "counters": self._event_counters.copy(),
                 "cache_size": len(self._events_cache),
-                "log_file": str(self._current_log_file)
+                "log_file": str(self._current_log_file),
+                "writer": self._writer.get_statistics()
             }
     
     def export_logs(self, 
@@ -544,11 +656,18 @@ class AuditLogger:
             output_file: Путь к выходному файлу
             start_time: Начальное время (timestamp)
             end_time: Конечное время (timestamp)
-            format_type: Формат экспорта (json, csv)
+            format_type: Формат экспорта (json, csv, jsonl - только с хранилищем)
         """
         try:
+            if self._store is not None:
+                # Потоковая выгрузка из хранилища за весь период
+                self._store.flush()
+                events_count = self._store.export(output_file, format_type, start_time, end_time)
+                self._log_export(output_file, format_type, events_count, start_time, end_time)
+                return
+            
             # Получение событий
-            events = self._events_cache.copy()
+            events = list(self._events_cache)
             
             # Фильтрация по времени
             if start_time:
@@ -571,31 +690,70 @@ class AuditLogger:
             else:
                 raise ValueError(f"Unsupported format: {format_type}")
             
-            # Логирование экспорта
-            self.log_security_event(
-                SecurityEventType.DATA_EXPORT,
-                f"Audit logs exported to {output_file}",
-                {
-                    "output_file": output_file,
-                    "format": format_type,
-                    "events_count": len(events),
-                    "start_time": start_time,
-                    "end_time": end_time
-                },
-                SecurityLevel.MEDIUM
-            )
-            
-            self._logger.info(f"Logs exported to: {output_file}")
+            self._log_export(output_file, format_type, len(events), start_time, end_time)
             
         except Exception as e:
             self._logger.error(f"Log export failed: {e}")
             raise RuntimeError(f"Log export failed: {e}")
     
+    def _log_export(self,
+                    output_file: str,
+                    format_type: str,
+                    events_count: int,
+                    start_time: Optional[float],
+                    end_time: Optional[float]) -> None:
+        """Логирование факта экспорта.
+        
+        Args:
+            output_file: Путь к выходному файлу
+            format_type: Формат экспорта
+            events_count: Количество выгруженных событий
+            start_time: Начальное время
+            end_time: Конечное время
+        """
+        self.log_security_event(
+            SecurityEventType.DATA_EXPORT,
+            f"Audit logs exported to {output_file}",
+            {
+                "output_file": output_file,
+                "format": format_type,
+                "events_count": events_count,
+                "start_time": start_time,
+                "end_time": end_time
+            },
+            SecurityLevel.MEDIUM
+        )
+        
+        self._logger.info(f"Logs exported to: {output_file}")
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Принудительная запись всех событий из очереди на диск.
+        
+        Args:
+            timeout: Максимальное время ожидания
+            
+        Returns:
+            True если все события записаны
+        """
+        return self._writer.flush(timeout)
+    
+    def close(self) -> None:
+        """Запись оставшихся событий и закрытие лог-файла и хранилища."""
+        self._writer.close()
+        if self._store is not None:
+            self._store.close()
+    
+    def get_store(self) -> Optional[AuditStore]:
+        """Индексированное хранилище событий (None, если не включено)."""
+        return self._store
+    
     def clear_cache(self) -> None:
         """Очистка кэша событий."""
         with self._lock:
             self._events_cache.clear()
             self._event_counters.clear()
+            self._activity_counters.clear()
+            self._last_alerts.clear()
         
         self._log_system_event("cache_cleared", "Event cache cleared", {})
         self._logger.info("Event cache cleared")
\ No newline at end of file
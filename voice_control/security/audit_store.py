@@ -0,0 +1,425 @@
+"""SQLite audit store.
+
+Индексированное хранилище событий аудита на SQLite (режим WAL):
+пакетная вставка в фоновом потоке, выборки по диапазону времени, типу,
+уровню и пользователю, удаление устаревших событий и потоковая выгрузка
+без загрузки всего журнала в память.
+"""
+
+import csv
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Маркер остановки фонового потока
+_STOP = object()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    event_type TEXT NOT NULL,
+    security_level TEXT NOT NULL,
+    message TEXT,
+    details TEXT,
+    source_ip TEXT,
+    user_agent TEXT,
+    session_id TEXT,
+    user_id TEXT,
+    component TEXT,
+    action TEXT,
+    resource TEXT,
+    result TEXT,
+    risk_score INTEGER,
+    tags TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_type_time ON events (event_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_level_time ON events (security_level, timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_user_time ON events (user_id, timestamp);
+"""
+
+# Порядок колонок совпадает с полями SecurityEvent
+_COLUMNS = (
+    "event_id", "timestamp", "event_type", "security_level", "message", "details",
+    "source_ip", "user_agent", "session_id", "user_id", "component", "action",
+    "resource", "result", "risk_score", "tags"
+)
+_JSON_COLUMNS = ("details", "tags")
+
+
+class AuditStore:
+    """Хранилище событий аудита на SQLite.
+
+    Вставка выполняется фоновым потоком пакетами через executemany в одной
+    транзакции; чтение идет через отдельные соединения, что в режиме WAL
+    не блокирует запись.
+    """
+
+    def __init__(self,
+                 db_path: Union[str, Path],
+                 batch_size: int = 500,
+                 flush_interval: float = 1.0,
+                 retention_days: Optional[float] = None):
+        """Инициализация хранилища.
+
+        Args:
+            db_path: Путь к файлу базы данных
+            batch_size: Максимальное количество событий в транзакции
+            flush_interval: Максимальная задержка вставки, секунды
+            retention_days: Срок хранения событий (None - бессрочно)
+        """
+        self._db_path = Path(db_path)
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._retention_days = retention_days
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._closed = False
+        self._last_prune = 0.0
+        self._inserted = 0
+
+        connection = self._connect()
+        try:
+            connection.executescript(_SCHEMA)
+        finally:
+            connection.close()
+        try:
+            self._db_path.chmod(0o600)
+        except OSError:
+            pass
+
+        self._thread = threading.Thread(target=self._run, name="AuditStoreWriter", daemon=True)
+        self._thread.start()
+
+    @property
+    def db_path(self) -> Path:
+        """Путь к файлу базы данных."""
+        return self._db_path
+
+    def add(self, event: Any) -> None:
+        """Постановка события в очередь вставки.
+
+        Args:
+            event: SecurityEvent или словарь с полями события
+        """
+        if self._closed:
+            raise RuntimeError("Audit store is closed")
+        # vars() вместо asdict(): глубокое копирование не нужно, строка сериализуется сразу
+        record = event if isinstance(event, dict) else vars(event)
+        self._queue.put(self._to_row(record))
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Ожидание вставки всех событий из очереди.
+
+        Args:
+            timeout: Максимальное время ожидания
+
+        Returns:
+            True если все события вставлены
+        """
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def query(self,
+              start_time: Optional[float] = None,
+              end_time: Optional[float] = None,
+              event_types: Optional[Sequence[str]] = None,
+              security_levels: Optional[Sequence[str]] = None,
+              user_id: Optional[str] = None,
+              limit: Optional[int] = None,
+              newest_first: bool = True) -> List[Dict[str, Any]]:
+        """Выборка событий.
+
+        Args:
+            start_time: Начало диапазона (timestamp, включительно)
+            end_time: Конец диапазона (timestamp, включительно)
+            event_types: Типы событий
+            security_levels: Уровни безопасности
+            user_id: Пользователь
+            limit: Максимальное количество событий
+            newest_first: Сортировка от новых к старым
+
+        Returns:
+            Список событий в формате asdict(SecurityEvent)
+        """
+        return list(self.iter_events(start_time, end_time, event_types, security_levels,
+                                     user_id, limit, newest_first))
+
+    def iter_events(self,
+                    start_time: Optional[float] = None,
+                    end_time: Optional[float] = None,
+                    event_types: Optional[Sequence[str]] = None,
+                    security_levels: Optional[Sequence[str]] = None,
+                    user_id: Optional[str] = None,
+                    limit: Optional[int] = None,
+                    newest_first: bool = False,
+                    fetch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Потоковая выборка событий порциями по fetch_size.
+
+        Args:
+            start_time: Начало диапазона (timestamp, включительно)
+            end_time: Конец диапазона (timestamp, включительно)
+            event_types: Типы событий
+            security_levels: Уровни безопасности
+            user_id: Пользователь
+            limit: Максимальное количество событий
+            newest_first: Сортировка от новых к старым
+            fetch_size: Размер порции чтения
+
+        Yields:
+            События в формате asdict(SecurityEvent)
+        """
+        where, params = self._build_filter(start_time, end_time, event_types, security_levels, user_id)
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM events{where} " \
+              f"ORDER BY timestamp {'DESC' if newest_first else 'ASC'}"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        connection = self._connect()
+        try:
+            cursor = connection.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._from_row(row)
+        finally:
+            connection.close()
+
+    def count(self,
+              start_time: Optional[float] = None,
+              end_time: Optional[float] = None,
+              event_types: Optional[Sequence[str]] = None,
+              security_levels: Optional[Sequence[str]] = None,
+              user_id: Optional[str] = None) -> int:
+        """Количество событий, удовлетворяющих фильтру."""
+        where, params = self._build_filter(start_time, end_time, event_types, security_levels, user_id)
+        connection = self._connect()
+        try:
+            return connection.execute(f"SELECT COUNT(*) FROM events{where}", params).fetchone()[0]
+        finally:
+            connection.close()
+
+    def count_by(self, column: str, start_time: Optional[float] = None) -> Dict[Optional[str], int]:
+        """Количество событий по значениям колонки (event_type, security_level, user_id).
+
+        Args:
+            column: Колонка группировки
+            start_time: Учитывать события не старше этого момента
+
+        Returns:
+            Словарь значение -> количество
+        """
+        if column not in ("event_type", "security_level", "user_id", "component"):
+            raise ValueError(f"Unsupported group column: {column}")
+        where, params = self._build_filter(start_time, None, None, None, None)
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                f"SELECT {column}, COUNT(*) FROM events{where} GROUP BY {column}", params
+            ).fetchall()
+        finally:
+            connection.close()
+        return {value: count for value, count in rows}
+
+    def prune(self, retention_days: Optional[float] = None) -> int:
+        """Удаление событий старше срока хранения.
+
+        Args:
+            retention_days: Срок хранения (по умолчанию - из конструктора)
+
+        Returns:
+            Количество удаленных событий
+        """
+        retention_days = retention_days if retention_days is not None else self._retention_days
+        if retention_days is None:
+            return 0
+        cutoff = time.time() - retention_days * 86400
+        connection = self._connect()
+        try:
+            with connection:
+                deleted = connection.execute("DELETE FROM events WHERE timestamp < ?", (cutoff,)).rowcount
+        finally:
+            connection.close()
+        if deleted:
+            logger.info(f"Pruned {deleted} audit events older than {retention_days} days")
+        return deleted
+
+    def export(self,
+               output_file: Union[str, Path],
+               format_type: str = "json",
+               start_time: Optional[float] = None,
+               end_time: Optional[float] = None,
+               event_types: Optional[Sequence[str]] = None,
+               security_levels: Optional[Sequence[str]] = None) -> int:
+        """Потоковая выгрузка событий в файл.
+
+        Args:
+            output_file: Путь к выходному файлу
+            format_type: Формат (json, jsonl, csv)
+            start_time: Начало диапазона
+            end_time: Конец диапазона
+            event_types: Типы событий
+            security_levels: Уровни безопасности
+
+        Returns:
+            Количество выгруженных событий
+        """
+        if format_type not in ("json", "jsonl", "csv"):
+            raise ValueError(f"Unsupported format: {format_type}")
+
+        events = self.iter_events(start_time, end_time, event_types, security_levels)
+        exported = 0
+        with open(output_file, "w", newline="" if format_type == "csv" else None, encoding="utf-8") as f:
+            if format_type == "csv":
+                writer = csv.DictWriter(f, fieldnames=_COLUMNS)
+                writer.writeheader()
+                for event in events:
+                    writer.writerow(event)
+                    exported += 1
+            elif format_type == "jsonl":
+                for event in events:
+                    f.write(json.dumps(event, ensure_ascii=False) + "\n")
+                    exported += 1
+            else:
+                # JSON-массив пишется по одному событию, без сборки списка в памяти
+                f.write("[")
+                for event in events:
+                    f.write(",\n  " if exported else "\n  ")
+                    f.write(json.dumps(event, ensure_ascii=False))
+                    exported += 1
+                f.write("\n]\n" if exported else "]\n")
+        return exported
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Статистика хранилища."""
+        return {
+            "db_path": str(self._db_path),
+            "inserted": self._inserted,
+            "pending": self._queue.qsize(),
+            "retention_days": self._retention_days
+        }
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Вставка оставшихся событий и остановка фонового потока."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(str(self._db_path), timeout=10.0)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _run(self) -> None:
+        """Цикл фонового потока: пакетная вставка и периодическая очистка."""
+        connection = self._connect()
+        stopping = False
+        try:
+            while not stopping:
+                try:
+                    item = self._queue.get(timeout=self._flush_interval)
+                except queue.Empty:
+                    self._maybe_prune()
+                    continue
+
+                rows: List[Tuple] = []
+                waiters: List[threading.Event] = []
+                while True:
+                    if item is _STOP:
+                        stopping = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        rows.append(item)
+                    if stopping or len(rows) >= self._batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+
+                if rows:
+                    try:
+                        with connection:
+                            connection.executemany(
+                                f"INSERT OR IGNORE INTO events ({', '.join(_COLUMNS)}) "
+                                f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                                rows
+                            )
+                        self._inserted += len(rows)
+                    except sqlite3.Error as e:
+                        logger.error(f"Failed to insert {len(rows)} audit events: {e}")
+                for done in waiters:
+                    done.set()
+                self._maybe_prune()
+        finally:
+            connection.close()
+
+    def _maybe_prune(self) -> None:
+        """Очистка устаревших событий не чаще раза в час."""
+        if self._retention_days is None or time.monotonic() - self._last_prune < 3600:
+            return
+        self._last_prune = time.monotonic()
+        try:
+            self.prune()
+        except sqlite3.Error as e:
+            logger.error(f"Audit store pruning failed: {e}")
+
+    @staticmethod
+    def _build_filter(start_time: Optional[float],
+                      end_time: Optional[float],
+                      event_types: Optional[Sequence[str]],
+                      security_levels: Optional[Sequence[str]],
+                      user_id: Optional[str]) -> Tuple[str, List[Any]]:
+        """Построение условия WHERE."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if start_time is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start_time)
+        if end_time is not None:
+            clauses.append("timestamp <= ?")
+            params.append(end_time)
+        if event_types:
+            clauses.append(f"event_type IN ({', '.join('?' * len(event_types))})")
+            params.extend(event_types)
+        if security_levels:
+            clauses.append(f"security_level IN ({', '.join('?' * len(security_levels))})")
+            params.extend(security_levels)
+        if user_id is not None:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    @staticmethod
+    def _to_row(record: Dict[str, Any]) -> Tuple:
+        return tuple(
+            json.dumps(record.get(column), ensure_ascii=False, default=str)
+            if column in _JSON_COLUMNS else record.get(column)
+            for column in _COLUMNS
+        )
+
+    @staticmethod
+    def _from_row(row: Sequence[Any]) -> Dict[str, Any]:
+        record = dict(zip(_COLUMNS, row))
+        for column in _JSON_COLUMNS:
+            if record[column] is not None:
+                record[column] = json.loads(record[column])
+        return record
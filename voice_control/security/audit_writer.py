@@ -0,0 +1,297 @@
+"""Buffered audit log writer.
+
+Буферизованная запись журнала аудита: файл держится открытым, события
+записываются фоновым потоком пакетами (group commit) - по размеру пакета,
+по таймеру или немедленно для важных событий. Размер файла для ротации
+отслеживается в памяти, а события, требующие надежности (HIGH/CRITICAL),
+подтверждаются только после fsync.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Маркер остановки фонового потока
+_STOP = object()
+
+
+class AuditLogWriter:
+    """Фоновый писатель журнала аудита с групповой фиксацией.
+
+    Записи ставятся в очередь вызовом write(); фоновый поток собирает их
+    в пакеты и записывает одним вызовом write() + flush(). Если в пакете
+    есть запись, требующая надежности, перед подтверждением выполняется
+    один общий fsync для всего пакета.
+    """
+
+    def __init__(self,
+                 log_dir: Path,
+                 component_name: str,
+                 max_log_size: int = 10 * 1024 * 1024,
+                 max_log_files: int = 5,
+                 flush_interval: float = 0.5,
+                 max_batch_size: int = 256):
+        """Инициализация писателя.
+
+        Args:
+            log_dir: Директория журналов
+            component_name: Название компонента (часть имени файла)
+            max_log_size: Максимальный размер файла журнала
+            max_log_files: Максимальное количество файлов журнала
+            flush_interval: Максимальная задержка записи обычных событий, секунды
+            max_batch_size: Максимальное количество записей в пакете
+        """
+        self._log_dir = Path(log_dir)
+        self._component_name = component_name
+        self._max_log_size = max_log_size
+        self._max_log_files = max_log_files
+        self._flush_interval = flush_interval
+        self._max_batch_size = max_batch_size
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._file = None
+        self._current_log_file: Optional[Path] = None
+        self._current_day = ""
+        self._current_size = 0
+        self._closed = False
+
+        self._statistics = {
+            "events_written": 0,
+            "batches": 0,
+            "fsyncs": 0,
+            "bytes_written": 0,
+            "rotations": 0,
+            "write_errors": 0
+        }
+
+        self._log_dir.mkdir(parents=True, exist_ok=True)
+        self._open_log_file()
+
+        self._thread = threading.Thread(target=self._run,
+                                        name=f"AuditWriter-{component_name}",
+                                        daemon=True)
+        self._thread.start()
+        _active_writers.add(self)
+
+    @property
+    def current_log_file(self) -> Optional[Path]:
+        """Текущий файл журнала."""
+        return self._current_log_file
+
+    def write(self, line: str, durable: bool = False) -> Optional[Future]:
+        """Постановка записи в очередь.
+
+        Args:
+            line: Строка журнала (без перевода строки)
+            durable: Требуется ли fsync перед подтверждением
+
+        Returns:
+            Future, завершаемый после fsync или с исключением при ошибке
+            записи (только для durable), иначе None
+        """
+        if self._closed:
+            raise RuntimeError("Audit log writer is closed")
+
+        done = Future() if durable else None
+        self._queue.put((line + "\n", done))
+        return done
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Ожидание записи всех поставленных в очередь событий с fsync.
+
+        Args:
+            timeout: Максимальное время ожидания
+
+        Returns:
+            True если все события записаны, False при ошибке записи
+            или истечении времени ожидания
+        """
+        if self._closed:
+            return True
+        done = Future()
+        self._queue.put((None, done))
+        try:
+            return done.result(timeout)
+        except Exception:
+            return False
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Запись оставшихся событий и закрытие файла."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        _active_writers.discard(self)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Статистика записи.
+
+        Returns:
+            Счетчики записанных событий, пакетов, fsync и ротаций
+        """
+        stats = dict(self._statistics)
+        stats["pending"] = self._queue.qsize()
+        stats["current_size"] = self._current_size
+        stats["log_file"] = str(self._current_log_file)
+        return stats
+
+    def _run(self) -> None:
+        """Цикл фонового потока: сбор пакета и групповая запись."""
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                continue
+
+            batch: List[Tuple[Optional[str], Optional[Future]]] = []
+            deadline = time.monotonic() + self._flush_interval
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                # Событие, ожидающее подтверждения, фиксирует пакет сразу
+                if item[1] is not None or len(batch) >= self._max_batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            # Дозабираем уже накопившиеся записи без ожидания
+            while not stopping and len(batch) < self._max_batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            if batch:
+                self._commit(batch)
+
+        self._close_file()
+
+    def _commit(self, batch: List[Tuple[Optional[str], Optional[Future]]]) -> None:
+        """Запись пакета в файл.
+
+        Args:
+            batch: Пары (строка или None для flush, Future подтверждения)
+        """
+        lines = [line for line, _ in batch if line is not None]
+        waiters = [done for _, done in batch if done is not None]
+
+        try:
+            if lines:
+                if self._should_rotate():
+                    self._rotate()
+                data = "".join(lines).encode("utf-8")
+                self._file.write(data)
+                self._file.flush()
+                self._current_size += len(data)
+                self._statistics["events_written"] += len(lines)
+                self._statistics["bytes_written"] += len(data)
+                self._statistics["batches"] += 1
+            if waiters:
+                os.fsync(self._file.fileno())
+                self._statistics["fsyncs"] += 1
+        except Exception as e:
+            self._statistics["write_errors"] += 1
+            logger.error(f"Failed to write audit log batch: {e}")
+            # Ожидающие подтверждения узнают, что события не записаны
+            for done in waiters:
+                done.set_exception(e)
+        else:
+            for done in waiters:
+                done.set_result(True)
+
+    def _log_file_for_today(self) -> Path:
+        """Путь к файлу журнала текущего дня (с номером части после ротации)."""
+        day = datetime.now().strftime("%Y%m%d")
+        base_name = f"audit_{self._component_name}_{day}"
+        last_part = 0
+        for existing in self._log_dir.glob(f"{base_name}_*.log"):
+            suffix = existing.stem[len(base_name) + 1:]
+            if suffix.isdigit():
+                last_part = max(last_part, int(suffix))
+
+        path = self._log_dir / (f"{base_name}_{last_part}.log" if last_part else f"{base_name}.log")
+        if path.exists() and path.stat().st_size >= self._max_log_size:
+            path = self._log_dir / f"{base_name}_{last_part + 1}.log"
+        return path
+
+    def _open_log_file(self) -> None:
+        """Открытие текущего файла журнала на дозапись."""
+        self._current_log_file = self._log_file_for_today()
+        self._current_day = datetime.now().strftime("%Y%m%d")
+        self._file = open(self._current_log_file, "ab")
+        os.chmod(self._current_log_file, 0o600)
+        self._current_size = self._file.tell()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+            except OSError as e:
+                logger.error(f"Failed to close audit log: {e}")
+            self._file = None
+
+    def _should_rotate(self) -> bool:
+        """Ротация по размеру (отслеживается в памяти) или при смене дня."""
+        if self._current_size >= self._max_log_size:
+            return True
+        return datetime.now().strftime("%Y%m%d") != self._current_day
+
+    def _rotate(self) -> None:
+        """Закрытие текущего файла, удаление старых журналов и открытие нового."""
+        self._close_file()
+        try:
+            existing_logs = sorted(
+                self._log_dir.glob(f"audit_{self._component_name}_*.log"),
+                key=lambda x: x.stat().st_mtime,
+                reverse=True
+            )
+            if len(existing_logs) >= self._max_log_files:
+                for old_log in existing_logs[self._max_log_files - 1:]:
+                    try:
+                        old_log.unlink()
+                        logger.info(f"Deleted old audit log: {old_log}")
+                    except OSError as e:
+                        logger.error(f"Failed to delete old log {old_log}: {e}")
+        except OSError as e:
+            logger.error(f"Log rotation failed: {e}")
+
+        self._open_log_file()
+        self._statistics["rotations"] += 1
+        logger.info(f"Log rotated to: {self._current_log_file}")
+
+
+# Активные писатели закрываются при завершении процесса
+_active_writers: "weakref.WeakSet[AuditLogWriter]" = weakref.WeakSet()
+
+
+def _close_active_writers() -> None:
+    for writer in list(_active_writers):
+        writer.close()
+
+
+atexit.register(_close_active_writers)
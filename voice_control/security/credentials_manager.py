@@ -8,6 +8,10 @@ import os
 import json
 import base64
 import hashlib
+import asyncio
+import atexit
+from copy import deepcopy
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from pathlib import Path
@@ -40,12 +44,21 @@ class SecureCredentialsManager:
     
     def __init__(self, 
                  credentials_dir: Optional[str] = None,
-                 master_key: Optional[str] = None):
+                 master_key: Optional[str] = None,
+                 use_vault: bool = False,
+                 prefetch: bool = True,
+                 metadata_flush_delay: float = 5.0):
         """Инициализация менеджера учетных данных.
         
+        Вывод ключа шифрования и чтение учетных данных выполняются в фоновом
+        пуле потоков, поэтому конструктор не блокируется на PBKDF2 и диске.
+        
         Args:
             credentials_dir: Директория для хранения учетных данных
             master_key: Мастер-ключ для шифрования
+            use_vault: Хранить все учетные данные в одном зашифрованном файле
+            prefetch: Расшифровать учетные данные заранее при запуске
+            metadata_flush_delay: Задержка отложенной записи сведений о доступе, секунды
         """
         self._logger = PerformanceLogger("SecureCredentialsManager")
         self._audit_logger = AuditLogger("credentials_access")
@@ -58,23 +71,219 @@ class SecureCredentialsManager:
         
         self._credentials_dir.mkdir(parents=True, exist_ok=True)
         
-        # Инициализация шифрования
-        self._encryption_manager = EncryptionManager(master_key)
+        # Вся работа с файлами и шифрованием выполняется в этом пуле
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="Credentials")
+        
+        # Инициализация шифрования (PBKDF2) в фоне
+        self._encryption_future: Future = self._executor.submit(EncryptionManager, master_key)
         
         # Кэш учетных данных
         self._credentials_cache: Dict[str, Any] = {}
         self._credentials_info: Dict[str, CredentialInfo] = {}
         self._cache_lock = threading.RLock()
         
+        # Единый зашифрованный файл: service -> учетные данные
+        self._use_vault = use_vault
+        self._vault: Dict[str, Dict[str, Any]] = {}
+        # Хранилище расшифровано (или создано) и может быть перезаписано
+        self._vault_loaded = False
+        self._save_lock = threading.Lock()
+        # Шифрование и запись под текущим ключом не пересекаются с ротацией:
+        # иначе отложенная запись старым ключом перезапишет перешифрованные данные
+        self._key_lock = threading.RLock()
+        
+        # Отложенная запись сведений о доступе (last_accessed, access_count)
+        self._metadata_flush_delay = metadata_flush_delay
+        self._metadata_dirty = False
+        self._metadata_timer: Optional[threading.Timer] = None
+        self._closed = False
+        
         # Настройки безопасности
         self._max_cache_age = 3600  # 1 час
         self._max_access_attempts = 5
         self._access_attempts: Dict[str, int] = {}
         
         # Загрузка существующих учетных данных
-        self._load_credentials_info()
+        if not use_vault:
+            self._load_credentials_info()
+        self._load_future: Future = self._executor.submit(self._load_store, prefetch)
+        
+        atexit.register(self.close)
+        
+        self._logger.info(f"SecureCredentialsManager initialized with dir: {self._credentials_dir}"
+                          f"{' (vault)' if use_vault else ''}")
+    
+    @property
+    def _encryption_manager(self) -> EncryptionManager:
+        """Менеджер шифрования (ожидает завершения вывода ключа)."""
+        return self._encryption_future.result()
+    
+    @_encryption_manager.setter
+    def _encryption_manager(self, manager: EncryptionManager) -> None:
+        future: Future = Future()
+        future.set_result(manager)
+        self._encryption_future = future
+    
+    def _get_vault_file_path(self) -> Path:
+        """Получение пути к единому файлу учетных данных.
+        
+        Returns:
+            Путь к файлу хранилища
+        """
+        return self._credentials_dir / "credentials.vault"
+    
+    def _load_store(self, prefetch: bool) -> None:
+        """Загрузка хранилища и предварительная расшифровка (в пуле потоков).
+        
+        Ошибка загрузки хранилища остается в _load_future, и все операции
+        с учетными данными завершаются с ней, а не работают с пустым хранилищем.
+        
+        Args:
+            prefetch: Расшифровать учетные данные всех сервисов в кэш
+        """
+        if self._use_vault:
+            try:
+                self._load_vault()
+            except Exception as e:
+                self._logger.error(f"Failed to load credentials vault: {e}")
+                raise
+            return
+        
+        if prefetch:
+            for service_name in list(self._credentials_info):
+                credentials_file = self._get_credentials_file_path(service_name)
+                if not credentials_file.exists():
+                    continue
+                # Файлы сервисов независимы: ошибка одного не мешает остальным
+                try:
+                    self._cache_credentials(service_name, self._read_credentials_file(credentials_file),
+                                            prefetched=True)
+                except Exception as e:
+                    self._logger.error(f"Failed to prefetch credentials for {service_name}: {e}")
+    
+    def _load_vault(self) -> None:
+        """Расшифровка единого файла хранилища в память.
+        
+        Если файла еще нет, в него переносятся учетные данные из отдельных файлов.
+        """
+        vault_file = self._get_vault_file_path()
+        if not vault_file.exists():
+            self._load_credentials_info()
+            migrated = {}
+            for service_name in list(self._credentials_info):
+                credentials_file = self._get_credentials_file_path(service_name)
+                if credentials_file.exists():
+                    migrated[service_name] = self._read_credentials_file(credentials_file)
+            with self._cache_lock:
+                self._vault = migrated
+                self._vault_loaded = True
+                for service_name, credentials in migrated.items():
+                    self._cache_credentials(service_name, credentials, prefetched=True)
+            if migrated:
+                self._save_vault()
+                # Отдельные файлы больше не нужны и не будут перешифрованы при ротации ключа
+                for service_name in migrated:
+                    self._get_credentials_file_path(service_name).unlink()
+                self._get_info_file_path().unlink()
+                self._logger.info(f"Migrated {len(migrated)} credential sets to vault")
+            return
+        
+        with open(vault_file, 'rb') as f:
+            vault_data = self._encryption_manager.decrypt_json(f.read())
+        
+        with self._cache_lock:
+            self._vault = {}
+            for service_name, entry in vault_data.get("services", {}).items():
+                self._vault[service_name] = entry["credentials"]
+                self._credentials_info[service_name] = self._info_from_dict(entry["info"])
+                self._cache_credentials(service_name, entry["credentials"], prefetched=True)
+            self._vault_loaded = True
+        
+        self._logger.info(f"Loaded vault with {len(self._vault)} credential sets")
+    
+    def _save_vault(self, encryption_manager: Optional[EncryptionManager] = None) -> None:
+        """Атомарная запись единого файла хранилища.
+        
+        Args:
+            encryption_manager: Менеджер шифрования (по умолчанию - текущий)
+            
+        Raises:
+            RuntimeError: Если хранилище не было загружено; файл, который не
+                удалось расшифровать, никогда не перезаписывается
+        """
+        with self._cache_lock:
+            if not self._vault_loaded:
+                raise RuntimeError("Credentials vault was not loaded, refusing to overwrite it")
+            vault_data = {
+                "version": 1,
+                "services": {
+                    service_name: {
+                        "credentials": credentials,
+                        "info": self._info_to_dict(self._credentials_info[service_name])
+                    }
+                    for service_name, credentials in self._vault.items()
+                    if service_name in self._credentials_info
+                }
+            }
         
-        self._logger.info(f"SecureCredentialsManager initialized with dir: {self._credentials_dir}")
+        with self._key_lock:
+            encrypted_data = (encryption_manager or self._encryption_manager).encrypt_json(vault_data)
+            self._write_private_file(self._get_vault_file_path(), encrypted_data)
+    
+    def _write_private_file(self, path: Path, data: bytes) -> None:
+        """Атомарная запись файла с правами 0600.
+        
+        Args:
+            path: Путь к файлу
+            data: Содержимое
+        """
+        temp_path = path.with_name(path.name + ".tmp")
+        with self._save_lock:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+    
+    def _read_credentials_file(self, credentials_file: Path) -> Dict[str, Any]:
+        """Чтение и расшифровка файла учетных данных одного сервиса.
+        
+        Args:
+            credentials_file: Путь к файлу
+            
+        Returns:
+            Учетные данные
+        """
+        with self._key_lock:
+            with open(credentials_file, 'rb') as f:
+                encrypted_data = f.read()
+            return json.loads(self._encryption_manager.decrypt(encrypted_data))
+    
+    def _cache_credentials(self, service_name: str, credentials: Dict[str, Any], prefetched: bool = False) -> None:
+        """Помещение учетных данных в кэш.
+        
+        Args:
+            service_name: Название сервиса
+            credentials: Учетные данные
+            prefetched: Загружены заранее (первое обращение еще не зафиксировано в аудите)
+        """
+        with self._cache_lock:
+            self._credentials_cache[service_name] = {
+                'data': credentials,
+                'timestamp': time.time(),
+                'audit_pending': prefetched
+            }
+    
+    async def _run_io(self, func, *args):
+        """Выполнение файловой или криптографической операции в пуле потоков."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+    
+    def _wait_loaded(self) -> None:
+        """Ожидание загрузки хранилища (для синхронных методов).
+        
+        Raises:
+            Exception: Ошибка загрузки хранилища
+        """
+        self._load_future.result()
     
     def _get_credentials_file_path(self, service_name: str) -> Path:
         """Получение пути к файлу учетных данных.
@@ -107,15 +316,7 @@ class SecureCredentialsManager:
                     info_data = json.load(f)
                 
                 for service_name, info_dict in info_data.items():
-                    self._credentials_info[service_name] = CredentialInfo(
-                        service_name=info_dict['service_name'],
-                        credential_type=info_dict['credential_type'],
-                        created_at=info_dict['created_at'],
-                        last_accessed=info_dict['last_accessed'],
-                        access_count=info_dict.get('access_count', 0),
-                        expires_at=info_dict.get('expires_at'),
-                        metadata=info_dict.get('metadata', {})
-                    )
+                    self._credentials_info[service_name] = self._info_from_dict(info_dict)
                 
                 self._logger.info(f"Loaded info for {len(self._credentials_info)} credential sets")
                 
@@ -123,28 +324,50 @@ class SecureCredentialsManager:
                 self._logger.error(f"Failed to load credentials info: {e}")
                 self._credentials_info = {}
     
+    @staticmethod
+    def _info_from_dict(info_dict: Dict[str, Any]) -> CredentialInfo:
+        """Создание CredentialInfo из сохраненного словаря."""
+        return CredentialInfo(
+            service_name=info_dict['service_name'],
+            credential_type=info_dict['credential_type'],
+            created_at=info_dict['created_at'],
+            last_accessed=info_dict['last_accessed'],
+            access_count=info_dict.get('access_count', 0),
+            expires_at=info_dict.get('expires_at'),
+            metadata=info_dict.get('metadata', {})
+        )
+    
+    @staticmethod
+    def _info_to_dict(info: CredentialInfo) -> Dict[str, Any]:
+        """Преобразование CredentialInfo в словарь для сохранения."""
+        return {
+            'service_name': info.service_name,
+            'credential_type': info.credential_type,
+            'created_at': info.created_at,
+            'last_accessed': info.last_accessed,
+            'access_count': info.access_count,
+            'expires_at': info.expires_at,
+            'metadata': info.metadata or {}
+        }
+    
     def _save_credentials_info(self) -> None:
         """Сохранение информации об учетных данных."""
-        info_file = self._get_info_file_path()
-        
         try:
-            info_data = {}
-            for service_name, info in self._credentials_info.items():
-                info_data[service_name] = {
-                    'service_name': info.service_name,
-                    'credential_type': info.credential_type,
-                    'created_at': info.created_at,
-                    'last_accessed': info.last_accessed,
-                    'access_count': info.access_count,
-                    'expires_at': info.expires_at,
-                    'metadata': info.metadata or {}
-                }
+            with self._cache_lock:
+                self._metadata_dirty = False
             
-            with open(info_file, 'w', encoding='utf-8') as f:
-                json.dump(info_data, f, indent=2)
+            if self._use_vault:
+                self._save_vault()
+                return
             
-            # Установка безопасных прав доступа
-            os.chmod(info_file, 0o600)
+            with self._cache_lock:
+                info_data = {
+                    service_name: self._info_to_dict(info)
+                    for service_name, info in self._credentials_info.items()
+                }
+            
+            self._write_private_file(self._get_info_file_path(),
+                                     json.dumps(info_data, indent=2).encode('utf-8'))
             
         except Exception as e:
             self._logger.error(f"Failed to save credentials info: {e}")
@@ -193,6 +416,8 @@ class SecureCredentialsManager:
                               metadata: Optional[Dict[str, Any]] = None) -> None:
         """Сохранение учетных данных.
         
+        Шифрование и запись файла выполняются в пуле потоков.
+        
         Args:
             service_name: Название сервиса
             credentials: Учетные данные
@@ -208,21 +433,11 @@ class SecureCredentialsManager:
             raise ValueError("Service name and credentials are required")
         
         try:
-            # Шифрование учетных данных
-            credentials_json = json.dumps(credentials)
-            encrypted_data = self._encryption_manager.encrypt(credentials_json)
-            
-            # Сохранение в файл
-            credentials_file = self._get_credentials_file_path(service_name)
-            with open(credentials_file, 'wb') as f:
-                f.write(encrypted_data)
-            
-            # Установка безопасных прав доступа
-            os.chmod(credentials_file, 0o600)
+            await asyncio.wrap_future(self._load_future)
             
             # Обновление информации
             current_time = time.time()
-            self._credentials_info[service_name] = CredentialInfo(
+            info = CredentialInfo(
                 service_name=service_name,
                 credential_type=credential_type,
                 created_at=current_time,
@@ -231,12 +446,7 @@ class SecureCredentialsManager:
                 metadata=metadata or {}
             )
             
-            self._save_credentials_info()
-            
-            # Очистка кэша
-            with self._cache_lock:
-                if service_name in self._credentials_cache:
-                    del self._credentials_cache[service_name]
+            await self._run_io(self._write_credentials, service_name, dict(credentials), info)
             
             # Сброс попыток доступа
             self._reset_access_attempts(service_name)
@@ -253,9 +463,60 @@ class SecureCredentialsManager:
             self._logger.error(f"Failed to store credentials for {service_name}: {e}")
             raise RuntimeError(f"Failed to store credentials: {e}")
     
+    def _write_credentials(self, service_name: str, credentials: Dict[str, Any], info: CredentialInfo) -> None:
+        """Шифрование и запись учетных данных сервиса (в пуле потоков).
+        
+        Args:
+            service_name: Название сервиса
+            credentials: Учетные данные
+            info: Информация об учетных данных
+        """
+        if self._use_vault:
+            with self._cache_lock:
+                self._vault[service_name] = credentials
+                self._credentials_info[service_name] = info
+                self._credentials_cache.pop(service_name, None)
+                self._metadata_dirty = False
+            self._save_vault()
+            return
+        
+        # Шифрование учетных данных и сохранение в файл с правами 0600
+        with self._key_lock:
+            encrypted_data = self._encryption_manager.encrypt(json.dumps(credentials))
+            self._write_private_file(self._get_credentials_file_path(service_name), encrypted_data)
+        
+        with self._cache_lock:
+            self._credentials_info[service_name] = info
+            self._credentials_cache.pop(service_name, None)
+        
+        self._save_credentials_info()
+    
+    def _load_credentials(self, service_name: str) -> Dict[str, Any]:
+        """Чтение учетных данных сервиса из хранилища (в пуле потоков).
+        
+        Args:
+            service_name: Название сервиса
+            
+        Returns:
+            Учетные данные (копия: изменения не попадают в хранилище)
+        """
+        if self._use_vault:
+            with self._cache_lock:
+                if service_name not in self._vault:
+                    raise RuntimeError(f"Credentials not found for service: {service_name}")
+                return deepcopy(self._vault[service_name])
+        
+        credentials_file = self._get_credentials_file_path(service_name)
+        if not credentials_file.exists():
+            raise RuntimeError(f"Credentials not found for service: {service_name}")
+        return self._read_credentials_file(credentials_file)
+    
     async def get_credentials(self, service_name: str) -> Dict[str, Any]:
         """Получение учетных данных.
         
+        Чтение и расшифровка выполняются в пуле потоков, поэтому несколько
+        сервисов могут инициализироваться параллельно.
+        
         Args:
             service_name: Название сервиса
             
@@ -274,57 +535,52 @@ class SecureCredentialsManager:
             raise RuntimeError(f"Access denied for service: {service_name}")
         
         try:
+            await asyncio.wrap_future(self._load_future)
+            
+            # Проверка срока действия
+            info = self._credentials_info.get(service_name)
+            if info and info.expires_at and time.time() > info.expires_at:
+                self._increment_access_attempts(service_name)
+                raise RuntimeError(f"Credentials expired for service: {service_name}")
+            
             # Проверка кэша
+            audit_pending = True
             with self._cache_lock:
-                if service_name in self._credentials_cache:
-                    cache_entry = self._credentials_cache[service_name]
+                cache_entry = self._credentials_cache.get(service_name)
+                if cache_entry is not None:
                     if (time.time() - cache_entry['timestamp']) < self._max_cache_age:
-                        self._update_access_info(service_name)
-                        return cache_entry['data']
+                        audit_pending = cache_entry['audit_pending']
+                        cache_entry['audit_pending'] = False
+                        credentials = cache_entry['data']
                     else:
                         # Удаление устаревшего кэша
                         del self._credentials_cache[service_name]
+                        cache_entry = None
             
-            # Проверка существования файла
-            credentials_file = self._get_credentials_file_path(service_name)
-            if not credentials_file.exists():
-                self._increment_access_attempts(service_name)
-                raise RuntimeError(f"Credentials not found for service: {service_name}")
-            
-            # Проверка срока действия
-            if service_name in self._credentials_info:
-                info = self._credentials_info[service_name]
-                if info.expires_at and time.time() > info.expires_at:
+            if cache_entry is None:
+                # Загрузка и расшифровка
+                try:
+                    credentials = await self._run_io(self._load_credentials, service_name)
+                except RuntimeError:
                     self._increment_access_attempts(service_name)
-                    raise RuntimeError(f"Credentials expired for service: {service_name}")
-            
-            # Загрузка и расшифровка
-            with open(credentials_file, 'rb') as f:
-                encrypted_data = f.read()
-            
-            decrypted_data = self._encryption_manager.decrypt(encrypted_data)
-            credentials = json.loads(decrypted_data)
-            
-            # Кэширование
-            with self._cache_lock:
-                self._credentials_cache[service_name] = {
-                    'data': credentials,
-                    'timestamp': time.time()
-                }
+                    raise
+                self._cache_credentials(service_name, credentials)
             
             # Обновление информации о доступе
             self._update_access_info(service_name)
             
-            # Сброс попыток доступа
-            self._reset_access_attempts(service_name)
-            
-            self._audit_logger.log_security_event(
-                "credentials_accessed",
-                f"Credentials accessed for service: {service_name}",
-                {"service": service_name}
-            )
+            if audit_pending:
+                # Сброс попыток доступа
+                self._reset_access_attempts(service_name)
+                
+                self._audit_logger.log_security_event(
+                    "credentials_accessed",
+                    f"Credentials accessed for service: {service_name}",
+                    {"service": service_name}
+                )
             
-            return credentials
+            # Копия: кэш разделяет данные с хранилищем
+            return deepcopy(credentials)
             
         except json.JSONDecodeError as e:
             self._increment_access_attempts(service_name)
@@ -338,14 +594,55 @@ class SecureCredentialsManager:
     def _update_access_info(self, service_name: str) -> None:
         """Обновление информации о доступе.
         
+        Сведения записываются отложенно: не чаще одного раза за
+        metadata_flush_delay секунд, а также при close().
+        
         Args:
             service_name: Название сервиса
         """
-        if service_name in self._credentials_info:
-            info = self._credentials_info[service_name]
+        with self._cache_lock:
+            info = self._credentials_info.get(service_name)
+            if info is None:
+                return
             info.last_accessed = time.time()
             info.access_count += 1
-            self._save_credentials_info()
+            self._metadata_dirty = True
+            
+            if self._metadata_timer is None and not self._closed:
+                self._metadata_timer = threading.Timer(self._metadata_flush_delay, self._flush_metadata)
+                self._metadata_timer.daemon = True
+                self._metadata_timer.start()
+    
+    def _flush_metadata(self) -> None:
+        """Запись накопленных сведений о доступе."""
+        with self._cache_lock:
+            self._metadata_timer = None
+            if not self._metadata_dirty:
+                return
+        self._save_credentials_info()
+    
+    def flush(self) -> None:
+        """Немедленная запись отложенных сведений о доступе."""
+        with self._cache_lock:
+            timer, self._metadata_timer = self._metadata_timer, None
+        if timer is not None:
+            timer.cancel()
+        self._flush_metadata()
+    
+    def close(self) -> None:
+        """Запись отложенных данных и остановка пула потоков."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._wait_loaded()
+        except Exception as e:
+            self._logger.error(f"Credentials store was not loaded, pending metadata is discarded: {e}")
+        else:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+            atexit.unregister(self.close)
     
     def delete_credentials(self, service_name: str) -> None:
         """Удаление учетных данных.
@@ -354,19 +651,20 @@ class SecureCredentialsManager:
             service_name: Название сервиса
         """
         try:
+            self._wait_loaded()
+            
             # Удаление файла
             credentials_file = self._get_credentials_file_path(service_name)
             if credentials_file.exists():
                 credentials_file.unlink()
             
-            # Удаление из кэша
+            # Удаление из кэша и информации
             with self._cache_lock:
-                if service_name in self._credentials_cache:
-                    del self._credentials_cache[service_name]
+                self._credentials_cache.pop(service_name, None)
+                self._vault.pop(service_name, None)
+                removed = self._credentials_info.pop(service_name, None) is not None
             
-            # Удаление информации
-            if service_name in self._credentials_info:
-                del self._credentials_info[service_name]
+            if removed:
                 self._save_credentials_info()
             
             # Сброс попыток доступа
@@ -390,6 +688,7 @@ class SecureCredentialsManager:
         Returns:
             Список названий сервисов
         """
+        self._wait_loaded()
         return list(self._credentials_info.keys())
     
     def get_service_info(self, service_name: str) -> Optional[Dict[str, Any]]:
@@ -401,6 +700,7 @@ class SecureCredentialsManager:
         Returns:
             Информация о сервисе или None
         """
+        self._wait_loaded()
         if service_name not in self._credentials_info:
             return None
         
@@ -428,28 +728,33 @@ class SecureCredentialsManager:
         try:
             # Создание нового менеджера шифрования
             new_encryption_manager = EncryptionManager(new_master_key)
-            
-            # Перешифровка всех учетных данных
-            for service_name in self.list_services():
-                # Получение данных со старым ключом
-                credentials_file = self._get_credentials_file_path(service_name)
-                with open(credentials_file, 'rb') as f:
-                    old_encrypted_data = f.read()
-                
-                # Расшифровка старым ключом
-                decrypted_data = self._encryption_manager.decrypt(old_encrypted_data)
+            self._wait_loaded()
+            
+            # Перешифровка и замена ключа - одна операция: запись другим
+            # потоком (например, отложенная запись сведений о доступе)
+            # выполняется либо до нее старым ключом, либо после - новым
+            with self._key_lock:
+                if self._use_vault:
+                    self._save_vault(new_encryption_manager)
                 
-                # Шифрование новым ключом
-                new_encrypted_data = new_encryption_manager.encrypt(decrypted_data)
+                # Перешифровка всех учетных данных
+                for service_name in ([] if self._use_vault else self.list_services()):
+                    # Получение данных со старым ключом
+                    credentials_file = self._get_credentials_file_path(service_name)
+                    with open(credentials_file, 'rb') as f:
+                        old_encrypted_data = f.read()
+                    
+                    # Расшифровка старым ключом
+                    decrypted_data = self._encryption_manager.decrypt(old_encrypted_data)
+                    
+                    # Шифрование новым ключом
+                    new_encrypted_data = new_encryption_manager.encrypt(decrypted_data)
+                    
+                    # Сохранение
+                    self._write_private_file(credentials_file, new_encrypted_data)
                 
-                # Сохранение
-                with open(credentials_file, 'wb') as f:
-                    f.write(new_encrypted_data)
-                
-                os.chmod(credentials_file, 0o600)
-            
-            # Замена менеджера шифрования
-            self._encryption_manager = new_encryption_manager
+                # Замена менеджера шифрования
+                self._encryption_manager = new_encryption_manager
             
             # Очистка кэша
             with self._cache_lock:
@@ -473,10 +778,11 @@ class SecureCredentialsManager:
         Returns:
             Количество удаленных записей
         """
+        self._wait_loaded()
         current_time = time.time()
         expired_services = []
         
-        for service_name, info in self._credentials_info.items():
+        for service_name, info in list(self._credentials_info.items()):
             if info.expires_at and current_time > info.expires_at:
                 expired_services.append(service_name)
         
@@ -517,5 +823,9 @@ class SecureCredentialsManager:
             "cached_services": len(self._credentials_cache),
             "access_attempts": self._access_attempts.copy(),
             "credentials_dir": str(self._credentials_dir),
+            "storage": "vault" if self._use_vault else "files",
+            "loaded": self._load_future.done(),
+            "load_failed": self._load_future.done() and self._load_future.exception() is not None,
+            "metadata_pending": self._metadata_dirty,
             "encryption_enabled": True
         }
\ No newline at end of file
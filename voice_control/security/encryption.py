@@ -8,17 +8,60 @@ import os
 import base64
 import hashlib
 import secrets
-from typing import Union, Optional, Dict, Any
+import struct
+import threading
+from collections import OrderedDict
+from typing import Union, Optional, Dict, Any, Tuple
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.backends import default_backend
 import json
 
 from ..utils.logger import PerformanceLogger
 
 
+# Параметры вывода ключа из мастер-ключа
+_KDF_ITERATIONS = 100000
+_DEFAULT_SALT = b'voice_control_salt_2024'
+
+# Кэш выведенных ключей на уровне процесса:
+# (отпечаток мастер-ключа, соль, алгоритм, итерации) -> выведенный ключ
+_derived_key_cache: "OrderedDict[Tuple[str, bytes, str, int], bytes]" = OrderedDict()
+_derived_key_cache_lock = threading.Lock()
+_DERIVED_KEY_CACHE_SIZE = 32
+
+# Потоковый формат зашифрованных файлов (AES-256-GCM по блокам):
+#   заголовок: magic(4) | version(1) | chunk_size(4) | nonce_prefix(8)
+#   блок:      длина шифртекста(4) | шифртекст с тегом(16)
+# Nonce блока = nonce_prefix + номер блока (4 байта). Заголовок, номер блока
+# и признак последнего блока входят в AAD, поэтому перестановка, подмена
+# заголовка и усечение файла обнаруживаются при расшифровке.
+_STREAM_MAGIC = b'VCEF'
+_STREAM_VERSION = 1
+_STREAM_HEADER = struct.Struct('>4sBI8s')
+_STREAM_CHUNK_LENGTH = struct.Struct('>I')
+_STREAM_TAG_SIZE = 16
+DEFAULT_FILE_CHUNK_SIZE = 64 * 1024
+# Длина шифртекста блока (данные + тег) должна помещаться в 4 байта
+MAX_FILE_CHUNK_SIZE = 2 ** 32 - 1 - _STREAM_TAG_SIZE
+
+
+def _master_key_fingerprint(master_key: bytes) -> str:
+    """Отпечаток мастер-ключа для ключа кэша (сам ключ в кэше не хранится)."""
+    return hashlib.sha256(b'voice_control_key_fingerprint' + master_key).hexdigest()
+
+
+def clear_derived_key_cache() -> None:
+    """Очистка кэша выведенных ключей."""
+    with _derived_key_cache_lock:
+        _derived_key_cache.clear()
+
+
 class EncryptionManager:
     """Менеджер шифрования для безопасной обработки данных.
     
@@ -44,6 +87,7 @@ class EncryptionManager:
         
         # Инициализация шифровальщика
         self._cipher_key = self._derive_key(self._master_key)
+        self._file_key = self._derive_file_key()
         
         if algorithm == "fernet":
             self._fernet = Fernet(self._cipher_key)
@@ -82,18 +126,29 @@ class EncryptionManager:
         """
         if salt is None:
             # Использование фиксированной соли для совместимости
-            salt = b'voice_control_salt_2024'
-        
-        # PBKDF2 для вывода ключа
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-            backend=default_backend()
-        )
-        
-        derived_key = kdf.derive(master_key)
+            salt = _DEFAULT_SALT
+        
+        # PBKDF2 выполняется один раз на процесс для каждой комбинации параметров
+        cache_key = (_master_key_fingerprint(master_key), salt, self._algorithm, _KDF_ITERATIONS)
+        with _derived_key_cache_lock:
+            derived_key = _derived_key_cache.get(cache_key)
+            if derived_key is not None:
+                _derived_key_cache.move_to_end(cache_key)
+        
+        if derived_key is None:
+            kdf = PBKDF2HMAC(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=salt,
+                iterations=_KDF_ITERATIONS,
+                backend=default_backend()
+            )
+            derived_key = kdf.derive(master_key)
+            
+            with _derived_key_cache_lock:
+                _derived_key_cache[cache_key] = derived_key
+                while len(_derived_key_cache) > _DERIVED_KEY_CACHE_SIZE:
+                    _derived_key_cache.popitem(last=False)
         
         if self._algorithm == "fernet":
             # Fernet требует base64-кодированный ключ
@@ -101,6 +156,21 @@ class EncryptionManager:
         
         return derived_key
     
+    def _derive_file_key(self) -> bytes:
+        """Вывод отдельного ключа для потокового шифрования файлов (HKDF).
+        
+        Returns:
+            32-байтовый ключ AES-256-GCM
+        """
+        raw_key = base64.urlsafe_b64decode(self._cipher_key) if self._algorithm == "fernet" else self._cipher_key
+        return HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b'voice_control file encryption v1',
+            backend=default_backend()
+        ).derive(raw_key)
+    
     def _setup_aes256(self) -> None:
         """Настройка AES-256 шифрования."""
         self._aes_key = self._cipher_key
@@ -344,41 +414,72 @@ class EncryptionManager:
         token_bytes = secrets.token_bytes(length)
         return base64.urlsafe_b64encode(token_bytes).decode('utf-8')
     
-    def encrypt_file(self, file_path: str, output_path: Optional[str] = None) -> str:
-        """Шифрование файла.
+    def encrypt_file(self,
+                     file_path: str,
+                     output_path: Optional[str] = None,
+                     chunk_size: int = DEFAULT_FILE_CHUNK_SIZE) -> str:
+        """Потоковое шифрование файла (AES-256-GCM по блокам, постоянный расход памяти).
         
         Args:
             file_path: Путь к исходному файлу
             output_path: Путь к зашифрованному файлу
+            chunk_size: Размер блока открытого текста
             
         Returns:
             Путь к зашифрованному файлу
+            
+        Raises:
+            ValueError: При размере блока вне диапазона 1..MAX_FILE_CHUNK_SIZE
         """
+        if not isinstance(chunk_size, int) or not 0 < chunk_size <= MAX_FILE_CHUNK_SIZE:
+            raise ValueError(f"chunk_size must be between 1 and {MAX_FILE_CHUNK_SIZE}, got {chunk_size!r}")
+        
         if output_path is None:
             output_path = file_path + ".encrypted"
         
+        temp_path = output_path + ".tmp"
         try:
-            with open(file_path, 'rb') as f:
-                file_data = f.read()
-            
-            encrypted_data = self.encrypt(file_data)
-            
-            with open(output_path, 'wb') as f:
-                f.write(encrypted_data)
-            
-            # Установка безопасных прав доступа
-            os.chmod(output_path, 0o600)
+            aead = AESGCM(self._file_key)
+            nonce_prefix = secrets.token_bytes(8)
+            header = _STREAM_HEADER.pack(_STREAM_MAGIC, _STREAM_VERSION, chunk_size, nonce_prefix)
+            
+            with open(file_path, 'rb') as source, self._open_private(temp_path) as target:
+                target.write(header)
+                index = 0
+                chunk = source.read(chunk_size)
+                while True:
+                    next_chunk = source.read(chunk_size) if chunk else b''
+                    is_final = not next_chunk
+                    ciphertext = aead.encrypt(
+                        nonce_prefix + struct.pack('>I', index),
+                        chunk,
+                        self._chunk_aad(header, index, is_final)
+                    )
+                    target.write(_STREAM_CHUNK_LENGTH.pack(len(ciphertext)))
+                    target.write(ciphertext)
+                    if is_final:
+                        break
+                    chunk = next_chunk
+                    index += 1
+            
+            os.replace(temp_path, output_path)
             
             self._logger.info(f"File encrypted: {file_path} -> {output_path}")
             return output_path
             
         except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
             self._logger.error(f"File encryption failed: {e}")
             raise RuntimeError(f"File encryption failed: {e}")
     
     def decrypt_file(self, encrypted_file_path: str, output_path: Optional[str] = None) -> str:
         """Расшифровка файла.
         
+        Файлы потокового формата расшифровываются по блокам с проверкой
+        целостности каждого блока; файлы, зашифрованные целиком прежними
+        версиями, расшифровываются как раньше.
+        
         Args:
             encrypted_file_path: Путь к зашифрованному файлу
             output_path: Путь к расшифрованному файлу
@@ -392,22 +493,91 @@ class EncryptionManager:
             else:
                 output_path = encrypted_file_path + ".decrypted"
         
+        temp_path = output_path + ".tmp"
         try:
-            with open(encrypted_file_path, 'rb') as f:
-                encrypted_data = f.read()
-            
-            decrypted_data = self.decrypt(encrypted_data)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(decrypted_data)
+            with open(encrypted_file_path, 'rb') as source:
+                header = source.read(_STREAM_HEADER.size)
+                is_stream = (len(header) == _STREAM_HEADER.size
+                             and header[:len(_STREAM_MAGIC)] == _STREAM_MAGIC)
+                
+                with self._open_private(temp_path) as target:
+                    if is_stream:
+                        self._decrypt_stream(header, source, target)
+                    else:
+                        # Прежний формат: файл зашифрован целиком
+                        encrypted_data = header + source.read()
+                        if self._algorithm == "fernet":
+                            target.write(self._decrypt_fernet(encrypted_data))
+                        else:
+                            target.write(self._decrypt_aes256(encrypted_data))
+            
+            os.replace(temp_path, output_path)
             
             self._logger.info(f"File decrypted: {encrypted_file_path} -> {output_path}")
             return output_path
             
         except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
             self._logger.error(f"File decryption failed: {e}")
             raise RuntimeError(f"File decryption failed: {e}")
     
+    def _decrypt_stream(self, header: bytes, source, target) -> None:
+        """Расшифровка блоков потокового формата.
+        
+        Args:
+            header: Заголовок файла
+            source: Файл с зашифрованными блоками (после заголовка)
+            target: Файл для расшифрованных данных
+            
+        Raises:
+            ValueError: При неподдерживаемой версии, повреждении или усечении файла
+        """
+        _, version, chunk_size, nonce_prefix = _STREAM_HEADER.unpack(header)
+        if version != _STREAM_VERSION:
+            raise ValueError(f"Unsupported encrypted file version: {version}")
+        
+        aead = AESGCM(self._file_key)
+        max_length = chunk_size + _STREAM_TAG_SIZE
+        index = 0
+        length_bytes = source.read(_STREAM_CHUNK_LENGTH.size)
+        while True:
+            if len(length_bytes) != _STREAM_CHUNK_LENGTH.size:
+                raise ValueError("Encrypted file is truncated")
+            (length,) = _STREAM_CHUNK_LENGTH.unpack(length_bytes)
+            if length > max_length:
+                raise ValueError("Encrypted file is corrupted")
+            ciphertext = source.read(length)
+            if len(ciphertext) != length:
+                raise ValueError("Encrypted file is truncated")
+            
+            length_bytes = source.read(_STREAM_CHUNK_LENGTH.size)
+            is_final = not length_bytes
+            try:
+                chunk = aead.decrypt(
+                    nonce_prefix + struct.pack('>I', index),
+                    ciphertext,
+                    self._chunk_aad(header, index, is_final)
+                )
+            except InvalidTag:
+                raise ValueError(f"Authentication failed for chunk {index}")
+            target.write(chunk)
+            
+            if is_final:
+                break
+            index += 1
+    
+    @staticmethod
+    def _open_private(path: str):
+        """Создание файла для записи сразу с правами 0600."""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o600)
+        return os.fdopen(fd, 'wb')
+    
+    @staticmethod
+    def _chunk_aad(header: bytes, index: int, is_final: bool) -> bytes:
+        """Дополнительные аутентифицируемые данные блока."""
+        return header + struct.pack('>I?', index, is_final)
+    
     def get_key_info(self) -> Dict[str, Any]:
         """Получение информации о ключах.
         
@@ -435,6 +605,7 @@ class EncryptionManager:
             # Генерация нового ключа
             self._master_key = new_master_key.encode('utf-8')
             self._cipher_key = self._derive_key(self._master_key)
+            self._file_key = self._derive_file_key()
             
             # Обновление шифровальщика
             if self._algorithm == "fernet":
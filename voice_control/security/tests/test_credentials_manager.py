@@ -0,0 +1,135 @@
+"""Тесты для менеджера учетных данных"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Добавляем путь к корню проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from voice_control.security.credentials_manager import SecureCredentialsManager
+
+KEY = "test-master-key-0123456789abcdef"
+OTHER_KEY = "other-master-key-0123456789abcdef"
+
+
+class TestSecureCredentialsManagerVault(unittest.TestCase):
+    """Тесты единого зашифрованного хранилища (vault)"""
+    
+    def setUp(self):
+        """Временные директории учетных данных и журналов аудита"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.credentials_dir = os.path.join(self.temp_dir, "credentials")
+        home = patch.dict(os.environ, {"HOME": self.temp_dir, "USERPROFILE": self.temp_dir})
+        home.start()
+        self.addCleanup(home.stop)
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+    
+    def _manager(self, master_key=KEY, use_vault=True):
+        manager = SecureCredentialsManager(self.credentials_dir, master_key=master_key,
+                                           use_vault=use_vault, metadata_flush_delay=0.01)
+        self.addCleanup(manager.close)
+        return manager
+    
+    def _vault_bytes(self):
+        return Path(self.credentials_dir, "credentials.vault").read_bytes()
+    
+    def test_migration_from_files(self):
+        """Учетные данные из отдельных файлов переносятся в vault, файлы удаляются"""
+        manager = self._manager(use_vault=False)
+        asyncio.run(manager.store_credentials("yandex", {"api_key": "a"}))
+        asyncio.run(manager.store_credentials("google", {"token": "b"}))
+        manager.close()
+        self.assertEqual(len(list(Path(self.credentials_dir).glob("*.cred"))), 2)
+        
+        vault = self._manager()
+        self.assertEqual(sorted(vault.list_services()), ["google", "yandex"])
+        self.assertEqual(asyncio.run(vault.get_credentials("yandex")), {"api_key": "a"})
+        self.assertEqual(list(Path(self.credentials_dir).glob("*.cred")), [])
+        self.assertFalse(Path(self.credentials_dir, "credentials_info.json").exists())
+        self.assertTrue(Path(self.credentials_dir, "credentials.vault").exists())
+    
+    def test_load_failure_keeps_vault(self):
+        """Хранилище, которое не удалось расшифровать, не перезаписывается"""
+        manager = self._manager()
+        asyncio.run(manager.store_credentials("yandex", {"api_key": "a"}))
+        manager.close()
+        original = self._vault_bytes()
+        
+        wrong = self._manager(OTHER_KEY)
+        with self.assertRaises(Exception):
+            wrong.list_services()
+        with self.assertRaises(RuntimeError):
+            asyncio.run(wrong.store_credentials("google", {"token": "b"}))
+        with self.assertRaises(RuntimeError):
+            wrong.delete_credentials("yandex")
+        wrong.flush()
+        self.assertTrue(wrong.get_security_status()["load_failed"])
+        wrong.close()
+        self.assertEqual(self._vault_bytes(), original)
+        
+        manager = self._manager()
+        self.assertEqual(asyncio.run(manager.get_credentials("yandex")), {"api_key": "a"})
+    
+    def test_rotate_master_key(self):
+        """После ротации хранилище открывается только новым ключом"""
+        manager = self._manager()
+        asyncio.run(manager.store_credentials("yandex", {"api_key": "a"}))
+        manager.rotate_master_key(OTHER_KEY)
+        self.assertEqual(asyncio.run(manager.get_credentials("yandex")), {"api_key": "a"})
+        manager.close()
+        
+        with self.assertRaises(Exception):
+            self._manager(KEY).list_services()
+        rotated = self._manager(OTHER_KEY)
+        self.assertEqual(asyncio.run(rotated.get_credentials("yandex")), {"api_key": "a"})
+    
+    def test_rotate_during_metadata_flush(self):
+        """Отложенная запись сведений о доступе не перешифровывает vault старым ключом"""
+        manager = self._manager()
+        asyncio.run(manager.store_credentials("yandex", {"api_key": "a"}))
+        original_write = manager._write_private_file
+        flushers = []
+        
+        def write_then_flush(path, data):
+            original_write(path, data)
+            # Запись перешифрованного vault: сведения о доступе сбрасываются
+            # из другого потока до замены ключа
+            if not flushers:
+                manager._update_access_info("yandex")
+                flusher = threading.Thread(target=manager.flush)
+                flushers.append(flusher)
+                flusher.start()
+                flusher.join(0.5)
+        
+        with patch.object(manager, "_write_private_file", side_effect=write_then_flush):
+            manager.rotate_master_key(OTHER_KEY)
+            flushers[0].join()
+        manager.close()
+        
+        rotated = self._manager(OTHER_KEY)
+        self.assertEqual(asyncio.run(rotated.get_credentials("yandex")), {"api_key": "a"})
+    
+    def test_returned_credentials_are_copies(self):
+        """Изменение полученных данных не меняет сохраняемые учетные данные"""
+        manager = self._manager()
+        asyncio.run(manager.store_credentials("yandex", {"api_key": "a"}))
+        manager.clear_cache()
+        asyncio.run(manager.get_credentials("yandex"))["api_key"] = "changed"
+        self.assertEqual(asyncio.run(manager.get_credentials("yandex")), {"api_key": "a"})
+        manager.close()
+        
+        reopened = self._manager()
+        reopened_credentials = asyncio.run(reopened.get_credentials("yandex"))
+        reopened_credentials["api_key"] = "changed"
+        self.assertEqual(asyncio.run(reopened.get_credentials("yandex")), {"api_key": "a"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,12 +7,15 @@ import shutil
 from PySide6.QtCore import QThread, Signal
 from PySide6.QtWidgets import QMessageBox
 
+from voice_control.utils.file_helper import FileHelper, FileError
+
 logger = logging.getLogger(__name__)
 
 class VoskModelDownloader(QThread):
     """Поток для скачивания моделей Vosk."""
     
     progress = Signal(int)
+    extract_progress = Signal(int)  # Прогресс распаковки, %
     finished_signal = Signal(str)  # Путь к распакованной модели
     error_signal = Signal(str)
 
@@ -51,38 +54,40 @@ class VoskModelDownloader(QThread):
                 logger.warning(f"Папка для распаковки {self.extract_path} уже существует. Удаление перед распаковкой.")
                 shutil.rmtree(self.extract_path)
             
-            with zipfile.ZipFile(self.zip_path, 'r') as zip_ref:
-                # Извлекаем все в download_dir
-                zip_ref.extractall(self.download_dir)
-                
-                # Ищем папку, которую создал zip
-                archived_folder_name_candidate1 = os.path.splitext(os.path.basename(self.zip_path))[0]
-                
-                # Проверяем различные варианты извлеченных папок
-                potential_extracted_folder_path1 = os.path.join(self.download_dir, self.model_internal_name)
-                potential_extracted_folder_path2 = os.path.join(self.download_dir, archived_folder_name_candidate1)
+            # Параллельная распаковка с проверкой путей и прогрессом
+            FileHelper(enable_logging=False).extract_archive(
+                self.zip_path, self.download_dir,
+                progress=lambda done, total: self.extract_progress.emit(int(done * 100 / total) if total else 100)
+            )
+            
+            # Ищем папку, которую создал zip
+            archived_folder_name_candidate1 = os.path.splitext(os.path.basename(self.zip_path))[0]
+            
+            # Проверяем различные варианты извлеченных папок
+            potential_extracted_folder_path1 = os.path.join(self.download_dir, self.model_internal_name)
+            potential_extracted_folder_path2 = os.path.join(self.download_dir, archived_folder_name_candidate1)
 
-                actual_extracted_path = None
-                if os.path.isdir(potential_extracted_folder_path1) and self.model_internal_name != archived_folder_name_candidate1:
-                    if self.extract_path == potential_extracted_folder_path1:
-                        actual_extracted_path = self.extract_path
-                    else:
-                        if os.path.exists(self.extract_path):
-                            shutil.rmtree(self.extract_path)
-                        shutil.move(potential_extracted_folder_path1, self.extract_path)
-                        actual_extracted_path = self.extract_path
-                elif os.path.isdir(potential_extracted_folder_path2):
-                    if self.extract_path == potential_extracted_folder_path2:
-                        actual_extracted_path = self.extract_path
-                    else:
-                        if os.path.exists(self.extract_path):
-                            shutil.rmtree(self.extract_path)
-                        shutil.move(potential_extracted_folder_path2, self.extract_path)
-                        actual_extracted_path = self.extract_path
+            actual_extracted_path = None
+            if os.path.isdir(potential_extracted_folder_path1) and self.model_internal_name != archived_folder_name_candidate1:
+                if self.extract_path == potential_extracted_folder_path1:
+                    actual_extracted_path = self.extract_path
+                else:
+                    if os.path.exists(self.extract_path):
+                        shutil.rmtree(self.extract_path)
+                    shutil.move(potential_extracted_folder_path1, self.extract_path)
+                    actual_extracted_path = self.extract_path
+            elif os.path.isdir(potential_extracted_folder_path2):
+                if self.extract_path == potential_extracted_folder_path2:
+                    actual_extracted_path = self.extract_path
                 else:
-                    if not os.path.isdir(self.extract_path):
-                        raise FileNotFoundError(f"Ожидаемая папка модели {self.extract_path} не найдена после распаковки.")
+                    if os.path.exists(self.extract_path):
+                        shutil.rmtree(self.extract_path)
+                    shutil.move(potential_extracted_folder_path2, self.extract_path)
                     actual_extracted_path = self.extract_path
+            else:
+                if not os.path.isdir(self.extract_path):
+                    raise FileNotFoundError(f"Ожидаемая папка модели {self.extract_path} не найдена после распаковки.")
+                actual_extracted_path = self.extract_path
 
             logger.info(f"Модель успешно распакована в: {actual_extracted_path}")
             self.finished_signal.emit(actual_extracted_path)
@@ -90,7 +95,7 @@ class VoskModelDownloader(QThread):
         except requests.exceptions.RequestException as e:
             logger.error(f"Ошибка скачивания модели '{self.model_display_name}': {e}")
             self.error_signal.emit(f"Ошибка HTTP: {e}")
-        except zipfile.BadZipFile as e:
+        except (zipfile.BadZipFile, FileError) as e:
             logger.error(f"Ошибка распаковки модели '{self.model_display_name}': Файл поврежден или не является ZIP-архивом. {e}")
             self.error_signal.emit(f"Ошибка ZIP: {e}")
         except Exception as e:
@@ -216,15 +221,14 @@ class VoskModelRegistry:
             return []
         
         installed_models = []
-        for item in os.listdir(models_dir):
-            model_path = os.path.join(models_dir, item)
-            if os.path.isdir(model_path):
+        with os.scandir(models_dir) as entries:
+            for entry in entries:
                 # Проверяем, что это действительно модель Vosk
-                if cls._is_valid_vosk_model(model_path):
+                if entry.is_dir() and cls._is_valid_vosk_model(entry.path):
                     installed_models.append({
-                        "name": item,
-                        "path": model_path,
-                        "size_mb": cls._get_directory_size_mb(model_path)
+                        "name": entry.name,
+                        "path": entry.path,
+                        "size_mb": cls._get_directory_size_mb(entry.path)
                     })
         return installed_models
     
@@ -241,12 +245,9 @@ class VoskModelRegistry:
     @classmethod
     def _get_directory_size_mb(cls, directory_path):
         """Возвращает размер директории в мегабайтах."""
-        total_size = 0
-        for dirpath, dirnames, filenames in os.walk(directory_path):
-            for filename in filenames:
-                filepath = os.path.join(dirpath, filename)
-                try:
-                    total_size += os.path.getsize(filepath)
-                except (OSError, IOError):
-                    pass
+        try:
+            total_size = FileHelper(enable_logging=False).get_directory_size(directory_path)
+        except Exception as e:
+            logger.warning(f"Не удалось определить размер {directory_path}: {e}")
+            total_size = 0
         return round(total_size / (1024 * 1024), 1)
\ No newline at end of file
@@ -282,6 +282,7 @@ class VoskSettingsTab(QWidget):
 
         self.download_thread = VoskModelDownloader(model_url, download_dir, model_name, model_dir_name)
         self.download_thread.progress.connect(self.vosk_download_progress_bar.setValue)
+        self.download_thread.extract_progress.connect(self.vosk_download_progress_bar.setValue)
         self.download_thread.finished_signal.connect(self._on_download_finished)
         self.download_thread.error_signal.connect(self._on_download_error)
         self.download_thread.start()
@@ -4,19 +4,82 @@
 включающий логирование, валидацию, аудио помощники и другие инструменты.
 """
 
-from .logger import PerformanceLogger
-from .validator import InputValidator, ValidationLevel, ValidationResult
-from .audio_helper import AudioHelper, AudioFormat, AudioBackend
-from .config_helper import ConfigHelper, ConfigFormat, ConfigSchema, ConfigChangeEvent, ConfigError
-from .file_helper import FileHelper, FileOperation, CompressionFormat, FileInfo, FileOperationResult, FileError
+import importlib
+
+# Имя -> подмодуль. Подмодули импортируются при первом обращении к имени:
+# audio_helper (numpy), config_helper (yaml, toml) и другие не должны
+# загружаться, когда нужен только трассировщик или профилировщик.
+_EXPORTS = {
+    'PerformanceLogger': 'logger',
+    'SystemMetricsSampler': 'logger',
+    'InputValidator': 'validator',
+    'ValidationLevel': 'validator',
+    'ValidationResult': 'validator',
+    'AudioHelper': 'audio_helper',
+    'AudioFormat': 'audio_helper',
+    'AudioBackend': 'audio_helper',
+    'MappedWav': 'audio_helper',
+    'ConfigHelper': 'config_helper',
+    'ConfigFormat': 'config_helper',
+    'ConfigSchema': 'config_helper',
+    'ConfigChangeEvent': 'config_helper',
+    'ConfigError': 'config_helper',
+    'ConfigStore': 'config_store',
+    'ConfigSnapshot': 'config_store',
+    'ConfigChange': 'config_store',
+    'FileWatchService': 'file_watcher',
+    'get_file_watch_service': 'file_watcher',
+    'MetricsExporter': 'metrics_exporter',
+    'MetricFamily': 'metrics_exporter',
+    'get_metrics_exporter': 'metrics_exporter',
+    'Tracer': 'tracing',
+    'Span': 'tracing',
+    'get_tracer': 'tracing',
+    'OperationProfiler': 'profiler',
+    'ProfileSession': 'profiler',
+    'get_profiler': 'profiler',
+    'FileHelper': 'file_helper',
+    'FileOperation': 'file_helper',
+    'CompressionFormat': 'file_helper',
+    'FileInfo': 'file_helper',
+    'FileOperationResult': 'file_helper',
+    'FileError': 'file_helper',
+    'ChecksumBatchResult': 'file_helper',
+}
+
+
+def __getattr__(name):
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
 
 __all__ = [
     # Main classes
     'PerformanceLogger',
+    'SystemMetricsSampler',
     'InputValidator', 
     'AudioHelper',
     'ConfigHelper',
     'FileHelper',
+    'FileWatchService',
+    'get_file_watch_service',
+    'MetricsExporter',
+    'MetricFamily',
+    'get_metrics_exporter',
+    'Tracer',
+    'Span',
+    'get_tracer',
+    'OperationProfiler',
+    'ProfileSession',
+    'get_profiler',
     
     # Validator types
     'ValidationLevel',
@@ -25,18 +88,23 @@ __all__ = [
     # Audio types
     'AudioFormat',
     'AudioBackend',
+    'MappedWav',
     
     # Config types
     'ConfigFormat',
     'ConfigSchema',
     'ConfigChangeEvent',
     'ConfigError',
+    'ConfigStore',
+    'ConfigSnapshot',
+    'ConfigChange',
     
     # File types
     'FileOperation',
     'CompressionFormat',
     'FileInfo',
     'FileOperationResult',
+    'ChecksumBatchResult',
     'FileError'
 ]
 
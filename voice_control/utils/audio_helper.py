@@ -5,16 +5,19 @@
 """
 
 import os
+import math
+import mmap
 import wave
 import struct
 import numpy as np
-from typing import Optional, Tuple, List, Dict, Any, Union
+from typing import Optional, Tuple, List, Dict, Any, Union, Iterator
 from pathlib import Path
 from dataclasses import dataclass
 from enum import Enum
 import tempfile
 import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     import librosa
@@ -88,6 +91,204 @@ class AudioFeatures:
     tempo: Optional[float] = None
 
 
+# Коды формата WAV (поле wFormatTag)
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class MappedWav:
+    """WAV файл, отображенный в память.
+    
+    Блок данных отображается через np.memmap и читается по требованию:
+    в памяти находятся только страницы, к которым обращались, поэтому
+    многочасовые записи обрабатываются с ограниченным расходом памяти.
+    """
+    
+    def __init__(self, file_path: str):
+        """Разбор заголовка и отображение блока данных.
+        
+        Args:
+            file_path: Путь к WAV файлу
+            
+        Raises:
+            ValueError: При неподдерживаемом или поврежденном WAV файле
+        """
+        self.file_path = file_path
+        file_size = os.path.getsize(file_path)
+        
+        fmt = None
+        data_offset = data_size = None
+        with open(file_path, 'rb') as f:
+            riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+            if riff != b'RIFF' or wave_id != b'WAVE':
+                raise ValueError(f"Not a RIFF/WAVE file: {file_path}")
+            
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    break
+                chunk_id, chunk_size = struct.unpack('<4sI', header)
+                if chunk_id == b'fmt ':
+                    fmt = f.read(chunk_size)
+                elif chunk_id == b'data':
+                    data_offset = f.tell()
+                    # Размер 0 или 0xFFFFFFFF пишут потоковые записывающие программы
+                    available = file_size - data_offset
+                    data_size = chunk_size if 0 < chunk_size <= available else available
+                    break
+                else:
+                    f.seek(chunk_size, os.SEEK_CUR)
+                # Блоки выравниваются по четной границе
+                if chunk_size % 2:
+                    f.seek(1, os.SEEK_CUR)
+        
+        if fmt is None or data_offset is None:
+            raise ValueError(f"WAV file has no fmt or data chunk: {file_path}")
+        
+        format_tag, self.channels, self.sample_rate, _, block_align, bits = struct.unpack('<HHIIHH', fmt[:16])
+        if format_tag == _WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+            format_tag = struct.unpack('<H', fmt[24:26])[0]
+        
+        self.sample_width = bits // 8
+        self.is_float = format_tag == _WAVE_FORMAT_IEEE_FLOAT
+        if format_tag not in (_WAVE_FORMAT_PCM, _WAVE_FORMAT_IEEE_FLOAT):
+            raise ValueError(f"Unsupported WAV format tag: {format_tag:#06x}")
+        if block_align != self.sample_width * self.channels:
+            raise ValueError(f"Unsupported WAV block alignment: {block_align}")
+        
+        if self.is_float:
+            dtypes = {4: '<f4', 8: '<f8'}
+        else:
+            dtypes = {1: 'u1', 2: '<i2', 3: 'u1', 4: '<i4'}
+        if self.sample_width not in dtypes:
+            raise ValueError(f"Unsupported sample width: {self.sample_width}")
+        
+        self.frames = data_size // block_align
+        self._block_align = block_align
+        # Смещение данных внутри отображения (np.memmap выравнивает начало)
+        self._map_offset = data_offset % mmap.ALLOCATIONGRANULARITY
+        self._released = 0
+        shape: Tuple[int, ...] = (self.frames, self.channels)
+        if self.sample_width == 3 and not self.is_float:
+            shape = (self.frames, self.channels, 3)
+        
+        self._samples: Optional[np.ndarray] = None
+        if self.frames:
+            self._samples = np.memmap(file_path, dtype=dtypes[self.sample_width], mode='r',
+                                      offset=data_offset, shape=shape)
+    
+    @property
+    def duration(self) -> float:
+        """Длительность, секунды."""
+        return self.frames / self.sample_rate if self.sample_rate else 0.0
+    
+    @property
+    def samples(self) -> np.ndarray:
+        """Отображенные отсчеты формы (frames, channels) без преобразования."""
+        if self._samples is None:
+            return np.empty((0, self.channels), dtype=np.float32)
+        return self._samples
+    
+    def read(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Чтение диапазона кадров с преобразованием в float32 [-1, 1].
+        
+        Args:
+            start: Первый кадр
+            stop: Кадр после последнего (по умолчанию - конец файла)
+            
+        Returns:
+            Массив формы (frames, channels)
+        """
+        return self._to_float(self.samples[start:stop])
+    
+    def _to_float(self, raw: np.ndarray) -> np.ndarray:
+        """Преобразование сырых отсчетов в float32 [-1, 1]."""
+        if self.is_float:
+            return raw.astype(np.float32)
+        if self.sample_width == 1:
+            return raw.astype(np.float32) / 128.0 - 1.0
+        if self.sample_width == 2:
+            return raw.astype(np.float32) / 32768.0
+        if self.sample_width == 3:
+            # Знаковое расширение старшего байта
+            value = (raw[..., 0].astype(np.int32)
+                     | (raw[..., 1].astype(np.int32) << 8)
+                     | (raw[..., 2].astype(np.int8).astype(np.int32) << 16))
+            return value.astype(np.float32) / 8388608.0
+        return raw.astype(np.float32) / 2147483648.0
+    
+    def release(self, stop: int) -> None:
+        """Освобождение страниц, содержащих кадры до stop.
+        
+        Страницы только читаются из файла, поэтому при повторном обращении
+        они будут снова загружены; освобождение ограничивает рост RSS при
+        последовательном проходе по большому файлу.
+        
+        Args:
+            stop: Кадр, до которого данные больше не нужны
+        """
+        mmap_obj = getattr(self._samples, '_mmap', None)
+        if mmap_obj is None or not hasattr(mmap, 'MADV_DONTNEED'):
+            return
+        end = (self._map_offset + stop * self._block_align) // mmap.PAGESIZE * mmap.PAGESIZE
+        if end > self._released:
+            mmap_obj.madvise(mmap.MADV_DONTNEED, self._released, end - self._released)
+            self._released = end
+    
+    def close(self) -> None:
+        """Освобождение отображения файла."""
+        if self._samples is not None:
+            mmap_obj = getattr(self._samples, '_mmap', None)
+            self._samples = None
+            if mmap_obj is not None:
+                try:
+                    mmap_obj.close()
+                except BufferError:
+                    # На отображение еще ссылаются выданные блоки
+                    pass
+    
+    def __enter__(self) -> 'MappedWav':
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class _StreamResampler:
+    """Потоковый ресемплер с линейной интерполяцией.
+    
+    Сохраняет дробную позицию и последний кадр предыдущего блока, поэтому
+    результат не зависит от разбиения входа на блоки.
+    """
+    
+    def __init__(self, orig_sr: int, target_sr: int):
+        self._step = orig_sr / target_sr
+        self._position = 0.0
+        self._tail: Optional[np.ndarray] = None
+    
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Ресемплинг очередного блока формы (frames,) или (frames, channels)."""
+        if self._tail is not None:
+            block = np.concatenate([self._tail, block])
+        self._tail = block[-1:]
+        
+        last = len(block) - 1
+        if last <= self._position:
+            self._position -= last
+            return block[:0]
+        
+        count = math.ceil((last - self._position) / self._step)
+        positions = self._position + self._step * np.arange(count)
+        self._position += self._step * count - last
+        
+        indices = np.arange(len(block))
+        if block.ndim == 1:
+            return np.interp(positions, indices, block).astype(np.float32)
+        return np.stack([np.interp(positions, indices, block[:, channel])
+                         for channel in range(block.shape[1])], axis=1).astype(np.float32)
+
+
 class AudioHelper:
     """Помощник для работы с аудио данными.
     
@@ -162,6 +363,14 @@ class AudioHelper:
             raise FileNotFoundError(f"Audio file not found: {file_path}")
         
         try:
+            # WAV читается через отображение в память без декодирования librosa
+            if file_path.lower().endswith('.wav'):
+                try:
+                    return self._load_wav_file(file_path, target_sr, mono, normalize)
+                except ValueError:
+                    if not LIBROSA_AVAILABLE:
+                        raise
+            
             # Использование librosa если доступно
             if LIBROSA_AVAILABLE:
                 audio_data, sample_rate = librosa.load(
@@ -175,10 +384,6 @@ class AudioHelper:
                 
                 return audio_data, sample_rate
             
-            # Fallback на wave для WAV файлов
-            elif file_path.lower().endswith('.wav'):
-                return self._load_wav_file(file_path, target_sr, mono, normalize)
-            
             else:
                 raise ValueError(f"Unsupported audio format. Install librosa for extended format support.")
                 
@@ -189,7 +394,10 @@ class AudioHelper:
                        target_sr: Optional[int] = None,
                        mono: bool = True,
                        normalize: bool = True) -> Tuple[np.ndarray, int]:
-        """Загрузка WAV файла с помощью wave модуля.
+        """Загрузка WAV файла через отображение в память.
+        
+        Отсчеты преобразуются блоками сразу в итоговый массив float32,
+        без промежуточной копии всех байтов файла.
         
         Args:
             file_path: Путь к WAV файлу
@@ -200,58 +408,105 @@ class AudioHelper:
         Returns:
             Кортеж (аудио данные, частота дискретизации)
         """
-        with wave.open(file_path, 'rb') as wav_file:
-            frames = wav_file.getnframes()
-            sample_rate = wav_file.getframerate()
-            channels = wav_file.getnchannels()
-            sample_width = wav_file.getsampwidth()
-            
-            # Чтение аудио данных
-            raw_audio = wav_file.readframes(frames)
-            
-            # Конвертация в numpy array
-            if sample_width == 1:
-                dtype = np.uint8
-                audio_data = np.frombuffer(raw_audio, dtype=dtype)
-                audio_data = audio_data.astype(np.float32) / 128.0 - 1.0
-            elif sample_width == 2:
-                dtype = np.int16
-                audio_data = np.frombuffer(raw_audio, dtype=dtype)
-                audio_data = audio_data.astype(np.float32) / 32768.0
-            elif sample_width == 4:
-                dtype = np.int32
-                audio_data = np.frombuffer(raw_audio, dtype=dtype)
-                audio_data = audio_data.astype(np.float32) / 2147483648.0
+        with MappedWav(file_path) as wav:
+            sample_rate = wav.sample_rate
+            downmix = mono or wav.channels == 1
+            shape = (wav.frames,) if downmix else (wav.frames, wav.channels)
+            audio_data = np.empty(shape, dtype=np.float32)
+            
+            position = 0
+            for block in self.iter_wav_blocks(file_path, mono=downmix, wav=wav):
+                audio_data[position:position + len(block)] = block
+                position += len(block)
+        
+        # Ресемплинг
+        if target_sr and target_sr != sample_rate:
+            if LIBROSA_AVAILABLE:
+                audio_data = librosa.resample(audio_data, orig_sr=sample_rate, target_sr=target_sr)
             else:
-                raise ValueError(f"Unsupported sample width: {sample_width}")
-            
-            # Обработка многоканального аудио
-            if channels > 1:
-                audio_data = audio_data.reshape(-1, channels)
-                if mono:
-                    audio_data = np.mean(audio_data, axis=1)
+                # Простой ресемплинг (не рекомендуется для продакшена)
+                audio_data = _StreamResampler(sample_rate, target_sr).process(audio_data)
+            sample_rate = target_sr
+        
+        # Нормализация
+        if normalize:
+            audio_data = self._normalize_audio(audio_data)
+        
+        return audio_data, sample_rate
+    
+    def open_wav(self, file_path: str) -> MappedWav:
+        """Открытие WAV файла с отображением данных в память.
+        
+        Args:
+            file_path: Путь к WAV файлу
             
-            # Ресемплинг
-            if target_sr and target_sr != sample_rate:
-                if LIBROSA_AVAILABLE:
-                    audio_data = librosa.resample(audio_data, orig_sr=sample_rate, target_sr=target_sr)
-                    sample_rate = target_sr
+        Returns:
+            Отображенный файл (закрывается через close() или with)
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Audio file not found: {file_path}")
+        return MappedWav(file_path)
+    
+    def iter_wav_blocks(self, file_path: str,
+                        block_frames: int = 65536,
+                        dtype: Optional[Any] = np.float32,
+                        mono: bool = False,
+                        target_sr: Optional[int] = None,
+                        wav: Optional[MappedWav] = None) -> Iterator[np.ndarray]:
+        """Потоковое чтение WAV файла блоками без загрузки всего файла.
+        
+        Args:
+            file_path: Путь к WAV файлу
+            block_frames: Количество входных кадров в блоке
+            dtype: Тип выходных отсчетов: np.float32 ([-1, 1]), np.int16
+                (PCM для распознавателей) или None (сырые отсчеты без копирования)
+            mono: Сводить каналы в моно
+            target_sr: Целевая частота дискретизации (линейная интерполяция)
+            wav: Уже открытый файл (иначе файл открывается и закрывается здесь)
+            
+        Yields:
+            Блоки формы (frames,) для моно или (frames, channels)
+        """
+        if block_frames <= 0:
+            raise ValueError("block_frames must be positive")
+        
+        owns_wav = wav is None
+        if owns_wav:
+            wav = self.open_wav(file_path)
+        
+        try:
+            if dtype is None and (mono or target_sr):
+                raise ValueError("Raw blocks do not support mono or resampling")
+            
+            resampler = None
+            if target_sr and target_sr != wav.sample_rate:
+                resampler = _StreamResampler(wav.sample_rate, target_sr)
+            
+            samples = wav.samples
+            for start in range(0, wav.frames, block_frames):
+                raw = samples[start:start + block_frames]
+                if dtype is None:
+                    yield raw
+                    wav.release(start + len(raw))
+                    continue
+                
+                block = wav._to_float(raw)
+                if mono or wav.channels == 1:
+                    block = block.mean(axis=1, dtype=np.float32) if wav.channels > 1 else block[:, 0]
+                if resampler is not None:
+                    block = resampler.process(block)
+                    if not len(block):
+                        continue
+                
+                if np.dtype(dtype) == np.int16:
+                    block = (np.clip(block, -1.0, 1.0) * 32767).astype(np.int16)
                 else:
-                    # Простой ресемплинг (не рекомендуется для продакшена)
-                    ratio = target_sr / sample_rate
-                    new_length = int(len(audio_data) * ratio)
-                    audio_data = np.interp(
-                        np.linspace(0, len(audio_data), new_length),
-                        np.arange(len(audio_data)),
-                        audio_data
-                    )
-                    sample_rate = target_sr
-            
-            # Нормализация
-            if normalize:
-                audio_data = self._normalize_audio(audio_data)
-            
-            return audio_data, sample_rate
+                    block = block.astype(dtype, copy=False)
+                wav.release(start + len(raw))
+                yield block
+        finally:
+            if owns_wav:
+                wav.close()
     
     def save_audio(self, audio_data: np.ndarray, 
                    file_path: str,
@@ -387,8 +642,7 @@ class AudioHelper:
             rms_energy = np.sqrt(np.mean(audio_data ** 2))
             
             # Zero crossing rate
-            zero_crossings = np.where(np.diff(np.sign(audio_data)))[0]
-            zcr = len(zero_crossings) / len(audio_data)
+            zcr = np.count_nonzero(np.diff(np.sign(audio_data))) / len(audio_data)
             
             features = AudioFeatures(
                 rms_energy=float(rms_energy),
@@ -411,15 +665,7 @@ class AudioHelper:
                 # Pitch (основная частота)
                 try:
                     pitches, magnitudes = librosa.piptrack(y=audio_data, sr=sample_rate)
-                    pitch_values = []
-                    for t in range(pitches.shape[1]):
-                        index = magnitudes[:, t].argmax()
-                        pitch = pitches[index, t]
-                        if pitch > 0:
-                            pitch_values.append(pitch)
-                    
-                    if pitch_values:
-                        features.pitch = float(np.median(pitch_values))
+                    features.pitch = self._median_pitch(pitches, magnitudes)
                 except Exception:
                     pass
                 
@@ -435,6 +681,59 @@ class AudioHelper:
         except Exception as e:
             raise RuntimeError(f"Failed to extract audio features: {str(e)}")
     
+    @staticmethod
+    def _median_pitch(pitches: np.ndarray, magnitudes: np.ndarray) -> Optional[float]:
+        """Медиана основной частоты по кадрам.
+        
+        В каждом кадре берется частота бина с максимальной амплитудой.
+        
+        Args:
+            pitches: Частоты формы (bins, frames) из piptrack
+            magnitudes: Амплитуды той же формы
+            
+        Returns:
+            Медиана положительных частот или None
+        """
+        if pitches.size == 0:
+            return None
+        frame_pitches = pitches[magnitudes.argmax(axis=0), np.arange(pitches.shape[1])]
+        frame_pitches = frame_pitches[frame_pitches > 0]
+        return float(np.median(frame_pitches)) if frame_pitches.size else None
+    
+    def extract_features_many(self, file_paths: List[str],
+                              target_sr: Optional[int] = None,
+                              max_workers: Optional[int] = None) -> Dict[str, Union[AudioFeatures, Exception]]:
+        """Извлечение характеристик из нескольких файлов в пуле процессов.
+        
+        Вызывающий код должен запускаться под защитой
+        if __name__ == "__main__" (требование multiprocessing на Windows).
+        
+        Args:
+            file_paths: Пути к аудио файлам
+            target_sr: Целевая частота дискретизации
+            max_workers: Количество процессов (по умолчанию - по числу ядер;
+                1 - обработка в текущем процессе)
+            
+        Returns:
+            Словарь путь -> характеристики или исключение при ошибке
+        """
+        results: Dict[str, Union[AudioFeatures, Exception]] = {}
+        if not file_paths:
+            return results
+        
+        if max_workers == 1 or len(file_paths) == 1:
+            for file_path in file_paths:
+                results[file_path] = _extract_file_features(file_path, target_sr, self._config)
+            return results
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outcomes = executor.map(_extract_file_features, file_paths,
+                                    [target_sr] * len(file_paths), [self._config] * len(file_paths))
+            for file_path, outcome in zip(file_paths, outcomes):
+                results[file_path] = outcome
+        return results
+    
     def convert_format(self, input_path: str, output_path: str, 
                       target_format: AudioFormat,
                       target_sr: Optional[int] = None,
@@ -499,27 +798,51 @@ class AudioHelper:
                 )
                 return trimmed_audio
             else:
-                # Простая обрезка по амплитуде
-                start_idx = 0
-                end_idx = len(audio_data)
-                
-                # Поиск начала
-                for i in range(len(audio_data)):
-                    if abs(audio_data[i]) > threshold:
-                        start_idx = i
-                        break
-                
-                # Поиск конца
-                for i in range(len(audio_data) - 1, -1, -1):
-                    if abs(audio_data[i]) > threshold:
-                        end_idx = i + 1
-                        break
+                # Обрезка по RMS энергии фреймов
+                rms = self._frame_rms(audio_data, frame_length, hop_length)
+                voiced = np.flatnonzero(rms > threshold)
+                if voiced.size == 0:
+                    return audio_data
                 
+                start_idx = int(voiced[0]) * hop_length
+                end_idx = min(len(audio_data), int(voiced[-1]) * hop_length + frame_length)
                 return audio_data[start_idx:end_idx]
                 
         except Exception as e:
             raise RuntimeError(f"Failed to trim silence: {str(e)}")
     
+    @staticmethod
+    def _frame_rms(audio_data: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+        """RMS энергия фреймов без копирования данных.
+        
+        Фреймы формируются как представление исходного массива (stride tricks),
+        последний неполный фрейм дополняется нулями.
+        
+        Args:
+            audio_data: Моно аудио данные
+            frame_length: Длина фрейма
+            hop_length: Шаг между фреймами
+            
+        Returns:
+            RMS каждого фрейма
+        """
+        samples = np.ascontiguousarray(audio_data, dtype=np.float32)
+        if len(samples) < frame_length:
+            padding = frame_length - len(samples)
+        else:
+            padding = -(len(samples) - frame_length) % hop_length
+        if padding:
+            samples = np.concatenate([samples, np.zeros(padding, dtype=np.float32)])
+        
+        n_frames = 1 + (len(samples) - frame_length) // hop_length
+        frames = np.lib.stride_tricks.as_strided(
+            samples,
+            shape=(n_frames, frame_length),
+            strides=(samples.strides[0] * hop_length, samples.strides[0]),
+            writeable=False
+        )
+        return np.sqrt(np.einsum('ij,ij->i', frames, frames) / frame_length)
+    
     def _normalize_audio(self, audio_data: np.ndarray, target_level: float = 0.95) -> np.ndarray:
         """Нормализация аудио данных.
         
@@ -588,4 +911,25 @@ class AudioHelper:
         try:
             self.cleanup_temp_files()
         except Exception:
-            pass
\ No newline at end of file
+            pass
+
+
+def _extract_file_features(file_path: str,
+                           target_sr: Optional[int],
+                           config: Optional[AudioConfig] = None) -> Union[AudioFeatures, Exception]:
+    """Загрузка файла и извлечение характеристик (задача пула процессов).
+    
+    Args:
+        file_path: Путь к аудио файлу
+        target_sr: Целевая частота дискретизации
+        config: Конфигурация аудио
+        
+    Returns:
+        Характеристики или исключение при ошибке
+    """
+    try:
+        helper = AudioHelper(config)
+        audio_data, sample_rate = helper.load_audio(file_path, target_sr=target_sr)
+        return helper.extract_features(audio_data, sample_rate)
+    except Exception as e:
+        return e
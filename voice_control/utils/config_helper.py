@@ -8,7 +8,7 @@ import os
 import json
 import yaml
 import toml
-from typing import Any, Dict, List, Optional, Union, Callable, Type
+from typing import Any, Dict, List, Optional, Tuple, Union, Callable, Type
 from pathlib import Path
 from dataclasses import dataclass, asdict, fields
 from enum import Enum
@@ -17,6 +17,8 @@ import time
 from copy import deepcopy
 import configparser
 
+from .file_watcher import get_file_watch_service
+
 
 class ConfigFormat(Enum):
     """Поддерживаемые форматы конфигурации."""
@@ -56,11 +58,104 @@ class ConfigChangeEvent:
     source: str
 
 
+_MISSING = object()
+
+
+def _assoc_in(node: Any, keys: List[str], value: Any) -> Dict[str, Any]:
+    """Новое дерево с замененным значением по пути.
+
+    Копируются только словари на пути к ключу, остальные поддеревья
+    разделяются со старым деревом.
+
+    Args:
+        node: Исходный узел
+        keys: Путь к значению
+        value: Новое значение
+
+    Returns:
+        Новый узел
+    """
+    result = dict(node) if isinstance(node, dict) else {}
+    if len(keys) == 1:
+        result[keys[0]] = value
+    else:
+        result[keys[0]] = _assoc_in(result.get(keys[0]), keys[1:], value)
+    return result
+
+
+def _merge_tree(node: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
+    """Глубокое слияние без изменения исходного дерева.
+
+    Args:
+        node: Исходный узел
+        updates: Вложенный словарь обновлений
+
+    Returns:
+        Новый узел или исходный, если ни одно значение не изменилось
+    """
+    result = None
+    for key, value in updates.items():
+        current = node.get(key, _MISSING)
+        if isinstance(current, dict) and isinstance(value, dict):
+            value = _merge_tree(current, value)
+        if current is value or (type(current) is type(value) and current == value):
+            continue
+        if result is None:
+            result = dict(node)
+        result[key] = value
+    return node if result is None else result
+
+
+def _diff_trees(old: Dict[str, Any], new: Dict[str, Any],
+                prefix: str = "") -> List[Tuple[str, Any, Any]]:
+    """Изменения между двумя деревьями конфигурации.
+
+    Поддеревья, совпадающие по идентичности, пропускаются без обхода,
+    поэтому стоимость пропорциональна размеру измененной части.
+
+    Args:
+        old: Старое дерево
+        new: Новое дерево
+        prefix: Путь к сравниваемым узлам
+
+    Returns:
+        Список (ключ, старое значение, новое значение)
+    """
+    if old is new:
+        return []
+
+    changes = []
+
+    # Измененные и новые ключи
+    for key, new_value in new.items():
+        full_key = f"{prefix}.{key}" if prefix else key
+        old_value = old.get(key)
+
+        if old_value is new_value:
+            continue
+        if isinstance(new_value, dict) and isinstance(old_value, dict):
+            changes.extend(_diff_trees(old_value, new_value, full_key))
+        elif old_value != new_value:
+            changes.append((full_key, old_value, new_value))
+
+    # Удаленные ключи
+    for key, old_value in old.items():
+        if key not in new:
+            full_key = f"{prefix}.{key}" if prefix else key
+            changes.append((full_key, old_value, None))
+
+    return changes
+
+
 class ConfigHelper:
     """Помощник для управления конфигурацией системы.
     
     Обеспечивает загрузку, сохранение, валидацию и мониторинг
     конфигурации с поддержкой различных форматов.
+
+    Дерево конфигурации не изменяется на месте: каждое изменение строит
+    новый корень, копируя только измененный путь, поэтому старая версия
+    остается согласованной для сравнения без глубокого копирования.
     """
     
     def __init__(self, 
@@ -89,6 +184,7 @@ class ConfigHelper:
         # Мониторинг изменений
         self._change_listeners: List[Callable[[ConfigChangeEvent], None]] = []
         self._last_modified: Optional[float] = None
+        self._watch_id: Optional[int] = None
         self._lock = threading.RLock()
         
         # Автоматическое определение формата
@@ -128,32 +224,43 @@ class ConfigHelper:
         return format_mapping.get(ext, ConfigFormat.JSON)
     
     def _start_file_monitoring(self) -> None:
-        """Запуск мониторинга изменений файла конфигурации."""
-        def monitor_file():
-            while True:
-                try:
-                    if os.path.exists(self._config_path):
-                        current_modified = os.path.getmtime(self._config_path)
-                        
-                        if (self._last_modified is not None and 
-                            current_modified > self._last_modified):
-                            
-                            # Файл изменился, перезагружаем конфигурацию
-                            old_config = deepcopy(self._config_data)
-                            self.load_config()
-                            
-                            # Уведомление о изменениях
-                            self._notify_changes(old_config, self._config_data, "file_reload")
-                        
-                        self._last_modified = current_modified
-                    
-                    time.sleep(1)  # Проверка каждую секунду
-                    
-                except Exception:
-                    time.sleep(5)  # При ошибке ждем дольше
+        """Запуск мониторинга изменений файла конфигурации.
         
-        monitor_thread = threading.Thread(target=monitor_file, daemon=True)
-        monitor_thread.start()
+        Используется общий для процесса сервис наблюдения за файлами,
+        поэтому отдельный поток на каждый экземпляр не создается.
+        """
+        if self._watch_id is None:
+            self._watch_id = get_file_watch_service().watch(self._config_path, self._on_file_changed)
+    
+    def stop_file_monitoring(self) -> None:
+        """Остановка мониторинга изменений файла конфигурации."""
+        if self._watch_id is not None:
+            get_file_watch_service().unwatch(self._watch_id)
+            self._watch_id = None
+    
+    def _on_file_changed(self, path: str) -> None:
+        """Перезагрузка конфигурации после изменения файла.
+        
+        Args:
+            path: Путь к измененному файлу
+        """
+        try:
+            if not os.path.exists(self._config_path):
+                return
+            
+            # Собственные сохранения не перезагружаем
+            if (self._last_modified is not None and
+                    os.path.getmtime(self._config_path) <= self._last_modified):
+                return
+            
+            with self._lock:
+                # load_config заменяет словарь целиком, поэтому старая
+                # конфигурация сохраняется без глубокого копирования
+                old_config = self._config_data
+                self.load_config()
+                self._notify_changes(old_config, self._config_data, "file_reload")
+        except Exception:
+            pass  # Ошибки перезагрузки не должны прерывать наблюдение
     
     def define_schema(self, schema: Dict[str, ConfigSchema]) -> None:
         """Определение схемы конфигурации.
@@ -164,10 +271,11 @@ class ConfigHelper:
         with self._lock:
             self._schema.update(schema)
             
-            # Обновление значений по умолчанию
+            # Обновление значений по умолчанию (копия: изменение исходного
+            # объекта схемы не должно менять значения по умолчанию)
             for key, config_schema in schema.items():
                 if config_schema.default is not None:
-                    self._defaults[key] = config_schema.default
+                    self._defaults[key] = deepcopy(config_schema.default)
     
     def add_schema_field(self, key: str, schema: ConfigSchema) -> None:
         """Добавление поля схемы.
@@ -179,7 +287,7 @@ class ConfigHelper:
         with self._lock:
             self._schema[key] = schema
             if schema.default is not None:
-                self._defaults[key] = schema.default
+                self._defaults[key] = deepcopy(schema.default)
     
     def load_config(self, file_path: Optional[str] = None) -> None:
         """Загрузка конфигурации из файла.
@@ -217,9 +325,9 @@ class ConfigHelper:
                     else:
                         raise ConfigError(f"Unsupported format: {format_to_use}")
                 
-                # Применение значений по умолчанию
-                merged_data = deepcopy(self._defaults)
-                self._deep_merge(merged_data, data)
+                # Применение значений по умолчанию: копия, чтобы изменение
+                # значений, полученных через get(), не затрагивало self._defaults
+                merged_data = dict(_merge_tree(deepcopy(self._defaults), data or {}))
                 
                 # Валидация
                 self._validate_config(merged_data)
@@ -437,10 +545,12 @@ class ConfigHelper:
             default: Значение по умолчанию
             
         Returns:
-            Значение конфигурации
+            Значение конфигурации (словари и списки - копии: поддеревья
+            разделяются между версиями конфигурации и не должны изменяться)
         """
         with self._lock:
-            return self._get_nested_value(self._config_data, key, default)
+            value = self._get_nested_value(self._config_data, key, default)
+        return deepcopy(value) if isinstance(value, (dict, list)) else value
     
     def set(self, key: str, value: Any, source: str = "manual") -> None:
         """Установка значения конфигурации.
@@ -452,15 +562,13 @@ class ConfigHelper:
         """
         with self._lock:
             old_value = self._get_nested_value(self._config_data, key)
-            self._set_nested_value(self._config_data, key, value)
+            # Копия: последующие изменения объекта вызывающим кодом не должны
+            # попадать в дерево конфигурации без уведомления
+            new_config = _assoc_in(self._config_data, key.split('.'), deepcopy(value))
             
-            # Валидация после изменения
-            try:
-                self._validate_config(self._config_data)
-            except ConfigError:
-                # Откат изменений при ошибке валидации
-                self._set_nested_value(self._config_data, key, old_value)
-                raise
+            # Валидация до публикации: при ошибке текущее дерево не затронуто
+            self._validate_config(new_config)
+            self._config_data = new_config
             
             # Уведомление об изменении
             event = ConfigChangeEvent(
@@ -499,92 +607,37 @@ class ConfigHelper:
         
         return current
     
-    def _set_nested_value(self, data: Dict[str, Any], key: str, value: Any) -> None:
-        """Установка вложенного значения по точечной нотации.
-        
-        Args:
-            data: Данные
-            key: Ключ (может содержать точки)
-            value: Значение
-        """
-        keys = key.split('.')
-        current = data
-        
-        for k in keys[:-1]:
-            if k not in current or not isinstance(current[k], dict):
-                current[k] = {}
-            current = current[k]
-        
-        current[keys[-1]] = value
-    
-    def _deep_merge(self, target: Dict[str, Any], source: Dict[str, Any]) -> None:
-        """Глубокое слияние словарей.
-        
-        Args:
-            target: Целевой словарь
-            source: Исходный словарь
-        """
-        for key, value in source.items():
-            if (key in target and 
-                isinstance(target[key], dict) and 
-                isinstance(value, dict)):
-                self._deep_merge(target[key], value)
-            else:
-                target[key] = value
-    
     def _notify_changes(self, old_config: Dict[str, Any], 
                        new_config: Dict[str, Any], 
-                       source: str) -> None:
+                       source: str) -> List[str]:
         """Уведомление об изменениях конфигурации.
         
         Args:
             old_config: Старая конфигурация
             new_config: Новая конфигурация
             source: Источник изменений
-        """
-        def find_changes(old_data: Dict[str, Any], 
-                        new_data: Dict[str, Any], 
-                        prefix: str = ""):
-            changes = []
             
-            # Проверка измененных и новых ключей
-            for key, new_value in new_data.items():
-                full_key = f"{prefix}.{key}" if prefix else key
-                old_value = old_data.get(key)
-                
-                if isinstance(new_value, dict) and isinstance(old_value, dict):
-                    changes.extend(find_changes(old_value, new_value, full_key))
-                elif old_value != new_value:
-                    changes.append(ConfigChangeEvent(
-                        key=full_key,
-                        old_value=old_value,
-                        new_value=new_value,
-                        timestamp=time.time(),
-                        source=source
-                    ))
-            
-            # Проверка удаленных ключей
-            for key, old_value in old_data.items():
-                if key not in new_data:
-                    full_key = f"{prefix}.{key}" if prefix else key
-                    changes.append(ConfigChangeEvent(
-                        key=full_key,
-                        old_value=old_value,
-                        new_value=None,
-                        timestamp=time.time(),
-                        source=source
-                    ))
-            
-            return changes
-        
-        changes = find_changes(old_config, new_config)
+        Returns:
+            Список измененных ключей в точечной нотации
+        """
+        changes = _diff_trees(old_config, new_config)
+        timestamp = time.time()
         
-        for change in changes:
+        for key, old_value, new_value in changes:
+            event = ConfigChangeEvent(
+                key=key,
+                old_value=old_value,
+                new_value=new_value,
+                timestamp=timestamp,
+                source=source
+            )
             for listener in self._change_listeners:
                 try:
-                    listener(change)
+                    listener(event)
                 except Exception:
                     pass
+        
+        return [key for key, _, _ in changes]
     
     def add_change_listener(self, listener: Callable[[ConfigChangeEvent], None]) -> None:
         """Добавление слушателя изменений конфигурации.
@@ -614,36 +667,44 @@ class ConfigHelper:
         with self._lock:
             return deepcopy(self._config_data)
     
-    def update(self, data: Dict[str, Any], source: str = "bulk_update") -> None:
+    def update(self, data: Dict[str, Any], source: str = "bulk_update") -> List[str]:
         """Массовое обновление конфигурации.
         
+        Копируются только пути, затронутые обновлением, а сравнение
+        пропускает неизмененные поддеревья.
+        
         Args:
             data: Новые данные
             source: Источник изменений
+            
+        Returns:
+            Список измененных ключей в точечной нотации
         """
         with self._lock:
-            old_config = deepcopy(self._config_data)
+            old_config = self._config_data
             
             # Слияние данных
-            self._deep_merge(self._config_data, data)
+            new_config = _merge_tree(old_config, deepcopy(data))
+            if new_config is old_config:
+                return []
             
-            # Валидация
-            try:
-                self._validate_config(self._config_data)
-            except ConfigError:
-                # Откат при ошибке
-                self._config_data = old_config
-                raise
+            # Валидация до публикации: при ошибке текущее дерево не затронуто
+            self._validate_config(new_config)
+            self._config_data = new_config
             
             # Уведомление об изменениях
-            self._notify_changes(old_config, self._config_data, source)
+            return self._notify_changes(old_config, new_config, source)
     
-    def reset_to_defaults(self) -> None:
-        """Сброс конфигурации к значениям по умолчанию."""
+    def reset_to_defaults(self) -> List[str]:
+        """Сброс конфигурации к значениям по умолчанию.
+        
+        Returns:
+            Список измененных ключей в точечной нотации
+        """
         with self._lock:
-            old_config = deepcopy(self._config_data)
+            old_config = self._config_data
             self._config_data = deepcopy(self._defaults)
-            self._notify_changes(old_config, self._config_data, "reset_defaults")
+            return self._notify_changes(old_config, self._config_data, "reset_defaults")
     
     def export_config(self, file_path: str, format: Optional[ConfigFormat] = None) -> None:
         """Экспорт конфигурации в файл.
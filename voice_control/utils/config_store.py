@@ -0,0 +1,296 @@
+"""Immutable versioned configuration store.
+
+Хранилище конфигурации с неизменяемыми версионированными снимками.
+
+Читатели получают текущий снимок одним чтением ссылки, без блокировок,
+из любого потока. Писатели сериализуются: каждое изменение строит новое
+дерево (копируется только изменённый путь, остальные поддеревья
+разделяются со старым снимком), вычисляет структурный diff и уведомляет
+только подписчиков на затронутые пути.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+KeyPath = Tuple[str, ...]
+
+_MISSING = object()
+
+
+def freeze(value: Any) -> Any:
+    """Рекурсивно превращает значение в неизменяемое (dict -> mappingproxy, list -> tuple)."""
+    if isinstance(value, MappingProxyType):
+        return value
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Рекурсивно превращает неизменяемое значение обратно в dict/list."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    if isinstance(value, frozenset):
+        return set(value)
+    return value
+
+
+@dataclass(frozen=True)
+class ConfigChange:
+    """Изменение одного значения конфигурации."""
+    keys: KeyPath
+    old_value: Any
+    new_value: Any
+
+    @property
+    def added(self) -> bool:
+        """Значение появилось в конфигурации."""
+        return self.old_value is _MISSING
+
+    @property
+    def removed(self) -> bool:
+        """Значение удалено из конфигурации."""
+        return self.new_value is _MISSING
+
+
+def diff_trees(old: Any, new: Any, prefix: KeyPath = ()) -> List[ConfigChange]:
+    """Структурный diff двух замороженных деревьев.
+
+    Поддеревья, совпадающие по идентичности, пропускаются без обхода,
+    поэтому стоимость пропорциональна размеру изменённой части.
+
+    Args:
+        old: Старое дерево
+        new: Новое дерево
+        prefix: Путь к сравниваемым узлам
+
+    Returns:
+        Список изменений листовых значений
+    """
+    if old is new:
+        return []
+
+    if isinstance(old, Mapping) and isinstance(new, Mapping):
+        changes: List[ConfigChange] = []
+        for key, old_item in old.items():
+            new_item = new.get(key, _MISSING)
+            if new_item is _MISSING:
+                changes.append(ConfigChange(prefix + (key,), old_item, _MISSING))
+            else:
+                changes.extend(diff_trees(old_item, new_item, prefix + (key,)))
+        for key, new_item in new.items():
+            if key not in old:
+                changes.append(ConfigChange(prefix + (key,), _MISSING, new_item))
+        return changes
+
+    if old == new:
+        return []
+    return [ConfigChange(prefix, old, new)]
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Неизменяемый снимок конфигурации."""
+    version: int
+    data: Mapping
+    timestamp: float
+    separator: str = "/"
+
+    def get(self, path: Union[str, Sequence[str]], default: Any = None) -> Any:
+        """Получение значения по пути ("magnifier/zoom_factor" или кортеж ключей)."""
+        value: Any = self.data
+        for key in _split_path(path, self.separator):
+            if isinstance(value, Mapping) and key in value:
+                value = value[key]
+            else:
+                return default
+        return value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Изменяемая копия снимка."""
+        return thaw(self.data)
+
+
+def _split_path(path: Union[str, Sequence[str]], separator: str) -> KeyPath:
+    """Преобразование пути в кортеж ключей."""
+    if isinstance(path, str):
+        return tuple(part for part in path.split(separator) if part)
+    return tuple(path)
+
+
+ConfigSubscriber = Callable[[ConfigSnapshot, List[ConfigChange]], None]
+
+
+class ConfigStore:
+    """Хранилище конфигурации с подписками на конкретные пути.
+
+    Подписчик на путь "magnifier" вызывается при изменении любого значения
+    внутри этой секции, подписчик на "magnifier/size" - только при
+    изменении размера лупы (или замене всей секции).
+    """
+
+    def __init__(self, initial: Optional[Mapping] = None, separator: str = "/"):
+        """
+        Инициализация хранилища
+
+        Args:
+            initial: Начальная конфигурация
+            separator: Разделитель ключей в строковых путях
+        """
+        self._separator = separator
+        self._snapshot = ConfigSnapshot(
+            version=0,
+            data=freeze(initial or {}),
+            timestamp=time.time(),
+            separator=separator
+        )
+        self._write_lock = threading.RLock()
+        self._subscribers: Dict[KeyPath, List[ConfigSubscriber]] = {}
+        self._subscribers_lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """Текущий снимок (чтение без блокировки)."""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """Версия текущего снимка."""
+        return self._snapshot.version
+
+    def get(self, path: Union[str, Sequence[str]], default: Any = None) -> Any:
+        """Получение значения из текущего снимка."""
+        return self._snapshot.get(path, default)
+
+    def set(self, path: Union[str, Sequence[str]], value: Any) -> List[ConfigChange]:
+        """Установка значения по пути с копированием только этого пути.
+
+        Returns:
+            Список изменений (пустой, если значение не изменилось)
+        """
+        keys = _split_path(path, self._separator)
+        if not keys:
+            raise ValueError("Путь настройки не может быть пустым")
+
+        with self._write_lock:
+            current = self._snapshot
+            new_data = _assoc_in(current.data, keys, freeze(value))
+            return self._publish(current, new_data)
+
+    def update(self, updates: Mapping) -> List[ConfigChange]:
+        """Рекурсивное слияние вложенного словаря с текущей конфигурацией."""
+        with self._write_lock:
+            current = self._snapshot
+            new_data = _merge(current.data, updates)
+            return self._publish(current, new_data)
+
+    def replace(self, data: Mapping) -> List[ConfigChange]:
+        """Полная замена конфигурации (например, после перезагрузки файла)."""
+        with self._write_lock:
+            current = self._snapshot
+            return self._publish(current, freeze(data))
+
+    def diff(self, data: Mapping) -> List[ConfigChange]:
+        """Изменения, которые внесла бы замена конфигурации на data."""
+        return diff_trees(self._snapshot.data, freeze(data))
+
+    def subscribe(self, path: Union[str, Sequence[str]], callback: ConfigSubscriber) -> Callable[[], None]:
+        """Подписка на изменения внутри пути.
+
+        Args:
+            path: Путь ("" - вся конфигурация)
+            callback: Функция callback(snapshot, changes)
+
+        Returns:
+            Функция отмены подписки
+        """
+        keys = _split_path(path, self._separator)
+        with self._subscribers_lock:
+            self._subscribers.setdefault(keys, []).append(callback)
+
+        def unsubscribe():
+            self.unsubscribe(keys, callback)
+
+        return unsubscribe
+
+    def unsubscribe(self, path: Union[str, Sequence[str]], callback: ConfigSubscriber) -> None:
+        """Отмена подписки."""
+        keys = _split_path(path, self._separator)
+        with self._subscribers_lock:
+            callbacks = self._subscribers.get(keys)
+            if callbacks and callback in callbacks:
+                callbacks.remove(callback)
+                if not callbacks:
+                    del self._subscribers[keys]
+
+    def _publish(self, current: ConfigSnapshot, new_data: Mapping) -> List[ConfigChange]:
+        """Публикация нового снимка, если он отличается от текущего."""
+        changes = diff_trees(current.data, new_data)
+        if not changes:
+            return []
+
+        snapshot = ConfigSnapshot(
+            version=current.version + 1,
+            data=new_data,
+            timestamp=time.time(),
+            separator=self._separator
+        )
+        self._snapshot = snapshot
+        self._notify(snapshot, changes)
+        return changes
+
+    def _notify(self, snapshot: ConfigSnapshot, changes: List[ConfigChange]) -> None:
+        """Уведомление подписчиков, пути которых затронуты изменениями."""
+        with self._subscribers_lock:
+            subscribers = [(keys, list(callbacks)) for keys, callbacks in self._subscribers.items()]
+
+        for keys, callbacks in subscribers:
+            depth = len(keys)
+            relevant = [
+                change for change in changes
+                if change.keys[:depth] == keys or keys[:len(change.keys)] == change.keys
+            ]
+            if not relevant:
+                continue
+
+            for callback in callbacks:
+                try:
+                    callback(snapshot, relevant)
+                except Exception as e:
+                    logger.error(f"Ошибка в подписчике на '{self._separator.join(keys)}': {e}")
+
+
+def _assoc_in(node: Any, keys: KeyPath, value: Any) -> Mapping:
+    """Новое дерево со значением по пути; остальные поддеревья разделяются."""
+    head = keys[0]
+    children = dict(node) if isinstance(node, Mapping) else {}
+    if len(keys) == 1:
+        children[head] = value
+    else:
+        children[head] = _assoc_in(children.get(head), keys[1:], value)
+    return MappingProxyType(children)
+
+
+def _merge(node: Any, updates: Mapping) -> Mapping:
+    """Рекурсивное слияние с копированием только затронутых узлов."""
+    children = dict(node) if isinstance(node, Mapping) else {}
+    for key, value in updates.items():
+        current = children.get(key)
+        if isinstance(value, Mapping) and isinstance(current, Mapping):
+            children[key] = _merge(current, value)
+        else:
+            children[key] = freeze(value)
+    return MappingProxyType(children)
@@ -7,16 +7,23 @@
 import os
 import shutil
 import hashlib
+import bz2
+import gzip
+import zlib
 import mimetypes
 import tempfile
 import zipfile
 import tarfile
 import json
 import pickle
+import queue
+import re
 from typing import Any, Dict, List, Optional, Union, Iterator, Callable, Tuple
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 import threading
 import time
 from contextlib import contextmanager
@@ -56,9 +63,23 @@ class FileInfo:
     is_directory: bool
     permissions: str
     mime_type: Optional[str]
-    checksum: Optional[str]
     owner: Optional[str]
     group: Optional[str]
+    _checksum: Optional[str] = field(default=None, repr=False)
+    _checksum_loader: Optional[Callable[[], str]] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def checksum(self) -> Optional[str]:
+        """Контрольная сумма (вычисляется при первом обращении)."""
+        if self._checksum is None and self._checksum_loader is not None:
+            self._checksum = self._checksum_loader()
+            self._checksum_loader = None
+        return self._checksum
+    
+    @checksum.setter
+    def checksum(self, value: Optional[str]) -> None:
+        self._checksum = value
+        self._checksum_loader = None
 
 
 @dataclass
@@ -73,11 +94,91 @@ class FileOperationResult:
     bytes_processed: int
 
 
+@dataclass
+class ChecksumBatchResult:
+    """Результат пакетного вычисления контрольных сумм."""
+    checksums: Dict[str, str]
+    errors: Dict[str, str]
+    bytes_hashed: int
+    cached: int
+    duration: float
+    
+    @property
+    def throughput_mb_s(self) -> float:
+        """Скорость хэширования прочитанных данных, МБ/с."""
+        return self.bytes_hashed / (1024 * 1024) / self.duration if self.duration > 0 else 0.0
+
+
 class FileError(Exception):
     """Исключение файловых операций."""
     pass
 
 
+# Размер блока параллельного сжатия tar.gz/tar.bz2 и буфера копирования
+_ARCHIVE_BLOCK_SIZE = 1024 * 1024
+# Члены ZIP больше этого размера сжимаются потоково в основном потоке
+_ZIP_PARALLEL_MEMBER_LIMIT = 8 * 1024 * 1024
+# Суммарный размер членов ZIP, сжимаемых в памяти одновременно (сжатые
+# данные несжимаемых файлов, например записей, не меньше исходных)
+_ZIP_MAX_PENDING_BYTES = 64 * 1024 * 1024
+# Внутренние атрибуты ZipFile, нужные для записи заранее сжатых данных
+# (есть в CPython 3.6+); без них члены пишутся через ZipFile.write()
+_ZIP_RAW_WRITE_ATTRIBUTES = ("_lock", "_writecheck", "_didModify", "_writing", "start_dir", "fp")
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class _ParallelCompressedWriter:
+    """Файловый объект, сжимающий блоки данных в пуле потоков.
+    
+    Каждый блок сжимается независимо (отдельный член gzip или поток bz2),
+    результаты записываются в исходном порядке. Конкатенация таких членов -
+    корректный файл gzip/bz2, который читается стандартными модулями.
+    """
+    
+    def __init__(self, fileobj, compress: Callable[[bytes], bytes],
+                 executor: ThreadPoolExecutor, max_pending: int):
+        self._fileobj = fileobj
+        self._compress = compress
+        self._executor = executor
+        self._max_pending = max_pending
+        self._buffer = bytearray()
+        self._pending: "deque[Future]" = deque()
+    
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        while len(self._buffer) >= _ARCHIVE_BLOCK_SIZE:
+            block = bytes(self._buffer[:_ARCHIVE_BLOCK_SIZE])
+            del self._buffer[:_ARCHIVE_BLOCK_SIZE]
+            self._submit(block)
+        return len(data)
+    
+    def _submit(self, block: bytes) -> None:
+        self._pending.append(self._executor.submit(self._compress, block))
+        while len(self._pending) > self._max_pending:
+            self._fileobj.write(self._pending.popleft().result())
+    
+    def close(self) -> None:
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        while self._pending:
+            self._fileobj.write(self._pending.popleft().result())
+
+
+class _ProgressReader:
+    """Обертка файла, сообщающая о количестве прочитанных байт."""
+    
+    def __init__(self, fileobj, callback: Callable[[int], None]):
+        self._fileobj = fileobj
+        self._callback = callback
+    
+    def read(self, size: int = -1) -> bytes:
+        data = self._fileobj.read(size)
+        self._callback(len(data))
+        return data
+
+
 class FileHelper:
     """Помощник для работы с файлами.
     
@@ -116,6 +217,12 @@ class FileHelper:
         # Кэш информации о файлах
         self._file_info_cache: Dict[str, Tuple[FileInfo, float]] = {}
         self._cache_ttl = 60  # 1 минута
+        
+        # Кэш контрольных сумм по (устройство, inode, размер, mtime_ns, алгоритм):
+        # не зависит от пути и TTL, устаревает при любом изменении файла
+        self._checksum_cache: "OrderedDict[Tuple[int, int, int, int, str], str]" = OrderedDict()
+        self._checksum_cache_size = 4096
+        self._checksum_buffer_size = 1024 * 1024
     
     def _validate_path(self, file_path: str) -> str:
         """Валидация пути к файлу.
@@ -238,14 +345,13 @@ class FileHelper:
                 is_directory=os.path.isdir(validated_path),
                 permissions=stat.filemode(stat_info.st_mode),
                 mime_type=mimetypes.guess_type(validated_path)[0],
-                checksum=None,
                 owner=None,
                 group=None
             )
             
-            # Дополнительная информация для файлов
+            # Контрольная сумма вычисляется только при обращении к ней
             if not file_info.is_directory and file_info.size < self._max_file_size:
-                file_info.checksum = self.calculate_checksum(validated_path)
+                file_info._checksum_loader = lambda: self.calculate_checksum(validated_path)
             
             # Кэширование
             if use_cache:
@@ -429,12 +535,13 @@ class FileHelper:
             except Exception as e:
                 raise FileError(f"Failed to delete file: {str(e)}")
     
-    def calculate_checksum(self, file_path: str, algorithm: str = 'sha256') -> str:
+    def calculate_checksum(self, file_path: str, algorithm: str = 'sha256', use_cache: bool = True) -> str:
         """Вычисление контрольной суммы файла.
         
         Args:
             file_path: Путь к файлу
             algorithm: Алгоритм хэширования
+            use_cache: Использовать кэш контрольных сумм
             
         Returns:
             Контрольная сумма
@@ -442,17 +549,103 @@ class FileHelper:
         validated_path = self._validate_path(file_path)
         
         try:
-            hash_obj = hashlib.new(algorithm)
-            
-            with open(validated_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(8192), b""):
-                    hash_obj.update(chunk)
-            
-            return hash_obj.hexdigest()
-            
+            return self._checksum(validated_path, algorithm, use_cache)[0]
         except Exception as e:
             raise FileError(f"Failed to calculate checksum: {str(e)}")
     
+    def _checksum(self, validated_path: str, algorithm: str, use_cache: bool = True) -> Tuple[str, int, bool]:
+        """Контрольная сумма файла с учетом кэша.
+        
+        Args:
+            validated_path: Проверенный путь к файлу
+            algorithm: Алгоритм хэширования
+            use_cache: Использовать кэш контрольных сумм
+            
+        Returns:
+            Кортеж (контрольная сумма, прочитано байт, найдена ли в кэше)
+        """
+        stat_info = os.stat(validated_path)
+        key = (stat_info.st_dev, stat_info.st_ino, stat_info.st_size, stat_info.st_mtime_ns, algorithm)
+        
+        if use_cache:
+            with self._lock:
+                cached = self._checksum_cache.get(key)
+                if cached is not None:
+                    self._checksum_cache.move_to_end(key)
+                    return cached, 0, True
+        
+        hash_obj = hashlib.new(algorithm)
+        buffer = bytearray(self._checksum_buffer_size)
+        view = memoryview(buffer)
+        bytes_read = 0
+        
+        with open(validated_path, 'rb', buffering=0) as f:
+            while True:
+                size = f.readinto(buffer)
+                if not size:
+                    break
+                hash_obj.update(view[:size])
+                bytes_read += size
+        
+        checksum = hash_obj.hexdigest()
+        with self._lock:
+            self._checksum_cache[key] = checksum
+            self._checksum_cache.move_to_end(key)
+            while len(self._checksum_cache) > self._checksum_cache_size:
+                self._checksum_cache.popitem(last=False)
+        
+        return checksum, bytes_read, False
+    
+    def checksum_many(self, file_paths: List[str],
+                      algorithm: str = 'sha256',
+                      max_workers: Optional[int] = None,
+                      use_cache: bool = True) -> ChecksumBatchResult:
+        """Вычисление контрольных сумм нескольких файлов в пуле потоков.
+        
+        hashlib освобождает GIL при хэшировании больших буферов, поэтому
+        файлы хэшируются параллельно.
+        
+        Args:
+            file_paths: Пути к файлам
+            algorithm: Алгоритм хэширования
+            max_workers: Количество потоков
+            use_cache: Использовать кэш контрольных сумм
+            
+        Returns:
+            Контрольные суммы, ошибки и скорость хэширования
+        """
+        checksums: Dict[str, str] = {}
+        errors: Dict[str, str] = {}
+        bytes_hashed = 0
+        cached = 0
+        start_time = time.time()
+        
+        def hash_one(file_path: str) -> Tuple[str, int, bool]:
+            return self._checksum(self._validate_path(file_path), algorithm, use_cache)
+        
+        workers = max_workers or min(8, os.cpu_count() or 1)
+        with self._operation_timer(FileOperation.READ, f"checksum_many[{len(file_paths)}]") as track_bytes:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="FileChecksum") as executor:
+                futures = [(file_path, executor.submit(hash_one, file_path)) for file_path in file_paths]
+                for file_path, future in futures:
+                    try:
+                        checksum, bytes_read, from_cache = future.result()
+                    except Exception as e:
+                        errors[file_path] = str(e)
+                        continue
+                    checksums[file_path] = checksum
+                    bytes_hashed += bytes_read
+                    cached += from_cache
+            track_bytes(bytes_hashed)
+        
+        return ChecksumBatchResult(
+            checksums=checksums,
+            errors=errors,
+            bytes_hashed=bytes_hashed,
+            cached=cached,
+            duration=time.time() - start_time
+        )
+    
     def find_files(self, directory: str, 
                    pattern: str = "*",
                    recursive: bool = True,
@@ -468,99 +661,447 @@ class FileHelper:
         Returns:
             Список найденных файлов
         """
+        return list(self.iter_files(directory, pattern, recursive=recursive, include_dirs=include_dirs))
+    
+    def iter_files(self, directory: str,
+                   pattern: str = "*",
+                   recursive: bool = True,
+                   include_dirs: bool = False,
+                   min_size: Optional[int] = None,
+                   max_size: Optional[int] = None,
+                   modified_after: Optional[float] = None,
+                   modified_before: Optional[float] = None,
+                   limit: Optional[int] = None,
+                   parallel: bool = False,
+                   max_workers: Optional[int] = None) -> Iterator[str]:
+        """Потоковый поиск файлов на основе os.scandir.
+        
+        Совпадения возвращаются по мере обнаружения. Фильтры по размеру и
+        времени изменения вычисляются по DirEntry.stat(), который вызывается
+        только при заданных фильтрах. Символические ссылки на директории
+        не обходятся (как в os.walk).
+        
+        Args:
+            directory: Директория для поиска
+            pattern: Шаблон имени
+            recursive: Рекурсивный поиск
+            include_dirs: Включить директории (фильтры размера к ним не применяются)
+            min_size: Минимальный размер файла, байты
+            max_size: Максимальный размер файла, байты
+            modified_after: Изменен не раньше (timestamp)
+            modified_before: Изменен не позже (timestamp)
+            limit: Максимальное количество результатов
+            parallel: Обходить поддиректории верхнего уровня в пуле потоков
+                (порядок результатов не определен)
+            max_workers: Количество потоков для parallel
+            
+        Returns:
+            Итератор путей
+            
+        Raises:
+            FileError: При недопустимом пути или ошибке чтения директории
+        """
         validated_dir = self._validate_path(directory)
+        if not os.path.isdir(validated_dir):
+            raise FileError(f"Failed to find files: not a directory: {directory}")
         
+        match_name = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+        check_stat = any(value is not None for value in (min_size, max_size, modified_after, modified_before))
+        
+        def matches(entry: os.DirEntry, is_dir: bool) -> bool:
+            if not match_name(os.path.normcase(entry.name)):
+                return False
+            if not check_stat:
+                return True
+            stat_info = entry.stat()
+            if not is_dir:
+                if min_size is not None and stat_info.st_size < min_size:
+                    return False
+                if max_size is not None and stat_info.st_size > max_size:
+                    return False
+            if modified_after is not None and stat_info.st_mtime < modified_after:
+                return False
+            if modified_before is not None and stat_info.st_mtime > modified_before:
+                return False
+            return True
+        
+        if parallel and recursive:
+            walker = self._walk_parallel(validated_dir, matches, include_dirs, max_workers)
+        else:
+            walker = self._walk(validated_dir, matches, recursive, include_dirs)
+        
+        if limit is None:
+            return walker
+        return self._take(walker, limit)
+    
+    @staticmethod
+    def _take(walker: Iterator[str], limit: int) -> Iterator[str]:
+        """Первые limit результатов с закрытием обхода."""
         try:
-            found_files = []
-            
-            if recursive:
-                for root, dirs, files in os.walk(validated_dir):
-                    # Файлы
-                    for file in files:
-                        if fnmatch.fnmatch(file, pattern):
-                            found_files.append(os.path.join(root, file))
-                    
-                    # Директории
-                    if include_dirs:
-                        for dir_name in dirs:
-                            if fnmatch.fnmatch(dir_name, pattern):
-                                found_files.append(os.path.join(root, dir_name))
-            else:
-                for item in os.listdir(validated_dir):
-                    item_path = os.path.join(validated_dir, item)
-                    
-                    if fnmatch.fnmatch(item, pattern):
-                        if os.path.isfile(item_path) or (include_dirs and os.path.isdir(item_path)):
-                            found_files.append(item_path)
+            for index, path in enumerate(walker):
+                if index >= limit:
+                    break
+                yield path
+        finally:
+            walker.close()
+    
+    @staticmethod
+    def _scan_entries(top: str,
+                      recursive: bool = True,
+                      stop: Optional[threading.Event] = None,
+                      top_level: bool = True) -> Iterator[Tuple[os.DirEntry, bool]]:
+        """Обход директории в глубину через os.scandir.
+        
+        Args:
+            top: Начальная директория
+            recursive: Обходить поддиректории
+            stop: Событие досрочной остановки
+            top_level: Ошибка чтения начальной директории приводит к FileError
+            
+        Returns:
+            Итератор пар (запись, является ли директорией)
+        """
+        pending = [top]
+        while pending:
+            if stop is not None and stop.is_set():
+                return
+            current = pending.pop()
+            try:
+                scanner = os.scandir(current)
+            except OSError as e:
+                if top_level and current == top:
+                    raise FileError(f"Failed to find files: {str(e)}")
+                continue
             
-            return found_files
+            subdirs = []
+            with scanner:
+                for entry in scanner:
+                    try:
+                        is_dir = entry.is_dir()
+                        # Символические ссылки на директории не обходятся (как в os.walk)
+                        if is_dir and recursive and not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    except OSError:
+                        # Запись удалена или недоступна во время обхода
+                        continue
+                    yield entry, is_dir
             
-        except Exception as e:
+            # Обратный порядок сохраняет порядок обхода директорий при pop()
+            pending.extend(reversed(subdirs))
+    
+    def _walk(self, top: str,
+              matches: Callable[[os.DirEntry, bool], bool],
+              recursive: bool,
+              include_dirs: bool,
+              stop: Optional[threading.Event] = None,
+              top_level: bool = True) -> Iterator[str]:
+        """Пути записей, прошедших фильтр.
+        
+        Args:
+            top: Начальная директория
+            matches: Фильтр записей
+            recursive: Обходить поддиректории
+            include_dirs: Возвращать директории
+            stop: Событие досрочной остановки
+            top_level: Ошибка чтения начальной директории приводит к FileError
+            
+        Returns:
+            Итератор путей
+        """
+        for entry, is_dir in self._scan_entries(top, recursive, stop, top_level):
+            if is_dir and not include_dirs:
+                continue
+            try:
+                if matches(entry, is_dir):
+                    yield entry.path
+            except OSError:
+                continue
+    
+    def _walk_parallel(self, top: str,
+                       matches: Callable[[os.DirEntry, bool], bool],
+                       include_dirs: bool,
+                       max_workers: Optional[int]) -> Iterator[str]:
+        """Обход поддиректорий верхнего уровня в пуле потоков.
+        
+        Результаты передаются через ограниченную очередь, поэтому обход
+        не опережает потребителя; при закрытии итератора потоки останавливаются.
+        
+        Args:
+            top: Начальная директория
+            matches: Фильтр записей
+            include_dirs: Возвращать директории
+            max_workers: Количество потоков
+            
+        Returns:
+            Итератор путей
+        """
+        top_dirs = []
+        for path in self._walk(top, matches, False, include_dirs):
+            yield path
+        try:
+            with os.scandir(top) as scanner:
+                top_dirs = [entry.path for entry in scanner
+                            if entry.is_dir() and not entry.is_symlink()]
+        except OSError as e:
             raise FileError(f"Failed to find files: {str(e)}")
+        if not top_dirs:
+            return
+        
+        results: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=1024)
+        stop = threading.Event()
+        
+        def walk_subtree(subdir: str) -> None:
+            try:
+                for path in self._walk(subdir, matches, True, include_dirs, stop, top_level=False):
+                    while not stop.is_set():
+                        try:
+                            results.put(path, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+            finally:
+                # Маркер завершения не нужен, если потребитель уже закрыл итератор
+                while not stop.is_set():
+                    try:
+                        results.put(None, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+        
+        workers = max_workers or min(8, (os.cpu_count() or 1) + 2)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="FileWalker")
+        try:
+            for subdir in top_dirs:
+                executor.submit(walk_subtree, subdir)
+            
+            remaining = len(top_dirs)
+            while remaining:
+                path = results.get()
+                if path is None:
+                    remaining -= 1
+                else:
+                    yield path
+        finally:
+            stop.set()
+            # Освобождаем потоки, ожидающие места в очереди
+            while True:
+                try:
+                    results.get_nowait()
+                except queue.Empty:
+                    break
+            # Еще не начатые поддиревья не обходятся
+            executor.shutdown(wait=False, cancel_futures=True)
     
     def compress_files(self, file_paths: List[str], 
                       archive_path: str,
                       format: CompressionFormat = CompressionFormat.ZIP,
-                      compression_level: int = 6) -> None:
+                      compression_level: int = 6,
+                      max_workers: Optional[int] = None,
+                      progress: Optional[ProgressCallback] = None) -> None:
         """Сжатие файлов в архив.
         
+        Сжатие выполняется в пуле потоков (zlib и bz2 освобождают GIL):
+        для ZIP параллельно сжимаются отдельные файлы, для tar.gz/tar.bz2 -
+        блоки потока tar. Результат записывается в архив по мере готовности.
+        
         Args:
             file_paths: Список путей к файлам
             archive_path: Путь к архиву
             format: Формат сжатия
             compression_level: Уровень сжатия
+            max_workers: Количество потоков сжатия
+            progress: Вызывается с (обработано байт, всего байт)
         """
         validated_archive = self._validate_path(archive_path)
-        validated_files = [self._validate_path(fp) for fp in file_paths]
+        validated_files = [fp for fp in (self._validate_path(fp) for fp in file_paths) if os.path.exists(fp)]
+        workers = max_workers or min(8, (os.cpu_count() or 1) + 1)
         
         with self._operation_timer(FileOperation.COMPRESS, 
                                  ",".join(file_paths), validated_archive) as log_bytes:
             try:
-                total_size = 0
+                base_path = os.path.commonpath(validated_files) if validated_files else ""
+                if len(validated_files) == 1:
+                    base_path = os.path.dirname(base_path)
+                members = [(fp, os.path.relpath(fp, base_path)) for fp in validated_files]
+                total_size = sum(os.path.getsize(fp) for fp in validated_files)
+                done = 0
                 
-                if format == CompressionFormat.ZIP:
-                    with zipfile.ZipFile(validated_archive, 'w', 
-                                        compression=zipfile.ZIP_DEFLATED,
-                                        compresslevel=compression_level) as zf:
-                        for file_path in validated_files:
-                            if os.path.exists(file_path):
-                                arcname = os.path.relpath(file_path, 
-                                                         os.path.commonpath(validated_files))
-                                zf.write(file_path, arcname)
-                                total_size += os.path.getsize(file_path)
+                def advance(size: int) -> None:
+                    nonlocal done
+                    done += size
+                    if progress:
+                        progress(done, total_size)
                 
-                elif format in [CompressionFormat.TAR, CompressionFormat.TAR_GZ, CompressionFormat.TAR_BZ2]:
-                    mode_map = {
-                        CompressionFormat.TAR: 'w',
-                        CompressionFormat.TAR_GZ: 'w:gz',
-                        CompressionFormat.TAR_BZ2: 'w:bz2'
-                    }
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="FileCompress") as executor:
+                    if format == CompressionFormat.ZIP:
+                        self._write_zip(members, validated_archive, compression_level,
+                                        executor, workers * 2, advance)
                     
-                    with tarfile.open(validated_archive, mode_map[format]) as tf:
-                        for file_path in validated_files:
-                            if os.path.exists(file_path):
-                                arcname = os.path.relpath(file_path,
-                                                         os.path.commonpath(validated_files))
-                                tf.add(file_path, arcname)
-                                total_size += os.path.getsize(file_path)
+                    elif format in [CompressionFormat.TAR, CompressionFormat.TAR_GZ, CompressionFormat.TAR_BZ2]:
+                        self._write_tar(members, validated_archive, format, compression_level,
+                                        executor, workers * 2, advance)
+                    
+                    else:
+                        raise FileError(f"Unsupported archive format: {format}")
                 
                 log_bytes(total_size)
                 
             except Exception as e:
                 raise FileError(f"Failed to compress files: {str(e)}")
     
+    @staticmethod
+    def _write_zip(members: List[Tuple[str, str]],
+                   archive_path: str,
+                   compression_level: int,
+                   executor: ThreadPoolExecutor,
+                   max_pending: int,
+                   advance: Callable[[int], None]) -> None:
+        """Запись ZIP архива с параллельным сжатием файлов.
+        
+        Члены сжимаются в памяти целиком, поэтому объем одновременно
+        сжимаемых данных ограничен _ZIP_MAX_PENDING_BYTES, а крупные файлы
+        сжимаются потоково через ZipFile.write().
+        
+        Args:
+            members: Пары (путь к файлу, имя в архиве)
+            archive_path: Путь к архиву
+            compression_level: Уровень сжатия
+            executor: Пул потоков сжатия
+            max_pending: Максимальное количество сжимаемых одновременно файлов
+            advance: Учет обработанных байт
+        """
+        def deflate(file_path: str) -> Tuple[bytes, int, int]:
+            compressor = zlib.compressobj(compression_level, zlib.DEFLATED, -15)
+            chunks = []
+            crc = 0
+            size = 0
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(_ARCHIVE_BLOCK_SIZE), b""):
+                    crc = zlib.crc32(block, crc)
+                    size += len(block)
+                    chunks.append(compressor.compress(block))
+            chunks.append(compressor.flush())
+            return b"".join(chunks), crc, size
+        
+        with zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_DEFLATED,
+                             compresslevel=compression_level) as zf:
+            pending: "deque[Tuple[zipfile.ZipInfo, Future]]" = deque()
+            pending_bytes = 0
+            raw_write = all(hasattr(zf, name) for name in _ZIP_RAW_WRITE_ATTRIBUTES)
+            
+            def write_ready(limit: int, byte_limit: int) -> None:
+                nonlocal pending_bytes
+                while pending and (len(pending) > limit or pending_bytes > byte_limit):
+                    zinfo, future = pending.popleft()
+                    pending_bytes -= zinfo.file_size
+                    data, crc, size = future.result()
+                    zinfo.CRC, zinfo.file_size, zinfo.compress_size = crc, size, len(data)
+                    FileHelper._write_zip_member(zf, zinfo, data)
+                    advance(size)
+            
+            for file_path, arcname in members:
+                zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+                if not raw_write or zinfo.is_dir() or zinfo.file_size > _ZIP_PARALLEL_MEMBER_LIMIT:
+                    # Порядок записи сохраняется: сначала готовые члены
+                    write_ready(0, 0)
+                    zf.write(file_path, arcname)
+                    advance(zinfo.file_size)
+                    continue
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+                pending.append((zinfo, executor.submit(deflate, file_path)))
+                pending_bytes += zinfo.file_size
+                write_ready(max_pending, _ZIP_MAX_PENDING_BYTES)
+            write_ready(0, 0)
+    
+    @staticmethod
+    def _write_zip_member(zf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, data: bytes) -> None:
+        """Запись заранее сжатых (raw deflate) данных члена ZIP.
+        
+        zipfile не принимает сжатые данные напрямую, поэтому локальный
+        заголовок и данные записываются так же, как это делает ZipFile.write().
+        Использует внутренние атрибуты ZipFile (_ZIP_RAW_WRITE_ATTRIBUTES),
+        проверено на CPython 3.6-3.13; при их отсутствии _write_zip
+        использует ZipFile.write().
+        
+        Args:
+            zf: Открытый на запись архив
+            zinfo: Информация о члене с заполненными CRC и размерами
+            data: Сжатые данные
+        """
+        zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+        with zf._lock:
+            if zf._writing:
+                raise ValueError("Can't write to ZIP archive while an open writing handle exists")
+            zf._writecheck(zinfo)
+            zf._didModify = True
+            zinfo.header_offset = zf.fp.tell()
+            zf.fp.write(zinfo.FileHeader(zip64))
+            zf.fp.write(data)
+            zf.filelist.append(zinfo)
+            zf.NameToInfo[zinfo.filename] = zinfo
+            zf.start_dir = zf.fp.tell()
+    
+    @staticmethod
+    def _write_tar(members: List[Tuple[str, str]],
+                   archive_path: str,
+                   format: CompressionFormat,
+                   compression_level: int,
+                   executor: ThreadPoolExecutor,
+                   max_pending: int,
+                   advance: Callable[[int], None]) -> None:
+        """Запись tar архива с параллельным сжатием блоков.
+        
+        Args:
+            members: Пары (путь к файлу, имя в архиве)
+            archive_path: Путь к архиву
+            format: Формат архива
+            compression_level: Уровень сжатия
+            executor: Пул потоков сжатия
+            max_pending: Максимальное количество сжимаемых одновременно блоков
+            advance: Учет обработанных байт
+        """
+        compressors = {
+            CompressionFormat.TAR_GZ: lambda block: gzip.compress(block, compression_level, mtime=0),
+            CompressionFormat.TAR_BZ2: lambda block: bz2.compress(block, max(1, compression_level)),
+        }
+        
+        with open(archive_path, 'wb') as raw:
+            target = raw
+            if format in compressors:
+                target = _ParallelCompressedWriter(raw, compressors[format], executor, max_pending)
+            
+            with tarfile.open(fileobj=target, mode='w|') as tf:
+                for file_path, arcname in members:
+                    tf.add(file_path, arcname)
+                    advance(os.path.getsize(file_path) if os.path.isfile(file_path) else 0)
+            
+            if target is not raw:
+                target.close()
+    
     def extract_archive(self, archive_path: str, 
                        extract_to: str,
-                       format: Optional[CompressionFormat] = None) -> List[str]:
+                       format: Optional[CompressionFormat] = None,
+                       max_workers: Optional[int] = None,
+                       progress: Optional[ProgressCallback] = None) -> List[str]:
         """Извлечение архива.
         
+        Члены ZIP извлекаются параллельно (у каждого потока свой дескриптор
+        архива), tar архивы - потоково за один проход. Члены с абсолютными
+        путями, выходом за пределы директории или ссылками наружу отклоняются.
+        
         Args:
             archive_path: Путь к архиву
             extract_to: Директория для извлечения
             format: Формат архива (автоопределение если None)
+            max_workers: Количество потоков извлечения ZIP
+            progress: Вызывается с (обработано байт, всего байт); для tar -
+                байты сжатого архива
             
         Returns:
             Список извлеченных файлов
+            
+        Raises:
+            FileError: При ошибке или небезопасном пути в архиве
         """
         validated_archive = self._validate_path(archive_path)
         validated_extract_to = self._validate_path(extract_to)
@@ -568,9 +1109,6 @@ class FileHelper:
         with self._operation_timer(FileOperation.EXTRACT, 
                                  validated_archive, validated_extract_to) as log_bytes:
             try:
-                extracted_files = []
-                total_size = 0
-                
                 # Автоопределение формата
                 if format is None:
                     if archive_path.endswith('.zip'):
@@ -588,27 +1126,15 @@ class FileHelper:
                 os.makedirs(validated_extract_to, exist_ok=True)
                 
                 if format == CompressionFormat.ZIP:
-                    with zipfile.ZipFile(validated_archive, 'r') as zf:
-                        for member in zf.namelist():
-                            extracted_path = zf.extract(member, validated_extract_to)
-                            extracted_files.append(extracted_path)
-                            if os.path.isfile(extracted_path):
-                                total_size += os.path.getsize(extracted_path)
+                    extracted_files, total_size = self._extract_zip(
+                        validated_archive, validated_extract_to, max_workers, progress)
                 
                 elif format in [CompressionFormat.TAR, CompressionFormat.TAR_GZ, CompressionFormat.TAR_BZ2]:
-                    mode_map = {
-                        CompressionFormat.TAR: 'r',
-                        CompressionFormat.TAR_GZ: 'r:gz',
-                        CompressionFormat.TAR_BZ2: 'r:bz2'
-                    }
-                    
-                    with tarfile.open(validated_archive, mode_map[format]) as tf:
-                        for member in tf.getmembers():
-                            tf.extract(member, validated_extract_to)
-                            extracted_path = os.path.join(validated_extract_to, member.name)
-                            extracted_files.append(extracted_path)
-                            if member.isfile():
-                                total_size += member.size
+                    extracted_files, total_size = self._extract_tar(
+                        validated_archive, validated_extract_to, format, progress)
+                
+                else:
+                    raise FileError(f"Unsupported archive format: {format}")
                 
                 log_bytes(total_size)
                 return extracted_files
@@ -616,6 +1142,151 @@ class FileHelper:
             except Exception as e:
                 raise FileError(f"Failed to extract archive: {str(e)}")
     
+    @staticmethod
+    def _safe_member_path(extract_to: str, member_name: str) -> str:
+        """Путь извлечения члена архива с проверкой выхода за директорию.
+        
+        Args:
+            extract_to: Директория извлечения (абсолютный путь)
+            member_name: Имя члена архива
+            
+        Returns:
+            Абсолютный путь для извлечения
+            
+        Raises:
+            FileError: При абсолютном пути или выходе за пределы директории
+        """
+        normalized_name = member_name.replace('\\', '/')
+        if normalized_name.startswith('/') or os.path.splitdrive(normalized_name)[0]:
+            raise FileError(f"Unsafe absolute path in archive: {member_name}")
+        
+        root = os.path.realpath(extract_to)
+        target = os.path.realpath(os.path.join(root, normalized_name))
+        if os.path.commonpath([root, target]) != root:
+            raise FileError(f"Unsafe path in archive: {member_name}")
+        return target
+    
+    def _extract_zip(self, archive_path: str,
+                     extract_to: str,
+                     max_workers: Optional[int],
+                     progress: Optional[ProgressCallback]) -> Tuple[List[str], int]:
+        """Параллельное извлечение ZIP архива.
+        
+        Returns:
+            Кортеж (извлеченные пути, распакованный объем)
+        """
+        with zipfile.ZipFile(archive_path, 'r') as zf:
+            infos = zf.infolist()
+        
+        # Все пути проверяются до записи первого файла
+        targets = [(info, self._safe_member_path(extract_to, info.filename)) for info in infos]
+        total_size = sum(info.file_size for info in infos)
+        done = 0
+        progress_lock = threading.Lock()
+        
+        for info, target in targets:
+            os.makedirs(target if info.is_dir() else os.path.dirname(target), exist_ok=True)
+        
+        local = threading.local()
+        open_archives: List[zipfile.ZipFile] = []
+        
+        def extract_member(info: zipfile.ZipInfo, target: str) -> None:
+            nonlocal done
+            archive = getattr(local, 'archive', None)
+            if archive is None:
+                archive = local.archive = zipfile.ZipFile(archive_path, 'r')
+                with progress_lock:
+                    open_archives.append(archive)
+            
+            with archive.open(info) as source, open(target, 'wb') as destination:
+                while True:
+                    block = source.read(_ARCHIVE_BLOCK_SIZE)
+                    if not block:
+                        break
+                    destination.write(block)
+                    if progress:
+                        with progress_lock:
+                            done += len(block)
+                            progress(done, total_size)
+        
+        files = [(info, target) for info, target in targets if not info.is_dir()]
+        workers = max_workers or min(8, (os.cpu_count() or 1) + 1)
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="FileExtract") as executor:
+                # Крупные файлы первыми - меньше простой в конце
+                files.sort(key=lambda item: item[0].file_size, reverse=True)
+                futures = [executor.submit(extract_member, info, target) for info, target in files]
+                for future in futures:
+                    future.result()
+        finally:
+            for archive in open_archives:
+                archive.close()
+        
+        return [target for _, target in targets], total_size
+    
+    def _extract_tar(self, archive_path: str,
+                     extract_to: str,
+                     format: CompressionFormat,
+                     progress: Optional[ProgressCallback]) -> Tuple[List[str], int]:
+        """Потоковое извлечение tar архива за один проход.
+        
+        Returns:
+            Кортеж (извлеченные пути, распакованный объем)
+        """
+        # gzip/bz2 модули читают многочленные файлы (в т.ч. созданные compress_files),
+        # потоковый режим tarfile - только один член
+        decompressors = {
+            CompressionFormat.TAR_GZ: lambda fileobj: gzip.GzipFile(fileobj=fileobj, mode='rb'),
+            CompressionFormat.TAR_BZ2: lambda fileobj: bz2.BZ2File(fileobj, mode='rb')
+        }
+        archive_size = os.path.getsize(archive_path)
+        read_bytes = 0
+        
+        def advance(size: int) -> None:
+            nonlocal read_bytes
+            read_bytes += size
+            if progress and size:
+                progress(read_bytes, archive_size)
+        
+        extracted_files = []
+        total_size = 0
+        with open(archive_path, 'rb') as raw:
+            source_stream = _ProgressReader(raw, advance)
+            if format in decompressors:
+                source_stream = decompressors[format](source_stream)
+            with tarfile.open(fileobj=source_stream, mode='r|') as tf:
+                for member in tf:
+                    target = self._safe_member_path(extract_to, member.name)
+                    
+                    if member.isdir():
+                        os.makedirs(target, exist_ok=True)
+                    elif member.isfile():
+                        os.makedirs(os.path.dirname(target), exist_ok=True)
+                        source = tf.extractfile(member)
+                        with open(target, 'wb') as destination:
+                            shutil.copyfileobj(source, destination, _ARCHIVE_BLOCK_SIZE)
+                        os.chmod(target, member.mode & 0o755 | stat.S_IRUSR | stat.S_IWUSR)
+                        total_size += member.size
+                    elif member.issym() or member.islnk():
+                        # Ссылка должна указывать внутрь директории извлечения
+                        link_base = os.path.dirname(target) if member.issym() else extract_to
+                        link_target = os.path.realpath(os.path.join(link_base, member.linkname))
+                        root = os.path.realpath(extract_to)
+                        if os.path.isabs(member.linkname) or os.path.commonpath([root, link_target]) != root:
+                            raise FileError(f"Unsafe link in archive: {member.name} -> {member.linkname}")
+                        os.makedirs(os.path.dirname(target), exist_ok=True)
+                        if hasattr(tarfile, 'data_filter'):
+                            tf.extract(member, extract_to, set_attrs=False, filter='data')
+                        else:
+                            tf.extract(member, extract_to, set_attrs=False)
+                    else:
+                        # Устройства и FIFO не извлекаются
+                        continue
+                    
+                    extracted_files.append(target)
+        
+        return extracted_files, total_size
+    
     @contextmanager
     def temporary_file(self, suffix: str = "", prefix: str = "tmp", 
                       directory: Optional[str] = None, text: bool = True):
@@ -659,16 +1330,37 @@ class FileHelper:
                 except OSError:
                     pass
     
-    def cleanup_temp_files(self) -> None:
-        """Очистка временных файлов."""
+    def cleanup_temp_files(self, max_age: Optional[float] = None) -> int:
+        """Очистка временных файлов.
+        
+        Args:
+            max_age: Также удалить файлы старше max_age секунд из временной
+                директории базовой директории (остаются после аварийного завершения)
+            
+        Returns:
+            Количество удаленных файлов
+        """
+        removed = 0
         with self._lock:
             for temp_file in self._temp_files[:]:
                 try:
                     if os.path.exists(temp_file):
                         os.unlink(temp_file)
+                        removed += 1
                     self._temp_files.remove(temp_file)
                 except OSError:
                     pass
+        
+        temp_dir = os.path.join(self._base_directory, "temp") if self._base_directory else None
+        if max_age is not None and temp_dir and os.path.isdir(temp_dir):
+            for temp_file in self.iter_files(temp_dir, modified_before=time.time() - max_age):
+                try:
+                    os.unlink(temp_file)
+                    removed += 1
+                except OSError:
+                    pass
+        
+        return removed
     
     def get_directory_size(self, directory: str) -> int:
         """Получение размера директории.
@@ -684,13 +1376,13 @@ class FileHelper:
         try:
             total_size = 0
             
-            for dirpath, dirnames, filenames in os.walk(validated_dir):
-                for filename in filenames:
-                    file_path = os.path.join(dirpath, filename)
-                    try:
-                        total_size += os.path.getsize(file_path)
-                    except OSError:
-                        pass
+            for entry, is_dir in self._scan_entries(validated_dir):
+                if is_dir:
+                    continue
+                try:
+                    total_size += entry.stat().st_size
+                except OSError:
+                    pass
             
             return total_size
             
@@ -808,6 +1500,7 @@ class FileHelper:
                 'total_duration': total_duration,
                 'average_duration': total_duration / len(self._operation_log),
                 'cache_size': len(self._file_info_cache),
+                'checksum_cache_size': len(self._checksum_cache),
                 'temp_files_count': len(self._temp_files)
             }
     
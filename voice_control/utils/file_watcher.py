@@ -0,0 +1,468 @@
+"""File Watch Service for voice control system.
+
+Общий для процесса сервис наблюдения за файлами конфигурации.
+Один фоновый поток обслуживает все наблюдаемые файлы: на Linux события
+приходят через inotify (поток спит, пока файлы не меняются), на остальных
+платформах используется опрос с настраиваемым интервалом. Серии событий
+объединяются (debounce), подписчики уведомляются только о файлах,
+содержимое которых действительно изменилось.
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import logging
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+
+FileSignature = Optional[Tuple[int, int, int]]
+
+# Флаги inotify (linux/inotify.h)
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_MOVE_SELF = 0x00000800
+_IN_IGNORED = 0x00008000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM |
+               _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_MOVE_SELF)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Минимальная обертка над inotify через ctypes."""
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._ctypes = ctypes
+
+    def add_watch(self, directory: str) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(self._ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        return wd
+
+    def remove_watch(self, wd: int) -> None:
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """Чтение накопленных событий: (wd, mask, имя файла)."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+            if not data:
+                break
+
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0").decode(sys.getfilesystemencoding(), "replace")
+                offset += length
+                events.append((wd, mask, name))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _CallbackRef:
+    """Ссылка на callback; связанные методы хранятся через weakref."""
+
+    def __init__(self, callback: Callable[[str], None]):
+        if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+            self._ref = weakref.WeakMethod(callback)
+            self._strong = None
+        else:
+            self._ref = None
+            self._strong = callback
+
+    def get(self) -> Optional[Callable[[str], None]]:
+        return self._strong if self._ref is None else self._ref()
+
+
+class FileWatchService:
+    """Сервис наблюдения за файлами с одним потоком на процесс.
+
+    Пример:
+        service = get_file_watch_service()
+        watch_id = service.watch("config/app.json", on_changed)
+        ...
+        service.unwatch(watch_id)
+    """
+
+    def __init__(self,
+                 debounce_interval: float = 0.2,
+                 poll_interval: float = 1.0,
+                 use_inotify: Optional[bool] = None):
+        """Инициализация сервиса.
+
+        Args:
+            debounce_interval: Пауза после последнего события перед уведомлением (сек)
+            poll_interval: Интервал опроса для режима без inotify (сек)
+            use_inotify: Использовать inotify (None - автоматически на Linux)
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._debounce_interval = debounce_interval
+        self._poll_interval = poll_interval
+        self._use_inotify = sys.platform.startswith("linux") if use_inotify is None else use_inotify
+
+        self._lock = threading.RLock()
+        self._next_id = 1
+        self._watches: Dict[int, Tuple[str, _CallbackRef]] = {}
+        self._by_path: Dict[str, Set[int]] = {}
+        self._signatures: Dict[str, FileSignature] = {}
+        self._pending: Dict[str, float] = {}
+
+        # Пути, за которыми следим опросом (все - в режиме опроса; в режиме
+        # inotify - только файлы в несуществующих или удаленных директориях,
+        # пока директория не появится снова)
+        self._polled_paths: Set[str] = set()
+        self._next_poll_at = 0.0
+
+        self._inotify: Optional[_Inotify] = None
+        self._dir_watches: Dict[str, int] = {}
+        self._wd_dirs: Dict[int, str] = {}
+        self._dir_refcount: Dict[str, int] = {}
+
+        self._thread: Optional[threading.Thread] = None
+        self._wake_event = threading.Event()
+        self._wake_r, self._wake_w = os.pipe()
+        self._stopped = False
+
+        self._stats = {"events": 0, "polls": 0, "notifications": 0, "suppressed": 0}
+
+    def watch(self, path: str, callback: Callable[[str], None]) -> int:
+        """Начало наблюдения за файлом.
+
+        Args:
+            path: Путь к файлу
+            callback: Функция callback(path), вызываемая после изменения файла
+
+        Returns:
+            Идентификатор наблюдения
+        """
+        abs_path = os.path.abspath(path)
+
+        with self._lock:
+            watch_id = self._next_id
+            self._next_id += 1
+            self._watches[watch_id] = (abs_path, _CallbackRef(callback))
+
+            if abs_path not in self._by_path:
+                self._by_path[abs_path] = set()
+                self._signatures[abs_path] = self._signature(abs_path)
+                self._add_backend_watch(abs_path)
+            self._by_path[abs_path].add(watch_id)
+
+            self._ensure_thread()
+            self._wake()
+
+        self._logger.debug(f"Watching file: {abs_path}")
+        return watch_id
+
+    def unwatch(self, watch_id: int) -> None:
+        """Прекращение наблюдения.
+
+        Args:
+            watch_id: Идентификатор, возвращенный watch()
+        """
+        with self._lock:
+            entry = self._watches.pop(watch_id, None)
+            if entry is None:
+                return
+
+            abs_path = entry[0]
+            ids = self._by_path.get(abs_path)
+            if ids is not None:
+                ids.discard(watch_id)
+                if not ids:
+                    del self._by_path[abs_path]
+                    self._signatures.pop(abs_path, None)
+                    self._pending.pop(abs_path, None)
+                    self._remove_backend_watch(abs_path)
+            self._wake()
+
+    def stop(self) -> None:
+        """Остановка сервиса и освобождение ресурсов."""
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+            self._wake()
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+
+        with self._lock:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+            self._dir_watches.clear()
+            self._wd_dirs.clear()
+            self._dir_refcount.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Статистика сервиса."""
+        with self._lock:
+            return {
+                "backend": "inotify" if self._inotify is not None else "polling",
+                "watched_files": len(self._by_path),
+                "watches": len(self._watches),
+                "polled_files": len(self._polled_paths),
+                "thread_alive": self._thread is not None and self._thread.is_alive(),
+                **self._stats
+            }
+
+    def _signature(self, path: str) -> FileSignature:
+        """Сигнатура содержимого файла (mtime_ns, размер, inode)."""
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            return None
+
+    def _add_backend_watch(self, abs_path: str) -> None:
+        """Регистрация файла в inotify (через директорию) или в опросе."""
+        if self._use_inotify and self._inotify is None:
+            try:
+                self._inotify = _Inotify()
+            except Exception as e:
+                self._logger.warning(f"inotify unavailable, falling back to polling: {e}")
+                self._use_inotify = False
+
+        if self._inotify is None or not self._add_directory_watch(abs_path):
+            self._polled_paths.add(abs_path)
+
+    def _add_directory_watch(self, abs_path: str) -> bool:
+        """Наблюдение за файлом через inotify его директории.
+
+        Args:
+            abs_path: Путь к файлу
+
+        Returns:
+            True, если директория наблюдается
+        """
+        # Наблюдаем за директорией: редакторы часто заменяют файл переименованием
+        directory = os.path.dirname(abs_path)
+        if directory not in self._dir_watches:
+            try:
+                wd = self._inotify.add_watch(directory)
+            except OSError as e:
+                self._logger.debug(f"Cannot watch directory {directory}, polling {abs_path}: {e}")
+                return False
+            self._dir_watches[directory] = wd
+            self._wd_dirs[wd] = directory
+        self._dir_refcount[directory] = self._dir_refcount.get(directory, 0) + 1
+        return True
+
+    def _drop_directory_watch(self, wd: int, now: float) -> None:
+        """Перевод файлов удаленной или перемещенной директории на опрос.
+
+        Args:
+            wd: Дескриптор наблюдения директории
+            now: Текущее время (monotonic)
+        """
+        directory = self._wd_dirs.pop(wd, None)
+        if directory is None:
+            return
+        self._dir_watches.pop(directory, None)
+        self._dir_refcount.pop(directory, None)
+        try:
+            # Для перемещенной директории наблюдение еще действует
+            self._inotify.remove_watch(wd)
+        except Exception:
+            pass
+
+        for path in self._by_path:
+            if os.path.dirname(path) == directory:
+                self._polled_paths.add(path)
+                self._pending[path] = now + self._debounce_interval
+        self._next_poll_at = min(self._next_poll_at, now + self._poll_interval)
+        self._logger.debug(f"Directory {directory} is gone, polling its files until it reappears")
+
+    def _remove_backend_watch(self, abs_path: str) -> None:
+        """Удаление файла из inotify или опроса."""
+        if abs_path in self._polled_paths:
+            self._polled_paths.discard(abs_path)
+            return
+
+        directory = os.path.dirname(abs_path)
+        count = self._dir_refcount.get(directory, 0) - 1
+        if count > 0:
+            self._dir_refcount[directory] = count
+            return
+
+        self._dir_refcount.pop(directory, None)
+        wd = self._dir_watches.pop(directory, None)
+        if wd is not None:
+            self._wd_dirs.pop(wd, None)
+            if self._inotify is not None:
+                try:
+                    self._inotify.remove_watch(wd)
+                except Exception:
+                    pass
+
+    def _ensure_thread(self) -> None:
+        """Ленивый запуск единственного потока наблюдения."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="FileWatchService", daemon=True)
+            self._thread.start()
+
+    def _wake(self) -> None:
+        """Пробуждение потока наблюдения."""
+        self._wake_event.set()
+        if self._inotify is not None:
+            try:
+                os.write(self._wake_w, b"\0")
+            except OSError:
+                pass
+
+    def _next_timeout(self, now: float) -> Optional[float]:
+        """Время ожидания до ближайшего события (None - без таймаута)."""
+        deadlines = list(self._pending.values())
+        if self._polled_paths:
+            deadlines.append(self._next_poll_at)
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - now)
+
+    def _run(self) -> None:
+        """Цикл потока наблюдения."""
+        while True:
+            with self._lock:
+                if self._stopped or not self._watches:
+                    self._thread = None
+                    return
+                timeout = self._next_timeout(time.monotonic())
+                inotify_fd = self._inotify.fd if self._inotify is not None else None
+
+            ready: List[int] = []
+            if inotify_fd is None:
+                # Режим опроса: select по pipe недоступен на Windows
+                self._wake_event.wait(timeout)
+                self._wake_event.clear()
+            else:
+                try:
+                    ready, _, _ = select.select([self._wake_r, inotify_fd], [], [], timeout)
+                except (OSError, ValueError) as e:
+                    self._logger.error(f"File watch select failed: {e}")
+                    time.sleep(self._poll_interval)
+                    continue
+
+                if self._wake_r in ready:
+                    try:
+                        os.read(self._wake_r, 4096)
+                    except OSError:
+                        pass
+                    self._wake_event.clear()
+
+            now = time.monotonic()
+            with self._lock:
+                if self._inotify is not None and self._inotify.fd in ready:
+                    self._handle_inotify_events(now)
+
+                if self._polled_paths and now >= self._next_poll_at:
+                    self._poll(now)
+
+                due = [path for path, deadline in self._pending.items() if deadline <= now]
+                for path in due:
+                    del self._pending[path]
+
+            for path in due:
+                self._check_and_notify(path)
+
+    def _handle_inotify_events(self, now: float) -> None:
+        """Разбор событий inotify (вызывается под блокировкой)."""
+        try:
+            events = self._inotify.read_events()
+        except OSError as e:
+            self._logger.error(f"Failed to read inotify events: {e}")
+            return
+
+        for wd, mask, name in events:
+            if mask & (_IN_IGNORED | _IN_MOVE_SELF):
+                self._drop_directory_watch(wd, now)
+                continue
+
+            directory = self._wd_dirs.get(wd)
+            if directory is None or not name:
+                continue
+
+            path = os.path.join(directory, name)
+            if path in self._by_path:
+                self._stats["events"] += 1
+                self._pending[path] = now + self._debounce_interval
+
+    def _poll(self, now: float) -> None:
+        """Опрос файлов без inotify (вызывается под блокировкой)."""
+        self._stats["polls"] += 1
+        self._next_poll_at = now + self._poll_interval
+        for path in list(self._polled_paths):
+            # Директория появилась снова: возвращаемся к inotify. Наблюдение
+            # добавляется до проверки сигнатуры, чтобы не пропустить изменение
+            if (self._inotify is not None and os.path.isdir(os.path.dirname(path))
+                    and self._add_directory_watch(path)):
+                self._polled_paths.discard(path)
+            if self._signature(path) != self._signatures.get(path) and path not in self._pending:
+                self._pending[path] = now + self._debounce_interval
+
+    def _check_and_notify(self, path: str) -> None:
+        """Уведомление подписчиков, если содержимое файла изменилось."""
+        with self._lock:
+            if path not in self._by_path:
+                return
+            signature = self._signature(path)
+            if signature == self._signatures.get(path):
+                self._stats["suppressed"] += 1
+                return
+            self._signatures[path] = signature
+            watch_ids = list(self._by_path[path])
+            callbacks = [(watch_id, self._watches[watch_id][1].get()) for watch_id in watch_ids]
+
+        for watch_id, callback in callbacks:
+            if callback is None:
+                # Владелец callback уничтожен
+                self.unwatch(watch_id)
+                continue
+            try:
+                self._stats["notifications"] += 1
+                callback(path)
+            except Exception as e:
+                self._logger.error(f"Error in file watch callback for {path}: {e}")
+
+
+# Глобальный сервис наблюдения
+_global_service: Optional[FileWatchService] = None
+_global_service_lock = threading.Lock()
+
+
+def get_file_watch_service() -> FileWatchService:
+    """Получение общего для процесса сервиса наблюдения за файлами."""
+    global _global_service
+    with _global_service_lock:
+        if _global_service is None:
+            _global_service = FileWatchService()
+        return _global_service
@@ -18,6 +18,22 @@ from contextlib import contextmanager
 from functools import wraps
 import traceback
 import sys
+import weakref
+
+try:
+    from logging_config import clear_routed_handlers, route_handler
+except ImportError:
+    # Пакет установлен без модуля logging_config приложения:
+    # обработчики подключаются к логгеру напрямую
+    def route_handler(logger: logging.Logger, handler: logging.Handler) -> logging.Handler:
+        logger.addHandler(handler)
+        return handler
+
+    def clear_routed_handlers(logger: logging.Logger) -> None:
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+from .metric_storage import MetricStore
 
 
 @dataclass
@@ -48,6 +64,170 @@ class OperationProfile:
     custom_metrics: Optional[Dict[str, float]] = None
 
 
+class SystemMetricsSampler:
+    """Общий для процесса сборщик системных метрик.
+    
+    Один поток периодически снимает метрики системы и процесса и
+    публикует их во все подписанные экземпляры PerformanceLogger.
+    Поток запускается лениво - при первом чтении системных метрик -
+    и может быть приостановлен, когда приложение простаивает.
+    """
+    
+    _instance: Optional['SystemMetricsSampler'] = None
+    _instance_lock = threading.Lock()
+    
+    def __init__(self, interval: float = 60.0):
+        """Инициализация сборщика.
+        
+        Args:
+            interval: Интервал снятия метрик в секундах
+        """
+        self._interval = interval
+        self._subscribers: 'weakref.WeakSet[PerformanceLogger]' = weakref.WeakSet()
+        self._latest: Dict[str, float] = {}
+        self._latest_timestamp: Optional[float] = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._thread: Optional[threading.Thread] = None
+        self._process = psutil.Process()
+    
+    @classmethod
+    def get_instance(cls) -> 'SystemMetricsSampler':
+        """Получение общего экземпляра сборщика."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+    
+    @property
+    def interval(self) -> float:
+        """Интервал снятия метрик в секундах."""
+        return self._interval
+    
+    @property
+    def process(self) -> psutil.Process:
+        """Объект текущего процесса (переиспользуется между замерами)."""
+        return self._process
+    
+    @property
+    def is_running(self) -> bool:
+        """Запущен ли поток сборщика."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def is_paused(self) -> bool:
+        """Приостановлен ли сбор метрик."""
+        return not self._resumed.is_set()
+    
+    def subscribe(self, performance_logger: 'PerformanceLogger') -> None:
+        """Подписка логгера на публикацию системных метрик."""
+        with self._lock:
+            self._subscribers.add(performance_logger)
+    
+    def unsubscribe(self, performance_logger: 'PerformanceLogger') -> None:
+        """Отмена подписки логгера."""
+        with self._lock:
+            self._subscribers.discard(performance_logger)
+    
+    def set_interval(self, interval: float) -> None:
+        """Изменение интервала снятия метрик.
+        
+        Args:
+            interval: Интервал в секундах
+        """
+        if interval <= 0:
+            raise ValueError("Interval must be positive")
+        self._interval = interval
+        self._wakeup.set()
+    
+    def start(self) -> None:
+        """Запуск потока сборщика (если еще не запущен)."""
+        with self._lock:
+            if self.is_running:
+                return
+            self._thread = threading.Thread(target=self._run, name="SystemMetricsSampler", daemon=True)
+            self._thread.start()
+    
+    def pause(self) -> None:
+        """Приостановка сбора метрик (например, когда приложение простаивает)."""
+        self._resumed.clear()
+    
+    def resume(self) -> None:
+        """Возобновление сбора метрик."""
+        self._resumed.set()
+        self._wakeup.set()
+    
+    def get_latest(self) -> Dict[str, Any]:
+        """Получение последних системных метрик.
+        
+        При первом обращении снимает метрики синхронно и запускает поток.
+        
+        Returns:
+            Словарь метрик с временем снятия
+        """
+        if self._latest_timestamp is None:
+            self._publish(self.sample())
+        self.start()
+        
+        with self._lock:
+            return {"timestamp": self._latest_timestamp, **self._latest}
+    
+    def sample(self) -> Dict[str, float]:
+        """Снятие системных метрик без блокирующих ожиданий.
+        
+        Returns:
+            Словарь метрик
+        """
+        # cpu_percent(interval=None) сравнивает с предыдущим вызовом и не спит
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        return {
+            "system_cpu_usage": psutil.cpu_percent(interval=None),
+            "system_memory_usage": memory.percent,
+            "system_memory_available": memory.available / (1024**3),
+            "system_disk_usage": disk.percent,
+            "process_memory_usage": self._process.memory_info().rss / (1024**2),
+            "process_cpu_usage": self._process.cpu_percent(interval=None)
+        }
+    
+    def _publish(self, metrics: Dict[str, float]) -> None:
+        """Сохранение и рассылка метрик подписчикам."""
+        with self._lock:
+            self._latest = metrics
+            self._latest_timestamp = time.time()
+            subscribers = list(self._subscribers)
+        
+        for subscriber in subscribers:
+            try:
+                subscriber._on_system_metrics(metrics)
+            except Exception as e:
+                logging.getLogger(__name__).error(f"System metrics subscriber error: {e}")
+    
+    def _run(self) -> None:
+        """Цикл потока сборщика."""
+        while True:
+            self._wakeup.wait(self._interval)
+            self._wakeup.clear()
+            self._resumed.wait()
+            
+            try:
+                self._publish(self.sample())
+            except Exception as e:
+                logging.getLogger(__name__).error(f"System monitoring error: {e}")
+
+
+_SYSTEM_METRIC_UNITS = {
+    "system_cpu_usage": "percent",
+    "system_memory_usage": "percent",
+    "system_memory_available": "GB",
+    "system_disk_usage": "percent",
+    "process_memory_usage": "MB",
+    "process_cpu_usage": "percent"
+}
+
+
 class PerformanceLogger:
     """Логгер производительности для мониторинга системы.
     
@@ -104,7 +284,8 @@ class PerformanceLogger:
         self._logger = logging.getLogger(f"voice_control.{component_name}")
         self._logger.setLevel(log_level)
         
-        # Очистка существующих обработчиков
+        # Очистка существующих обработчиков (в том числе подключенных через очередь)
+        clear_routed_handlers(self._logger)
         self._logger.handlers.clear()
         
         # Настройка форматтера
@@ -113,7 +294,8 @@ class PerformanceLogger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         
-        # Файловый обработчик
+        # Файловый и консольный обработчики работают в фоновом потоке
+        # логирования, чтобы запись на диск не блокировала горячие пути
         if enable_file_logging:
             from logging.handlers import RotatingFileHandler
             log_file = self._log_dir / f"{component_name}.log"
@@ -124,23 +306,20 @@ class PerformanceLogger:
                 encoding='utf-8'
             )
             file_handler.setFormatter(formatter)
-            self._logger.addHandler(file_handler)
+            route_handler(self._logger, file_handler)
         
-        # Консольный обработчик
         if enable_console_logging:
             console_handler = logging.StreamHandler(sys.stdout)
             console_handler.setFormatter(formatter)
-            self._logger.addHandler(console_handler)
+            route_handler(self._logger, console_handler)
         
-        # Метрики производительности
-        self._metrics: List[PerformanceMetric] = []
+        # Метрики производительности (колоночные кольцевые буферы по названию метрики)
+        self._metrics = MetricStore(capacity_per_metric=4096)
         self._operation_profiles: Dict[str, OperationProfile] = {}
         self._metrics_lock = threading.RLock()
         
-        # Настройки мониторинга
-        self._max_metrics_count = 10000
+        # Настройки мониторинга (интервал задается общим SystemMetricsSampler)
         self._enable_system_monitoring = True
-        self._monitoring_interval = 60  # секунд
         
         # Счетчики
         self._operation_counters: Dict[str, int] = {}
@@ -153,39 +332,29 @@ class PerformanceLogger:
         self.info(f"PerformanceLogger initialized for component: {component_name}")
     
     def _start_system_monitoring(self) -> None:
-        """Запуск мониторинга системных ресурсов."""
-        def monitor_system():
-            while True:
-                try:
-                    # Мониторинг CPU
-                    cpu_percent = psutil.cpu_percent(interval=1)
-                    self.record_metric("system_cpu_usage", cpu_percent, "percent")
-                    
-                    # Мониторинг памяти
-                    memory = psutil.virtual_memory()
-                    self.record_metric("system_memory_usage", memory.percent, "percent")
-                    self.record_metric("system_memory_available", memory.available / (1024**3), "GB")
-                    
-                    # Мониторинг диска
-                    disk = psutil.disk_usage('/')
-                    self.record_metric("system_disk_usage", disk.percent, "percent")
-                    
-                    # Мониторинг процесса
-                    process = psutil.Process()
-                    process_memory = process.memory_info().rss / (1024**2)  # MB
-                    process_cpu = process.cpu_percent()
-                    
-                    self.record_metric("process_memory_usage", process_memory, "MB")
-                    self.record_metric("process_cpu_usage", process_cpu, "percent")
-                    
-                    time.sleep(self._monitoring_interval)
-                    
-                except Exception as e:
-                    self.error(f"System monitoring error: {e}")
-                    time.sleep(self._monitoring_interval)
+        """Подписка на общий сборщик системных метрик.
+        
+        Поток сборщика запускается только при первом чтении системных
+        метрик (см. get_system_metrics).
+        """
+        SystemMetricsSampler.get_instance().subscribe(self)
+    
+    def _on_system_metrics(self, metrics: Dict[str, float]) -> None:
+        """Запись опубликованных сборщиком системных метрик.
         
-        monitor_thread = threading.Thread(target=monitor_system, daemon=True)
-        monitor_thread.start()
+        Args:
+            metrics: Системные метрики
+        """
+        for name, value in metrics.items():
+            self.record_metric(name, value, _SYSTEM_METRIC_UNITS.get(name, ""))
+    
+    def get_system_metrics(self) -> Dict[str, Any]:
+        """Получение последних системных метрик от общего сборщика.
+        
+        Returns:
+            Словарь системных метрик
+        """
+        return SystemMetricsSampler.get_instance().get_latest()
     
     def debug(self, message: str, **kwargs) -> None:
         """Логирование отладочного сообщения."""
@@ -198,47 +367,6 @@ class PerformanceLogger:
     def warning(self, message: str, **kwargs) -> None:
         """Логирование предупреждения."""
         self._logger.warning(self._format_message(message, **kwargs))
-
-def setup_logging(logger_name, level=logging.INFO, log_file=None, console=True, encoding='utf-8'):
-    """
-    Настраивает и возвращает логгер.
-
-    Args:
-        logger_name (str): Имя логгера.
-        level (int): Уровень логирования.
-        log_file (str, optional): Путь к файлу лога. Defaults to None.
-        console (bool, optional): Выводить ли логи в консоль. Defaults to True.
-        encoding (str, optional): Кодировка файла лога. Defaults to 'utf-8'.
-
-    Returns:
-        logging.Logger: Настроенный экземпляр логгера.
-    """
-    logger = logging.getLogger(logger_name)
-    logger.setLevel(level)
-    logger.propagate = False  # Предотвращаем двойное логирование
-
-    # Удаляем существующие обработчики, чтобы избежать дублирования
-    if logger.hasHandlers():
-        logger.handlers.clear()
-
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-    if log_file:
-        # Убедимся, что директория для логов существует
-        log_dir = os.path.dirname(log_file)
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-        file_handler = logging.FileHandler(log_file, encoding=encoding)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-
-    if console:
-        stream_handler = logging.StreamHandler()
-        stream_handler.setFormatter(formatter)
-        logger.addHandler(stream_handler)
-
-    return logger
-
     
     def error(self, message: str, **kwargs) -> None:
         """Логирование ошибки."""
@@ -283,22 +411,14 @@ def setup_logging(logger_name, level=logging.INFO, log_file=None, console=True,
             metadata: Дополнительные метаданные
         """
         with self._metrics_lock:
-            metric = PerformanceMetric(
-                name=name,
-                value=value,
-                unit=unit,
-                timestamp=time.time(),
-                component=self._component_name,
-                operation=operation,
-                metadata=metadata or {}
-            )
-            
-            self._metrics.append(metric)
-            
-            # Ограничение количества метрик
-            if len(self._metrics) > self._max_metrics_count:
-                self._metrics = self._metrics[-self._max_metrics_count:]
-            
+            recorded = self._metrics.record(name, value, unit, time.time(), operation, metadata)
+        
+        if not recorded:
+            self._logger.debug(f"Non-finite value rejected for metric {name}: {value}")
+            return
+        
+        # Форматирование сообщения только при включенном DEBUG
+        if self._logger.isEnabledFor(logging.DEBUG):
             self.debug(f"Metric recorded: {name}={value} {unit}", 
                       operation=operation, metadata=metadata)
     
@@ -318,7 +438,7 @@ def setup_logging(logger_name, level=logging.INFO, log_file=None, console=True,
         # Начало профилирования
         start_time = time.time()
         start_memory = self._get_memory_usage()
-        start_cpu = self._get_cpu_usage()
+        start_cpu = time.process_time()
         
         profile = OperationProfile(
             operation_id=operation_id,
@@ -353,7 +473,7 @@ def setup_logging(logger_name, level=logging.INFO, log_file=None, console=True,
             profile.end_time = end_time
             profile.duration = end_time - start_time
             profile.memory_usage = self._get_memory_usage() - start_memory
-            profile.cpu_usage = self._get_cpu_usage() - start_cpu
+            profile.cpu_usage = self._get_cpu_usage(start_cpu, profile.duration)
             
             # Запись метрик
             self.record_metric(f"{operation_name}_duration", profile.duration, "seconds", operation_name)
@@ -372,20 +492,37 @@ def setup_logging(logger_name, level=logging.INFO, log_file=None, console=True,
             Использование памяти в MB
         """
         try:
-            process = psutil.Process()
+            process = SystemMetricsSampler.get_instance().process
             return process.memory_info().rss / (1024 * 1024)
         except Exception:
             return 0.0
     
-    def _get_cpu_usage(self) -> float:
-        """Получение текущего использования CPU.
+    def _get_cpu_usage(self, start_cpu_time: float, duration: float) -> float:
+        """Загрузка CPU процессом за время операции.
+        
+        Считается по процессорному времени (time.process_time), а не через
+        cpu_percent общего psutil.Process: cpu_percent измеряет от предыдущего
+        вызова на том же объекте и сбивал бы замеры сборщика метрик.
+        
+        Args:
+            start_cpu_time: Процессорное время в начале операции
+            duration: Длительность операции в секундах
+            
+        Returns:
+            Использование CPU в процентах
+        """
+        if duration <= 0:
+            return 0.0
+        return (time.process_time() - start_cpu_time) / duration * 100
+    
+    def _get_process_cpu_percent(self) -> float:
+        """Загрузка CPU процессом по последнему замеру общего сборщика.
         
         Returns:
             Использование CPU в процентах
         """
         try:
-            process = psutil.Process()
-            return process.cpu_percent()
+            return SystemMetricsSampler.get_instance().get_latest().get("process_cpu_usage", 0.0)
         except Exception:
             return 0.0
     
@@ -425,28 +562,28 @@ def setup_logging(logger_name, level=logging.INFO, log_file=None, console=True,
         Returns:
             Список метрик
         """
-        with self._metrics_lock:
-            metrics = self._metrics.copy()
-        
-        # Применение фильтров
-        if metric_name:
-            metrics = [m for m in metrics if m.name == metric_name]
-        
-        if operation:
-            metrics = [m for m in metrics if m.operation == operation]
+        since = time.time() - time_range if time_range else None
         
-        if time_range:
-            current_time = time.time()
-            metrics = [m for m in metrics if (current_time - m.timestamp) <= time_range]
-        
-        # Сортировка по времени (новые первыми)
-        metrics.sort(key=lambda x: x.timestamp, reverse=True)
-        
-        # Ограничение количества
-        if limit:
-            metrics = metrics[:limit]
+        with self._metrics_lock:
+            return self._metrics.query(
+                self._component_name,
+                metric_name=metric_name or None,
+                operation=operation or None,
+                since=since,
+                limit=limit
+            )
+    
+    def get_metric_summary(self, metric_name: str) -> Optional[Dict[str, Any]]:
+        """Получение сводки по метрике: min/max/среднее и перцентили p50/p95/p99.
         
-        return [asdict(metric) for metric in metrics]
+        Args:
+            metric_name: Название метрики
+            
+        Returns:
+            Сводка по метрике или None, если метрика не записывалась
+        """
+        with self._metrics_lock:
+            return self._metrics.summary(metric_name)
     
     def get_operation_profiles(self, 
                               operation_name: Optional[str] = None,
@@ -495,7 +632,7 @@ def setup_logging(logger_name, level=logging.INFO, log_file=None, console=True,
             total_errors = sum(self._error_counters.values())
             
             # Статистика за последний час
-            recent_metrics = [m for m in self._metrics if (current_time - m.timestamp) <= 3600]
+            recent_metrics_count = self._metrics.count_since(current_time - 3600)
             recent_profiles = [p for p in self._operation_profiles.values() 
                              if p.start_time and (current_time - p.start_time) <= 3600]
             
@@ -511,17 +648,18 @@ def setup_logging(logger_name, level=logging.INFO, log_file=None, console=True,
             
             return {
                 "component": self._component_name,
-                "total_metrics": len(self._metrics),
+                "total_metrics": self._metrics.total_retained(),
                 "total_operations": total_operations,
                 "total_errors": total_errors,
-                "recent_metrics_count": len(recent_metrics),
+                "recent_metrics_count": recent_metrics_count,
                 "recent_operations_count": len(recent_profiles),
                 "average_operation_duration": avg_duration,
                 "success_rate": success_rate,
                 "operation_counters": self._operation_counters.copy(),
                 "error_counters": self._error_counters.copy(),
+                "metric_summaries": self._metrics.summaries(),
                 "memory_usage_mb": self._get_memory_usage(),
-                "cpu_usage_percent": self._get_cpu_usage()
+                "cpu_usage_percent": self._get_process_cpu_percent()
             }
     
     def export_metrics(self, output_file: str, format_type: str = "json") -> None:
@@ -581,14 +719,30 @@ def setup_logging(logger_name, level=logging.INFO, log_file=None, console=True,
         self.info("All metrics and profiles cleared")
     
     def set_max_metrics_count(self, count: int) -> None:
-        """Установка максимального количества метрик.
+        """Установка максимального количества хранимых значений на одну метрику.
         
         Args:
-            count: Максимальное количество метрик
+            count: Максимальное количество значений каждой метрики
         """
-        self._max_metrics_count = count
+        with self._metrics_lock:
+            self._metrics.set_capacity(count)
         self.info(f"Max metrics count set to: {count}")
     
+    @classmethod
+    def get_all_loggers(cls) -> List['PerformanceLogger']:
+        """Получение всех созданных логгеров компонентов.
+        
+        Returns:
+            Список экземпляров логгеров
+        """
+        with cls._lock:
+            return list(cls._instances.values())
+    
+    @property
+    def component_name(self) -> str:
+        """Название компонента."""
+        return self._component_name
+    
     @classmethod
     def get_logger(cls, component_name: str) -> 'PerformanceLogger':
         """Получение экземпляра логгера для компонента.
@@ -599,4 +753,46 @@ def setup_logging(logger_name, level=logging.INFO, log_file=None, console=True,
         Returns:
             Экземпляр логгера
         """
-        return cls(component_name)
\ No newline at end of file
+        return cls(component_name)
+
+
+def setup_logging(logger_name, level=logging.INFO, log_file=None, console=True, encoding='utf-8'):
+    """
+    Настраивает и возвращает логгер.
+
+    Args:
+        logger_name (str): Имя логгера.
+        level (int): Уровень логирования.
+        log_file (str, optional): Путь к файлу лога. Defaults to None.
+        console (bool, optional): Выводить ли логи в консоль. Defaults to True.
+        encoding (str, optional): Кодировка файла лога. Defaults to 'utf-8'.
+
+    Returns:
+        logging.Logger: Настроенный экземпляр логгера.
+    """
+    logger = logging.getLogger(logger_name)
+    logger.setLevel(level)
+    logger.propagate = False  # Предотвращаем двойное логирование
+
+    # Удаляем существующие обработчики, чтобы избежать дублирования
+    clear_routed_handlers(logger)
+    if logger.hasHandlers():
+        logger.handlers.clear()
+
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if log_file:
+        # Убедимся, что директория для логов существует
+        log_dir = os.path.dirname(log_file)
+        if not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+        file_handler = logging.FileHandler(log_file, encoding=encoding)
+        file_handler.setFormatter(formatter)
+        route_handler(logger, file_handler)
+
+    if console:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+        route_handler(logger, stream_handler)
+
+    return logger
@@ -0,0 +1,436 @@
+"""Metric Storage for voice control system.
+
+Колоночное хранилище метрик: для каждой метрики заранее выделяются
+кольцевые массивы NumPy (время, значение, операция), а распределение
+значений накапливается в потоковой гистограмме с логарифмическими
+корзинами (в духе HdrHistogram). Запись значения не создает объектов
+на каждую метрику, а перцентили p50/p95/p99 вычисляются за O(корзин)
+независимо от количества записанных значений.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class LogHistogram:
+    """Потоковая гистограмма с логарифмическими корзинами.
+
+    Ширина корзины растет геометрически, поэтому относительная ошибка
+    оценки любого перцентиля не превышает relative_accuracy во всем
+    диапазоне [lowest_value, highest_value]. Значения меньше lowest_value
+    (включая нулевые и отрицательные) попадают в отдельную нулевую корзину,
+    значения больше highest_value - в последнюю. NaN и бесконечности
+    не принимаются.
+    """
+
+    __slots__ = ("_lowest", "_highest", "_log_gamma", "_gamma", "_offset",
+                 "_counts", "_zero_count", "count", "total", "min", "max")
+
+    def __init__(self,
+                 lowest_value: float = 1e-6,
+                 highest_value: float = 1e9,
+                 relative_accuracy: float = 0.01):
+        """Инициализация гистограммы.
+
+        Args:
+            lowest_value: Минимальное различимое положительное значение
+            highest_value: Максимальное различимое значение
+            relative_accuracy: Относительная точность оценки перцентилей
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        if not 0 < lowest_value < highest_value:
+            raise ValueError("Invalid histogram range")
+
+        self._lowest = lowest_value
+        self._highest = highest_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._offset = math.ceil(math.log(lowest_value) / self._log_gamma)
+        bucket_count = math.ceil(math.log(highest_value) / self._log_gamma) - self._offset + 1
+
+        self._counts = np.zeros(bucket_count, dtype=np.int64)
+        self._zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def bucket_count(self) -> int:
+        """Количество корзин."""
+        return len(self._counts)
+
+    def record(self, value: float) -> None:
+        """Добавление значения.
+
+        Args:
+            value: Значение
+
+        Raises:
+            ValueError: Если значение не конечно (NaN или бесконечность)
+        """
+        if not math.isfinite(value):
+            raise ValueError(f"Histogram value must be finite, got {value}")
+
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        if value < self._lowest:
+            self._zero_count += 1
+            return
+
+        if value > self._highest:
+            index = len(self._counts) - 1
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma) - self._offset
+        self._counts[index] += 1
+
+    def percentiles(self, quantiles: Sequence[float]) -> List[float]:
+        """Оценка перцентилей за один проход по корзинам.
+
+        Args:
+            quantiles: Квантили в диапазоне [0, 1]
+
+        Returns:
+            Оценки значений (0.0 для пустой гистограммы)
+        """
+        if self.count == 0:
+            return [0.0 for _ in quantiles]
+
+        cumulative = np.cumsum(self._counts)
+        results = []
+        for q in quantiles:
+            # Порядковый номер значения (с единицы), которое ищем
+            rank = max(1, math.ceil(q * self.count))
+            if rank <= self._zero_count:
+                value = 0.0
+            else:
+                index = int(np.searchsorted(cumulative, rank - self._zero_count))
+                # Середина корзины (gamma^(i-1), gamma^i] в смысле относительной ошибки
+                upper = self._gamma ** (index + self._offset)
+                value = 2 * upper / (self._gamma + 1)
+            results.append(float(min(max(value, self.min), self.max)))
+        return results
+
+    def reset(self) -> None:
+        """Очистка гистограммы."""
+        self._counts.fill(0)
+        self._zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+
+class MetricSeries:
+    """Кольцевое колоночное хранилище значений одной метрики."""
+
+    __slots__ = ("name", "unit", "histogram", "rejected", "_timestamps", "_values",
+                 "_operations", "_metadata", "_next", "_size")
+
+    def __init__(self, name: str, unit: str, capacity: int):
+        """Инициализация серии.
+
+        Args:
+            name: Название метрики
+            unit: Единица измерения
+            capacity: Количество хранимых последних значений
+        """
+        self.name = name
+        self.unit = unit
+        self.histogram = LogHistogram()
+        # Количество отброшенных значений NaN/бесконечность
+        self.rejected = 0
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._values = np.zeros(capacity, dtype=np.float64)
+        self._operations = np.full(capacity, -1, dtype=np.int32)
+        # Метаданные редки, поэтому хранятся отдельно по номеру ячейки
+        self._metadata: Dict[int, Dict[str, Any]] = {}
+        self._next = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        """Размер кольцевого буфера."""
+        return len(self._values)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self,
+               timestamp: float,
+               value: float,
+               operation_code: int = -1,
+               metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """Запись значения в кольцевой буфер и гистограмму.
+
+        Args:
+            timestamp: Время записи
+            value: Значение
+            operation_code: Код операции (-1 - без операции)
+            metadata: Дополнительные метаданные
+
+        Returns:
+            False, если значение не конечно и было отброшено
+        """
+        # Проверка до записи, чтобы буфер и гистограмма не расходились
+        if not math.isfinite(value):
+            self.rejected += 1
+            return False
+
+        slot = self._next
+        self._timestamps[slot] = timestamp
+        self._values[slot] = value
+        self._operations[slot] = operation_code
+        if metadata:
+            self._metadata[slot] = metadata
+        elif self._metadata:
+            self._metadata.pop(slot, None)
+
+        self._next = (slot + 1) % len(self._values)
+        if self._size < len(self._values):
+            self._size += 1
+
+        self.histogram.record(value)
+        return True
+
+    def slots(self) -> np.ndarray:
+        """Номера заполненных ячеек в хронологическом порядке."""
+        start = (self._next - self._size) % len(self._values)
+        return (start + np.arange(self._size)) % len(self._values)
+
+    def columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Колонки (слоты, время, значения, коды операций) в хронологическом порядке."""
+        slots = self.slots()
+        return slots, self._timestamps[slots], self._values[slots], self._operations[slots]
+
+    def count_since(self, since: float) -> int:
+        """Количество хранимых значений, записанных не раньше since.
+
+        Буфер состоит из двух отсортированных по времени отрезков,
+        поэтому подсчет выполняется двоичным поиском.
+        """
+        if self._size < len(self._values):
+            segments = (self._timestamps[:self._size],)
+        else:
+            segments = (self._timestamps[self._next:], self._timestamps[:self._next])
+        return sum(len(seg) - int(np.searchsorted(seg, since, side="left")) for seg in segments)
+
+    def metadata(self, slot: int) -> Dict[str, Any]:
+        """Метаданные значения в ячейке."""
+        return self._metadata.get(slot, {})
+
+    def summary(self) -> Dict[str, Any]:
+        """Сводка по метрике: количество, min/max/среднее и перцентили.
+
+        Returns:
+            Словарь статистики (по всем значениям с момента очистки)
+        """
+        histogram = self.histogram
+        p50, p95, p99 = histogram.percentiles((0.5, 0.95, 0.99))
+        has_values = histogram.count > 0
+        return {
+            "unit": self.unit,
+            "count": histogram.count,
+            "retained": self._size,
+            "rejected": self.rejected,
+            "last": float(self._values[(self._next - 1) % len(self._values)]) if self._size else 0.0,
+            "min": float(histogram.min) if has_values else 0.0,
+            "max": float(histogram.max) if has_values else 0.0,
+            "sum": histogram.total,
+            "mean": histogram.total / histogram.count if has_values else 0.0,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99
+        }
+
+    def resize(self, capacity: int) -> None:
+        """Изменение размера буфера с сохранением последних значений.
+
+        Args:
+            capacity: Новый размер буфера
+        """
+        slots, timestamps, values, operations = self.columns()
+        keep = min(len(slots), capacity)
+        metadata = {new_slot: self._metadata[slot]
+                    for new_slot, slot in enumerate(slots[len(slots) - keep:].tolist())
+                    if slot in self._metadata}
+
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._values = np.zeros(capacity, dtype=np.float64)
+        self._operations = np.full(capacity, -1, dtype=np.int32)
+        self._timestamps[:keep] = timestamps[len(slots) - keep:]
+        self._values[:keep] = values[len(slots) - keep:]
+        self._operations[:keep] = operations[len(slots) - keep:]
+        self._metadata = metadata
+        self._size = keep
+        self._next = keep % capacity
+
+
+class MetricStore:
+    """Набор колоночных серий метрик одного компонента.
+
+    Класс не потокобезопасен: синхронизацию выполняет владелец
+    (PerformanceLogger под своей блокировкой).
+    """
+
+    def __init__(self, capacity_per_metric: int = 4096):
+        """Инициализация хранилища.
+
+        Args:
+            capacity_per_metric: Количество хранимых значений на одну метрику
+        """
+        if capacity_per_metric <= 0:
+            raise ValueError("capacity_per_metric must be positive")
+        self._capacity = capacity_per_metric
+        self._series: Dict[str, MetricSeries] = {}
+        self._operation_codes: Dict[str, int] = {}
+        self._operation_names: List[str] = []
+
+    @property
+    def capacity_per_metric(self) -> int:
+        """Количество хранимых значений на одну метрику."""
+        return self._capacity
+
+    def record(self,
+               name: str,
+               value: float,
+               unit: str,
+               timestamp: float,
+               operation: Optional[str] = None,
+               metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """Запись значения метрики.
+
+        Args:
+            name: Название метрики
+            value: Значение
+            unit: Единица измерения
+            timestamp: Время записи
+            operation: Название операции
+            metadata: Дополнительные метаданные
+
+        Returns:
+            False, если значение не конечно и было отброшено
+        """
+        series = self._series.get(name)
+        if series is None:
+            series = self._series[name] = MetricSeries(name, unit, self._capacity)
+
+        operation_code = -1
+        if operation is not None:
+            operation_code = self._operation_codes.get(operation, -1)
+            if operation_code < 0:
+                operation_code = len(self._operation_names)
+                self._operation_codes[operation] = operation_code
+                self._operation_names.append(operation)
+
+        return series.append(timestamp, value, operation_code, metadata)
+
+    def names(self) -> List[str]:
+        """Названия записанных метрик."""
+        return list(self._series)
+
+    def total_retained(self) -> int:
+        """Количество хранимых значений по всем метрикам."""
+        return sum(len(series) for series in self._series.values())
+
+    def count_since(self, since: float) -> int:
+        """Количество хранимых значений, записанных не раньше since."""
+        return sum(series.count_since(since) for series in self._series.values())
+
+    def summary(self, name: str) -> Optional[Dict[str, Any]]:
+        """Сводка по одной метрике (None, если метрика не записывалась)."""
+        series = self._series.get(name)
+        return series.summary() if series is not None else None
+
+    def summaries(self) -> Dict[str, Dict[str, Any]]:
+        """Сводки по всем метрикам."""
+        return {name: series.summary() for name, series in self._series.items()}
+
+    def query(self,
+              component: str,
+              metric_name: Optional[str] = None,
+              operation: Optional[str] = None,
+              since: Optional[float] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Выборка значений в формате PerformanceMetric (новые первыми).
+
+        Args:
+            component: Название компонента для результата
+            metric_name: Фильтр по названию метрики
+            operation: Фильтр по операции
+            since: Только значения, записанные не раньше этого времени
+            limit: Ограничение количества результатов
+
+        Returns:
+            Список метрик
+        """
+        if metric_name is not None:
+            series_list = [self._series[metric_name]] if metric_name in self._series else []
+        else:
+            series_list = list(self._series.values())
+
+        operation_code = None
+        if operation is not None:
+            operation_code = self._operation_codes.get(operation)
+            if operation_code is None:
+                return []
+
+        rows: List[Tuple[MetricSeries, np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+        for series in series_list:
+            slots, timestamps, values, operations = series.columns()
+            mask = np.ones(len(slots), dtype=bool)
+            if operation_code is not None:
+                mask &= operations == operation_code
+            if since is not None:
+                mask &= timestamps >= since
+            rows.append((series, slots[mask], timestamps[mask], values[mask], operations[mask]))
+
+        if not rows:
+            return []
+
+        owners = np.concatenate([np.full(len(r[1]), i, dtype=np.int32) for i, r in enumerate(rows)])
+        slots = np.concatenate([r[1] for r in rows])
+        timestamps = np.concatenate([r[2] for r in rows])
+        values = np.concatenate([r[3] for r in rows])
+        operations = np.concatenate([r[4] for r in rows])
+
+        order = np.argsort(-timestamps, kind="stable")
+        if limit:
+            order = order[:limit]
+
+        result = []
+        for i in order.tolist():
+            series = rows[owners[i]][0]
+            code = int(operations[i])
+            result.append({
+                "name": series.name,
+                "value": float(values[i]),
+                "unit": series.unit,
+                "timestamp": float(timestamps[i]),
+                "component": component,
+                "operation": self._operation_names[code] if code >= 0 else None,
+                "metadata": series.metadata(int(slots[i]))
+            })
+        return result
+
+    def set_capacity(self, capacity_per_metric: int) -> None:
+        """Изменение количества хранимых значений на одну метрику."""
+        if capacity_per_metric <= 0:
+            raise ValueError("capacity_per_metric must be positive")
+        self._capacity = capacity_per_metric
+        for series in self._series.values():
+            series.resize(capacity_per_metric)
+
+    def clear(self) -> None:
+        """Удаление всех метрик."""
+        self._series.clear()
+        self._operation_codes.clear()
+        self._operation_names.clear()
@@ -0,0 +1,379 @@
+"""Metrics Exporter for voice control system.
+
+Локальная HTTP-точка выдачи метрик в формате OpenMetrics (совместим
+с Prometheus). Сервер включается явно и слушает только loopback-адрес,
+поэтому метрики доступны локальному сборщику и недоступны из сети.
+Значения собираются при каждом запросе из зарегистрированных
+сборщиков: метрики и профили PerformanceLogger, статистика ErrorHandler,
+счетчики потерь аудиобуферов и статистика кэша моделей.
+"""
+
+import logging
+import math
+import socket
+import sys
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .logger import PerformanceLogger
+
+logger = logging.getLogger(__name__)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+_LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+_SUMMARY_QUANTILES = (("p50", "0.5"), ("p95", "0.95"), ("p99", "0.99"))
+
+
+@dataclass
+class MetricFamily:
+    """Семейство метрик OpenMetrics.
+
+    Attributes:
+        name: Имя семейства (для counter - без суффикса _total)
+        metric_type: Тип (gauge, counter, summary, info, unknown)
+        help: Описание
+        unit: Единица измерения (пустая строка - без единицы)
+        samples: Значения: (суффикс имени, метки, значение)
+    """
+    name: str
+    metric_type: str
+    help: str
+    unit: str = ""
+    samples: List[Tuple[str, Dict[str, str], float]] = field(default_factory=list)
+
+    def add(self, value: float, suffix: str = "", **labels: str) -> 'MetricFamily':
+        """Добавление значения.
+
+        Args:
+            value: Значение
+            suffix: Суффикс имени (_total, _count, _sum)
+            **labels: Метки
+
+        Returns:
+            Это же семейство (для цепочки вызовов)
+        """
+        self.samples.append((suffix, labels, value))
+        return self
+
+
+MetricCollector = Callable[[], Iterable[MetricFamily]]
+
+
+def _escape_label(value: str) -> str:
+    """Экранирование значения метки."""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """Форматирование значения по правилам OpenMetrics."""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def render_openmetrics(families: Iterable[MetricFamily]) -> str:
+    """Формирование текстового представления OpenMetrics.
+
+    Args:
+        families: Семейства метрик
+
+    Returns:
+        Текст, завершающийся маркером # EOF
+    """
+    lines = []
+    for family in families:
+        if not family.samples:
+            continue
+        lines.append(f"# TYPE {family.name} {family.metric_type}")
+        if family.unit:
+            lines.append(f"# UNIT {family.name} {family.unit}")
+        if family.help:
+            lines.append(f"# HELP {family.name} {_escape_label(family.help)}")
+        for suffix, labels, value in family.samples:
+            label_text = ""
+            if labels:
+                label_text = "{" + ",".join(
+                    f'{key}="{_escape_label(val)}"' for key, val in labels.items()
+                ) + "}"
+            lines.append(f"{family.name}{suffix}{label_text} {_format_value(value)}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def collect_performance_metrics() -> List[MetricFamily]:
+    """Метрики, счетчики операций и ошибок всех PerformanceLogger."""
+    values = MetricFamily("voice_control_metric", "summary",
+                          "Values recorded by PerformanceLogger components")
+    last = MetricFamily("voice_control_metric_last", "gauge",
+                        "Last value recorded by PerformanceLogger components")
+    operations = MetricFamily("voice_control_operations", "counter",
+                              "Operations profiled by PerformanceLogger")
+    errors = MetricFamily("voice_control_operation_errors", "counter",
+                          "Errors logged by PerformanceLogger by type")
+    success = MetricFamily("voice_control_operation_success_ratio", "gauge",
+                           "Share of successful profiled operations")
+
+    for perf_logger in PerformanceLogger.get_all_loggers():
+        try:
+            statistics = perf_logger.get_statistics()
+        except Exception as e:
+            logger.debug(f"Failed to collect statistics for {perf_logger.component_name}: {e}")
+            continue
+
+        component = perf_logger.component_name
+        for name, summary in statistics["metric_summaries"].items():
+            labels = {"component": component, "name": name, "unit": summary["unit"]}
+            for key, quantile in _SUMMARY_QUANTILES:
+                values.add(summary[key], quantile=quantile, **labels)
+            values.add(summary["count"], "_count", **labels)
+            values.add(summary["sum"], "_sum", **labels)
+            last.add(summary["last"], **labels)
+
+        for operation, count in statistics["operation_counters"].items():
+            operations.add(count, "_total", component=component, operation=operation)
+        for error_type, count in statistics["error_counters"].items():
+            errors.add(count, "_total", component=component, type=error_type)
+        if statistics["operation_counters"]:
+            success.add(statistics["success_rate"] / 100, component=component)
+
+    return [values, last, operations, errors, success]
+
+
+def collect_error_handler_metrics() -> List[MetricFamily]:
+    """Статистика глобального ErrorHandler (если модуль загружен)."""
+    module = sys.modules.get("voice_control.core.error_handler")
+    if module is None:
+        return []
+
+    statistics = module.get_error_handler().get_error_statistics()
+    total = MetricFamily("voice_control_errors", "counter", "Errors handled by ErrorHandler")
+    total.add(statistics["total_errors"], "_total")
+
+    by_category = MetricFamily("voice_control_errors_by_category", "counter",
+                               "Errors handled by ErrorHandler by category")
+    for category, count in statistics["category_stats"].items():
+        by_category.add(count, "_total", category=str(category))
+
+    by_severity = MetricFamily("voice_control_recent_errors", "gauge",
+                               "Errors among the last 100 handled by severity")
+    for severity, count in statistics["severity_stats"].items():
+        by_severity.add(count, severity=str(severity))
+
+    return [total, by_category, by_severity]
+
+
+def collect_audio_metrics() -> List[MetricFamily]:
+    """Счетчики аудиоданных, вытесненных из буферов (если модуль загружен)."""
+    module = sys.modules.get("voice_control.microphone.audio_buffer")
+    if module is None:
+        return []
+
+    statistics = module.get_drop_statistics()
+    return [
+        MetricFamily("voice_control_audio_dropped_blocks", "counter",
+                     "Audio blocks evicted from capture buffers on overflow")
+        .add(statistics["dropped_blocks"], "_total"),
+        MetricFamily("voice_control_audio_dropped_bytes", "counter",
+                     "Audio bytes evicted from capture buffers on overflow", unit="bytes")
+        .add(statistics["dropped_bytes"], "_total")
+    ]
+
+
+def collect_model_cache_metrics() -> List[MetricFamily]:
+    """Статистика кэша моделей Vosk (если модуль загружен)."""
+    module = sys.modules.get("voice_control.utils.vosk_model_loader")
+    if module is None:
+        return []
+
+    statistics = module.get_model_cache_statistics()
+    requests = MetricFamily("voice_control_model_cache_requests", "counter",
+                            "Vosk model load requests by cache result")
+    requests.add(statistics["hits"], "_total", result="hit")
+    requests.add(statistics["misses"], "_total", result="miss")
+
+    return [
+        requests,
+        MetricFamily("voice_control_model_load_failures", "counter", "Failed Vosk model loads")
+        .add(statistics["load_failures"], "_total"),
+        MetricFamily("voice_control_model_load_seconds", "counter",
+                     "Time spent loading Vosk models", unit="seconds")
+        .add(statistics["load_seconds_total"], "_total"),
+        MetricFamily("voice_control_model_cache_loaded_models", "gauge",
+                     "Vosk models currently held in memory")
+        .add(statistics["loaded_models"])
+    ]
+
+
+class MetricsExporter:
+    """HTTP-сервер выдачи метрик в формате OpenMetrics на localhost.
+
+    Сервер не запускается автоматически: его включает приложение
+    (настройка diagnostics/metrics_endpoint_enabled) вызовом start().
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9464):
+        """Инициализация экспортера.
+
+        Args:
+            host: Loopback-адрес для прослушивания
+            port: Порт (0 - выбрать свободный)
+
+        Raises:
+            ValueError: Если адрес не является loopback-адресом
+        """
+        if host not in _LOOPBACK_HOSTS:
+            raise ValueError(f"Metrics endpoint may only bind to localhost, got: {host}")
+
+        self._host = host
+        self._port = port
+        self._collectors: Dict[str, MetricCollector] = {}
+        self._collectors_lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._scrapes = 0
+        self._scrape_errors = 0
+
+        self.register_collector("performance", collect_performance_metrics)
+        self.register_collector("errors", collect_error_handler_metrics)
+        self.register_collector("audio", collect_audio_metrics)
+        self.register_collector("model_cache", collect_model_cache_metrics)
+
+    @property
+    def is_running(self) -> bool:
+        """Запущен ли сервер."""
+        return self._server is not None
+
+    @property
+    def port(self) -> int:
+        """Фактический порт сервера."""
+        return self._server.server_address[1] if self._server else self._port
+
+    @property
+    def url(self) -> str:
+        """Адрес страницы метрик."""
+        host = f"[{self._host}]" if ":" in self._host else self._host
+        return f"http://{host}:{self.port}/metrics"
+
+    def register_collector(self, name: str, collector: MetricCollector) -> None:
+        """Регистрация сборщика метрик.
+
+        Args:
+            name: Уникальное имя сборщика
+            collector: Функция, возвращающая семейства метрик
+        """
+        with self._collectors_lock:
+            self._collectors[name] = collector
+
+    def unregister_collector(self, name: str) -> None:
+        """Удаление сборщика метрик."""
+        with self._collectors_lock:
+            self._collectors.pop(name, None)
+
+    def collect(self) -> List[MetricFamily]:
+        """Сбор метрик со всех сборщиков.
+
+        Ошибка одного сборщика не мешает остальным и учитывается
+        в метрике voice_control_scrape_errors.
+
+        Returns:
+            Список семейств метрик
+        """
+        with self._collectors_lock:
+            collectors = list(self._collectors.items())
+
+        families: List[MetricFamily] = []
+        for name, collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                self._scrape_errors += 1
+                logger.warning(f"Metrics collector '{name}' failed: {e}")
+
+        self._scrapes += 1
+        families.append(MetricFamily("voice_control_scrapes", "counter",
+                                     "Metrics endpoint scrapes").add(self._scrapes, "_total"))
+        families.append(MetricFamily("voice_control_scrape_errors", "counter",
+                                     "Failed metrics collectors").add(self._scrape_errors, "_total"))
+        return families
+
+    def render(self) -> str:
+        """Текущие метрики в формате OpenMetrics."""
+        return render_openmetrics(self.collect())
+
+    def start(self) -> None:
+        """Запуск HTTP-сервера в фоновом потоке."""
+        if self._server is not None:
+            return
+
+        exporter = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"Metrics endpoint: {format % args}")
+
+        server_class = ThreadingHTTPServer
+        if ":" in self._host:
+            class _IPv6Server(ThreadingHTTPServer):
+                address_family = socket.AF_INET6
+
+            server_class = _IPv6Server
+
+        self._server = server_class((self._host, self._port), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="MetricsExporter", daemon=True)
+        self._thread.start()
+        logger.info(f"Metrics endpoint started at {self.url}")
+
+    def stop(self) -> None:
+        """Остановка HTTP-сервера."""
+        server = self._server
+        if server is None:
+            return
+
+        server.shutdown()
+        server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        self._server = None
+        self._thread = None
+        logger.info("Metrics endpoint stopped")
+
+
+# Глобальный экспортер
+_global_exporter: Optional[MetricsExporter] = None
+_global_exporter_lock = threading.Lock()
+
+
+def get_metrics_exporter(port: int = 9464) -> MetricsExporter:
+    """Получение общего экспортера метрик (создается при первом обращении).
+
+    Args:
+        port: Порт, используемый при создании экспортера
+    """
+    global _global_exporter
+    with _global_exporter_lock:
+        if _global_exporter is None:
+            _global_exporter = MetricsExporter(port=port)
+        return _global_exporter
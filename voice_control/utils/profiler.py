@@ -0,0 +1,293 @@
+"""Operation Profiler for voice control system.
+
+Профилирование горячих путей (распознавание, загрузка моделей, запуск
+приложения) по флагу PerformanceConfig.enable_profiling. Для каждой
+операции в profiling_output_dir сохраняется отдельный файл:
+
+- режим "cprofile" - детерминированный профиль cProfile (.pstats) и его
+  текстовая сводка (.txt);
+- режим "sampling" - выборочный профиль стека потока (.collapsed, формат
+  "кадр;кадр;кадр количество" для flamegraph.pl / speedscope).
+
+Профилирование можно включать и выключать во время работы без перезапуска.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PROFILING_MODES = ("cprofile", "sampling")
+
+
+class _StackSampler:
+    """Поток, периодически снимающий стек одного потока через sys._current_frames()."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ProfilerSampler", daemon=True)
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            stack: List[str] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+
+class ProfileSession:
+    """Активная сессия профилирования одной операции."""
+
+    def __init__(self, operation: str, mode: str, sample_interval: float):
+        self.operation = operation
+        self.mode = mode
+        self.thread_id = threading.get_ident()
+        self.started_at = time.perf_counter()
+        self.duration: Optional[float] = None
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_StackSampler] = None
+
+        if mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = _StackSampler(self.thread_id, sample_interval)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """Остановка сбора данных."""
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        self.duration = time.perf_counter() - self.started_at
+
+    def write(self, output_dir: Path, stem: str) -> List[Path]:
+        """Сохранение результатов в файлы.
+
+        Args:
+            output_dir: Директория профилей
+            stem: Имя файлов без расширения
+
+        Returns:
+            Список созданных файлов
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+
+        if self._profile is not None:
+            pstats_path = output_dir / f"{stem}.pstats"
+            self._profile.dump_stats(str(pstats_path))
+            written.append(pstats_path)
+
+            summary = io.StringIO()
+            summary.write(f"{self.operation}: {self.duration:.3f} s\n\n")
+            pstats.Stats(self._profile, stream=summary).sort_stats("cumulative").print_stats(40)
+            summary_path = output_dir / f"{stem}.txt"
+            summary_path.write_text(summary.getvalue(), encoding="utf-8")
+            written.append(summary_path)
+
+        if self._sampler is not None:
+            collapsed_path = output_dir / f"{stem}.collapsed"
+            with open(collapsed_path, "w", encoding="utf-8") as f:
+                for stack, count in self._sampler.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            written.append(collapsed_path)
+
+        return written
+
+
+class OperationProfiler:
+    """Профилировщик операций с сохранением профиля каждой операции в файл."""
+
+    def __init__(self,
+                 output_dir: Union[str, Path] = "profiling",
+                 enabled: bool = False,
+                 mode: str = "cprofile",
+                 sample_interval: float = 0.005):
+        """Инициализация профилировщика.
+
+        Args:
+            output_dir: Директория для файлов профилей
+            enabled: Включено ли профилирование
+            mode: Режим профилирования ("cprofile" или "sampling")
+            sample_interval: Интервал снятия стека в режиме "sampling", секунды
+        """
+        if mode not in PROFILING_MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+
+        self._output_dir = Path(output_dir)
+        self._enabled = enabled
+        self._mode = mode
+        self._sample_interval = sample_interval
+        self._lock = threading.Lock()
+        # Потоки с активной сессией: вложенные операции попадают во внешний
+        # профиль. В режиме "cprofile" активна не более чем одна сессия на
+        # процесс: в Python 3.12+ cProfile использует общий для процесса
+        # sys.monitoring, и второй профиль не запускается
+        self._active_threads: Dict[int, ProfileSession] = {}
+        self._written_files: List[Path] = []
+
+    @property
+    def enabled(self) -> bool:
+        """Включено ли профилирование."""
+        return self._enabled
+
+    @property
+    def output_dir(self) -> Path:
+        """Директория файлов профилей."""
+        return self._output_dir
+
+    @property
+    def mode(self) -> str:
+        """Режим профилирования."""
+        return self._mode
+
+    def set_enabled(self, enabled: bool) -> None:
+        """Включение или выключение профилирования (действует на новые операции)."""
+        self._enabled = enabled
+        logger.info(f"Profiling {'enabled' if enabled else 'disabled'} "
+                    f"(mode={self._mode}, output={self._output_dir})")
+
+    def set_mode(self, mode: str) -> None:
+        """Смена режима профилирования."""
+        if mode not in PROFILING_MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self._mode = mode
+
+    def set_output_dir(self, output_dir: Union[str, Path]) -> None:
+        """Смена директории файлов профилей."""
+        self._output_dir = Path(output_dir)
+
+    def start(self, operation: str) -> Optional[ProfileSession]:
+        """Начало профилирования операции в текущем потоке.
+
+        Args:
+            operation: Название операции
+
+        Returns:
+            Сессия или None, если профилирование выключено, поток (или, в режиме
+            "cprofile", процесс) уже профилируется или профиль не удалось запустить
+        """
+        if not self._enabled:
+            return None
+
+        thread_id = threading.get_ident()
+        with self._lock:
+            if thread_id in self._active_threads:
+                return None
+            if self._mode == "cprofile" and any(
+                    active.mode == "cprofile" for active in self._active_threads.values()):
+                return None
+            # Ошибка профилировщика не должна прерывать профилируемую операцию
+            try:
+                session = ProfileSession(operation, self._mode, self._sample_interval)
+            except Exception as e:
+                logger.warning(f"Failed to start profiling {operation}: {e}")
+                return None
+            self._active_threads[thread_id] = session
+        return session
+
+    def stop(self, session: Optional[ProfileSession]) -> List[Path]:
+        """Завершение профилирования и сохранение результатов.
+
+        Args:
+            session: Сессия, полученная из start() (None игнорируется)
+
+        Returns:
+            Список созданных файлов
+        """
+        if session is None:
+            return []
+
+        session.stop()
+        with self._lock:
+            self._active_threads.pop(session.thread_id, None)
+
+        stem = "{}_{}_{}".format(
+            re.sub(r"[^\w.-]+", "_", session.operation),
+            datetime.now().strftime("%Y%m%d_%H%M%S_%f"),
+            os.getpid()
+        )
+        try:
+            written = session.write(self._output_dir, stem)
+        except OSError as e:
+            logger.error(f"Failed to write profile for {session.operation}: {e}")
+            return []
+
+        with self._lock:
+            self._written_files.extend(written)
+        logger.info(f"Profile for {session.operation} ({session.duration:.3f} s) saved to {written[0]}")
+        return written
+
+    @contextmanager
+    def profile(self, operation: str) -> Iterator[Optional[ProfileSession]]:
+        """Контекстный менеджер профилирования операции.
+
+        Args:
+            operation: Название операции
+        """
+        session = self.start(operation)
+        try:
+            yield session
+        finally:
+            self.stop(session)
+
+    def get_written_files(self) -> List[Path]:
+        """Файлы профилей, созданные за время работы."""
+        with self._lock:
+            return list(self._written_files)
+
+
+# Глобальный профилировщик
+_global_profiler: Optional[OperationProfiler] = None
+_global_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> OperationProfiler:
+    """Получение общего профилировщика, настроенного по PerformanceConfig.
+
+    Настройки читаются без создания менеджера конфигурации, поэтому
+    обращение к профилировщику не записывает файл конфигурации.
+    """
+    global _global_profiler
+    with _global_profiler_lock:
+        if _global_profiler is None:
+            enabled, output_dir = False, "profiling"
+            try:
+                from ..core.config import read_performance_config
+                performance = read_performance_config()
+                enabled, output_dir = performance.enable_profiling, performance.profiling_output_dir
+            except Exception as e:
+                logger.debug(f"Profiling settings unavailable, using defaults: {e}")
+            _global_profiler = OperationProfiler(output_dir, enabled=enabled)
+        return _global_profiler
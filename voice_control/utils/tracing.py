@@ -0,0 +1,356 @@
+"""Latency Tracing for voice control system.
+
+Легковесная трассировка задержек по фразам: от нажатия горячей клавиши
+через захват звука и распознавание до вставки текста в целевое окно.
+Каждая фраза получает идентификатор трассы, стадии записываются как
+интервалы (spans) в кольцевой буфер и могут быть выгружены в JSONL или
+в формат Chrome Trace (chrome://tracing, Perfetto).
+
+Приложение обрабатывает одну фразу за раз, а стадии выполняются в разных
+потоках (Qt, поток PyAudio, QThread распознавания), поэтому активная
+трасса хранится на уровне процесса; при необходимости идентификатор
+трассы можно передать явно.
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    """Интервал выполнения одной стадии.
+
+    Attributes:
+        trace_id: Идентификатор трассы (фразы)
+        name: Название стадии
+        start_ns: Начало по монотонным часам (perf_counter_ns)
+        end_ns: Окончание (None - интервал еще не завершен)
+        thread_id: Идентификатор потока, открывшего интервал
+        thread_name: Имя потока
+        attributes: Дополнительные атрибуты
+    """
+    trace_id: str
+    name: str
+    start_ns: int
+    end_ns: Optional[int] = None
+    thread_id: int = 0
+    thread_name: str = ""
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        """Длительность в миллисекундах."""
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class Tracer:
+    """Трассировщик задержек с кольцевым буфером завершенных интервалов."""
+
+    def __init__(self, capacity: int = 2048, enabled: bool = True):
+        """Инициализация трассировщика.
+
+        Args:
+            capacity: Количество хранимых завершенных интервалов
+            enabled: Включена ли трассировка
+        """
+        self._enabled = enabled
+        self._spans: Deque[Span] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._current_trace_id: Optional[str] = None
+        self._trace_roots: Dict[str, Span] = {}
+        # Смещение монотонных часов относительно времени эпохи
+        self._epoch_offset_ns = time.time_ns() - time.perf_counter_ns()
+        # Приемник метрик создается заранее: интервалы закрываются в том числе
+        # в callback PyAudio, где создание логгера и обработчиков недопустимо
+        self._perf_logger = None
+        try:
+            from .logger import PerformanceLogger
+            self._perf_logger = PerformanceLogger("Tracing", enable_console_logging=False)
+        except Exception as e:
+            logger.warning(f"Span latency metrics unavailable: {e}")
+
+    @property
+    def enabled(self) -> bool:
+        """Включена ли трассировка."""
+        return self._enabled
+
+    def set_enabled(self, enabled: bool) -> None:
+        """Включение или выключение трассировки."""
+        self._enabled = enabled
+
+    def current_trace_id(self) -> Optional[str]:
+        """Идентификатор активной трассы."""
+        return self._current_trace_id
+
+    def start_trace(self, name: str = "utterance", **attributes) -> Optional[str]:
+        """Начало новой трассы (фразы).
+
+        Незавершенная предыдущая трасса закрывается с атрибутом abandoned.
+
+        Args:
+            name: Название корневого интервала
+            **attributes: Атрибуты трассы
+
+        Returns:
+            Идентификатор трассы или None, если трассировка выключена
+        """
+        if not self._enabled:
+            return None
+
+        previous = self._current_trace_id
+        if previous is not None:
+            self.end_trace(previous, abandoned=True)
+
+        trace_id = uuid.uuid4().hex[:16]
+        root = self._new_span(trace_id, name, attributes)
+        with self._lock:
+            self._trace_roots[trace_id] = root
+            self._current_trace_id = trace_id
+        return trace_id
+
+    def end_trace(self, trace_id: Optional[str] = None, **attributes) -> Optional[Span]:
+        """Завершение трассы и запись корневого интервала.
+
+        Args:
+            trace_id: Идентификатор трассы (по умолчанию - активная)
+            **attributes: Дополнительные атрибуты корневого интервала
+
+        Returns:
+            Корневой интервал или None, если трасса не найдена
+        """
+        with self._lock:
+            trace_id = trace_id or self._current_trace_id
+            root = self._trace_roots.pop(trace_id, None) if trace_id else None
+            if trace_id is not None and trace_id == self._current_trace_id:
+                self._current_trace_id = None
+
+        if root is None:
+            return None
+
+        root.attributes.update(attributes)
+        self.end_span(root)
+        return root
+
+    def start_span(self, name: str, trace_id: Optional[str] = None, **attributes) -> Optional[Span]:
+        """Открытие интервала, который будет закрыт позже (например, в другом обработчике).
+
+        Args:
+            name: Название стадии
+            trace_id: Идентификатор трассы (по умолчанию - активная)
+            **attributes: Атрибуты интервала
+
+        Returns:
+            Интервал или None, если трассировка выключена или нет активной трассы
+        """
+        if not self._enabled:
+            return None
+        trace_id = trace_id or self._current_trace_id
+        if trace_id is None:
+            return None
+        return self._new_span(trace_id, name, attributes)
+
+    def end_span(self, span: Optional[Span], **attributes) -> None:
+        """Закрытие интервала и запись его в буфер.
+
+        Args:
+            span: Интервал (None игнорируется)
+            **attributes: Дополнительные атрибуты
+        """
+        if span is None or span.end_ns is not None:
+            return
+        span.end_ns = time.perf_counter_ns()
+        if attributes:
+            span.attributes.update(attributes)
+        self._store(span)
+
+    def record_span(self,
+                    name: str,
+                    start_ns: int,
+                    end_ns: Optional[int] = None,
+                    trace_id: Optional[str] = None,
+                    **attributes) -> None:
+        """Запись интервала с уже известными границами (perf_counter_ns).
+
+        Args:
+            name: Название стадии
+            start_ns: Начало интервала
+            end_ns: Окончание (по умолчанию - текущий момент)
+            trace_id: Идентификатор трассы (по умолчанию - активная)
+            **attributes: Атрибуты интервала
+        """
+        if not self._enabled:
+            return
+        trace_id = trace_id or self._current_trace_id
+        if trace_id is None:
+            return
+        thread = threading.current_thread()
+        self._store(Span(
+            trace_id=trace_id,
+            name=name,
+            start_ns=start_ns,
+            end_ns=end_ns if end_ns is not None else time.perf_counter_ns(),
+            thread_id=thread.ident or 0,
+            thread_name=thread.name,
+            attributes=attributes
+        ))
+
+    @contextmanager
+    def span(self, name: str, trace_id: Optional[str] = None, **attributes) -> Iterator[Optional[Span]]:
+        """Контекстный менеджер для интервала.
+
+        Args:
+            name: Название стадии
+            trace_id: Идентификатор трассы (по умолчанию - активная)
+            **attributes: Атрибуты интервала
+        """
+        span = self.start_span(name, trace_id, **attributes)
+        try:
+            yield span
+        except Exception as e:
+            if span is not None:
+                span.attributes["error"] = str(e)
+            raise
+        finally:
+            self.end_span(span)
+
+    def get_spans(self, trace_id: Optional[str] = None, limit: Optional[int] = None) -> List[Span]:
+        """Получение завершенных интервалов.
+
+        Args:
+            trace_id: Фильтр по трассе
+            limit: Только последние limit интервалов
+
+        Returns:
+            Список интервалов в порядке завершения
+        """
+        with self._lock:
+            spans = list(self._spans)
+        if trace_id is not None:
+            spans = [span for span in spans if span.trace_id == trace_id]
+        if limit:
+            spans = spans[-limit:]
+        return spans
+
+    def get_trace_summary(self, trace_id: Optional[str] = None) -> Dict[str, float]:
+        """Длительности стадий трассы в миллисекундах.
+
+        Args:
+            trace_id: Идентификатор трассы (по умолчанию - последняя завершенная)
+
+        Returns:
+            Словарь стадия -> суммарная длительность
+        """
+        spans = self.get_spans()
+        if trace_id is None:
+            if not spans:
+                return {}
+            trace_id = spans[-1].trace_id
+
+        summary: Dict[str, float] = {}
+        for span in spans:
+            if span.trace_id == trace_id:
+                summary[span.name] = summary.get(span.name, 0.0) + (span.duration_ms or 0.0)
+        return summary
+
+    def export_jsonl(self, output_file: Union[str, Path], trace_id: Optional[str] = None) -> int:
+        """Выгрузка интервалов в JSONL (одна строка на интервал).
+
+        Args:
+            output_file: Путь к файлу
+            trace_id: Только интервалы этой трассы
+
+        Returns:
+            Количество выгруженных интервалов
+        """
+        spans = self.get_spans(trace_id)
+        with open(output_file, "w", encoding="utf-8") as f:
+            for span in spans:
+                record = asdict(span)
+                record["start_time"] = (span.start_ns + self._epoch_offset_ns) / 1e9
+                record["duration_ms"] = span.duration_ms
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        return len(spans)
+
+    def export_chrome_trace(self, output_file: Union[str, Path], trace_id: Optional[str] = None) -> int:
+        """Выгрузка интервалов в формате Chrome Trace Event.
+
+        Args:
+            output_file: Путь к файлу
+            trace_id: Только интервалы этой трассы
+
+        Returns:
+            Количество выгруженных интервалов
+        """
+        spans = self.get_spans(trace_id)
+        events = []
+        for span in spans:
+            events.append({
+                "name": span.name,
+                "cat": "voice_control",
+                "ph": "X",
+                "ts": (span.start_ns + self._epoch_offset_ns) / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": 1,
+                "tid": span.thread_name or span.thread_id,
+                "args": {"trace_id": span.trace_id, **span.attributes}
+            })
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f,
+                      ensure_ascii=False, default=str)
+        return len(events)
+
+    def clear(self) -> None:
+        """Очистка буфера интервалов."""
+        with self._lock:
+            self._spans.clear()
+
+    def _new_span(self, trace_id: str, name: str, attributes: Dict[str, Any]) -> Span:
+        """Создание открытого интервала в текущем потоке."""
+        thread = threading.current_thread()
+        return Span(
+            trace_id=trace_id,
+            name=name,
+            start_ns=time.perf_counter_ns(),
+            thread_id=thread.ident or 0,
+            thread_name=thread.name,
+            attributes=dict(attributes)
+        )
+
+    def _store(self, span: Span) -> None:
+        """Запись завершенного интервала в буфер и метрики производительности."""
+        with self._lock:
+            self._spans.append(span)
+
+        if self._perf_logger is None:
+            return
+        try:
+            self._perf_logger.record_metric(f"{span.name}_latency", span.duration_ms / 1000,
+                                            "seconds", operation="trace")
+        except Exception as e:
+            logger.debug(f"Failed to record span metric: {e}")
+
+
+# Глобальный трассировщик
+_global_tracer: Optional[Tracer] = None
+_global_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Получение общего для процесса трассировщика."""
+    global _global_tracer
+    with _global_tracer_lock:
+        if _global_tracer is None:
+            _global_tracer = Tracer()
+        return _global_tracer
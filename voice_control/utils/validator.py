@@ -8,6 +8,8 @@ import re
 import os
 import json
 import ipaddress
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Union, Callable, Tuple
 from pathlib import Path
 from urllib.parse import urlparse
@@ -16,6 +18,33 @@ from enum import Enum
 import mimetypes
 
 
+# Соответствие строковых названий типов типам Python
+_TYPE_MAPPING: Dict[str, Union[type, Tuple[type, ...]]] = {
+    'str': str,
+    'string': str,
+    'int': int,
+    'integer': int,
+    'float': float,
+    'number': (int, float),
+    'bool': bool,
+    'boolean': bool,
+    'list': list,
+    'array': list,
+    'dict': dict,
+    'object': dict,
+    'none': type(None),
+    'null': type(None)
+}
+
+# Схема по умолчанию: один объект, чтобы кэш скомпилированных схем
+# (по идентичности) не заполнялся новыми пустыми словарями. Не изменяется.
+_EMPTY_SCHEMA: Dict[str, Any] = {}
+
+# Проверка одного поля: (данные, ошибки полей, проверенные данные)
+_FieldCheck = Callable[[Dict[str, Any], Dict[str, List[str]], Dict[str, Any]], None]
+SchemaValidator = Callable[[Dict[str, Any]], 'ValidationResult']
+
+
 class ValidationLevel(Enum):
     """Уровни валидации."""
     STRICT = "strict"
@@ -70,6 +99,15 @@ class InputValidator:
         self._custom_rules: Dict[str, List[ValidationRule]] = {}
         self._global_rules: List[ValidationRule] = []
         
+        # Скомпилированные схемы: id(schema) -> (schema, версия правил, валидатор)
+        self._compiled_schemas: "OrderedDict[int, Tuple[Dict[str, Any], int, SchemaValidator]]" = OrderedDict()
+        self._compiled_cache_size = 128
+        # Схемы, переданные в validate_data один раз: в кэш попадают только
+        # повторно используемые схемы, одноразовые словари его не вытесняют
+        self._seen_schemas: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._rules_version = 0
+        self._compile_lock = threading.Lock()
+        
         # Предустановленные паттерны
         self._patterns = {
             'email': re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'),
@@ -105,6 +143,7 @@ class InputValidator:
         if field_name not in self._custom_rules:
             self._custom_rules[field_name] = []
         self._custom_rules[field_name].append(rule)
+        self._rules_version += 1
     
     def add_global_rule(self, rule: ValidationRule) -> None:
         """Добавление глобального правила валидации.
@@ -113,10 +152,17 @@ class InputValidator:
             rule: Правило валидации
         """
         self._global_rules.append(rule)
+        self._rules_version += 1
     
     def validate_data(self, data: Dict[str, Any], schema: Optional[Dict[str, Any]] = None) -> ValidationResult:
         """Валидация данных по схеме.
         
+        Схема кэшируется по идентичности объекта начиная со второго
+        использования (см. compile_schema). Схему, создаваемую заново на
+        каждый вызов, приходится каждый раз компилировать, что в несколько
+        раз медленнее проверки по кэшу, поэтому схемы следует хранить в
+        долгоживущих объектах (например, константах модуля).
+        
         Args:
             data: Данные для валидации
             schema: Схема валидации
@@ -124,79 +170,8 @@ class InputValidator:
         Returns:
             Результат валидации
         """
-        errors = []
-        warnings = []
-        field_errors = {}
-        validated_data = {}
-        
         try:
-            # Валидация по схеме
-            if schema:
-                for field_name, field_config in schema.items():
-                    field_errors[field_name] = []
-                    
-                    # Проверка обязательности поля
-                    if field_config.get('required', False) and field_name not in data:
-                        field_errors[field_name].append(f"Field '{field_name}' is required")
-                        continue
-                    
-                    if field_name in data:
-                        field_value = data[field_name]
-                        
-                        # Валидация типа
-                        expected_type = field_config.get('type')
-                        if expected_type and not self._validate_type(field_value, expected_type):
-                            field_errors[field_name].append(f"Field '{field_name}' must be of type {expected_type}")
-                            continue
-                        
-                        # Валидация значения
-                        validation_result = self._validate_field_value(field_name, field_value, field_config)
-                        if not validation_result[0]:
-                            field_errors[field_name].extend(validation_result[1])
-                        else:
-                            validated_data[field_name] = field_value
-            
-            # Применение пользовательских правил
-            for field_name, value in data.items():
-                if field_name in self._custom_rules:
-                    for rule in self._custom_rules[field_name]:
-                        if rule.level.value <= self._validation_level.value:
-                            try:
-                                if not rule.validator(value):
-                                    if field_name not in field_errors:
-                                        field_errors[field_name] = []
-                                    field_errors[field_name].append(rule.error_message)
-                            except Exception as e:
-                                if field_name not in field_errors:
-                                    field_errors[field_name] = []
-                                field_errors[field_name].append(f"Validation error: {str(e)}")
-            
-            # Применение глобальных правил
-            for rule in self._global_rules:
-                if rule.level.value <= self._validation_level.value:
-                    try:
-                        if not rule.validator(data):
-                            errors.append(rule.error_message)
-                    except Exception as e:
-                        errors.append(f"Global validation error: {str(e)}")
-            
-            # Сбор всех ошибок
-            for field, field_error_list in field_errors.items():
-                errors.extend(field_error_list)
-            
-            # Удаление пустых списков ошибок
-            field_errors = {k: v for k, v in field_errors.items() if v}
-            
-            is_valid = len(errors) == 0
-            
-            return ValidationResult(
-                is_valid=is_valid,
-                errors=errors,
-                warnings=warnings,
-                field_errors=field_errors,
-                validated_data=validated_data if is_valid else None
-            )
-            
+            validator = self._get_validator(schema or _EMPTY_SCHEMA)
         except Exception as e:
             return ValidationResult(
                 is_valid=False,
@@ -204,100 +179,243 @@ class InputValidator:
                 warnings=[],
                 field_errors={}
             )
+        return validator(data)
     
-    def _validate_type(self, value: Any, expected_type: str) -> bool:
-        """Валидация типа значения.
+    def compile_schema(self, schema: Dict[str, Any]) -> SchemaValidator:
+        """Компиляция схемы в специализированную функцию валидации.
+        
+        Типы, регулярные выражения и ограничения разрешаются один раз;
+        пользовательские и глобальные правила отбираются по уровню валидации.
+        Результат кэшируется по идентичности объекта схемы, поэтому схема
+        не должна изменяться после первого использования (иначе вызовите
+        clear_schema_cache()). Добавление правил делает кэш недействительным.
         
         Args:
-            value: Значение для проверки
-            expected_type: Ожидаемый тип
+            schema: Схема валидации
             
         Returns:
-            True если тип корректен
+            Функция data -> ValidationResult
         """
-        type_mapping = {
-            'str': str,
-            'string': str,
-            'int': int,
-            'integer': int,
-            'float': float,
-            'number': (int, float),
-            'bool': bool,
-            'boolean': bool,
-            'list': list,
-            'array': list,
-            'dict': dict,
-            'object': dict,
-            'none': type(None),
-            'null': type(None)
-        }
-        
-        expected_python_type = type_mapping.get(expected_type.lower())
-        if expected_python_type:
-            return isinstance(value, expected_python_type)
-        
-        return True
+        key = id(schema)
+        with self._compile_lock:
+            cached = self._compiled_schemas.get(key)
+            if cached is not None and cached[0] is schema and cached[1] == self._rules_version:
+                self._compiled_schemas.move_to_end(key)
+                return cached[2]
+            rules_version = self._rules_version
+        
+        validator = self._build_validator(schema)
+        
+        with self._compile_lock:
+            self._compiled_schemas[key] = (schema, rules_version, validator)
+            self._compiled_schemas.move_to_end(key)
+            while len(self._compiled_schemas) > self._compiled_cache_size:
+                self._compiled_schemas.popitem(last=False)
+        return validator
     
-    def _validate_field_value(self, field_name: str, value: Any, config: Dict[str, Any]) -> Tuple[bool, List[str]]:
-        """Валидация значения поля.
+    def _get_validator(self, schema: Dict[str, Any]) -> SchemaValidator:
+        """Валидатор для validate_data: из кэша или без кэширования при первом использовании схемы.
         
         Args:
-            field_name: Название поля
-            value: Значение поля
-            config: Конфигурация валидации
+            schema: Схема валидации
             
         Returns:
-            Кортеж (валидно, список ошибок)
+            Функция data -> ValidationResult
         """
-        errors = []
+        key = id(schema)
+        with self._compile_lock:
+            cached = self._compiled_schemas.get(key)
+            if cached is not None and cached[0] is schema and cached[1] == self._rules_version:
+                self._compiled_schemas.move_to_end(key)
+                return cached[2]
+            # Схема хранится в _seen_schemas, поэтому ее id не может достаться другому объекту
+            reused = self._seen_schemas.pop(key, None) is schema
+            if not reused:
+                self._seen_schemas[key] = schema
+                while len(self._seen_schemas) > self._compiled_cache_size:
+                    self._seen_schemas.popitem(last=False)
+        
+        if reused:
+            return self.compile_schema(schema)
+        return self._build_validator(schema)
+    
+    def clear_schema_cache(self) -> None:
+        """Очистка кэша скомпилированных схем."""
+        with self._compile_lock:
+            self._compiled_schemas.clear()
+            self._seen_schemas.clear()
+    
+    def _build_validator(self, schema: Dict[str, Any]) -> SchemaValidator:
+        """Построение функции валидации для схемы.
         
-        # Валидация длины строки
-        if isinstance(value, str):
-            min_length = config.get('min_length')
-            max_length = config.get('max_length', self._default_settings['max_string_length'])
-            
-            if min_length and len(value) < min_length:
-                errors.append(f"Field '{field_name}' must be at least {min_length} characters long")
+        Args:
+            schema: Схема валидации
             
-            if max_length and len(value) > max_length:
-                errors.append(f"Field '{field_name}' must be no more than {max_length} characters long")
+        Returns:
+            Функция data -> ValidationResult
+        """
+        level = self._validation_level.value
+        field_checks = [self._compile_field(field_name, field_config)
+                        for field_name, field_config in schema.items()]
+        schema_fields = list(schema)
+        custom_rules = {
+            field_name: rules
+            for field_name, rules in (
+                (name, [rule for rule in field_rules if rule.level.value <= level])
+                for name, field_rules in self._custom_rules.items()
+            )
+            if rules
+        }
+        global_rules = [rule for rule in self._global_rules if rule.level.value <= level]
+        
+        # Вложенные функции без аннотаций: аннотации вычисляются при каждом
+        # создании функции, а схема может компилироваться на каждый вызов
+        def validate(data):  # SchemaValidator
+            errors: List[str] = []
+            field_errors: Dict[str, List[str]] = {field_name: [] for field_name in schema_fields}
+            validated_data: Dict[str, Any] = {}
+            
+            try:
+                # Валидация по схеме
+                for check in field_checks:
+                    check(data, field_errors, validated_data)
+                
+                # Применение пользовательских правил
+                if custom_rules:
+                    for field_name, value in data.items():
+                        rules = custom_rules.get(field_name)
+                        if not rules:
+                            continue
+                        for rule in rules:
+                            try:
+                                if not rule.validator(value):
+                                    field_errors.setdefault(field_name, []).append(rule.error_message)
+                            except Exception as e:
+                                field_errors.setdefault(field_name, []).append(f"Validation error: {str(e)}")
+                
+                # Применение глобальных правил
+                for rule in global_rules:
+                    try:
+                        if not rule.validator(data):
+                            errors.append(rule.error_message)
+                    except Exception as e:
+                        errors.append(f"Global validation error: {str(e)}")
+                
+                # Сбор всех ошибок (пустые списки ошибок удаляются)
+                for field_error_list in field_errors.values():
+                    errors.extend(field_error_list)
+                field_errors = {k: v for k, v in field_errors.items() if v}
+                
+                is_valid = not errors
+                return ValidationResult(
+                    is_valid=is_valid,
+                    errors=errors,
+                    warnings=[],
+                    field_errors=field_errors,
+                    validated_data=validated_data if is_valid else None
+                )
+                
+            except Exception as e:
+                return ValidationResult(
+                    is_valid=False,
+                    errors=[f"Validation failed: {str(e)}"],
+                    warnings=[],
+                    field_errors={}
+                )
+        
+        return validate
+    
+    def _compile_field(self, field_name: str, config: Dict[str, Any]) -> _FieldCheck:
+        """Компиляция проверок одного поля схемы.
         
-        # Валидация диапазона чисел
-        if isinstance(value, (int, float)):
-            min_value = config.get('min_value')
-            max_value = config.get('max_value')
-            
-            if min_value is not None and value < min_value:
-                errors.append(f"Field '{field_name}' must be at least {min_value}")
-            
-            if max_value is not None and value > max_value:
-                errors.append(f"Field '{field_name}' must be no more than {max_value}")
+        Проверки выполняются в порядке: обязательность, тип, длина строки,
+        диапазон чисел, паттерн, допустимые и запрещенные значения.
         
-        # Валидация паттерна
+        Args:
+            field_name: Название поля
+            config: Конфигурация валидации поля
+            
+        Returns:
+            Функция проверки поля
+        """
+        required = config.get('required', False)
+        expected_type = config.get('type')
+        python_type = _TYPE_MAPPING.get(expected_type.lower()) if expected_type else None
+        value_checks: List[Callable[[Any], Optional[str]]] = []
+        
+        # Длина строки
+        min_length = config.get('min_length')
+        max_length = config.get('max_length', self._default_settings['max_string_length'])
+        if min_length:
+            min_length_message = f"Field '{field_name}' must be at least {min_length} characters long"
+            value_checks.append(lambda value: min_length_message
+                                if isinstance(value, str) and len(value) < min_length else None)
+        if max_length:
+            max_message = f"Field '{field_name}' must be no more than {max_length} characters long"
+            value_checks.append(lambda value: max_message if isinstance(value, str) and len(value) > max_length else None)
+        
+        # Диапазон чисел
+        min_value = config.get('min_value')
+        max_value = config.get('max_value')
+        if min_value is not None:
+            min_value_message = f"Field '{field_name}' must be at least {min_value}"
+            value_checks.append(lambda value: min_value_message
+                                if isinstance(value, (int, float)) and value < min_value else None)
+        if max_value is not None:
+            max_value_message = f"Field '{field_name}' must be no more than {max_value}"
+            value_checks.append(lambda value: max_value_message
+                                if isinstance(value, (int, float)) and value > max_value else None)
+        
+        # Паттерн
         pattern = config.get('pattern')
-        if pattern and isinstance(value, str):
-            if isinstance(pattern, str):
-                if pattern in self._patterns:
-                    if not self._patterns[pattern].match(value):
-                        errors.append(f"Field '{field_name}' does not match required pattern")
-                else:
-                    try:
-                        if not re.match(pattern, value):
-                            errors.append(f"Field '{field_name}' does not match required pattern")
-                    except re.error:
-                        errors.append(f"Invalid pattern for field '{field_name}'")
-        
-        # Валидация списка допустимых значений
+        if pattern and isinstance(pattern, str):
+            pattern_message = f"Field '{field_name}' does not match required pattern"
+            compiled = self._patterns.get(pattern)
+            if compiled is None:
+                try:
+                    compiled = re.compile(pattern)
+                except re.error:
+                    invalid_message = f"Invalid pattern for field '{field_name}'"
+                    value_checks.append(lambda value: invalid_message if isinstance(value, str) else None)
+            if compiled is not None:
+                match = compiled.match
+                value_checks.append(lambda value: pattern_message
+                                    if isinstance(value, str) and not match(value) else None)
+        
+        # Допустимые и запрещенные значения
         allowed_values = config.get('allowed_values')
-        if allowed_values and value not in allowed_values:
-            errors.append(f"Field '{field_name}' must be one of: {', '.join(map(str, allowed_values))}")
-        
-        # Валидация запрещенных значений
+        if allowed_values:
+            allowed_message = f"Field '{field_name}' must be one of: {', '.join(map(str, allowed_values))}"
+            value_checks.append(lambda value: allowed_message if value not in allowed_values else None)
         forbidden_values = config.get('forbidden_values')
-        if forbidden_values and value in forbidden_values:
-            errors.append(f"Field '{field_name}' cannot be one of: {', '.join(map(str, forbidden_values))}")
-        
-        return len(errors) == 0, errors
+        if forbidden_values:
+            forbidden_message = f"Field '{field_name}' cannot be one of: {', '.join(map(str, forbidden_values))}"
+            value_checks.append(lambda value: forbidden_message if value in forbidden_values else None)
+        
+        required_message = f"Field '{field_name}' is required"
+        type_message = f"Field '{field_name}' must be of type {expected_type}"
+        
+        def check(data, field_errors, validated_data):  # _FieldCheck
+            if field_name not in data:
+                if required:
+                    field_errors[field_name].append(required_message)
+                return
+            
+            value = data[field_name]
+            if python_type is not None and not isinstance(value, python_type):
+                field_errors[field_name].append(type_message)
+                return
+            
+            failed = False
+            for value_check in value_checks:
+                message = value_check(value)
+                if message is not None:
+                    field_errors[field_name].append(message)
+                    failed = True
+            if not failed:
+                validated_data[field_name] = value
+        
+        return check
     
     def validate_string(self, value: str, 
                        min_length: Optional[int] = None,
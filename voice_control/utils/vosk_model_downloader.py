@@ -11,11 +11,16 @@ import os
 import sys
 import argparse
 import requests
-import zipfile
 import shutil
 from pathlib import Path
 from typing import Dict, Optional
 
+try:
+    from .file_helper import FileHelper
+except ImportError:
+    # Запуск как отдельного скрипта
+    from file_helper import FileHelper
+
 # Доступные модели Vosk
 VOSK_MODELS = {
     'ru': {
@@ -77,8 +82,12 @@ def extract_archive(archive_path: Path, extract_to: Path) -> Optional[Path]:
     try:
         print(f"Извлечение архива: {archive_path}")
         
-        with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_to)
+        def report(done: int, total: int) -> None:
+            if total:
+                print(f"\rРаспаковано: {done * 100 / total:.1f}%", end='', flush=True)
+        
+        FileHelper(enable_logging=False).extract_archive(str(archive_path), str(extract_to), progress=report)
+        print()
         
         # Ищем папку модели
         for item in extract_to.iterdir():
@@ -1,14 +1,43 @@
 """Диалог загрузки модели Vosk с прогрессом и возможностью отмены."""
 import logging
 import os
+import threading
+import time
+import weakref
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                                QProgressBar, QPushButton, QMessageBox)
 from PySide6.QtCore import Signal, QThread, QTimer
 from vosk import Model, KaldiRecognizer
 import json
 
+from .profiler import get_profiler
+
 logger = logging.getLogger(__name__)
 
+# Общие для процесса счетчики кэша загруженных моделей
+_model_cache_statistics = {
+    "hits": 0,
+    "misses": 0,
+    "load_failures": 0,
+    "load_seconds_total": 0.0
+}
+_model_cache_lock = threading.Lock()
+_loaded_managers = weakref.WeakSet()
+
+
+def get_model_cache_statistics():
+    """Возвращает статистику кэша моделей Vosk: попадания, загрузки, ошибки и время загрузки."""
+    with _model_cache_lock:
+        stats = dict(_model_cache_statistics)
+        stats["loaded_models"] = len(_loaded_managers)
+    return stats
+
+
+def _record_model_cache(key, value=1):
+    """Увеличивает счетчик статистики кэша моделей."""
+    with _model_cache_lock:
+        _model_cache_statistics[key] += value
+
 class ModelLoadingDialog(QDialog):
     """Диалог для отображения прогресса загрузки модели Vosk."""
     
@@ -104,10 +133,11 @@ class ModelLoadingThread(QThread):
                 raise ValueError(f"Путь к модели должен быть директорией: {self.model_path}")
             
             # Загружаем модель (это может занять много времени)
-            model = Model(self.model_path)
-            
-            # Создаем распознаватель с частотой дискретизации 16000 Гц
-            recognizer = KaldiRecognizer(model, 16000)
+            with get_profiler().profile("model_load"):
+                model = Model(self.model_path)
+                
+                # Создаем распознаватель с частотой дискретизации 16000 Гц
+                recognizer = KaldiRecognizer(model, 16000)
             
             logger.info(f"Модель Vosk успешно загружена: {self.model_path}")
             self.model_loaded.emit(model, recognizer)
@@ -209,15 +239,19 @@ class VoskModelManager:
         if (self.current_model and self.current_recognizer and 
             self.current_model_path == model_path):
             logger.info(f"Модель уже загружена: {model_path}")
+            _record_model_cache("hits")
             return True
         
+        _record_model_cache("misses")
+        load_started = time.perf_counter()
         if show_dialog:
             success, model, recognizer = VoskModelTester.test_model_loading(
                 model_path, parent_widget)
         else:
             try:
-                model = Model(model_path)
-                recognizer = KaldiRecognizer(model, 16000)
+                with get_profiler().profile("model_load"):
+                    model = Model(model_path)
+                    recognizer = KaldiRecognizer(model, 16000)
                 success = True
             except Exception as e:
                 logger.error(f"Ошибка загрузки модели: {e}")
@@ -225,13 +259,18 @@ class VoskModelManager:
                 model = None
                 recognizer = None
         
+        _record_model_cache("load_seconds_total", time.perf_counter() - load_started)
+        
         if success:
             self.current_model = model
             self.current_recognizer = recognizer
             self.current_model_path = model_path
+            with _model_cache_lock:
+                _loaded_managers.add(self)
             logger.info(f"Модель Vosk успешно загружена: {model_path}")
             return True
         else:
+            _record_model_cache("load_failures")
             return False
     
     def get_model_info(self):
@@ -257,4 +296,6 @@ class VoskModelManager:
         self.current_model = None
         self.current_recognizer = None
         self.current_model_path = None
+        with _model_cache_lock:
+            _loaded_managers.discard(self)
         logger.info("Модель Vosk выгружена")
\ No newline at end of file
@@ -24,6 +24,7 @@ from voice_control.recognizers.yandex_recognizer import YandexSpeechRecognizer
 from voice_control.recognizers.vosk_recognizer import VoskSpeechRecognizer
 # from voice_control.recognizers.google_recognizer import GoogleSpeechRecognizer
 from voice_control.microphone.qt_audio_capture import QtAudioCapture
+from voice_control.utils.tracing import get_tracer
 
 # Настройка логирования
 logger = logging.getLogger(__name__)
@@ -100,6 +101,10 @@ class  VoiceAnnotationWidget(QWidget):
         # Флаг для отложенного закрытия виджета
         self._finalize_after_recognition = False
         
+        # Трасса текущей фразы и интервал захвата звука
+        self._trace_id = None
+        self._capture_span = None
+        
         # Для плавного отображения уровня звука
         self.current_level = 0
         self.target_level = 0
@@ -356,14 +361,24 @@ class  VoiceAnnotationWidget(QWidget):
                 logger.error(self.tr("Не найдены микрофоны"))
                 return
             
+            # Фраза продолжает трассу горячей клавиши или начинает новую
+            tracer = get_tracer()
+            trace_id = tracer.current_trace_id()
+            if trace_id is None or trace_id == self._trace_id:
+                trace_id = tracer.start_trace("utterance", trigger="widget")
+            self._trace_id = trace_id
+            self._capture_span = tracer.start_span("capture", trace_id)
+            
             if self.audio_capture.start_recording():
                 self.model.is_recording = True
                 
                 logger.info(self.tr("Начата запись звука (макс. длительность: {} сек)").format(self.model.max_duration_sec))
             else:
                 logger.error(self.tr("Не удалось начать запись"))
+                self._end_trace(status="capture_failed")
         except Exception as e:
             logger.error(self.tr("Ошибка при запуске записи: {}").format(e))
+            self._end_trace(status="capture_failed")
 
     def stop_recording(self):
         """Остановка записи звука."""
@@ -400,9 +415,13 @@ class  VoiceAnnotationWidget(QWidget):
         """Обработчик сигнала о завершении записи."""
         logger.info(self.tr("Получен сигнал о завершении записи от audio_capture"))
         self.model.is_recording = False 
+        tracer = get_tracer()
+        tracer.end_span(self._capture_span)
+        self._capture_span = None
 
         try:
-            audio_data = self.audio_capture.get_recorded_data()
+            with tracer.span("collect_audio", self._trace_id):
+                audio_data = self.audio_capture.get_recorded_data()
             if audio_data and len(audio_data) > 0:
                 logger.info(self.tr("Аудиоданные успешно получены из буфера: {} байт.").format(len(audio_data[0]) if isinstance(audio_data, tuple) and audio_data else len(audio_data)))
                 
@@ -416,13 +435,20 @@ class  VoiceAnnotationWidget(QWidget):
                     self.view.resize(self.view.width(), 150)
                     self.model.current_text = self.tr("Запись завершена. Отредактируйте текст или нажмите 'Готово'.")
                     QApplication.processEvents()
+                    self._end_trace(status="manual")
             else:
                 logger.warning(self.tr("Не удалось получить аудиоданные из буфера (пустые данные или null)."))
                 self.model.current_text = self.tr("<нет записи>") 
+                self._end_trace(status="no_audio")
 
         except Exception as e:
             logger.error(self.tr("Ошибка при обработке аудиоданных в _on_recording_stopped: {}").format(e), exc_info=True)
             self.model.error_message = self.tr("Ошибка обработки аудио: {}").format(e)
+            self._end_trace(status="error")
+
+    def _end_trace(self, **attributes):
+        """Завершает трассу текущей фразы (повторный вызов ничего не делает)."""
+        get_tracer().end_trace(self._trace_id, **attributes)
 
     def _on_volume_changed(self, volume):
         """Обработчик сигнала изменения громкости."""
@@ -484,7 +510,8 @@ class  VoiceAnnotationWidget(QWidget):
                 self.recognition_thread = QThread()
                 self.recognition_worker = RecognitionWorker(self.recognizer, 
                                                   audio_file_path=worker_file_path, 
-                                                  audio_data_tuple=worker_audio_data)
+                                                  audio_data_tuple=worker_audio_data,
+                                                  trace_id=self._trace_id)
                 self.recognition_worker.moveToThread(self.recognition_thread)
 
                 self.recognition_worker.recognition_finished.connect(self._on_recognition_result)
@@ -501,6 +528,7 @@ class  VoiceAnnotationWidget(QWidget):
             logger.error(self.tr("Ошибка при настройке или запуске потока распознавания: {}").format(e), exc_info=True)
             self.model.error_message = self.tr("Внутренняя ошибка: {}").format(e)
             self.model.is_recognizing = False
+            self._end_trace(status="error")
             if self.recognition_thread:
                 if self.recognition_thread.isRunning():
                     self.recognition_thread.quit()
@@ -557,11 +585,13 @@ class  VoiceAnnotationWidget(QWidget):
                 self.model.error_message = self.tr("Ошибка: не удалось распознать текст.")
                 self.view.show_text_edit(True)
                 logger.error(self.tr("Ошибка распознавания: не удалось распознать текст."))
+                self._end_trace(status="empty")
         else:
             error_msg = result.get('error', self.tr('Неизвестная ошибка распознавания'))
             self.model.error_message = self.tr("Ошибка: {}").format(error_msg)
             self.view.show_text_edit(True)
             logger.error(self.tr("Ошибка распознавания: {}").format(error_msg))
+            self._end_trace(status="error")
 
         if self._finalize_after_recognition:
             self._finalize_after_recognition = False
@@ -577,6 +607,7 @@ class  VoiceAnnotationWidget(QWidget):
 
         self.model.error_message = self.tr("Ошибка распознавания: {}").format(error_message)
         self.view.show_text_edit(True)
+        self._end_trace(status="error")
 
         if self._finalize_after_recognition:
             self._finalize_after_recognition = False
@@ -660,6 +691,8 @@ class  VoiceAnnotationWidget(QWidget):
 
         text = self.model.current_text.strip()
         mode = self.settings_manager.get_setting("main/recognition_mode", 0)
+        # Если текст не был вставлен привязкой, фраза завершается здесь
+        self._end_trace(status="emitted", mode=mode)
 
         logger.info(self.tr("Аннотация готова: '{}...' ({} символов), режим: {}").format(text[:50], len(text), mode))
 
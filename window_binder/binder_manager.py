@@ -12,6 +12,7 @@ from window_binder.storage.binding_storage import BindingStorage
 from window_binder.managers.widget_manager import WidgetManager
 from window_binder.models.binding_model import WindowBinding, WindowIdentifier, SelectedWindowData, IdentificationMethod
 from window_binder.utils.window_identifier import window_identification_service
+from voice_control.utils.tracing import get_tracer
 
 BINDINGS_FILE = os.path.join("settings", "bindings.json")
 
@@ -68,6 +69,14 @@ class BinderManager(QObject):
             self.logger.warning("Recognition finished with empty text, skipping paste.")
             return
 
+        tracer = get_tracer()
+        with tracer.span("paste", chars=len(text)):
+            self._paste_text(text)
+        # Вставка - последняя стадия фразы
+        tracer.end_trace(status="pasted")
+
+    def _paste_text(self, text):
+        """Вставка распознанного текста в окно привязки или в активное окно."""
         # Случай 1: Распознавание было вызвано для конкретной привязки
         if self.specific_binding_target:
             binding = self.specific_binding_target
@@ -409,5 +418,6 @@ class BinderManager(QObject):
     
     def cleanup(self):
         """Очистить все ресурсы"""
+        self.storage.flush()
         self.widget_manager.cleanup()
         self.logger.info("BinderManager cleanup completed")
\ No newline at end of file
@@ -4,6 +4,7 @@ import uuid
 import logging
 from typing import Dict, List, Optional
 from window_binder.models.binding_model import WindowBinding
+from utils.write_behind import get_write_behind_writer
 
 
 class BindingStorage:
@@ -14,11 +15,13 @@ class BindingStorage:
         self.logger = logging.getLogger(__name__)
     
     def save_bindings(self, bindings: Dict[str, WindowBinding]) -> bool:
-        """Сохранить привязки в файл"""
+        """Сохранить привязки в файл.
+        
+        Запись отложенная: частые сохранения (например, при перетаскивании
+        виджета) объединяются в одну атомарную запись файла.
+        """
         try:
-            self.logger.info(f"BindingStorage: [SAVE_START] Starting to save {len(bindings)} bindings to {self.bindings_file}")
-            
-            os.makedirs(os.path.dirname(self.bindings_file), exist_ok=True)
+            self.logger.debug(f"BindingStorage: [SAVE_START] Scheduling save of {len(bindings)} bindings to {self.bindings_file}")
             
             bindings_to_save = [b.to_dict() for b in bindings.values()]
             
@@ -26,10 +29,9 @@ class BindingStorage:
                 display_name = binding_data.get('window_identifier', {}).get('title', 'unknown')
                 self.logger.debug(f"BindingStorage: [SAVING_BINDING] ID: {binding_data['id']}, Name: '{display_name}'")
 
-            with open(self.bindings_file, "w", encoding='utf-8') as f:
-                json.dump(bindings_to_save, f, indent=4, ensure_ascii=False)
+            get_write_behind_writer().write_json(self.bindings_file, bindings_to_save, indent=4)
             
-            self.logger.info(f"BindingStorage: [SAVE_SUCCESS] Successfully saved {len(bindings_to_save)} bindings to {self.bindings_file}")
+            self.logger.debug(f"BindingStorage: [SAVE_SCHEDULED] Scheduled save of {len(bindings_to_save)} bindings to {self.bindings_file}")
             return True
             
         except Exception as e:
@@ -40,6 +42,9 @@ class BindingStorage:
         """Загрузить привязки из файла"""
         bindings: Dict[str, WindowBinding] = {}
         
+        # Незаписанные изменения должны попасть на диск до чтения
+        self.flush()
+        
         if not os.path.exists(self.bindings_file):
             self.logger.info(f"BindingStorage: [LOAD_INFO] Bindings file {self.bindings_file} not found, starting with empty bindings")
             return bindings
@@ -64,6 +69,10 @@ class BindingStorage:
         
         return bindings
     
+    def flush(self) -> None:
+        """Немедленно записать отложенные изменения привязок"""
+        get_write_behind_writer().flush(self.bindings_file)
+    
     def add_binding(self, bindings: Dict[str, WindowBinding], binding: WindowBinding) -> str:
         """Добавить новую привязку"""
         binding.update_timestamp()
@@ -1,6 +1,8 @@
 """Утилиты для логирования"""
 
 import logging
+
+from logging_config import route_handler
 from window_binder.config import config
 from window_binder.utils.file_utils import FileUtils
 
@@ -33,11 +35,11 @@ class LoggingUtils:
                 # Форматтер
                 formatter = logging.Formatter(config.logging.log_format)
                 file_handler.setFormatter(formatter)
-                logger.addHandler(file_handler)
+                route_handler(logger, file_handler)
             
             # Простой форматтер для консоли
             console_formatter = logging.Formatter('%(name)s - %(levelname)s - %(message)s')
             console_handler.setFormatter(console_formatter)
-            logger.addHandler(console_handler)
+            route_handler(logger, console_handler)
         
         return logger
\ No newline at end of file